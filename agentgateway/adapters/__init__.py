@@ -1,8 +1,22 @@
-from .groq_agent import GroqAgent
-from .openai_gpt_agent import OpenAIGPTAgent
-from .fireworks_ai_agent import FireworksAIAgent
-from .together_ai_agent import TogetherAIAgent
-from .bedrock_converse_agent import BedrockConverseAgent
-from .anthropic_claude_agent import AnthropicClaudeAgent
-
-__all__ = [GroqAgent, OpenAIGPTAgent, FireworksAIAgent,TogetherAIAgent,BedrockConverseAgent,AnthropicClaudeAgent]
+import importlib
+
+# each adapter imports its provider SDK, so adapters are loaded on first access
+_LAZY_IMPORTS = {
+    "GroqAgent": ".groq_agent",
+    "OpenAIGPTAgent": ".openai_gpt_agent",
+    "FireworksAIAgent": ".fireworks_ai_agent",
+    "TogetherAIAgent": ".together_ai_agent",
+    "BedrockConverseAgent": ".bedrock_converse_agent",
+    "AnthropicClaudeAgent": ".anthropic_claude_agent",
+    "RoutingAgent": ".routing_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["GroqAgent", "OpenAIGPTAgent", "FireworksAIAgent", "TogetherAIAgent", "BedrockConverseAgent",
+           "AnthropicClaudeAgent", "RoutingAgent"]
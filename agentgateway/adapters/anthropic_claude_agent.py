@@ -1,19 +1,28 @@
-from datetime import datetime, timezone
-
+import asyncio
+import json
 import anthropic
-import time
-from typing import List, Dict, Any, Type, Optional
+from typing import List, Dict, Any, Type, Optional, Iterator
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.abstract_tool import Tool
-from agentgateway.core.response import Response, ResponseType, EventType
-from anthropic.types import ToolUseBlock, TextBlock
+from agentgateway.core.clients import create_async_client, get_adapter_max_retries, get_shared_client
+from agentgateway.core.message import to_canonical, to_provider_messages
+from agentgateway.core.prompt_caching import ANTHROPIC_CACHE_CONTROL, add_anthropic_cache_control
+from agentgateway.core.response import Response, ResponseType, StreamEvent, StreamEventType
+from agentgateway.core.streaming import assemble_anthropic_message_stream
+from anthropic.types import Message, ToolUseBlock, TextBlock
 from agentgateway.utils.agent_logger import AgentLogger
 
 
 class AnthropicClaudeAgent(AbstractAgent):
+    PROVIDER = "anthropic"
+    SUPPORTS_PROVIDER_BATCH = True
+    WIRE_FORMAT = "anthropic"
+    BATCH_PATH = "/v1/messages/batches"
+
     def __init__(self, model_id: str):
         super().__init__(model_id)
         self.client = None
+        self.async_client = None
         self.formatted_tools = []
         self.logging = AgentLogger("Agent")
         self.response = None
@@ -27,7 +36,9 @@ class AnthropicClaudeAgent(AbstractAgent):
             raise ValueError("Missing required authentication parameter: api_key")
 
         self.auth_data = {'api_key': kwargs['api_key']}
-        self.client = anthropic.Client(api_key=self.auth_data['api_key'])
+        self.client = get_shared_client(anthropic.Client, max_retries=get_adapter_max_retries(),
+                                        api_key=self.auth_data['api_key'])
+        self.async_client = None
 
     def get_auth(self) -> Dict[str, Any]:
         """
@@ -60,20 +71,64 @@ class AnthropicClaudeAgent(AbstractAgent):
         Add a new tool to the agent's toolkit and format it for Claude.
         :param tool: A Tool instance to be added.
         """
-        formatted_tool = {
+        self._add_tool_definition(tool, "anthropic", self._format_tool)
+        super().add_tool(tool)
+
+    def _format_tool(self, tool: Tool) -> Dict[str, Any]:
+        schema = tool.get_parameters_schema()
+        return {
             "name": tool.name,
             "description": tool.description,
             "input_schema": {
                 "type": "object",
-                "properties": tool.get_parameters_schema().get("properties", {}),
-                "required": tool.get_parameters_schema().get("required", [])
+                "properties": schema.get("properties", {}),
+                "required": schema.get("required", [])
             }
         }
-        self.formatted_tools.append(formatted_tool)
-        self.tools[tool.name] = tool
 
     def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response, conversation_id = self._prepare_run(agent_input, is_tool_response, conversation_id)
+
+        self.logging.info("AnthropicClaudeAgent:run:invoking the selected model %s", self.model_id)
+        try:
+            model_response = self._call_model(self._build_request(conversation_id), response)
+            self._process_model_response(model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response, conversation_id = await asyncio.to_thread(self._prepare_run, agent_input, is_tool_response,
+                                                            conversation_id)
+
+        self.logging.info("AnthropicClaudeAgent:arun:invoking the selected model %s", self.model_id)
+        try:
+            request = await asyncio.to_thread(self._build_request, conversation_id)
+            model_response = await self._acall_model(request, response)
+            await asyncio.to_thread(self._process_model_response, model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        response, conversation_id = self._prepare_run(agent_input, is_tool_response, conversation_id)
+
+        self.logging.info("AnthropicClaudeAgent:stream:streaming the selected model %s", self.model_id)
+        try:
+            model_response = yield from self._stream_model(self._build_request(conversation_id), response)
+            self._process_model_response(model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
 
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _prepare_run(self, agent_input, is_tool_response, conversation_id):
         # if response object is not set, create a new one
         if self.response is None:
             self.response = Response()
@@ -90,61 +145,101 @@ class AnthropicClaudeAgent(AbstractAgent):
         if not self.client:
             raise ValueError("Authentication not set. Please call set_auth() before running the agent.")
 
-        self.add_to_conversation_history({"role":"user", "content": agent_input}, conversation_id)
+        self.extend_conversation_history(to_canonical({"role":"user", "content": agent_input}, self.WIRE_FORMAT),
+                                         conversation_id)
+        return response, conversation_id
 
-        self.logging.info(f"AnthropicClaudeAgent:run:invoking the selected model {self.model_id}")
-        try:
-            start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            start = time.perf_counter()
-            if len(self.formatted_tools) > 0:
-                model_response = self.client.messages.create(
-                    model=self.model_id,
-                    system=self.instructions,
-                    max_tokens=self.model_config['max_tokens'],
-                    temperature=self.model_config['temperature'],
-                    messages=self.get_conversation_history(conversation_id),
-                    tools=self.formatted_tools,
-                    tool_choice={"type": "auto"}
-                )
+    def _build_request(self, conversation_id) -> Dict[str, Any]:
+        request = {
+            "model": self.model_id,
+            "system": self.instructions,
+            "max_tokens": self.model_config['max_tokens'],
+            "temperature": self.model_config['temperature'],
+            "messages": to_provider_messages(self.get_request_history(conversation_id), self.WIRE_FORMAT)
+        }
+        if len(self.formatted_tools) > 0:
+            request["tools"] = self.formatted_tools
+            request["tool_choice"] = {"type": "auto"}
+        if self.prompt_caching:
+            self._add_cache_breakpoints(request)
+        return request
+
+    def _add_cache_breakpoints(self, request: Dict[str, Any]):
+        # the formatted tools are shared definitions, so the last one is copied rather than marked in place
+        if request.get("tools"):
+            request["tools"] = request["tools"][:-1] + [{**request["tools"][-1], "cache_control": ANTHROPIC_CACHE_CONTROL}]
+        if request["system"]:
+            request["system"] = [{"type": "text", "text": request["system"], "cache_control": ANTHROPIC_CACHE_CONTROL}]
+        request["messages"] = add_anthropic_cache_control(request["messages"])
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return self.client.messages.create(**request)
+
+    def _invoke_model_stream(self, request: Dict[str, Any]):
+        events = self.client.messages.create(**request, stream=True)
+        message = yield from assemble_anthropic_message_stream(events)
+        return Message.model_validate(message)
+
+    async def _ainvoke_model(self, request: Dict[str, Any]):
+        if self.async_client is None:
+            self.async_client = create_async_client(anthropic.AsyncClient, max_retries=get_adapter_max_retries(),
+                                                    api_key=self.auth_data['api_key'])
+        return await self.async_client.messages.create(**request)
+
+    def _get_usage(self, model_response):
+        return model_response.usage.input_tokens, model_response.usage.output_tokens
+
+    def _get_cache_usage(self, model_response):
+        usage = model_response.usage
+        return (getattr(usage, "cache_read_input_tokens", None) or 0,
+                getattr(usage, "cache_creation_input_tokens", None) or 0)
+
+    def _deserialize_model_response(self, data):
+        return Message.model_validate(data)
+
+    def _submit_batch(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        # Message Batches are called through the client's raw HTTP methods, as the pinned SDK predates them
+        body = {"requests": [{"custom_id": custom_id, "params": request} for custom_id, request in requests.items()]}
+        batch = self.client.post(self.BATCH_PATH, body=body, cast_to=object)
+        return batch["id"]
+
+    def _get_batch_results(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        batch = self.client.get(f"{self.BATCH_PATH}/{batch_id}", cast_to=object)
+        if batch["processing_status"] != "ended":
+            return None
+        results = {}
+        for line in self.client.get(f"{self.BATCH_PATH}/{batch_id}/results", cast_to=str).splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            result = entry["result"]
+            if result["type"] == "succeeded":
+                results[entry["custom_id"]] = Message.model_validate(result["message"])
             else:
-                model_response = self.client.messages.create(
-                    model=self.model_id,
-                    system=self.instructions,
-                    max_tokens=self.model_config['max_tokens'],
-                    temperature=self.model_config['temperature'],
-                    messages=self.get_conversation_history(conversation_id)
-                )
-            end_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            llm_latency = time.perf_counter() - start
-            response.set_conversation_id(conversation_id)
-            response.update_usage(model_response.usage.input_tokens,
-                                  model_response.usage.output_tokens)
-            response.add_trace_detail(EventType.LLM_CALL, latency=llm_latency,
-                                      input_tokens=model_response.usage.input_tokens,
-                                      output_tokens=model_response.usage.output_tokens,
-                                      start_time=start_time, end_time=end_time)
-
-            self.logging.info(f"AnthropicClaudeAgent:run:model invoke completed")
-            assistant_message = self.get_model_response(model_response.content)
-            message = {"role":"assistant", "content":model_response.model_dump()}
-            self.add_to_conversation_history(self.get_formatted_assistant_message(model_response.model_dump()), conversation_id)
-            if model_response.stop_reason == "tool_use":
-                self.logging.info(f"AnthropicClaudeAgent:run: tool use detected")
-                response.set_response_type(ResponseType.TOOL_CALL)
-                tools = self.get_tools(model_response.content)
-                response.set_tools(tools)
-                self.logging.info(f"AnthropicClaudeAgent:run: tools extracted")
-            elif model_response.stop_reason == "end_turn":
-                response.set_response_type(ResponseType.ANSWER)
-                response.set_content(assistant_message)
-            elif model_response.stop_reason == "max_tokens":
-                response.set_response_type(ResponseType.ERROR)
-                response.set_content(assistant_message)
-        except Exception as e:
-            response.set_response_type(ResponseType.ERROR)
-            response.set_content(str(e))
+                error = result.get("error", {}).get("error", {})
+                results[entry["custom_id"]] = Exception(error.get("message", f"Batch request {result['type']}"))
+        return results
 
-        return response
+    def _process_model_response(self, model_response, response: Response, conversation_id):
+        response.set_conversation_id(conversation_id)
+
+        self.logging.info("AnthropicClaudeAgent:run:model invoke completed")
+        assistant_message = self.get_model_response(model_response.content)
+        self.extend_conversation_history(
+            to_canonical(self.get_formatted_assistant_message(model_response.model_dump()), self.WIRE_FORMAT),
+            conversation_id)
+        if model_response.stop_reason == "tool_use":
+            self.logging.info("AnthropicClaudeAgent:run: tool use detected")
+            response.set_response_type(ResponseType.TOOL_CALL)
+            tools = self.get_tools(model_response.content)
+            response.set_tools(tools)
+            self.logging.info("AnthropicClaudeAgent:run: tools extracted")
+        elif model_response.stop_reason == "end_turn":
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(assistant_message)
+        elif model_response.stop_reason == "max_tokens":
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(assistant_message)
 
     def get_formatted_tool_output(self, tool, tool_output):
         return {"type": "tool_result", "tool_use_id": tool.instance_id, "content": tool_output}
@@ -174,16 +269,16 @@ class AnthropicClaudeAgent(AbstractAgent):
         return message
 
     def get_tools(self, response) -> []:
-        self.logging.info(f"AnthropicClaudeAgent:get_tools: function called")
+        self.logging.info("AnthropicClaudeAgent:get_tools: function called")
         tools = []
         for item in response:
             if isinstance(item, ToolUseBlock):
-                self.logging.info(f"AnthropicClaudeAgent:get_tools: tool instance 'name': {item.name} 'input': {item.input}")
+                self.logging.info("AnthropicClaudeAgent:get_tools: tool instance 'name': %s 'input': %s", item.name, item.input)
                 tool_info = {'name': item.name, 'input': item.input, 'id': item.id}
                 tool = self.get_tool_from_response(tool_info)
-                self.logging.info(f"AnthropicClaudeAgent:get_tools: tool instance 'name': {item.name} created")
+                self.logging.info("AnthropicClaudeAgent:get_tools: tool instance 'name': %s created", item.name)
                 tools.append(tool)
-                self.logging.info(f"AnthropicClaudeAgent:get_tools: compiled the tools and returning")
+                self.logging.info("AnthropicClaudeAgent:get_tools: compiled the tools and returning")
         return tools
 
     def get_model_response(self, response) -> str:
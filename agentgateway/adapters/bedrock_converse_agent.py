@@ -1,15 +1,22 @@
-import json, time
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
-import boto3
+import asyncio
+import json
+from typing import List, Dict, Any, Optional, Iterator
 from botocore.exceptions import ClientError
 
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.abstract_tool import Tool
-from agentgateway.core.response import Response, ResponseType, EventType
+from agentgateway.core.clients import get_adapter_max_retries, get_shared_boto3_client
+from agentgateway.core.message import to_canonical, to_provider_messages
+from agentgateway.core.prompt_caching import BEDROCK_CACHE_POINT, add_bedrock_cache_points
+from agentgateway.core.response import Response, ResponseType, StreamEvent, StreamEventType
+from agentgateway.core.streaming import assemble_converse_stream
 from agentgateway.utils.agent_logger import AgentLogger
 
 class BedrockConverseAgent(AbstractAgent):
+    PROVIDER = "bedrock"
+    TOOLS_REQUEST_KEY = "toolConfig"
+    WIRE_FORMAT = "bedrock"
+
     def __init__(self, model_id: str):
         super().__init__(model_id)
         self.client = None
@@ -32,7 +39,8 @@ class BedrockConverseAgent(AbstractAgent):
             'aws_secret_access_key': kwargs['aws_secret_access_key'],
             'region_name': kwargs['region_name']
         }
-        self.client = boto3.client('bedrock-runtime', **self.auth_data)
+        self.client = get_shared_boto3_client('bedrock-runtime', max_retries=get_adapter_max_retries(),
+                                              **self.auth_data)
 
     def get_auth(self) -> Dict[str, Any]:
         """
@@ -65,7 +73,11 @@ class BedrockConverseAgent(AbstractAgent):
         Add a new tool to the agent's toolkit and format it for Bedrock Converse.
         :param tool: A Tool instance to be added.
         """
-        formatted_tool = {
+        self._add_tool_definition(tool, "bedrock", self._format_tool)
+        super().add_tool(tool)
+
+    def _format_tool(self, tool: Tool) -> Dict[str, Any]:
+        return {
             "toolSpec": {
                 "name": tool.name,
                 "description": tool.description,
@@ -74,12 +86,65 @@ class BedrockConverseAgent(AbstractAgent):
                 }
             }
         }
-        self.formatted_tools.append(formatted_tool)
-        self.tools[tool.name] = tool
 
     def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
         self.logging.info("BedrockConverseAgent:run:Running Bedrock Converse Agent")
+        response, conversation_id = self._prepare_run(conversation_id)
+
+        try:
+            self._add_input_to_history(agent_input, is_tool_response, conversation_id)
+            bedrock_response = self._call_model(self._build_request(conversation_id), response)
+            self._process_model_response(bedrock_response, response, conversation_id)
+
+        except ClientError as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(f"AWS Bedrock ClientError: {str(e)}")
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        self.logging.info("BedrockConverseAgent:arun:Running Bedrock Converse Agent")
+        response, conversation_id = await asyncio.to_thread(self._prepare_run, conversation_id)
+
+        try:
+            await asyncio.to_thread(self._add_input_to_history, agent_input, is_tool_response, conversation_id)
+            # boto3 has no asyncio client, so the default _ainvoke_model runs converse() in a worker thread
+            request = await asyncio.to_thread(self._build_request, conversation_id)
+            bedrock_response = await self._acall_model(request, response)
+            await asyncio.to_thread(self._process_model_response, bedrock_response, response, conversation_id)
+
+        except ClientError as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(f"AWS Bedrock ClientError: {str(e)}")
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        self.logging.info("BedrockConverseAgent:stream:Running Bedrock Converse Agent")
+        response, conversation_id = self._prepare_run(conversation_id)
+
+        try:
+            self._add_input_to_history(agent_input, is_tool_response, conversation_id)
+            bedrock_response = yield from self._stream_model(self._build_request(conversation_id), response)
+            self._process_model_response(bedrock_response, response, conversation_id)
+
+        except ClientError as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(f"AWS Bedrock ClientError: {str(e)}")
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
 
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _prepare_run(self, conversation_id):
         # if response object is not set, create a new one
         if self.response is None:
             self.response = Response()
@@ -95,75 +160,73 @@ class BedrockConverseAgent(AbstractAgent):
         if not self.client:
             raise ValueError("Authentication not set. Please call set_auth() before running the agent.")
 
-        try:
-            if not is_tool_response:
-                self.add_to_conversation_history({"role":"user","content": [{"text": agent_input}]}, conversation_id)
-            else:
-                self.add_to_conversation_history({"role":"user", "content":agent_input}, conversation_id)
-
-            if len(self.formatted_tools) > 0:
-                body = {
-                    "modelId": self.model_id,
-                    "system" : [{"text": self.instructions}],
-                    "messages": self.get_conversation_history(conversation_id),
-                    "toolConfig": {
-                        "tools": self.formatted_tools,
-                    },
-                    "inferenceConfig": {
-                        "maxTokens": self.model_config.get('max_tokens', 2000),
-                        "temperature": self.model_config.get('temperature', 0.7),
-                        "topP": self.model_config.get('top_p', 1),
-                        "stopSequences": self.model_config.get('stop_sequences', [])
-                    }
-                }
-            else:
-                body = {
-                    "modelId": self.model_id,
-                    "system": [{"text": self.instructions}],
-                    "messages": self.get_conversation_history(conversation_id),
-                    "inferenceConfig": {
-                        "maxTokens": self.model_config.get('max_tokens', 2000),
-                        "temperature": self.model_config.get('temperature', 0.7),
-                        "topP": self.model_config.get('top_p', 1),
-                        "stopSequences": self.model_config.get('stop_sequences', [])
-                    }
-                }
+        return response, conversation_id
 
-            start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            start = time.perf_counter()
-            bedrock_response = self.client.converse(**body)
-            llm_latency = time.perf_counter() - start
-            usage = bedrock_response.get('usage', {})
-            input_tokens = usage.get('inputTokens', 0)
-            output_tokens = usage.get('outputTokens', 0)
-            end_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-
-            response.set_conversation_id(conversation_id)
-            response.update_usage(input_tokens, output_tokens)
-            response. add_trace_detail(EventType.LLM_CALL, latency=llm_latency, input_tokens=input_tokens,
-                                       output_tokens=output_tokens, start_time=start_time, end_time=end_time)
-
-            assistant_message = bedrock_response['output']['message']['content']
-            self.add_to_conversation_history({"role":"assistant", "content":assistant_message}, conversation_id)
-
-            if bedrock_response['stopReason'] == "tool_use":
-                self.logging.info("BedrockConverseAgent:run: tool use detected")
-                response.set_response_type(ResponseType.TOOL_CALL)
-                tools = self.get_tools(bedrock_response['output']['message'])
-                response.set_tools(tools)
-                self.logging.info("BedrockConverseAgent:run: tools extracted")
-            else:
-                response.set_response_type(ResponseType.ANSWER)
-                response.set_content(assistant_message[0]['text'])
+    def _add_input_to_history(self, agent_input, is_tool_response, conversation_id):
+        if not is_tool_response:
+            self.add_to_conversation_history({"role":"user", "content": agent_input}, conversation_id)
+        else:
+            self.extend_conversation_history(to_canonical({"role":"user", "content":agent_input}, self.WIRE_FORMAT),
+                                             conversation_id)
 
-        except ClientError as e:
-            response.set_response_type(ResponseType.ERROR)
-            response.set_content(f"AWS Bedrock ClientError: {str(e)}")
-        except Exception as e:
-            response.set_response_type(ResponseType.ERROR)
-            response.set_content(str(e))
+    def _build_request(self, conversation_id) -> Dict[str, Any]:
+        body = {
+            "modelId": self.model_id,
+            "system": [{"text": self.instructions}],
+            "messages": to_provider_messages(self.get_request_history(conversation_id), self.WIRE_FORMAT),
+            "inferenceConfig": {
+                "maxTokens": self.model_config.get('max_tokens', 2000),
+                "temperature": self.model_config.get('temperature', 0.7),
+                "topP": self.model_config.get('top_p', 1),
+                "stopSequences": self.model_config.get('stop_sequences', [])
+            }
+        }
+        if len(self.formatted_tools) > 0:
+            body["toolConfig"] = {
+                "tools": self.formatted_tools,
+            }
+        if self.prompt_caching:
+            self._add_cache_points(body)
+        return body
 
-        return response
+    def _add_cache_points(self, body: Dict[str, Any]):
+        if "toolConfig" in body:
+            body["toolConfig"] = {**body["toolConfig"], "tools": body["toolConfig"]["tools"] + [BEDROCK_CACHE_POINT]}
+        if self.instructions:
+            body["system"] = body["system"] + [BEDROCK_CACHE_POINT]
+        body["messages"] = add_bedrock_cache_points(body["messages"])
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return self.client.converse(**request)
+
+    def _invoke_model_stream(self, request: Dict[str, Any]):
+        stream_response = self.client.converse_stream(**request)
+        return (yield from assemble_converse_stream(stream_response['stream']))
+
+    def _get_usage(self, model_response):
+        usage = model_response.get('usage', {})
+        return usage.get('inputTokens', 0), usage.get('outputTokens', 0)
+
+    def _get_cache_usage(self, model_response):
+        usage = model_response.get('usage', {})
+        return usage.get('cacheReadInputTokens', 0), usage.get('cacheWriteInputTokens', 0)
+
+    def _process_model_response(self, bedrock_response, response: Response, conversation_id):
+        response.set_conversation_id(conversation_id)
+
+        assistant_message = bedrock_response['output']['message']['content']
+        self.extend_conversation_history(to_canonical({"role":"assistant", "content":assistant_message}, self.WIRE_FORMAT),
+                                         conversation_id)
+
+        if bedrock_response['stopReason'] == "tool_use":
+            self.logging.info("BedrockConverseAgent:run: tool use detected")
+            response.set_response_type(ResponseType.TOOL_CALL)
+            tools = self.get_tools(bedrock_response['output']['message'])
+            response.set_tools(tools)
+            self.logging.info("BedrockConverseAgent:run: tools extracted")
+        else:
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(assistant_message[0]['text'])
 
     def get_tools(self, model_response) -> List[Tool]:
         self.logging.info("BedrockConverseAgent:get_tools: function called")
@@ -177,9 +240,9 @@ class BedrockConverseAgent(AbstractAgent):
                     'input': tool_use['input'],
                     'id': tool_use['toolUseId']
                 }
-                self.logging.info(f"BedrockConverseAgent:get_tools: tool instance 'name': {tool_info['name']} 'input': {tool_info['input']}")
+                self.logging.info("BedrockConverseAgent:get_tools: tool instance 'name': %s 'input': %s", tool_info['name'], tool_info['input'])
                 tool = self.get_tool_from_response(tool_info)
-                self.logging.info(f"BedrockConverseAgent:get_tools: tool instance 'name': {tool_info['name']} created")
+                self.logging.info("BedrockConverseAgent:get_tools: tool instance 'name': %s created", tool_info['name'])
                 tools.append(tool)
 
         self.logging.info("BedrockConverseAgent:get_tools: compiled the tools and returning")
@@ -1,18 +1,22 @@
-import json, time
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+import asyncio
+import json
+from typing import List, Dict, Any, Optional, Iterator
 
 import openai
-from openai.types.chat import ChatCompletionMessageToolCall
+from openai.types.chat import ChatCompletion, ChatCompletionMessageToolCall
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.abstract_tool import Tool
-from agentgateway.core.response import Response, ResponseType, EventType
+from agentgateway.core.clients import create_async_client, get_adapter_max_retries, get_shared_client
+from agentgateway.core.response import Response, ResponseType, StreamEvent, StreamEventType
+from agentgateway.core.streaming import assemble_chat_completion_stream
 from agentgateway.utils.agent_logger import AgentLogger
 
 class FireworksAIAgent(AbstractAgent):
+    PROVIDER = "fireworks"
     def __init__(self, model_id: str):
         super().__init__(model_id)
         self.api_url = "https://api.fireworks.ai/inference/v1"
+        self.async_client = None
         self.formatted_tools = []
         self.logging = AgentLogger("Agent")
         self.response = None
@@ -28,7 +32,9 @@ class FireworksAIAgent(AbstractAgent):
         self.auth_data = {
             'api_key': kwargs['api_key']
         }
-        self.client = openai.OpenAI(base_url=self.api_url, api_key=kwargs['api_key'])
+        self.client = get_shared_client(openai.OpenAI, max_retries=get_adapter_max_retries(),
+                                        base_url=self.api_url, api_key=kwargs['api_key'])
+        self.async_client = None
 
     def get_auth(self) -> Dict[str, Any]:
         """
@@ -61,7 +67,11 @@ class FireworksAIAgent(AbstractAgent):
         Add a new tool to the agent's toolkit and format it for Fireworks AI.
         :param tool: A Tool instance to be added.
         """
-        formatted_tool = {
+        self._add_tool_definition(tool, "chat_completions", self._format_tool)
+        super().add_tool(tool)
+
+    def _format_tool(self, tool: Tool) -> Dict[str, Any]:
+        return {
             "type": "function",
             "function": {
                 "name": tool.name,
@@ -69,12 +79,55 @@ class FireworksAIAgent(AbstractAgent):
                 "parameters": tool.get_parameters_schema()
             }
         }
-        self.formatted_tools.append(formatted_tool)
-        self.tools[tool.name] = tool
 
     def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
         self.logging.info("FireworksAIAgent:run:Running Fireworks AI Agent")
+        response, conversation_id = self._prepare_run(conversation_id)
+
+        try:
+            self._add_input_to_history(agent_input, is_tool_response, conversation_id)
+            fireworks_response = self._call_model(self._build_request(conversation_id), response)
+            self._process_model_response(fireworks_response, response, conversation_id)
+
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        self.logging.info("FireworksAIAgent:arun:Running Fireworks AI Agent")
+        response, conversation_id = await asyncio.to_thread(self._prepare_run, conversation_id)
+
+        try:
+            await asyncio.to_thread(self._add_input_to_history, agent_input, is_tool_response, conversation_id)
+            request = await asyncio.to_thread(self._build_request, conversation_id)
+            fireworks_response = await self._acall_model(request, response)
+            await asyncio.to_thread(self._process_model_response, fireworks_response, response, conversation_id)
+
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
 
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        self.logging.info("FireworksAIAgent:stream:Running Fireworks AI Agent")
+        response, conversation_id = self._prepare_run(conversation_id)
+
+        try:
+            self._add_input_to_history(agent_input, is_tool_response, conversation_id)
+            fireworks_response = yield from self._stream_model(self._build_request(conversation_id), response)
+            self._process_model_response(fireworks_response, response, conversation_id)
+
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _prepare_run(self, conversation_id):
         # if response object is not set, create a new one
         if self.response is None:
             self.response = Response()
@@ -90,66 +143,71 @@ class FireworksAIAgent(AbstractAgent):
             else:
                 conversation_id = self.current_conversation_id
 
-        try:
-            if not is_tool_response:
-                self.add_to_conversation_history({"role":"user", "content":agent_input},conversation_id)
-            else:
-                self.extend_conversation_history(agent_input, conversation_id)
-
-            messages = [
-                {"role": "system", "content": self.instructions}
-            ]
-            messages.extend(self.get_conversation_history(conversation_id))
-
-            start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            start = time.perf_counter()
-            if len(self.formatted_tools) > 0:
-                fireworks_response = self.client.chat.completions.create(
-                    model=self.model_id,
-                    messages=messages,
-                    tools=self.formatted_tools,
-                    tool_choice="auto",
-                    **self.model_config
-                )
-            else:
-                fireworks_response = self.client.chat.completions.create(
-                    model=self.model_id,
-                    messages=messages,
-                    **self.model_config
-                )
-            end_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            llm_latency = time.perf_counter() - start
-            response.set_conversation_id(conversation_id)
-            response.update_usage(fireworks_response.usage.prompt_tokens,
-                                  fireworks_response.usage.completion_tokens)
-            response.add_trace_detail(EventType.LLM_CALL, latency=llm_latency, input_tokens=fireworks_response.usage.prompt_tokens,
-                                      output_tokens=fireworks_response.usage.completion_tokens,
-                                      start_time=start_time, end_time=end_time)
-
-            finish_reason = fireworks_response.choices[0].finish_reason
-
-            if finish_reason != "tool_calls":
-                assistant_message = fireworks_response.choices[0].message.content
-                self.add_to_conversation_history({"role": "assistant", "content": assistant_message}, conversation_id)
-            else:
-                assistant_message = self.generate_assistant_message_for_toolcalls(fireworks_response.choices[0].message)
-                self.add_to_conversation_history(assistant_message, conversation_id)
-
-            if finish_reason == "tool_calls":
-                self.logging.info("FireworksAIAgent:run: function call detected")
-                response.set_response_type(ResponseType.TOOL_CALL)
-                tools = self.get_tools(fireworks_response.choices[0].message.tool_calls)
-                response.set_tools(tools)
-                self.logging.info("FireworksAIAgent:run: tools extracted")
-            else:
-                response.set_response_type(ResponseType.ANSWER)
-                response.set_content(assistant_message)
+        return response, conversation_id
 
-        except Exception as e:
-            response.set_response_type(ResponseType.ERROR)
-            response.set_content(str(e))
+    def _add_input_to_history(self, agent_input, is_tool_response, conversation_id):
+        if not is_tool_response:
+            self.add_to_conversation_history({"role":"user", "content":agent_input},conversation_id)
+        else:
+            self.extend_conversation_history(agent_input, conversation_id)
 
-        return response
+    def _build_request(self, conversation_id) -> Dict[str, Any]:
+        messages = [
+            {"role": "system", "content": self.instructions}
+        ]
+        messages.extend(self.get_request_history(conversation_id))
+
+        request = {
+            "model": self.model_id,
+            "messages": messages,
+            **self.model_config
+        }
+        if len(self.formatted_tools) > 0:
+            request["tools"] = self.formatted_tools
+            request["tool_choice"] = "auto"
+        return request
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return self.client.chat.completions.create(**request)
+
+    def _invoke_model_stream(self, request: Dict[str, Any]):
+        chunks = self.client.chat.completions.create(**request, stream=True,
+                                                     stream_options={"include_usage": True})
+        completion = yield from assemble_chat_completion_stream(chunks)
+        return ChatCompletion.model_validate(completion)
+
+    async def _ainvoke_model(self, request: Dict[str, Any]):
+        if self.async_client is None:
+            self.async_client = create_async_client(openai.AsyncOpenAI, max_retries=get_adapter_max_retries(),
+                                                    base_url=self.api_url, api_key=self.auth_data['api_key'])
+        return await self.async_client.chat.completions.create(**request)
+
+    def _get_usage(self, model_response):
+        return model_response.usage.prompt_tokens, model_response.usage.completion_tokens
+
+    def _deserialize_model_response(self, data):
+        return ChatCompletion.model_validate(data)
+
+    def _process_model_response(self, fireworks_response, response: Response, conversation_id):
+        response.set_conversation_id(conversation_id)
+        finish_reason = fireworks_response.choices[0].finish_reason
+
+        if finish_reason != "tool_calls":
+            assistant_message = fireworks_response.choices[0].message.content
+            self.add_to_conversation_history({"role": "assistant", "content": assistant_message}, conversation_id)
+        else:
+            assistant_message = self.generate_assistant_message_for_toolcalls(fireworks_response.choices[0].message)
+            self.add_to_conversation_history(assistant_message, conversation_id)
+
+        if finish_reason == "tool_calls":
+            self.logging.info("FireworksAIAgent:run: function call detected")
+            response.set_response_type(ResponseType.TOOL_CALL)
+            tools = self.get_tools(fireworks_response.choices[0].message.tool_calls)
+            response.set_tools(tools)
+            self.logging.info("FireworksAIAgent:run: tools extracted")
+        else:
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(assistant_message)
 
     def get_tools(self, tool_calls) -> List[Tool]:
         self.logging.info("FireworksAIAgent:get_tools: function called")
@@ -163,14 +221,14 @@ class FireworksAIAgent(AbstractAgent):
                 except (ValueError, TypeError):
                     pass  # tool_input is already a dictionary
 
-                self.logging.info(f"FireworksAIAgent:get_tools: tool instance 'name': {item.function.name} 'input': {tool_input}")
+                self.logging.info("FireworksAIAgent:get_tools: tool instance 'name': %s 'input': %s", item.function.name, tool_input)
                 tool_info = {'name': item.function.name, 'input': tool_input, 'id': item.id}
 
                 tool = self.get_tool_from_response(tool_info)
-                self.logging.info(f"FireworksAIAgent:get_tools: tool instance 'name': {item.function.name} created")
+                self.logging.info("FireworksAIAgent:get_tools: tool instance 'name': %s created", item.function.name)
                 tools.append(tool)
 
-        self.logging.info(f"FireworksAIAgent:get_tools: compiled the tools and returning")
+        self.logging.info("FireworksAIAgent:get_tools: compiled the tools and returning")
         return tools
 
     def get_formatted_tool_output(self, tool, tool_output):
@@ -1,19 +1,25 @@
-from datetime import datetime, timezone
-
-from openai import OpenAI, ChatCompletion
-import json, traceback, time
-from typing import List, Dict, Any, Optional
-from openai.types.chat import ChatCompletionMessageToolCall
+import asyncio
+from openai import OpenAI, AsyncOpenAI
+import json, traceback
+from typing import List, Dict, Any, Optional, Iterator
+from openai.types.chat import ChatCompletion, ChatCompletionMessageToolCall
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.abstract_tool import Tool
-from agentgateway.core.response import Response, ResponseType, EventType
+from agentgateway.core.clients import create_async_client, get_adapter_max_retries, get_shared_client
+from agentgateway.core.response import Response, ResponseType, StreamEvent, StreamEventType
+from agentgateway.core.streaming import assemble_chat_completion_stream
 from agentgateway.utils.agent_logger import AgentLogger
 
 
 class OpenAIGPTAgent(AbstractAgent):
+    PROVIDER = "openai"
+    SUPPORTS_PROVIDER_BATCH = True
+    BATCH_ENDPOINT = "/v1/chat/completions"
+
     def __init__(self, model_id: str):
         super().__init__(model_id)
         self.client = None
+        self.async_client = None
         self.formatted_tools = []
         self.logging = AgentLogger("Agent")
         self.response = None
@@ -23,7 +29,9 @@ class OpenAIGPTAgent(AbstractAgent):
             raise ValueError("Missing required authentication parameter: api_key")
 
         self.auth_data = {'api_key': kwargs['api_key']}
-        self.client = OpenAI(api_key=self.auth_data['api_key'])
+        self.client = get_shared_client(OpenAI, max_retries=get_adapter_max_retries(),
+                                        api_key=self.auth_data['api_key'])
+        self.async_client = None
 
     def get_auth(self) -> Dict[str, Any]:
         return self.auth_data
@@ -40,23 +48,26 @@ class OpenAIGPTAgent(AbstractAgent):
         return self.model_config.copy()
 
     def add_tool(self, tool: Tool):
-        formatted_tool = {
+        self._add_tool_definition(tool, "openai", self._format_tool)
+        super().add_tool(tool)
+
+    def _format_tool(self, tool: Tool) -> Dict[str, Any]:
+        schema = tool.get_parameters_schema()
+        return {
             "type": "function",
             "function": {
                 "name": tool.name,
                 "description": tool.description,
                 "parameters": {
                     "type": "object",
-                    "properties": tool.get_parameters_schema().get("properties", {}),
-                    "required": tool.get_parameters_schema().get("required", [])
+                    "properties": schema.get("properties", {}),
+                    "required": schema.get("required", [])
                 }
             }
         }
-        self.formatted_tools.append(formatted_tool)
-        self.tools[tool.name] = tool
 
     def get_tools(self, response) -> List[Tool]:
-        self.logging.info(f"OpenAIAgent:get_tools: function called")
+        self.logging.info("OpenAIAgent:get_tools: function called")
         tools = []
 
         for item in response.tool_calls:
@@ -67,15 +78,15 @@ class OpenAIGPTAgent(AbstractAgent):
                 except (ValueError, TypeError):
                     pass  # tool_input is already a dictionary
 
-                self.logging.info(f"OpenAIAgent:get_tools: tool instance 'name': {item.function.name} 'input': {tool_input}")
+                self.logging.info("OpenAIAgent:get_tools: tool instance 'name': %s 'input': %s", item.function.name, tool_input)
                 tool_info = {'name': item.function.name, 'input': tool_input, 'id': item.id}
 
                 tool = self.get_tool_from_response(tool_info)
-                self.logging.info(f"OpenAIAgent:get_tools: tool instance 'name': {item.function.name} created")
+                self.logging.info("OpenAIAgent:get_tools: tool instance 'name': %s created", item.function.name)
                 tools.append(tool)
-                self.logging.info(f"OpenAIAgent:get_tools: compiled the tools and returning")
+                self.logging.info("OpenAIAgent:get_tools: compiled the tools and returning")
 
-        self.logging.info(f"OpenAIAgent:get_tools: compiled the tools and returning")
+        self.logging.info("OpenAIAgent:get_tools: compiled the tools and returning")
         return tools
 
     def get_formatted_tool_output(self, tool, tool_output):
@@ -83,7 +94,50 @@ class OpenAIGPTAgent(AbstractAgent):
 
     def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
         self.logging.info("OpenAIAgent:run:Running OpenAI Agent")
+        response, conversation_id = self._prepare_run(agent_input, is_tool_response, conversation_id)
+
+        self.logging.info("OpenAIAgent:run:invoking the selected model %s", self.model_id)
+        try:
+            model_response = self._call_model(self._build_request(conversation_id), response)
+            self._process_model_response(model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        self.logging.info("OpenAIAgent:arun:Running OpenAI Agent")
+        response, conversation_id = await asyncio.to_thread(self._prepare_run, agent_input, is_tool_response,
+                                                            conversation_id)
+
+        self.logging.info("OpenAIAgent:arun:invoking the selected model %s", self.model_id)
+        try:
+            request = await asyncio.to_thread(self._build_request, conversation_id)
+            model_response = await self._acall_model(request, response)
+            await asyncio.to_thread(self._process_model_response, model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        return response
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        self.logging.info("OpenAIAgent:stream:Running OpenAI Agent")
+        response, conversation_id = self._prepare_run(agent_input, is_tool_response, conversation_id)
 
+        self.logging.info("OpenAIAgent:stream:streaming the selected model %s", self.model_id)
+        try:
+            model_response = yield from self._stream_model(self._build_request(conversation_id), response)
+            self._process_model_response(model_response, response, conversation_id)
+        except Exception as e:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(str(e))
+
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _prepare_run(self, agent_input, is_tool_response, conversation_id):
         # if response object is not set, create a new one
         if self.response is None:
             self.response = Response()
@@ -104,74 +158,106 @@ class OpenAIGPTAgent(AbstractAgent):
         elif is_tool_response:
             self.extend_conversation_history(agent_input, conversation_id)
 
+        return response, conversation_id
+
+    def _build_request(self, conversation_id) -> Dict[str, Any]:
         messages = [
             {"role": "system", "content": self.instructions}
         ]
-        messages.extend(self.get_conversation_history(conversation_id))
+        messages.extend(self.get_request_history(conversation_id))
 
-        self.logging.info(f"OpenAIAgent:run:invoking the selected model {self.model_id}")
-        try:
-            start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            start = time.perf_counter()
-            if len(self.tools) > 0:
-                model_response = self.client.chat.completions.create(
-                    model=self.model_id,
-                    messages=messages,
-                    max_tokens=self.model_config['max_tokens'],
-                    temperature=self.model_config['temperature'],
-                    tools=self.formatted_tools
-                )
-            else:
-                model_response = self.client.chat.completions.create(
-                    model=self.model_id,
-                    messages=messages,
-                    max_tokens=self.model_config['max_tokens'],
-                    temperature=self.model_config['temperature']
-                )
-            end_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-            latency = time.perf_counter() - start
-            response.set_conversation_id(conversation_id)
-            response.update_usage(model_response.usage.prompt_tokens,
-                                  model_response.usage.completion_tokens)
-            response.add_trace_detail(EventType.LLM_CALL, input_tokens=model_response.usage.prompt_tokens,
-                                      output_tokens=model_response.usage.completion_tokens,
-                                      latency=latency, start_time=start_time, end_time=end_time)
-
-            self.logging.info(f"OpenAIAgent:run:model invoke completed")
-            finish_reason = model_response.choices[0].finish_reason
-            if finish_reason != "tool_calls":
-                assistant_message = model_response.choices[0].message.content
-                self.add_to_conversation_history({"role":"assistant", "content":assistant_message}, conversation_id)
-            else:
-                assistant_message = self.generate_assistant_message_for_toolcalls(model_response.choices[0].message )
-                self.add_to_conversation_history(assistant_message, conversation_id)
-
-            if finish_reason == "tool_calls":
-                self.logging.info(f"OpenAIAgent:run: function call detected")
-                response.set_response_type(ResponseType.TOOL_CALL)
-                tools = self.get_tools(model_response.choices[0].message)
-
-                response.set_tools(tools)
-                self.logging.info(f"OpenAIAgent:run: tools extracted")
-
-            elif finish_reason == "stop":
-                response.set_response_type(ResponseType.ANSWER)
-                response.set_content(assistant_message)
-            elif finish_reason == "length":
-                response.set_response_type(ResponseType.ERROR)
-                response.set_content("Response exceeded maximum token limit.")
-            elif finish_reason == "content_filter":
-                response.set_response_type(ResponseType.ERROR)
-                response.set_content("Response was filtered due to content safety.")
-            else:
-                response.set_response_type(ResponseType.ERROR)
-                response.set_content(f"Unexpected finish reason: {finish_reason}")
-
-        except Exception as e:
+        request = {
+            "model": self.model_id,
+            "messages": messages,
+            "max_tokens": self.model_config['max_tokens'],
+            "temperature": self.model_config['temperature']
+        }
+        if len(self.tools) > 0:
+            request["tools"] = self.formatted_tools
+        return request
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return self.client.chat.completions.create(**request)
+
+    def _invoke_model_stream(self, request: Dict[str, Any]):
+        chunks = self.client.chat.completions.create(**request, stream=True,
+                                                     stream_options={"include_usage": True})
+        completion = yield from assemble_chat_completion_stream(chunks)
+        return ChatCompletion.model_validate(completion)
+
+    async def _ainvoke_model(self, request: Dict[str, Any]):
+        if self.async_client is None:
+            self.async_client = create_async_client(AsyncOpenAI, max_retries=get_adapter_max_retries(),
+                                                    api_key=self.auth_data['api_key'])
+        return await self.async_client.chat.completions.create(**request)
+
+    def _get_usage(self, model_response):
+        return model_response.usage.prompt_tokens, model_response.usage.completion_tokens
+
+    def _submit_batch(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        lines = "\n".join(json.dumps({"custom_id": custom_id, "method": "POST", "url": self.BATCH_ENDPOINT, "body": request})
+                          for custom_id, request in requests.items())
+        batch_file = self.client.files.create(file=("batch.jsonl", lines.encode("utf-8")), purpose="batch")
+        batch = self.client.batches.create(input_file_id=batch_file.id, endpoint=self.BATCH_ENDPOINT,
+                                           completion_window="24h")
+        return batch.id
+
+    def _get_batch_results(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+        results = {}
+        # expired and cancelled batches still report the requests that completed
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = entry.get("response") or {}
+                if entry.get("error") or result.get("status_code") != 200:
+                    error = entry.get("error") or result.get("body", {}).get("error") or {}
+                    results[entry["custom_id"]] = Exception(error.get("message", f"Batch request failed: {entry}"))
+                else:
+                    results[entry["custom_id"]] = ChatCompletion.model_validate(result["body"])
+        return results
+
+    def _deserialize_model_response(self, data):
+        return ChatCompletion.model_validate(data)
+
+    def _process_model_response(self, model_response, response: Response, conversation_id):
+        response.set_conversation_id(conversation_id)
+
+        self.logging.info("OpenAIAgent:run:model invoke completed")
+        finish_reason = model_response.choices[0].finish_reason
+        if finish_reason != "tool_calls":
+            assistant_message = model_response.choices[0].message.content
+            self.add_to_conversation_history({"role":"assistant", "content":assistant_message}, conversation_id)
+        else:
+            assistant_message = self.generate_assistant_message_for_toolcalls(model_response.choices[0].message )
+            self.add_to_conversation_history(assistant_message, conversation_id)
+
+        if finish_reason == "tool_calls":
+            self.logging.info("OpenAIAgent:run: function call detected")
+            response.set_response_type(ResponseType.TOOL_CALL)
+            tools = self.get_tools(model_response.choices[0].message)
+
+            response.set_tools(tools)
+            self.logging.info("OpenAIAgent:run: tools extracted")
+
+        elif finish_reason == "stop":
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(assistant_message)
+        elif finish_reason == "length":
             response.set_response_type(ResponseType.ERROR)
-            response.set_content(str(e))
-
-        return response
+            response.set_content("Response exceeded maximum token limit.")
+        elif finish_reason == "content_filter":
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content("Response was filtered due to content safety.")
+        else:
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content(f"Unexpected finish reason: {finish_reason}")
 
     def generate_assistant_message_for_toolcalls(self, chat_message):
         """
@@ -0,0 +1,273 @@
+import asyncio
+import copy
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.conversation_manager import ConversationManager
+from agentgateway.core.history_translation import CHAT_COMPLETIONS, from_chat_completions
+from agentgateway.core.message import to_canonical
+from agentgateway.core.response import Response, ResponseType, EventType, StreamEvent, StreamEventType
+from agentgateway.utils.agent_logger import AgentLogger
+
+
+class BackendStats:
+    """
+    Exponentially weighted moving averages of one backend's call latency and error rate.
+    """
+    __slots__ = ("latency", "error_rate", "calls", "updated")
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.updated = 0.0
+
+    def record(self, latency: float, failed: bool, alpha: float, now: float):
+        self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        self.error_rate = alpha * float(failed) + (1 - alpha) * self.error_rate
+        self.calls += 1
+        self.updated = now
+
+    def score(self, error_penalty: float, error_half_life: float, now: float) -> float:
+        """
+        Expected cost of a call in seconds: the latency average plus error_penalty seconds at a 100% error rate.
+        The error rate halves every error_half_life seconds without calls, so a backend that failed is tried
+        again once the others have been slower for a while.
+        """
+        if self.latency is None:
+            return 0.0
+        error_rate = self.error_rate * 0.5 ** ((now - self.updated) / error_half_life)
+        return self.latency + error_penalty * error_rate
+
+
+class RoutingAgent(AbstractAgent):
+    """
+    An adapter routing each LLM turn to one of several backend adapters, for example Groq, Together and Fireworks
+    serving the same Llama model.
+
+    Backends are ranked by the moving averages of their latency and error rate, and a turn that fails on one
+    backend, including by exceeding timeout, is retried on the next. Backends that were never called are tried
+    first. The conversation history is kept in the canonical chat_completions format, which every backend converts
+    to its provider's format, so a conversation can move between providers, tool calls included.
+
+    Args:
+        backends: The backend adapters, with their auth and model set, as a list or by name.
+        ewma_alpha: Weight of the latest call in the moving averages.
+        error_penalty: Seconds added to a backend's score at a 100% error rate.
+        error_half_life: Seconds after which the error rate of an idle backend has halved.
+        timeout: Seconds a backend may take for a turn, its retries included, before the router fails over.
+    """
+
+    def __init__(self, backends: Union[List[AbstractAgent], Dict[str, AbstractAgent]],
+                 ewma_alpha: Optional[float] = None, error_penalty: Optional[float] = None,
+                 error_half_life: Optional[float] = None, timeout: Optional[float] = None):
+        super().__init__("")
+        if not backends:
+            raise ValueError("RoutingAgent needs at least one backend")
+        if not isinstance(backends, dict):
+            backends = {f"{type(backend).__name__}:{backend.get_model()}": backend for backend in backends}
+        for name, backend in backends.items():
+            if not isinstance(backend, AbstractAgent):
+                raise TypeError(f"Backend {name} must be an instance of AbstractAgent. Got {type(backend).__name__}")
+        self.backends: Dict[str, AbstractAgent] = dict(backends)
+        self.ewma_alpha = ewma_alpha if ewma_alpha is not None else \
+            self.config_manager.get_nested('routing', 'ewma_alpha', default=0.3)
+        self.error_penalty = error_penalty if error_penalty is not None else \
+            self.config_manager.get_nested('routing', 'error_penalty', default=10)
+        self.error_half_life = error_half_life if error_half_life is not None else \
+            self.config_manager.get_nested('routing', 'error_half_life', default=60)
+        self.timeout = timeout if timeout is not None else \
+            self.config_manager.get_nested('routing', 'timeout', default=None)
+        self.stats = {name: BackendStats() for name in self.backends}
+        self._stats_lock = threading.Lock()
+        self.logging = AgentLogger("RoutingAgent")
+        self.response = None
+
+    def set_auth(self, **kwargs):
+        """
+        Set the authentication data of backends by name, e.g. set_auth(groq={"api_key": ...}).
+        """
+        for name, auth in kwargs.items():
+            if name not in self.backends:
+                raise ValueError(f"Unknown backend: {name}")
+            self.backends[name].set_auth(**auth)
+
+    def get_auth(self) -> Dict[str, Any]:
+        return {name: backend.get_auth() for name, backend in self.backends.items()}
+
+    def set_model_config(self, **kwargs):
+        """
+        Set or update the model configuration of every backend.
+        """
+        for backend in self.backends.values():
+            backend.set_model_config(**kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return {name: backend.get_model_config() for name, backend in self.backends.items()}
+
+    def set_instructions(self, instructions: str):
+        super().set_instructions(instructions)
+        for backend in self.backends.values():
+            backend.set_instructions(instructions)
+
+    def add_tool(self, tool: Tool):
+        for backend in self.backends.values():
+            backend.add_tool(tool)
+        super().add_tool(tool)
+
+    def remove_tool(self, tool_name: str):
+        for backend in self.backends.values():
+            backend.remove_tool(tool_name)
+        super().remove_tool(tool_name)
+
+    def get_formatted_tool_output(self, tool, tool_output):
+        return {"role": "tool", "tool_call_id": tool.instance_id,
+                "content": tool_output if isinstance(tool_output, str) else json.dumps(tool_output, default=str)}
+
+    def route(self) -> List[str]:
+        """
+        The backend names in the order a turn tries them, best score first.
+        """
+        now = time.monotonic()
+        with self._stats_lock:
+            scores = {name: stats.score(self.error_penalty, self.error_half_life, now)
+                      for name, stats in self.stats.items()}
+        # sorted() is stable, so ties keep the order the backends were given in
+        return sorted(self.backends, key=scores.get)
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response, conversation_id = self._prepare_run(conversation_id)
+        for name in self.route():
+            worker, history_length, backend_input = self._start_backend(name, agent_input, is_tool_response,
+                                                                        conversation_id, response)
+            trace_start, start = len(response.trace_details), time.perf_counter()
+            try:
+                worker.run(backend_input, is_tool_response=is_tool_response, conversation_id=conversation_id)
+            except Exception as e:
+                response.set_response_type(ResponseType.ERROR)
+                response.set_content(str(e))
+            if self._finish_backend(name, worker, history_length, conversation_id, response, trace_start, start):
+                return response
+        return self._all_failed(response)
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False,
+                   conversation_id: Optional[str] = None) -> Response:
+        response, conversation_id = self._prepare_run(conversation_id)
+        for name in self.route():
+            # the conversation is read and written from a worker thread, as it may be kept in a network store
+            worker, history_length, backend_input = await asyncio.to_thread(
+                self._start_backend, name, agent_input, is_tool_response, conversation_id, response)
+            trace_start, start = len(response.trace_details), time.perf_counter()
+            try:
+                await worker.arun(backend_input, is_tool_response=is_tool_response, conversation_id=conversation_id)
+            except Exception as e:
+                response.set_response_type(ResponseType.ERROR)
+                response.set_content(str(e))
+            if await asyncio.to_thread(self._finish_backend, name, worker, history_length, conversation_id,
+                                       response, trace_start, start):
+                return response
+        return self._all_failed(response)
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        """
+        Streaming counterpart of run(). A backend failing after it streamed text cannot be failed over, as the
+        consumer has seen its output; its error is returned.
+        """
+        response, conversation_id = self._prepare_run(conversation_id)
+        for name in self.route():
+            worker, history_length, backend_input = self._start_backend(name, agent_input, is_tool_response,
+                                                                        conversation_id, response)
+            trace_start, start = len(response.trace_details), time.perf_counter()
+            streamed = False
+            try:
+                for event in worker.stream(backend_input, is_tool_response=is_tool_response,
+                                           conversation_id=conversation_id):
+                    if event.event_type != StreamEventType.RESPONSE:
+                        streamed = True
+                        yield event
+            except Exception as e:
+                response.set_response_type(ResponseType.ERROR)
+                response.set_content(str(e))
+            if self._finish_backend(name, worker, history_length, conversation_id, response, trace_start, start):
+                break
+            if streamed:
+                break
+        else:
+            self._all_failed(response)
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _prepare_run(self, conversation_id) -> Tuple[Response, str]:
+        # if response object is not set, create a new one
+        if self.response is None:
+            self.response = Response()
+
+        if conversation_id is None:
+            if not self.current_conversation_id:
+                raise ValueError("No conversation id provided. Please start conversation to get started.")
+            conversation_id = self.current_conversation_id
+        return self.response, conversation_id
+
+    def _start_backend(self, name: str, agent_input, is_tool_response: bool, conversation_id: str,
+                       response: Response) -> Tuple[AbstractAgent, int, Any]:
+        """
+        Prepare a copy of a backend for one turn: it writes to the shared response and reads the conversation
+        from a scratch conversation manager, so a failed turn leaves no trace in the history. Copies also let
+        concurrent conversations use the same backends.
+        """
+        backend = self.backends[name]
+        history = list(self.get_conversation_history(conversation_id))
+        worker = copy.copy(backend)
+        worker.response = response
+        worker.current_conversation_id = conversation_id
+        worker.conversation_manager = ConversationManager()
+        worker.extend_conversation_history(history, conversation_id)
+        if self.timeout is not None:
+            policy = copy.copy(worker.retry_policy)
+            policy.deadline = self.timeout if policy.deadline is None else min(policy.deadline, self.timeout)
+            worker.set_retry_policy(policy)
+
+        backend_input = agent_input
+        if is_tool_response and backend.WIRE_FORMAT != CHAT_COMPLETIONS:
+            # the gateway formats tool results with get_formatted_tool_output(), as chat_completions messages;
+            # the other adapters take the tool result blocks of their own format
+            backend_input = from_chat_completions(agent_input, backend.WIRE_FORMAT)[0]["content"]
+        response.set_response_type(None)
+        response.set_content(None)
+        return worker, len(history), backend_input
+
+    def _finish_backend(self, name: str, worker: AbstractAgent, history_length: int, conversation_id: str,
+                        response: Response, trace_start: int, start: float) -> bool:
+        """
+        Record the outcome of a backend's turn and, if it succeeded, add its messages to the history.
+        :return: Whether the turn succeeded.
+        """
+        latency = time.perf_counter() - start
+        failed = response.response_type == ResponseType.ERROR
+        with self._stats_lock:
+            self.stats[name].record(latency, failed, self.ewma_alpha, time.monotonic())
+        # name the backend in the trace entries of its turn
+        for detail in response.trace_details[trace_start:]:
+            detail["name"] = detail["name"] or name
+
+        if failed:
+            self.logging.warning("RoutingAgent:run: backend %s failed %s", name, response.content)
+            if len(response.trace_details) == trace_start:
+                # failed before calling the provider, e.g. without auth
+                response.add_trace_detail(EventType.LLM_ERROR, latency=latency, name=name, error=response.content)
+            return False
+
+        messages = worker.get_conversation_history(conversation_id)[history_length:]
+        # backends store canonical messages; to_canonical() also reads messages in a provider's format
+        self.extend_conversation_history([canonical for message in messages for canonical in to_canonical(message)],
+                                         conversation_id)
+        return True
+
+    def _all_failed(self, response: Response) -> Response:
+        response.set_response_type(ResponseType.ERROR)
+        response.set_content(f"All backends failed, last error: {response.content}")
+        return response
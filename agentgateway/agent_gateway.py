@@ -1,19 +1,27 @@
+import asyncio
+import copy
+import importlib
+import itertools
+import json
+import threading
 import time
-from datetime import datetime, timezone
-from typing import Union, List, Optional
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Union, List, Dict, Optional, Iterator, Iterable, Any
 from enum import Enum
+from agentgateway.core import metrics
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.prompt import Prompt
 from agentgateway.core.abstract_tool import Tool
-from agentgateway.core.response import Response, ResponseType, EventType
+from agentgateway.core.batch import BatchResult, in_input_order
+from agentgateway.core.cache import Cache, get_shared_cache
+from agentgateway.core.rate_limiter import get_rate_limiter
+from agentgateway.core.response import Response, ResponseType, EventType, StreamEvent, StreamEventType
+from agentgateway.core.run_context import RunContext
+from agentgateway.core.tracing import Span, get_tracer, now_ns
 from agentgateway.utils.agent_logger import AgentLogger
-from agentgateway.adapters.anthropic_claude_agent import AnthropicClaudeAgent
-from agentgateway.adapters.openai_gpt_agent import OpenAIGPTAgent
-from agentgateway.adapters.bedrock_converse_agent import BedrockConverseAgent
-from agentgateway.adapters.groq_agent import GroqAgent
-from agentgateway.adapters.together_ai_agent import TogetherAIAgent
-from agentgateway.adapters.fireworks_ai_agent import FireworksAIAgent
 from agentgateway.core.conversation_manager import ConversationManager
+from agentgateway.utils.config_manager import ConfigManager
 
 
 class AgentType(Enum):
@@ -25,15 +33,44 @@ class AgentType(Enum):
     TOGETHER = "together"
     FIREWORKS = "fireworks"
 
+# adapter modules import their provider SDK, so only the selected one is imported
+ADAPTER_MODULES = {
+    AgentType.BEDROCK: ("agentgateway.adapters.bedrock_converse_agent", "BedrockConverseAgent"),
+    AgentType.OPENAI: ("agentgateway.adapters.openai_gpt_agent", "OpenAIGPTAgent"),
+    AgentType.ANTHROPIC: ("agentgateway.adapters.anthropic_claude_agent", "AnthropicClaudeAgent"),
+    AgentType.GROQ: ("agentgateway.adapters.groq_agent", "GroqAgent"),
+    AgentType.TOGETHER: ("agentgateway.adapters.together_ai_agent", "TogetherAIAgent"),
+    AgentType.FIREWORKS: ("agentgateway.adapters.fireworks_ai_agent", "FireworksAIAgent"),
+}
+
+# returned by _get_cached_tool_output() when a call is not cached
+_CACHE_MISS = object()
+
 class UnsupportedAgentException(Exception):
     def __init__(self, agent_type):
         self.agent_type = agent_type
         super().__init__(f"Unsupported agent type: {agent_type}")
 
 class AgentGateway:
-    def __init__(self, agent_type_or_adapter: Union[AgentType, AbstractAgent], model_id):
+    def __init__(self, agent_type_or_adapter: Union[AgentType, AbstractAgent], model_id,
+                 parallel_tool_calls: Optional[bool] = None, max_tool_workers: Optional[int] = None):
         self.logging = AgentLogger("Agent")
         self.tools = {}
+        config_manager = ConfigManager()
+        if parallel_tool_calls is None:
+            parallel_tool_calls = config_manager.get_nested('tools', 'parallel_execution', default=False)
+        if max_tool_workers is None:
+            max_tool_workers = config_manager.get_nested('tools', 'max_workers', default=4)
+        self.parallel_tool_calls = parallel_tool_calls
+        self.max_tool_workers = max_tool_workers
+        self._tool_executor = None
+        self._tool_executor_lock = threading.Lock()
+        self.tool_cache = get_shared_cache(
+            config_manager.get_nested('cache', 'tool_results', default='none'), "tool",
+            max_entries=config_manager.get_nested('cache', 'max_entries', default=10000),
+            sqlite_path=config_manager.get_nested('cache', 'sqlite_path', default='agentgateway_cache.sqlite'),
+            redis_url=config_manager.get_nested('cache', 'redis_url', default='redis://localhost:6379')
+        )
         if isinstance(agent_type_or_adapter, AgentType):
             self.agent_type = agent_type_or_adapter
             self.adapter = self._get_adapter(agent_type_or_adapter, model_id)
@@ -42,26 +79,14 @@ class AgentGateway:
             self.adapter = agent_type_or_adapter
         else:
             raise UnsupportedAgentException(type(agent_type_or_adapter).__name__)
+        metrics.start_configured_http_server()
 
     def _get_adapter(self, agent_type: AgentType, model_id) -> AbstractAgent:
-        self.logging.info(f"AgentGateway:_get_adapter:Fetching adapter for {agent_type}")
-        if agent_type == AgentType.BEDROCK:
-            self.adapter = BedrockConverseAgent(model_id)
-            return self.adapter
-        elif agent_type == AgentType.OPENAI:
-            self.adapter = OpenAIGPTAgent(model_id)
-            return self.adapter
-        elif agent_type == AgentType.ANTHROPIC:
-            self.adapter = AnthropicClaudeAgent(model_id)
-            return self.adapter
-        elif agent_type == AgentType.GROQ:
-            self.adapter = GroqAgent(model_id)
-            return self.adapter
-        elif agent_type == AgentType.TOGETHER:
-            self.adapter = TogetherAIAgent(model_id)
-            return self.adapter
-        elif agent_type == AgentType.FIREWORKS:
-            self.adapter = FireworksAIAgent(model_id)
+        self.logging.info("AgentGateway:_get_adapter:Fetching adapter for %s", agent_type)
+        if agent_type in ADAPTER_MODULES:
+            module_name, class_name = ADAPTER_MODULES[agent_type]
+            adapter_class = getattr(importlib.import_module(module_name), class_name)
+            self.adapter = adapter_class(model_id)
             return self.adapter
         elif agent_type == AgentType.VERTEX:
             pass
@@ -82,7 +107,7 @@ class AgentGateway:
             ValueError: If tool authentication is not properly set up
             TypeError: If provided conversation manager is not a valid ConversationManager instance
         """
-        self.logging.info(f"AgentGateway:create_agent: Preparing the requested agent")
+        self.logging.info("AgentGateway:create_agent: Preparing the requested agent")
         self.adapter.set_instructions(prompt.content)
 
         # Set custom conversation manager if provided
@@ -91,61 +116,447 @@ class AgentGateway:
 
         for tool in tools:
             self.logging.info(
-                f"AgentGateway:create_agent: Iterating the tools and validating auth {tool.is_auth_setup()}")
+                "AgentGateway:create_agent: Iterating the tools and validating auth %s", tool.is_auth_setup())
             if tool.is_auth_setup():
                 self.adapter.add_tool(tool)
                 self.tools[tool.name] = tool
             else:
                 self.logging.info(
-                    f"AgentGateway:create_agent: Tools {tool.name} auth is not setup, exiting")
+                    "AgentGateway:create_agent: Tools %s auth is not setup, exiting", tool.name)
                 raise ValueError(f"Invalid auth setup: {tool.name}")
 
+    def set_tool_cache(self, cache: Optional[Cache]):
+        """
+        Set the cache of tool results, or None to always execute tools. Only results of tools with a cache TTL
+        are cached, see Tool.CACHE_TTL.
+
+        Args:
+            cache: A Cache instance (InMemoryCache, SQLiteCache, RedisCache or a custom subclass)
+        """
+        if cache is not None and not isinstance(cache, Cache):
+            raise TypeError(f"Cache must be an instance of Cache. Got {type(cache).__name__}")
+        self.tool_cache = cache
+
     def start_conversation(self):
         return self.adapter.start_conversation()
 
     def run_agent(self, agent_input, conversation_id: Optional[str] = None):
+        """
+        Run the agent on an input until it answers, executing the tools it calls.
+        Each call keeps its response and conversation in its own RunContext, so threads can run different
+        conversations on one gateway at once.
+        """
+        self.logging.info("AgentGateway:run_agent:Running agent for %s", agent_input)
+        with RunContext(self.adapter, conversation_id).activate() as run, \
+                run.trace("agent.run", self._run_attributes(conversation_id)), self._observe_run(run):
+            return self._run_agent(run, agent_input, conversation_id)
+
+    def _run_agent(self, run: RunContext, agent_input, conversation_id: Optional[str]):
         final_answer = False
         tool_response = False
-        conversation_id = conversation_id
-        self.logging.info(f"AgentGateway:run_agent:Running agent for {agent_input}")
-        # set a new response
-        self.adapter.response = Response()
         while not final_answer:
-            response = self.adapter.run(agent_input, is_tool_response=tool_response, conversation_id=conversation_id)
-            self.logging.info(f"AgentGateway:run_agent:Agent execution completed")
-            if response.response_type == ResponseType.ANSWER:
-                self.logging.info(f"AgentGateway:run_agent:Final answer from Agent")
-                final_answer = True
-                tool_response = False
-                return response
-            elif response.response_type == ResponseType.TOOL_CALL:
-                self.logging.info(f"AgentGateway:run_agent:Agent responds with tool use")
-                conversation_id = response.conversation_id
-                tool_results = []
-                response_tools = response.get_tools()
-                self.logging.info(f"AgentGateway:run_agent: iterating tools")
-
-                for response_tool in response_tools:
-                    self.logging.info(f"AgentGateway:run_agent: executing tool {response_tool.name} and id {response_tool.instance_id}")
-                    if response_tool.name in self.tools:
-                        self.logging.info(f"AgentGateway:run_agent: setting the auth params for the agents to execute")
-                        start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-                        start = time.perf_counter()
-                        tool_output = response_tool.execute()
-                        end_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-                        tool_latency = time.perf_counter() - start
-                        response.add_trace_detail(EventType.TOOL_CALL, latency=tool_latency, name=response_tool.name, start_time=start_time,end_time=end_time)
-                        formatted_tool_output = self.adapter.get_formatted_tool_output(tool=response_tool,tool_output=tool_output)
-                        tool_results.append(formatted_tool_output)
-                        self.logging.info(f"AgentGateway:run_agent: {response_tool.get_name()} tool output: {tool_output}")
+            run.turns += 1
+            with run.trace("agent.turn"):
+                # batch() lets stores that support it send the history writes of this LLM turn together
+                with self.adapter.conversation_manager.batch():
+                    response = self.adapter.run(agent_input, is_tool_response=tool_response, conversation_id=conversation_id)
+                self.logging.info("AgentGateway:run_agent:Agent execution completed")
+                if response.response_type == ResponseType.ANSWER:
+                    self.logging.info("AgentGateway:run_agent:Final answer from Agent")
+                    final_answer = True
+                    tool_response = False
+                    return response
+                elif response.response_type == ResponseType.TOOL_CALL:
+                    self.logging.info("AgentGateway:run_agent:Agent responds with tool use")
+                    conversation_id = response.conversation_id
+                    response_tools = response.get_tools()
+                    self.logging.info("AgentGateway:run_agent: iterating tools")
+
+                    self._check_response_tools(response_tools)
+
+                    if self.parallel_tool_calls and len(response_tools) > 1:
+                        self.logging.info("AgentGateway:run_agent: executing %s tools in parallel", len(response_tools))
+                        # map() yields results in submission order, so tool_results matches response_tools
+                        tool_runs = list(self._get_tool_executor().map(self._execute_tool, response_tools))
                     else:
-                        # TODO: retrigger LLM call with the error to fix the issue
-                        self.logging.error(f"AgentGateway:run_agent: invalid tool {response_tool.get_name()} returned by Agent")
-                        raise UnsupportedAgentException(f"{response_tool.get_name()} returned by Agent")
-                    self.logging.info(f"AgentGateway:run_agent:Agent execution completed")
-
-                agent_input=tool_results
-                tool_response = True
-            elif response.response_type == ResponseType.ERROR:
-                self.logging.info(f"AgentGateway:run_agent:Agent Errored {response.content}")
-                raise Exception(f"Agent encountered an error: {response.content}")
\ No newline at end of file
+                        tool_runs = [self._execute_tool(response_tool) for response_tool in response_tools]
+
+                    tool_results = self._collect_tool_results(response, response_tools, tool_runs, run.span)
+                    self.logging.info("AgentGateway:run_agent:Agent execution completed")
+
+                    agent_input=tool_results
+                    tool_response = True
+                elif response.response_type == ResponseType.ERROR:
+                    self.logging.info("AgentGateway:run_agent:Agent Errored %s", response.content)
+                    raise Exception(f"Agent encountered an error: {response.content}")
+
+    async def arun_agent(self, agent_input, conversation_id: Optional[str] = None):
+        """
+        Asynchronous counterpart of run_agent() for use inside an asyncio event loop.
+        LLM calls go through the adapter's arun() and tools through Tool.aexecute(). History and cache stores are
+        called from worker threads, so a network store does not block the loop.
+        """
+        self.logging.info("AgentGateway:arun_agent:Running agent for %s", agent_input)
+        # asyncio tasks run in copies of the context, so concurrent tasks each see their own run
+        with RunContext(self.adapter, conversation_id).activate() as run, \
+                run.trace("agent.run", self._run_attributes(conversation_id)), self._observe_run(run):
+            return await self._arun_agent(run, agent_input, conversation_id)
+
+    async def _arun_agent(self, run: RunContext, agent_input, conversation_id: Optional[str]):
+        tool_response = False
+        while True:
+            run.turns += 1
+            with run.trace("agent.turn"):
+                async with self.adapter.conversation_manager.abatch():
+                    response = await self.adapter.arun(agent_input, is_tool_response=tool_response, conversation_id=conversation_id)
+                self.logging.info("AgentGateway:arun_agent:Agent execution completed")
+                if response.response_type == ResponseType.ANSWER:
+                    self.logging.info("AgentGateway:arun_agent:Final answer from Agent")
+                    return response
+                elif response.response_type == ResponseType.TOOL_CALL:
+                    self.logging.info("AgentGateway:arun_agent:Agent responds with tool use")
+                    conversation_id = response.conversation_id
+                    response_tools = response.get_tools()
+                    self._check_response_tools(response_tools)
+
+                    if self.parallel_tool_calls and len(response_tools) > 1:
+                        self.logging.info("AgentGateway:arun_agent: executing %s tools concurrently", len(response_tools))
+                        semaphore = asyncio.Semaphore(self.max_tool_workers)
+                        tool_runs = await asyncio.gather(
+                            *(self._aexecute_tool(response_tool, semaphore) for response_tool in response_tools))
+                    else:
+                        tool_runs = [await self._aexecute_tool(response_tool) for response_tool in response_tools]
+
+                    agent_input = self._collect_tool_results(response, response_tools, tool_runs, run.span)
+                    tool_response = True
+                elif response.response_type == ResponseType.ERROR:
+                    self.logging.info("AgentGateway:arun_agent:Agent Errored %s", response.content)
+                    raise Exception(f"Agent encountered an error: {response.content}")
+
+    def stream_agent(self, agent_input, conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        """
+        Streaming counterpart of run_agent().
+        Yields TEXT_DELTA events as the model produces text, a TOOL_CALL event before each tool runs and a
+        TOOL_RESULT event with its output afterwards, and finally a RESPONSE event carrying the same Response
+        run_agent() would have returned.
+        """
+        self.logging.info("AgentGateway:stream_agent:Running agent for %s", agent_input)
+        run = RunContext(self.adapter, conversation_id)
+        with run.trace("agent.run", self._run_attributes(conversation_id)), self._observe_run(run):
+            yield from self._stream_agent(run, agent_input, conversation_id)
+
+    def _stream_agent(self, run: RunContext, agent_input, conversation_id: Optional[str]) -> Iterator[StreamEvent]:
+        tool_response = False
+        while True:
+            run.turns += 1
+            with run.trace("agent.turn"):
+                response = None
+                streamed_text = False
+                events = self.adapter.stream(agent_input, is_tool_response=tool_response, conversation_id=conversation_id)
+                for event in run.iterate(events):
+                    if event.event_type == StreamEventType.RESPONSE:
+                        response = event.response
+                    else:
+                        streamed_text = streamed_text or event.event_type == StreamEventType.TEXT_DELTA
+                        yield event
+                # the history writes of this turn are complete; a batch cannot be held open across yields, so the
+                # turn's conversation is flushed, leaving the other conversations queued in a shared manager
+                with run.activate():
+                    turn_conversation_id = conversation_id or self.adapter.current_conversation_id
+                self.adapter.conversation_manager.flush([turn_conversation_id])
+                self.logging.info("AgentGateway:stream_agent:Agent execution completed")
+
+                if response.response_type == ResponseType.ANSWER:
+                    self.logging.info("AgentGateway:stream_agent:Final answer from Agent")
+                    if not streamed_text and response.content:
+                        # adapters without streaming support and response cache hits deliver the answer at once
+                        yield StreamEvent(StreamEventType.TEXT_DELTA, content=response.content)
+                    yield StreamEvent(StreamEventType.RESPONSE, response=response)
+                    return
+                elif response.response_type == ResponseType.TOOL_CALL:
+                    self.logging.info("AgentGateway:stream_agent:Agent responds with tool use")
+                    conversation_id = response.conversation_id
+                    response_tools = response.get_tools()
+                    self._check_response_tools(response_tools)
+
+                    for response_tool in response_tools:
+                        yield StreamEvent(StreamEventType.TOOL_CALL, tool=response_tool)
+
+                    if self.parallel_tool_calls and len(response_tools) > 1:
+                        self.logging.info("AgentGateway:stream_agent: executing %s tools in parallel", len(response_tools))
+                        tool_runs = list(self._get_tool_executor().map(self._execute_tool, response_tools))
+                    else:
+                        tool_runs = [self._execute_tool(response_tool) for response_tool in response_tools]
+
+                    for response_tool, tool_run in zip(response_tools, tool_runs):
+                        yield StreamEvent(StreamEventType.TOOL_RESULT, content=tool_run[0], tool=response_tool)
+
+                    agent_input = self._collect_tool_results(response, response_tools, tool_runs, run.span)
+                    tool_response = True
+                elif response.response_type == ResponseType.ERROR:
+                    self.logging.info("AgentGateway:stream_agent:Agent Errored %s", response.content)
+                    raise Exception(f"Agent encountered an error: {response.content}")
+
+    def run_batch(self, inputs: Iterable[Any], max_concurrency: Optional[int] = None,
+                  requests_per_minute: Optional[float] = None, ordered: bool = False,
+                  use_provider_batch: bool = False, keep_history: Optional[bool] = None) -> Iterator[BatchResult]:
+        """
+        Run independent inputs, each in a new conversation, and yield a BatchResult per input as it completes.
+
+        By default inputs run through run_agent() on at most max_concurrency threads, and their LLM calls wait on
+        the adapter's rate limiter, configured per provider and model in the rate_limits section of config.yaml.
+        Inputs are read lazily, so a long iterable is never held in memory at once.
+
+        With use_provider_batch, inputs are submitted through the provider's batch endpoint (OpenAI Batch or
+        Anthropic Message Batches) in chunks of batch.provider_batch_size and results are yielded as each chunk
+        ends. Provider batches run a single model call per input, so the gateway must have no tools.
+
+        Args:
+            inputs: The agent inputs.
+            max_concurrency: Inputs run at once. Defaults to the batch.max_concurrency setting.
+            requests_per_minute: Limit on LLM calls to this provider, shared by all batches in the process, in
+                place of the adapter's rate limiter.
+            ordered: Yield results in input order instead of completion order.
+            use_provider_batch: Submit through the provider's batch endpoint.
+            keep_history: Keep the conversation history of each input. Defaults to the batch.keep_history setting.
+
+        Raises:
+            ValueError: If use_provider_batch is set and the adapter does not support it or the gateway has tools
+        """
+        config_manager = ConfigManager()
+        if keep_history is None:
+            keep_history = config_manager.get_nested('batch', 'keep_history', default=False)
+
+        if use_provider_batch:
+            if not self.adapter.SUPPORTS_PROVIDER_BATCH:
+                raise ValueError(f"{type(self.adapter).__name__} does not support provider batch endpoints")
+            if self.tools:
+                raise ValueError("Provider batch endpoints run a single model call per input and cannot execute tools")
+            results = self._run_provider_batch(
+                inputs, keep_history,
+                batch_size=config_manager.get_nested('batch', 'provider_batch_size', default=1000),
+                poll_interval=config_manager.get_nested('batch', 'poll_interval', default=30))
+        else:
+            if max_concurrency is None:
+                max_concurrency = config_manager.get_nested('batch', 'max_concurrency', default=8)
+            results = self._run_concurrent_batch(inputs, keep_history, max_concurrency, requests_per_minute)
+        return in_input_order(results) if ordered else results
+
+    def _run_attributes(self, conversation_id: Optional[str]) -> Dict[str, Any]:
+        return {"agent": type(self.adapter).__name__, "model": self.adapter.model_id, "conversation_id": conversation_id}
+
+    @contextmanager
+    def _observe_run(self, run: RunContext):
+        """
+        Record the run in the metrics once it ends, with its final response type, "cancelled" when it was cancelled
+        or its stream closed before the end, or "exception" when it raised otherwise than on an ERROR response.
+        """
+        try:
+            yield
+        except (GeneratorExit, asyncio.CancelledError):
+            self._record_run_metrics(run, "cancelled")
+            raise
+        except BaseException:
+            response_type = run.response.response_type
+            self._record_run_metrics(run, response_type.value if response_type == ResponseType.ERROR else "exception")
+            raise
+        self._record_run_metrics(run, run.response.response_type.value)
+
+    def _record_run_metrics(self, run: RunContext, response_type: str):
+        metrics.observe_run(type(self.adapter).__name__, self.adapter.model_id, response_type, run.turns)
+
+    def _provider_key(self) -> str:
+        return self.agent_type.value if self.agent_type is not None else type(self.adapter).__name__
+
+    def _fork(self) -> 'AgentGateway':
+        """
+        A gateway for one batch input. It shares the tools, clients and conversation store of this gateway and
+        has its own adapter, whose rate limiter can be replaced for the batch.
+        """
+        worker = copy.copy(self)
+        worker.adapter = copy.copy(self.adapter)
+        return worker
+
+    def _run_batch_input(self, index: int, agent_input, keep_history: bool, limiter) -> BatchResult:
+        worker = self._fork()
+        if limiter is not None:
+            worker.adapter.set_rate_limiter(limiter)
+        conversation_id = worker.start_conversation()
+        try:
+            return BatchResult(index, agent_input, response=worker.run_agent(agent_input, conversation_id))
+        except Exception as e:
+            self.logging.error("AgentGateway:run_batch: input %s failed %s", index, e)
+            return BatchResult(index, agent_input, error=e)
+        finally:
+            if not keep_history:
+                worker.adapter.clear_conversation_history(conversation_id)
+
+    def _run_concurrent_batch(self, inputs: Iterable[Any], keep_history: bool, max_concurrency: int,
+                              requests_per_minute: Optional[float]) -> Iterator[BatchResult]:
+        limiter = get_rate_limiter(self._provider_key(), requests_per_minute) if requests_per_minute else None
+        if self.parallel_tool_calls:
+            # created before forking, so every input shares one tool pool
+            self._get_tool_executor()
+        pending_inputs = enumerate(inputs)
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="agentgateway-batch")
+        try:
+            # keep a bounded number of inputs queued, so a long iterable is consumed as results come back
+            running = {executor.submit(self._run_batch_input, index, agent_input, keep_history, limiter)
+                       for index, agent_input in itertools.islice(pending_inputs, 2 * max_concurrency)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for index, agent_input in itertools.islice(pending_inputs, len(done)):
+                    running.add(executor.submit(self._run_batch_input, index, agent_input, keep_history, limiter))
+                for future in done:
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_provider_batch(self, inputs: Iterable[Any], keep_history: bool, batch_size: int,
+                            poll_interval: float) -> Iterator[BatchResult]:
+        pending_inputs = enumerate(inputs)
+        jobs = {}
+        while True:
+            chunk = list(itertools.islice(pending_inputs, batch_size))
+            if not chunk:
+                break
+            batch_id = self.adapter.submit_batch({f"request-{index}": agent_input for index, agent_input in chunk})
+            self.logging.info("AgentGateway:run_batch: submitted provider batch %s with %s inputs", batch_id, len(chunk))
+            jobs[batch_id] = chunk
+
+        while jobs:
+            for batch_id in list(jobs):
+                responses = self.adapter.get_batch_results(batch_id)
+                if responses is None:
+                    continue
+                for index, agent_input in jobs.pop(batch_id):
+                    response = responses[f"request-{index}"]
+                    if not keep_history:
+                        self.adapter.clear_conversation_history(response.conversation_id)
+                    if response.response_type == ResponseType.ERROR:
+                        yield BatchResult(index, agent_input,
+                                          error=Exception(f"Agent encountered an error: {response.content}"))
+                    else:
+                        yield BatchResult(index, agent_input, response=response)
+            if jobs:
+                time.sleep(poll_interval)
+
+    def _check_response_tools(self, response_tools: List[Tool]):
+        for response_tool in response_tools:
+            if response_tool.name not in self.tools:
+                # TODO: retrigger LLM call with the error to fix the issue
+                self.logging.error("AgentGateway:run_agent: invalid tool %s returned by Agent", response_tool.get_name())
+                raise UnsupportedAgentException(f"{response_tool.get_name()} returned by Agent")
+
+    def _collect_tool_results(self, response: Response, response_tools: List[Tool], tool_runs,
+                              parent_span: Optional[Span] = None) -> list:
+        """
+        Record a TOOL_CALL trace entry, or TOOL_CACHE_HIT for a cached result, and a "tool.call" span per tool and
+        format the outputs for the adapter, in tool order.
+        """
+        tracer = get_tracer()
+        tool_results = []
+        for response_tool, (tool_output, tool_latency, start_ns, end_ns, cache_hit) in zip(response_tools, tool_runs):
+            event_type = EventType.TOOL_CACHE_HIT if cache_hit else EventType.TOOL_CALL
+            response.add_trace_detail(event_type, latency=tool_latency, name=response_tool.name, start_ns=start_ns, end_ns=end_ns)
+            if cache_hit:
+                metrics.count_cache_hit("tool_result")
+            else:
+                metrics.observe_tool_call(response_tool.name, tool_latency)
+            if tracer.enabled:
+                tracer.record_span("tool.call", start_ns, end_ns, parent_span,
+                                   attributes={"tool": response_tool.name, "tool_call_id": response_tool.instance_id,
+                                               "cache_hit": cache_hit})
+            formatted_tool_output = self.adapter.get_formatted_tool_output(tool=response_tool,tool_output=tool_output)
+            tool_results.append(formatted_tool_output)
+            self.logging.info("AgentGateway:run_agent: %s tool output: %s", response_tool.get_name(), tool_output)
+        return tool_results
+
+    def _execute_tool(self, response_tool: Tool):
+        """
+        Execute a single tool and capture its timing.
+
+        :param response_tool: The tool instance returned by the adapter.
+        :return: A tuple of (tool_output, latency, start_ns, end_ns, cache_hit), the timestamps from tracing.now_ns().
+        """
+        start_ns = now_ns()
+        cache_key = self._get_tool_cache_key(response_tool)
+        if cache_key is not None:
+            tool_output = self._get_cached_tool_output(cache_key)
+            if tool_output is not _CACHE_MISS:
+                end_ns = now_ns()
+                return tool_output, (end_ns - start_ns) / 1e9, start_ns, end_ns, True
+        self.logging.info("AgentGateway:_execute_tool: executing tool %s and id %s", response_tool.name, response_tool.instance_id)
+        tool_output = response_tool.execute()
+        end_ns = now_ns()
+        if cache_key is not None:
+            self._cache_tool_output(response_tool, cache_key, tool_output)
+        return tool_output, (end_ns - start_ns) / 1e9, start_ns, end_ns, False
+
+    async def _aexecute_tool(self, response_tool: Tool, semaphore: Optional[asyncio.Semaphore] = None):
+        """
+        Asynchronous counterpart of _execute_tool(), optionally bounded by a semaphore.
+        The tool cache is read and written from a worker thread, as it may be a network or disk store.
+        """
+        if semaphore is not None:
+            async with semaphore:
+                return await self._aexecute_tool(response_tool)
+        start_ns = now_ns()
+        cache_key = self._get_tool_cache_key(response_tool)
+        if cache_key is not None:
+            tool_output = await asyncio.to_thread(self._get_cached_tool_output, cache_key)
+            if tool_output is not _CACHE_MISS:
+                end_ns = now_ns()
+                return tool_output, (end_ns - start_ns) / 1e9, start_ns, end_ns, True
+        self.logging.info("AgentGateway:_aexecute_tool: executing tool %s and id %s", response_tool.name, response_tool.instance_id)
+        tool_output = await response_tool.aexecute()
+        end_ns = now_ns()
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache_tool_output, response_tool, cache_key, tool_output)
+        return tool_output, (end_ns - start_ns) / 1e9, start_ns, end_ns, False
+
+    def _get_tool_cache_key(self, response_tool: Tool) -> Optional[str]:
+        if self.tool_cache is None:
+            return None
+        return response_tool.get_cache_key()
+
+    def _get_cached_tool_output(self, cache_key: str) -> Any:
+        """
+        The cached output of a tool call, or _CACHE_MISS, as None is a valid tool output.
+        """
+        try:
+            cached = self.tool_cache.get(cache_key)
+        except Exception as e:
+            self.logging.warning("AgentGateway:_get_cached_tool_output: cache lookup failed %s", e)
+            return _CACHE_MISS
+        if cached is None:
+            return _CACHE_MISS
+        return json.loads(cached)["output"]
+
+    def _cache_tool_output(self, response_tool: Tool, cache_key: str, tool_output: Any):
+        if not response_tool.is_cacheable_result(tool_output):
+            return
+        try:
+            self.tool_cache.set(cache_key, json.dumps({"output": tool_output}), response_tool.cache_ttl)
+        except TypeError:
+            # the output does not survive a JSON round trip, so it is executed every time
+            self.logging.info("AgentGateway:_cache_tool_output: output of %s is not JSON serializable", response_tool.name)
+        except Exception as e:
+            self.logging.warning("AgentGateway:_cache_tool_output: cache store failed %s", e)
+
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        # concurrent runs on one gateway must not each create, and leak, a pool
+        with self._tool_executor_lock:
+            if self._tool_executor is None:
+                self._tool_executor = ThreadPoolExecutor(max_workers=self.max_tool_workers,
+                                                         thread_name_prefix="agentgateway-tool")
+            return self._tool_executor
+
+    def close(self):
+        """
+        Release the worker threads used for parallel tool execution.
+        """
+        with self._tool_executor_lock:
+            executor, self._tool_executor = self._tool_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,10 +1,37 @@
+import importlib
+
 from .abstract_agent import AbstractAgent
 from .abstract_tool import Tool
+from .batch import BatchResult
+from .cache import Cache, InMemoryCache, SQLiteCache, RedisCache
 from .conversation_manager import ConversationManager
-from .dynamo_conversation_manager import DynamoConversationManager
-from .message import Message
+from .cached_conversation_manager import CachedConversationManager
+from .history_policy import HistoryPolicy, FullHistoryPolicy, SlidingWindowPolicy, LastMessagesPolicy, SummarizingPolicy
+from .message import Message, ToolCall
+from .metrics import MetricsRegistry
 from .prompt import Prompt
-from .redis_conversation_manager import RedisConversationManager
-from .response import Response
+from .rate_limiter import RateLimiter
+from .response import Response, StreamEvent, StreamEventType
+from .retry import RetryPolicy
+from .run_context import RunContext
+from .tracing import Tracer, InMemorySpanExporter, JsonlSpanExporter, OtlpFileSpanExporter
+
+# these managers import redis and boto3, so they are loaded on first access
+_LAZY_IMPORTS = {
+    "DynamoConversationManager": ".dynamo_conversation_manager",
+    "RedisConversationManager": ".redis_conversation_manager",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = [AbstractAgent, Tool, ConversationManager, DynamoConversationManager,Message, Prompt, RedisConversationManager,Response]
\ No newline at end of file
+__all__ = ["AbstractAgent", "Tool", "BatchResult", "Cache", "InMemoryCache", "SQLiteCache", "RedisCache",
+           "ConversationManager", "CachedConversationManager", "DynamoConversationManager", "HistoryPolicy",
+           "FullHistoryPolicy", "SlidingWindowPolicy", "LastMessagesPolicy", "SummarizingPolicy", "Message",
+           "MetricsRegistry", "Prompt", "RateLimiter", "RedisConversationManager", "Response", "RetryPolicy",
+           "RunContext", "StreamEvent", "StreamEventType", "ToolCall", "Tracer", "InMemorySpanExporter",
+           "JsonlSpanExporter", "OtlpFileSpanExporter"]
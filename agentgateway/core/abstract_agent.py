@@ -1,12 +1,21 @@
-import json, os
+import asyncio
+import functools
+import json, os, time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from agentgateway.core.response import Response
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Generator
+from agentgateway.core.response import Response, ResponseType, EventType, StreamEvent, StreamEventType
+from agentgateway.core import metrics
+from agentgateway.core.cache import Cache, get_shared_cache, make_cache_key
+from agentgateway.core.rate_limiter import RateLimiter, RatePermit, get_provider_rate_limiter
+from agentgateway.core.retry import AttemptOutcome, LatencyTracker, RetryPolicy
+from agentgateway.core.run_context import get_current_run
+from agentgateway.core.tracing import CLIENT, get_tracer, now_ns
 import uuid
 from agentgateway.core.abstract_tool import Tool
 from agentgateway.core.conversation_manager import ConversationManager
-from agentgateway.core.redis_conversation_manager import RedisConversationManager
-from agentgateway.core.dynamo_conversation_manager import DynamoConversationManager
+from agentgateway.core.cached_conversation_manager import get_shared_cached_conversation_manager
+from agentgateway.core.tool_definitions import ToolDefinition, get_tool_definition
+from agentgateway.core.history_policy import HistoryPolicy, FullHistoryPolicy, SlidingWindowPolicy, LastMessagesPolicy
 from agentgateway.utils.config_manager import ConfigManager
 
 
@@ -14,6 +23,16 @@ class AbstractAgent(ABC):
     """
     Abstract base class for all agent implementations.
     """
+    # request key holding the formatted tools, replaced by their digests in response cache keys
+    TOOLS_REQUEST_KEY = "tools"
+    # whether the adapter implements _submit_batch() and _get_batch_results() for the provider's batch endpoint
+    SUPPORTS_PROVIDER_BATCH = False
+    # message format of the provider, which get_formatted_tool_output() returns; the conversation history is
+    # stored in the canonical chat_completions format and converted to it per request, see core/message.py
+    WIRE_FORMAT = "chat_completions"
+    # provider name under rate_limits.providers in config.yaml, the AgentType value of the adapter
+    PROVIDER: Optional[str] = None
+
     def __init__(self, model_id: str=""):
 
         self.config_manager = ConfigManager()
@@ -22,29 +41,177 @@ class AbstractAgent(ABC):
         self.instructions = ""
         self.tools = {}
         self.formatted_tools = []
+        self.tool_definitions: List[ToolDefinition] = []
         self.auth_data = {}
         self.model_config = {
             "max_tokens": self.config_manager.get_nested(self.model_profile, 'max_tokens', default=2000),
             "temperature": self.config_manager.get_nested(self.model_profile, 'temperature', default=0.7)
         }
         self.model_id = model_id
+        self._response: Optional[Response] = None
         self.current_conversation_id = ""
         self.conversation_manager = self._initialize_conversation_manager()
+        self.response_cache = self._initialize_response_cache()
+        self.response_cache_ttl = self.config_manager.get_nested('cache', 'ttl', default=600)
+        self.history_policy = self._initialize_history_policy()
+        self.prompt_caching = self.config_manager.get_nested('prompt_caching', 'enabled', default=False)
+        self.rate_limiter: Optional[RateLimiter] = None
+        self._configured_rate_limiter = True
+        self._resolve_rate_limiter()
+        self.retry_policy = self._initialize_retry_policy()
+        self.latency_tracker = LatencyTracker()
+        self._batches = {}
+
+    @property
+    def response(self) -> Optional[Response]:
+        """
+        The response of the run in progress, held by the active RunContext of this adapter if there is one.
+        """
+        run = get_current_run(self)
+        return run.response if run is not None else self._response
+
+    @response.setter
+    def response(self, response: Optional[Response]):
+        run = get_current_run(self)
+        if run is not None:
+            run.response = response
+        else:
+            self._response = response
+
+    @property
+    def current_conversation_id(self) -> Optional[str]:
+        """
+        The conversation of the run in progress, or else the one last started or continued by this adapter.
+        """
+        run = get_current_run(self)
+        if run is not None and run.conversation_id is not None:
+            return run.conversation_id
+        return self._current_conversation_id
+
+    @current_conversation_id.setter
+    def current_conversation_id(self, conversation_id: Optional[str]):
+        run = get_current_run(self)
+        if run is not None:
+            run.conversation_id = conversation_id
+        else:
+            self._current_conversation_id = conversation_id
 
     def _initialize_conversation_manager(self) -> ConversationManager:
         conversation_manager_type = self.config_manager.get_nested(self.mem_profile, 'conversation_manager',
                                                                    default='in_memory')
 
+        # the Redis and DynamoDB managers pull in their SDKs, so they are only imported when configured
         if conversation_manager_type == 'redis':
+            from agentgateway.core.redis_conversation_manager import RedisConversationManager
             redis_url = self.config_manager.get_nested(self.mem_profile, 'redis_url', default='redis://localhost:6379')
-            return RedisConversationManager(redis_url)
+            storage_mode = self.config_manager.get_nested(self.mem_profile, 'redis_storage_mode', default='string')
+            store = ("redis", redis_url, storage_mode)
+            create_manager = functools.partial(RedisConversationManager, redis_url, storage_mode)
         elif conversation_manager_type == 'dynamodb':
+            from agentgateway.core.dynamo_conversation_manager import DynamoConversationManager
             table_name = self.config_manager.get_nested(self.mem_profile, 'dynamodb_table', default='conversations')
             region_name = self.config_manager.get_nested(self.mem_profile, 'dynamodb_region', default='us-west-2')
-            return DynamoConversationManager(table_name, region_name)
+            storage_mode = self.config_manager.get_nested(self.mem_profile, 'dynamodb_storage_mode', default='document')
+            store = ("dynamodb", table_name, region_name, storage_mode)
+            create_manager = functools.partial(DynamoConversationManager, table_name, region_name, storage_mode)
         else:
             return ConversationManager()
 
+        if self.config_manager.get_nested(self.mem_profile, 'cache_conversations', default=False):
+            # one write-behind cache per store, shared by every adapter using it
+            return get_shared_cached_conversation_manager(
+                store, create_manager,
+                ttl=self.config_manager.get_nested('cache', 'ttl', default=600),
+                max_size=self.config_manager.get_nested('cache', 'max_conversations', default=1000),
+                flush_interval=self.config_manager.get_nested('cache', 'flush_interval', default=None)
+            )
+        return create_manager()
+
+    def _initialize_response_cache(self) -> Optional[Cache]:
+        backend = self.config_manager.get_nested('cache', 'llm_responses', default='none')
+        return get_shared_cache(
+            backend, "llm",
+            max_entries=self.config_manager.get_nested('cache', 'max_entries', default=10000),
+            sqlite_path=self.config_manager.get_nested('cache', 'sqlite_path', default='agentgateway_cache.sqlite'),
+            redis_url=self.config_manager.get_nested('cache', 'redis_url', default='redis://localhost:6379')
+        )
+
+    def set_response_cache(self, cache: Optional[Cache], ttl: Optional[float] = None) -> None:
+        """
+        Set the cache consulted before each provider call, or None to disable response caching.
+
+        Args:
+            cache: A Cache instance (InMemoryCache, SQLiteCache, RedisCache or a custom subclass)
+            ttl: Seconds a cached response stays valid. Defaults to the cache.ttl setting.
+        """
+        if cache is not None and not isinstance(cache, Cache):
+            raise TypeError(f"Cache must be an instance of Cache. Got {type(cache).__name__}")
+        self.response_cache = cache
+        if ttl is not None:
+            self.response_cache_ttl = ttl
+
+    def _initialize_history_policy(self) -> HistoryPolicy:
+        policy = self.config_manager.get_nested('history', 'policy', default='full')
+        if policy == 'sliding_window':
+            return SlidingWindowPolicy(self.config_manager.get_nested('history', 'max_tokens', default=8000))
+        elif policy == 'last_messages':
+            return LastMessagesPolicy(self.config_manager.get_nested('history', 'max_messages', default=20))
+        elif policy in ('full', None):
+            return FullHistoryPolicy()
+        # summarizing needs an authenticated summarizer tool, so it is only available through set_history_policy()
+        raise ValueError(f"Unsupported history policy: {policy}")
+
+    def set_history_policy(self, policy: HistoryPolicy) -> None:
+        """
+        Set the policy that selects the part of the conversation history sent with each LLM request.
+        :param policy: A HistoryPolicy instance, e.g. SlidingWindowPolicy or SummarizingPolicy.
+        """
+        if not isinstance(policy, HistoryPolicy):
+            raise TypeError(f"Policy must be an instance of HistoryPolicy. Got {type(policy).__name__}")
+        self.history_policy = policy
+
+    def set_prompt_caching(self, enabled: bool) -> None:
+        """
+        Enable or disable provider-side prompt caching of the system prompt, tool definitions and stable
+        history prefix, on providers that support it (Anthropic and Bedrock). Disabled by default.
+        """
+        self.prompt_caching = bool(enabled)
+
+    def set_rate_limiter(self, limiter: Optional[RateLimiter]) -> None:
+        """
+        Set the limiter every provider call waits on, or None to call the provider without limits.
+        By default adapters use the limiter configured for their PROVIDER and model in the rate_limits section of
+        config.yaml, shared by every adapter of that provider and model; a limiter set here replaces it, also
+        after set_model(). Response cache hits do not count against the limit.
+        """
+        if limiter is not None and not isinstance(limiter, RateLimiter):
+            raise TypeError(f"Limiter must be an instance of RateLimiter. Got {type(limiter).__name__}")
+        self.rate_limiter = limiter
+        self._configured_rate_limiter = False
+
+    def _resolve_rate_limiter(self):
+        if self._configured_rate_limiter and self.PROVIDER is not None:
+            self.rate_limiter = get_provider_rate_limiter(self.PROVIDER, self.model_id)
+
+    def _initialize_retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(
+            max_attempts=self.config_manager.get_nested('retry', 'max_attempts', default=3),
+            base_delay=self.config_manager.get_nested('retry', 'base_delay', default=0.5),
+            max_delay=self.config_manager.get_nested('retry', 'max_delay', default=20),
+            attempt_timeout=self.config_manager.get_nested('retry', 'attempt_timeout', default=None),
+            deadline=self.config_manager.get_nested('retry', 'deadline', default=None),
+            hedge_after=self.config_manager.get_nested('retry', 'hedge_after', default=None)
+        )
+
+    def set_retry_policy(self, policy: RetryPolicy) -> None:
+        """
+        Set how failed provider calls are retried, and optionally bounded by timeouts and hedged.
+        :param policy: A RetryPolicy instance; RetryPolicy(max_attempts=1) disables retries.
+        """
+        if not isinstance(policy, RetryPolicy):
+            raise TypeError(f"Policy must be an instance of RetryPolicy. Got {type(policy).__name__}")
+        self.retry_policy = policy
+
     def set_conversation_manager(self, manager: ConversationManager) -> None:
         """
         Set a custom conversation manager implementation.
@@ -76,6 +243,373 @@ class AbstractAgent(ABC):
         elif conversation_id != self.current_conversation_id:
             self.current_conversation_id = conversation_id
 
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False,
+                   conversation_id: Optional[str] = None) -> Response:
+        """
+        Asynchronous counterpart of run().
+        Adapters with an async SDK client override this; the default offloads run() to a worker thread.
+        :param agent_input: The input message from the user, or the formatted tool results.
+        :param is_tool_response: boolean indicating the type of input
+        :param conversation_id: The conversation to continue.
+        :return: The agent's response.
+        """
+        return await asyncio.to_thread(self.run, agent_input, is_tool_response, conversation_id)
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None) -> Iterator[StreamEvent]:
+        """
+        Streaming counterpart of run().
+        Yields TEXT_DELTA events as the model produces text and ends with a RESPONSE event carrying the same
+        Response run() would have returned. Adapters without a streaming implementation yield only the
+        final RESPONSE event.
+        :param agent_input: The input message from the user, or the formatted tool results.
+        :param is_tool_response: boolean indicating the type of input
+        :param conversation_id: The conversation to continue.
+        """
+        response = self.run(agent_input, is_tool_response, conversation_id)
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def _invoke_model(self, request: Dict[str, Any]) -> Any:
+        """
+        Send a prepared request to the provider using the blocking client.
+        :param request: Keyword arguments for the provider SDK call.
+        :return: The raw provider response.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _invoke_model")
+
+    async def _ainvoke_model(self, request: Dict[str, Any]) -> Any:
+        """
+        Send a prepared request to the provider without blocking the event loop.
+        :param request: Keyword arguments for the provider SDK call.
+        :return: The raw provider response.
+        """
+        return await asyncio.to_thread(self._invoke_model, request)
+
+    def _invoke_model_stream(self, request: Dict[str, Any]) -> Generator[StreamEvent, None, Any]:
+        """
+        Send a prepared request to the provider as a stream.
+        Yields TEXT_DELTA events and returns a raw provider response assembled from the stream, equivalent
+        to the one _invoke_model() returns for the same request.
+        :param request: Keyword arguments for the provider SDK call.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _invoke_model_stream")
+
+    def _get_usage(self, model_response) -> Tuple[int, int]:
+        """
+        Extract the token usage from a raw provider response.
+        :param model_response: The raw provider response.
+        :return: A tuple of (input_tokens, output_tokens).
+        """
+        return 0, 0
+
+    def _get_cache_usage(self, model_response) -> Tuple[int, int]:
+        """
+        Extract the prompt cache usage from a raw provider response.
+        :param model_response: The raw provider response.
+        :return: A tuple of (cache_read_tokens, cache_write_tokens).
+        """
+        return 0, 0
+
+    def _serialize_model_response(self, model_response) -> Any:
+        """
+        Convert a raw provider response into JSON-compatible data for the response cache.
+        """
+        if hasattr(model_response, "model_dump"):
+            return model_response.model_dump(mode="json")
+        return model_response
+
+    def _deserialize_model_response(self, data) -> Any:
+        """
+        Rebuild a raw provider response from data produced by _serialize_model_response().
+        """
+        return data
+
+    def _get_response_cache_key(self, request: Dict[str, Any]) -> str:
+        # the request holds the model id, instructions, formatted tools, model config and history;
+        # the tools are already encoded, so their digests stand in for them
+        if self.TOOLS_REQUEST_KEY in request:
+            request = {key: value for key, value in request.items() if key != self.TOOLS_REQUEST_KEY}
+        return make_cache_key(type(self).__name__, request, [definition.digest for definition in self.tool_definitions])
+
+    def _get_cached_model_response(self, cache_key: str, response: Response) -> Any:
+        start_ns = now_ns()
+        try:
+            cached = self.response_cache.get(cache_key)
+        except Exception as e:
+            self.logging.warning("AbstractAgent:_get_cached_model_response: cache lookup failed %s", e)
+            return None
+        if cached is None:
+            return None
+        model_response = self._deserialize_model_response(json.loads(cached))
+        end_ns = now_ns()
+        input_tokens, output_tokens = self._get_usage(model_response)
+        cache_read_tokens, cache_write_tokens = self._get_cache_usage(model_response)
+        response.add_trace_detail(EventType.LLM_CACHE_HIT, latency=(end_ns - start_ns) / 1e9,
+                                  input_tokens=input_tokens, output_tokens=output_tokens, name=self.model_id,
+                                  start_ns=start_ns, end_ns=end_ns,
+                                  cache_read_tokens=cache_read_tokens, cache_write_tokens=cache_write_tokens)
+        self._trace_model_call(EventType.LLM_CACHE_HIT, start_ns, end_ns, input_tokens=input_tokens,
+                               output_tokens=output_tokens)
+        metrics.count_cache_hit("llm_response")
+        return model_response
+
+    def _cache_model_response(self, cache_key: str, model_response):
+        try:
+            self.response_cache.set(cache_key, json.dumps(self._serialize_model_response(model_response), default=str),
+                                    self.response_cache_ttl)
+        except Exception as e:
+            self.logging.warning("AbstractAgent:_cache_model_response: cache store failed %s", e)
+
+    def _call_model(self, request: Dict[str, Any], response: Response) -> Any:
+        """
+        Invoke the model under the retry policy and record usage and an LLM_CALL trace entry on the response,
+        plus an LLM_ERROR entry for every failed attempt.
+        Identical requests are answered from the response cache when one is configured.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self._get_response_cache_key(request)
+            model_response = self._get_cached_model_response(cache_key, response)
+            if model_response is not None:
+                return model_response
+
+        model_response = self.retry_policy.call(lambda: self._attempt_model(request),
+                                                lambda outcome: self._record_attempt(outcome, response),
+                                                self.latency_tracker)
+
+        if cache_key is not None:
+            self._cache_model_response(cache_key, model_response)
+        return model_response
+
+    async def _acall_model(self, request: Dict[str, Any], response: Response) -> Any:
+        """
+        Asynchronous counterpart of _call_model(). The response cache is read and written from a worker thread,
+        as it may be a network or disk store.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self._get_response_cache_key(request)
+            model_response = await asyncio.to_thread(self._get_cached_model_response, cache_key, response)
+            if model_response is not None:
+                return model_response
+
+        model_response = await self.retry_policy.acall(lambda: self._aattempt_model(request),
+                                                       lambda outcome: self._record_attempt(outcome, response),
+                                                       self.latency_tracker)
+
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache_model_response, cache_key, model_response)
+        return model_response
+
+    def _stream_model(self, request: Dict[str, Any], response: Response) -> Generator[StreamEvent, None, Any]:
+        """
+        Streaming counterpart of _call_model(). Yields the TEXT_DELTA events of the stream and returns the
+        assembled provider response. A response cache hit yields no events.
+
+        Only errors raised before the first event are retried, as the consumer has seen the events of a stream
+        that fails later. Attempt timeouts and hedging do not apply to streams; the deadline does.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self._get_response_cache_key(request)
+            model_response = self._get_cached_model_response(cache_key, response)
+            if model_response is not None:
+                return model_response
+
+        deadline_at = self.retry_policy.start_deadline()
+        attempt = 0
+        while True:
+            attempt += 1
+            outcome = AttemptOutcome(attempt)
+            permit = self._acquire_rate_limit(request)
+            outcome.start()
+            stream = self._invoke_model_stream(request)
+            streamed = False
+            try:
+                while True:
+                    try:
+                        event = next(stream)
+                    except StopIteration as stop:
+                        model_response = stop.value
+                        break
+                    streamed = True
+                    yield event
+            except BaseException as e:
+                # includes GeneratorExit, so a stream abandoned by its consumer frees its concurrency slot
+                self._release_rate_limit(permit, error=e)
+                if streamed or not isinstance(e, Exception):
+                    raise
+                self._record_attempt(outcome.finish(error=e), response)
+                delay = self.retry_policy.retry_delay(attempt, e, deadline_at)
+                if delay is None:
+                    raise
+                self.retry_policy.sleep(delay)
+                continue
+            self._record_attempt(outcome.finish(value=model_response), response)
+            self._release_rate_limit(permit, model_response, outcome.latency)
+            self.latency_tracker.observe(outcome.latency)
+            break
+
+        if cache_key is not None:
+            self._cache_model_response(cache_key, model_response)
+        return model_response
+
+    def _estimate_request_tokens(self, request: Dict[str, Any]) -> int:
+        # prompt tokens at about four characters each, plus the completion budget
+        return len(json.dumps(request, default=str)) // 4 + int(self.model_config.get('max_tokens') or 0)
+
+    def _acquire_rate_limit(self, request: Dict[str, Any]) -> Optional[RatePermit]:
+        if self.rate_limiter is None:
+            return None
+        tokens = self._estimate_request_tokens(request) if self.rate_limiter.tokens_per_minute else 0
+        return self.rate_limiter.acquire(tokens)
+
+    async def _aacquire_rate_limit(self, request: Dict[str, Any]) -> Optional[RatePermit]:
+        if self.rate_limiter is None:
+            return None
+        tokens = self._estimate_request_tokens(request) if self.rate_limiter.tokens_per_minute else 0
+        return await self.rate_limiter.aacquire(tokens)
+
+    def _release_rate_limit(self, permit: Optional[RatePermit], model_response=None,
+                            latency: Optional[float] = None, error: Optional[BaseException] = None):
+        if permit is None:
+            return
+        tokens_used = sum(self._get_usage(model_response)) if model_response is not None else None
+        self.rate_limiter.release(permit, tokens_used=tokens_used, latency=latency, error=error)
+
+    def _attempt_model(self, request: Dict[str, Any]) -> Any:
+        """
+        Make one provider call within the rate limit. Called by the retry policy once per attempt, possibly
+        from a worker thread.
+        """
+        permit = self._acquire_rate_limit(request)
+        start = time.perf_counter()
+        try:
+            model_response = self._invoke_model(request)
+        except BaseException as e:
+            self._release_rate_limit(permit, error=e)
+            raise
+        self._release_rate_limit(permit, model_response, time.perf_counter() - start)
+        return model_response
+
+    async def _aattempt_model(self, request: Dict[str, Any]) -> Any:
+        permit = await self._aacquire_rate_limit(request)
+        start = time.perf_counter()
+        try:
+            model_response = await self._ainvoke_model(request)
+        except BaseException as e:
+            self._release_rate_limit(permit, error=e)
+            raise
+        self._release_rate_limit(permit, model_response, time.perf_counter() - start)
+        return model_response
+
+    def _record_attempt(self, outcome: AttemptOutcome, response: Response):
+        if outcome.error is None:
+            self._record_model_usage(outcome.value, response, outcome.latency, outcome.start_ns,
+                                     outcome.end_ns, attempt=outcome.attempt, hedged=outcome.hedged)
+            return
+        error = "superseded" if outcome.superseded else f"{type(outcome.error).__name__}: {outcome.error}"
+        response.add_trace_detail(EventType.LLM_ERROR, latency=outcome.latency,
+                                  name="hedge" if outcome.hedged else None, start_ns=outcome.start_ns,
+                                  end_ns=outcome.end_ns, attempt=outcome.attempt, error=error)
+        self._trace_model_call(EventType.LLM_ERROR, outcome.start_ns, outcome.end_ns, error=error,
+                               attempt=outcome.attempt, hedged=outcome.hedged)
+        if not outcome.superseded:
+            metrics.count_llm_error(type(self).__name__, self.model_id, type(outcome.error).__name__)
+
+    def _record_model_usage(self, model_response, response: Response, latency: float, start_ns: int, end_ns: int,
+                            attempt: Optional[int] = None, hedged: bool = False):
+        input_tokens, output_tokens = self._get_usage(model_response)
+        cache_read_tokens, cache_write_tokens = self._get_cache_usage(model_response)
+        response.update_usage(input_tokens, output_tokens, cache_read_tokens, cache_write_tokens)
+        response.add_trace_detail(EventType.LLM_CALL, latency=latency, input_tokens=input_tokens,
+                                  output_tokens=output_tokens, start_ns=start_ns, end_ns=end_ns,
+                                  cache_read_tokens=cache_read_tokens, cache_write_tokens=cache_write_tokens,
+                                  attempt=attempt)
+        self._trace_model_call(EventType.LLM_CALL, start_ns, end_ns, attempt=attempt, hedged=hedged,
+                               input_tokens=input_tokens, output_tokens=output_tokens,
+                               cache_read_tokens=cache_read_tokens, cache_write_tokens=cache_write_tokens)
+        metrics.observe_llm_call(type(self).__name__, self.model_id, latency, input_tokens, output_tokens,
+                                 cache_read_tokens, cache_write_tokens)
+
+    def _trace_model_call(self, event_type: EventType, start_ns: int, end_ns: int, error: Optional[str] = None,
+                          **attributes):
+        """
+        Export an "llm.call" span, a child of the current span of the active run, when tracing is enabled.
+        """
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        run = get_current_run()
+        attributes.update({"event_type": event_type.value, "provider": type(self).__name__, "model": self.model_id})
+        tracer.record_span("llm.call", start_ns, end_ns, run.span if run is not None else None, CLIENT,
+                           attributes, error)
+
+    def submit_batch(self, agent_inputs: Dict[str, Any]) -> str:
+        """
+        Submit single-turn requests through the provider's batch endpoint. Each input starts a new conversation.
+
+        :param agent_inputs: User inputs by custom id. Ids may contain letters, digits, "-" and "_".
+        :return: The provider's batch id, to pass to get_batch_results().
+        """
+        if not self.SUPPORTS_PROVIDER_BATCH:
+            raise NotImplementedError(f"{type(self).__name__} does not support provider batch endpoints")
+        requests, conversations = {}, {}
+        for custom_id, agent_input in agent_inputs.items():
+            conversation_id = self.conversation_manager.start_conversation()
+            self.add_to_conversation_history({"role": "user", "content": agent_input}, conversation_id)
+            requests[custom_id] = self._build_request(conversation_id)
+            conversations[custom_id] = conversation_id
+        start_ns = now_ns()
+        batch_id = self._submit_batch(requests)
+        self._batches[batch_id] = (conversations, start_ns)
+        return batch_id
+
+    def get_batch_results(self, batch_id: str) -> Optional[Dict[str, Response]]:
+        """
+        Collect the results of a batch submitted with submit_batch().
+        :return: None while the batch is still processing, else a Response per custom id. Requests that failed
+                 or got no result have an ERROR response.
+        """
+        results = self._get_batch_results(batch_id)
+        if results is None:
+            return None
+        conversations, start_ns = self._batches.pop(batch_id)
+        end_ns = now_ns()
+        latency = (end_ns - start_ns) / 1e9
+
+        responses = {}
+        for custom_id, conversation_id in conversations.items():
+            response = Response(conversation_id=conversation_id)
+            model_response = results.get(custom_id)
+            if model_response is None:
+                model_response = Exception(f"No result for request {custom_id} in batch {batch_id}")
+            try:
+                if isinstance(model_response, Exception):
+                    raise model_response
+                self._record_model_usage(model_response, response, latency, start_ns, end_ns)
+                self._process_model_response(model_response, response, conversation_id)
+            except Exception as e:
+                response.set_response_type(ResponseType.ERROR)
+                response.set_content(str(e))
+            responses[custom_id] = response
+        return responses
+
+    def _submit_batch(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Upload prepared requests to the provider's batch endpoint.
+        :param requests: Keyword arguments for the provider SDK call, by custom id.
+        :return: The provider's batch id.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _submit_batch")
+
+    def _get_batch_results(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: None while the batch is processing, else raw provider responses, or the Exception of a failed
+                 request, by custom id.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _get_batch_results")
+
     @abstractmethod
     def set_auth(self, **kwargs):
         """
@@ -119,8 +653,7 @@ class AbstractAgent(ABC):
         tool_instance = None
 
         if tool_name in self.tools:
-            tool_instance = self.tools[tool_name].clone()
-            tool_instance.instance_id = instance_id
+            tool_instance = self.tools[tool_name].create_invocation(instance_id)
             self._validate_and_set_input(tool_instance, input_params)
 
         return tool_instance
@@ -130,8 +663,21 @@ class AbstractAgent(ABC):
         Add a new tool to the agent's toolkit.
         :param tool: A Tool instance to be added.
         """
+        tool.get_validator()
         self.tools[tool.name] = tool
 
+    def _add_tool_definition(self, tool: Tool, provider_format: str, formatter) -> Dict[str, Any]:
+        """
+        Append the provider-specific definition of a tool to formatted_tools.
+        Definitions come from a process-wide cache, so agents with the same tools format each one only once.
+        :param provider_format: Name of the provider format, e.g. "anthropic" or "bedrock".
+        :param formatter: Builds the definition on a cache miss.
+        """
+        definition = get_tool_definition(tool, provider_format, formatter)
+        self.tool_definitions.append(definition)
+        self.formatted_tools.append(definition.definition)
+        return definition.definition
+
     def remove_tool(self, tool_name: str):
         """
         Remove a tool from the agent's toolkit.
@@ -142,6 +688,7 @@ class AbstractAgent(ABC):
 
     def set_model(self, model_id: str):
         self.model_id = model_id
+        self._resolve_rate_limiter()
 
     def get_model(self):
         return self.model_id
@@ -163,6 +710,12 @@ class AbstractAgent(ABC):
             conversation_id = self.current_conversation_id
         return self.conversation_manager.get_conversation_history(conversation_id)
 
+    def get_request_history(self, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The conversation history to send with an LLM request, trimmed by the history policy.
+        """
+        return self.history_policy.apply(self.get_conversation_history(conversation_id))
+
     def clear_conversation_history(self, conversation_id: Optional[str] = None):
         if conversation_id is None:
             conversation_id = self.current_conversation_id
@@ -194,58 +747,6 @@ class AbstractAgent(ABC):
         return [tool.to_dict() for tool in self.tools]
 
     def _validate_and_set_input(self, tool: Tool, input_params: Dict[str, Any]):
-        schema = tool.get_parameters_schema()
-        properties = schema.get('properties', {})
-        required = schema.get('required', [])
-
-        # Check for required parameters
-        for param in required:
-            if param not in input_params:
-                raise ValueError(f"Missing required parameter: {param}")
-
-        # Validate and set parameters
-        for key, value in input_params.items():
-            if key not in properties:
-                raise ValueError(f"Unexpected parameter: {key}")
-
-            expected_type = properties[key]['type']
-            if not self._check_type(value, expected_type):
-                raise TypeError(
-                    f"Invalid type for parameter '{key}'. Expected {expected_type}, got {type(value).__name__}")
-
-            tool.set_parameter(key, value)
-
-    def _check_type(self, value: Any, expected_type: str) -> bool:
-        if expected_type == 'string':
-            return isinstance(value, str)
-        elif expected_type == 'number':
-            return isinstance(value, (int, float))
-        elif expected_type == 'integer':
-            return isinstance(value, int)
-        elif expected_type == 'boolean':
-            return isinstance(value, bool)
-        elif expected_type == 'array':
-            return isinstance(value, list)
-        elif expected_type == 'object':
-            return isinstance(value, dict)
-        else:
-            return True
-
-    def _validate_input(self, tool: Tool, input_params: Dict[str, Any]):
-        schema = tool.get_parameters_schema()
-        required_params = schema.get('required', [])
-        properties = schema.get('properties', {})
-
-        # Check for required parameters
-        for param in required_params:
-            if param not in input_params:
-                raise ValueError(f"Missing required parameter: {param}")
-
-        # Check parameter types
-        for param, value in input_params.items():
-            if param in properties:
-                expected_type = properties[param]['type']
-                if not self._check_type(value, expected_type):
-                    raise TypeError(
-                        f"Invalid type for parameter '{param}'. Expected {expected_type}, got {type(value).__name__}")
+        # the validator was compiled when the tool was added, see add_tool()
+        tool.set_parameters(input_params, replace=True)
 
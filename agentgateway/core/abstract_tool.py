@@ -1,12 +1,26 @@
+import asyncio
 import copy
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from agentgateway.core.cache import make_cache_key
+from agentgateway.core.schema_validator import SchemaValidator
+
+_WHITESPACE = re.compile(r"\s+")
 
 
 class Tool(ABC):
     """
     Abstract base class for all tool implementations.
+
+    Tools whose result depends only on their parameters for a while can opt in to result caching by setting
+    CACHE_TTL. AgentGateway then looks each call up in its tool cache, configured in cache.tool_results, before
+    execute(), keyed on the normalized parameters.
     """
+    # seconds a result may be reused for the same parameters; None never caches the tool's results
+    CACHE_TTL: Optional[float] = None
+    # parameters the cache key is built from, all of them when None
+    CACHE_KEY_PARAMETERS: Optional[Tuple[str, ...]] = None
 
     def __init__(self, name: str, description: str):
         """
@@ -19,6 +33,8 @@ class Tool(ABC):
         self.description = description
         self.auth_data = {}
         self._parameters: Dict[str, Any] = {}
+        self._validator = None
+        self.cache_ttl = self.CACHE_TTL
 
     @abstractmethod
     def execute(self) -> Any:
@@ -29,6 +45,14 @@ class Tool(ABC):
         """
         pass
 
+    async def aexecute(self) -> Any:
+        """
+        Execute the tool's functionality without blocking the event loop.
+        Tools with a native async implementation can override this; the default runs execute() in a worker thread.
+        :return: The result of the tool's execution.
+        """
+        return await asyncio.to_thread(self.execute)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the tool to a dictionary representation.
@@ -62,26 +86,35 @@ class Tool(ABC):
     def is_auth_setup(self) -> bool:
         pass
 
-    def set_parameters(self, parameters: Dict[str, Any]):
+    def get_validator(self) -> SchemaValidator:
         """
-        Set the parameters for the tool.
-        :param parameters: A dictionary of parameters to set.
+        Get the validator compiled from get_parameters_schema(), compiling it on first use.
+        Invocations created with create_invocation() share the compiled validator.
         """
-        schema = self.get_parameters_schema()
-        properties = schema.get('properties', {})
-        required = schema.get('required', [])
+        validator = getattr(self, "_validator", None)
+        if validator is None:
+            validator = SchemaValidator(self.get_parameters_schema())
+            self._validator = validator
+        return validator
 
-        for key, value in parameters.items():
-            if key not in properties:
-                raise ValueError(f"Unexpected parameter: {key}")
-            if key in required and value is None:
-                raise ValueError(f"Required parameter '{key}' cannot be None")
-            self._parameters[key] = value
+    def set_validator(self, validator: SchemaValidator):
+        """
+        Use an already compiled validator, e.g. one shared by every instance of a tool class.
+        """
+        self._validator = validator
 
-        # Check if all required parameters are set
-        for req in required:
-            if req not in self._parameters:
-                raise ValueError(f"Missing required parameter: {req}")
+    def set_parameters(self, parameters: Dict[str, Any], replace: bool = False):
+        """
+        Set the parameters for the tool.
+        Missing optional parameters get their schema defaults.
+        :param parameters: A dictionary of parameters to set.
+        :param replace: Validate the parameters on their own and replace the current ones, instead of merging.
+        :raises ValueError: If a parameter is unexpected, a required one is missing or a value is not in its enum.
+        :raises TypeError: If a value does not match the type in the schema.
+        """
+        if not replace:
+            parameters = {**self._parameters, **parameters}
+        self._parameters = self.get_validator().validate(parameters)
 
     def get_parameters(self) -> Dict[str, Any]:
         """
@@ -108,16 +141,41 @@ class Tool(ABC):
         :param value: The value to set for the parameter.
         :raises ValueError: If the parameter is not defined in the schema or if it's a required parameter and the value is None.
         """
-        schema = self.get_parameters_schema()
-        properties = schema.get('properties', {})
-        required = schema.get('required', [])
+        self._parameters[key] = self.get_validator().validate_parameter(key, value)
 
-        if key not in properties:
-            raise ValueError(f"Unexpected parameter: {key}")
-        if key in required and value is None:
-            raise ValueError(f"Required parameter '{key}' cannot be None")
+    def set_cache_ttl(self, ttl: Optional[float]):
+        """
+        Set the seconds a result of this tool may be reused for the same parameters, or None to disable caching.
+        """
+        self.cache_ttl = ttl
 
-        self._parameters[key] = value
+    def normalize_cache_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The parameters as they enter the cache key. Strings are stripped and runs of whitespace collapsed;
+        tools whose results do not depend on case or punctuation normalize further.
+        """
+        return {key: _WHITESPACE.sub(" ", value).strip() if isinstance(value, str) else value
+                for key, value in parameters.items()}
+
+    def get_cache_key(self) -> Optional[str]:
+        """
+        The key of the result of this call in the tool cache, or None when the tool's results are not cached.
+        """
+        ttl = getattr(self, "cache_ttl", self.CACHE_TTL)
+        if ttl is None or ttl <= 0:
+            return None
+        parameters = self.get_parameters()
+        if self.CACHE_KEY_PARAMETERS is not None:
+            parameters = {key: parameters.get(key) for key in self.CACHE_KEY_PARAMETERS}
+        return make_cache_key(type(self).__module__, type(self).__qualname__, self.name,
+                              self.normalize_cache_parameters(parameters))
+
+    def is_cacheable_result(self, tool_output: Any) -> bool:
+        """
+        Whether a result may be cached. Tools that report failures in their output, rather than by raising,
+        return False for them, so a transient failure is not reused.
+        """
+        return True
 
     def set_instance_id(self, instance_id: str):
         self.instance_id = instance_id
@@ -128,9 +186,32 @@ class Tool(ABC):
     def get_name(self) -> str:
         return self.name
 
+    def get_definition_key(self):
+        """
+        Identity of the tool definition, used to share formatted definitions between instances.
+        It includes a digest of the parameters schema, so instances of a class whose schema differs do not share.
+        """
+        return (type(self).__module__, type(self).__qualname__, self.name, self.description,
+                make_cache_key(self.get_parameters_schema()))
+
+    def create_invocation(self, instance_id: str = "") -> 'Tool':
+        """
+        Create a lightweight instance of the tool for a single call.
+        The invocation shares the tool definition, auth data and any attached clients or models with this tool,
+        and holds its own instance_id and parameters. It costs one attribute dict instead of a deep copy.
+        :param instance_id: The id of the tool call, as returned by the model.
+        :return: A new instance of the tool starting with a copy of this tool's parameters.
+        """
+        invocation = object.__new__(type(self))
+        invocation.__dict__.update(self.__dict__)
+        invocation.instance_id = instance_id
+        invocation._parameters = dict(self._parameters)
+        return invocation
+
     def clone(self):
         """
         Create a deep copy of the tool.
+        Use create_invocation() for per-call instances; clone() also copies auth data and attached resources.
         :return: A new instance of the tool with copied attributes.
         """
         new_tool = copy.deepcopy(self)
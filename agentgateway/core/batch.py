@@ -0,0 +1,42 @@
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from agentgateway.core.response import Response
+
+
+class BatchResult:
+    """
+    The outcome of one input of AgentGateway.run_batch().
+    index is the position of the input in the batch; exactly one of response and error is set.
+    """
+    __slots__ = ("index", "input", "response", "error")
+
+    def __init__(self, index: int, agent_input: Any, response: Optional[Response] = None,
+                 error: Optional[Exception] = None):
+        self.index = index
+        self.input = agent_input
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error is not None else f"response={self.response}"
+        return f"BatchResult(index={self.index}, {outcome})"
+
+
+def in_input_order(results: Iterable[BatchResult]) -> Iterator[BatchResult]:
+    """
+    Re-order results arriving in completion order into input order, holding back only those that arrive early.
+    """
+    held: Dict[int, BatchResult] = {}
+    next_index = 0
+    for result in results:
+        held[result.index] = result
+        while next_index in held:
+            yield held.pop(next_index)
+            next_index += 1
+    # inputs that were never run leave gaps; release the rest in order
+    for index in sorted(held):
+        yield held[index]
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+    Dict keys are sorted so logically equal inputs always hash to the same key.
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cache(ABC):
+    """
+    Minimal string key/value cache with per-entry TTL used for LLM responses and tool results.
+    A ttl of None or <= 0 means the entry does not expire.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class InMemoryCache(Cache):
+    """
+    Bounded, thread-safe LRU cache held in the current process.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl and ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    """
+    On-disk cache in a SQLite file, shared by every process that points at the same path.
+
+    The table is bounded like InMemoryCache: every prune_interval writes, expired rows are deleted and the
+    least recently written rows beyond max_entries are evicted.
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_entries: int = 10000, prune_interval: int = 100):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl and ttl > 0 else None
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                self._prune()
+
+    def _prune(self):
+        # a replaced row gets a new rowid, so rowid order is write order
+        self._connection.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if count > self.max_entries:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN (SELECT rowid FROM {self.table} ORDER BY rowid LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class RedisCache(Cache):
+    """
+    Cache stored in Redis under a key prefix, with TTLs enforced by Redis.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "agentgateway:cache:"):
+        import redis
+        self.redis = redis.from_url(redis_url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.redis.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        if ttl and ttl > 0:
+            self.redis.set(self.prefix + key, value, px=int(ttl * 1000))
+        else:
+            self.redis.set(self.prefix + key, value)
+
+    def delete(self, key: str):
+        self.redis.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.redis.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.redis.delete(*keys)
+
+
+_shared_caches: Dict[Tuple[str, str, str], Cache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared_cache(backend: str, namespace: str, max_entries: int = 10000,
+                     sqlite_path: str = "agentgateway_cache.sqlite",
+                     redis_url: str = "redis://localhost:6379") -> Optional[Cache]:
+    """
+    Return the process-wide cache for a backend and namespace, creating it on first use.
+    :param backend: One of "memory", "sqlite", "redis"; "none" or empty disables caching.
+    :param namespace: Separates independent caches (e.g. LLM responses and tool results).
+    """
+    if not backend or backend == "none":
+        return None
+    if backend == "memory":
+        location = ""
+    elif backend == "sqlite":
+        location = sqlite_path
+    elif backend == "redis":
+        location = redis_url
+    else:
+        raise ValueError(f"Unsupported cache backend: {backend}")
+
+    with _shared_caches_lock:
+        cache = _shared_caches.get((backend, location, namespace))
+        if cache is None:
+            if backend == "memory":
+                cache = InMemoryCache(max_entries)
+            elif backend == "sqlite":
+                cache = SQLiteCache(sqlite_path, table=f"{namespace}_cache", max_entries=max_entries)
+            else:
+                cache = RedisCache(redis_url, prefix=f"agentgateway:{namespace}:")
+            _shared_caches[(backend, location, namespace)] = cache
+        return cache
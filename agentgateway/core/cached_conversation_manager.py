@@ -0,0 +1,285 @@
+import asyncio
+import atexit
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, Callable, Hashable, Iterable, Optional
+from agentgateway.core.conversation_manager import ConversationManager
+
+# writes of one conversation are ordered by one of these locks, picked by its id
+_WRITE_LOCK_STRIPES = 64
+
+
+class _CachedConversation:
+    __slots__ = ("history", "expires_at")
+
+    def __init__(self, history: List[Dict[str, Any]], expires_at: float):
+        self.history = history
+        self.expires_at = expires_at
+
+
+class CachedConversationManager(ConversationManager):
+    """
+    Write-behind cache in front of another ConversationManager.
+
+    Hot conversations are kept in a bounded in-process LRU so history reads do not hit the backing store.
+    Appends update the cache immediately and are queued; the queue is written to the backing manager when a
+    batch() closes (AgentGateway opens one per LLM turn), every `flush_interval` seconds, when a
+    conversation is evicted or expires, and at interpreter exit.
+
+    Each thread or asyncio task has its own batch, which writes the conversations appended to within it when it
+    closes. The cache lock only guards the in-process state: the backing manager is called outside it, so a
+    conversation waiting on the store does not hold up the others. Use get_shared_cached_conversation_manager()
+    to share one cache between the adapters of a backing store.
+    """
+
+    def __init__(self, backing_manager: ConversationManager, ttl: float = 600, max_size: int = 1000,
+                 flush_interval: Optional[float] = None):
+        if not isinstance(backing_manager, ConversationManager):
+            raise TypeError(
+                f"Backing manager must be an instance of ConversationManager. Got {type(backing_manager).__name__}"
+            )
+        self.backing_manager = backing_manager
+        self.ttl = ttl
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._entries: "OrderedDict[str, _CachedConversation]" = OrderedDict()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._write_locks = [threading.Lock() for _ in range(_WRITE_LOCK_STRIPES)]
+        # conversations appended to in the batch() open in the current thread or asyncio task
+        self._batch = contextvars.ContextVar(f"cached_conversation_batch_{id(self)}", default=None)
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="agentgateway-history-flush",
+                                             daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def start_conversation(self) -> str:
+        conversation_id = self.backing_manager.start_conversation()
+        evicted = []
+        with self._lock:
+            self._store(conversation_id, [], evicted)
+        self._write(evicted)
+        return conversation_id
+
+    def get_conversation_history(self, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if conversation_id is None:
+            raise ValueError("Conversation ID cannot be None")
+        evicted = []
+        with self._lock:
+            entry = self._get_entry(conversation_id, evicted)
+            if entry is not None:
+                return list(entry.history)
+        with self._write_lock(conversation_id):
+            # queued messages of an evicted or expired entry reach the store before it is read
+            self._write_locked([conversation_id])
+            history = list(self.backing_manager.get_conversation_history(conversation_id))
+            with self._lock:
+                entry = self._get_entry(conversation_id, evicted)
+                if entry is None:
+                    # messages appended while the store was read are queued, not yet written
+                    entry = self._store(conversation_id, history + self._pending.get(conversation_id, []), evicted)
+                history = list(entry.history)
+        self._write(evicted)
+        return history
+
+    def clear_conversation_history(self, conversation_id: Optional[str] = None):
+        if conversation_id is None:
+            raise ValueError("Conversation ID cannot be None")
+        with self._write_lock(conversation_id):
+            with self._lock:
+                self._pending.pop(conversation_id, None)
+                self._entries.pop(conversation_id, None)
+            self.backing_manager.clear_conversation_history(conversation_id)
+
+    def add_to_conversation_history(self, message: Dict[str, Any], conversation_id: Optional[str] = None):
+        if conversation_id is None:
+            raise ValueError("Conversation ID cannot be None")
+        self._append(conversation_id, [message])
+
+    def extend_conversation_history(self, messages: List, conversation_id: Optional[str] = None):
+        if conversation_id is None:
+            raise ValueError("Conversation ID cannot be None")
+        if messages:
+            self._append(conversation_id, list(messages))
+
+    @contextmanager
+    def batch(self):
+        """
+        Write the appends made in the current thread or task to the backing manager when the outermost batch
+        closes.
+        """
+        if self._batch.get() is not None:
+            # nested batch, the outermost one writes
+            yield self
+            return
+        conversation_ids = set()
+        token = self._batch.set(conversation_ids)
+        try:
+            yield self
+        finally:
+            self._batch.reset(token)
+            self._write(conversation_ids)
+
+    @asynccontextmanager
+    async def abatch(self):
+        """
+        Asynchronous counterpart of batch(): the appends are written from a worker thread, off the event loop.
+        """
+        if self._batch.get() is not None:
+            yield self
+            return
+        conversation_ids = set()
+        token = self._batch.set(conversation_ids)
+        try:
+            yield self
+        finally:
+            self._batch.reset(token)
+            await asyncio.to_thread(self._write, conversation_ids)
+
+    def flush(self, conversation_ids: Optional[Iterable[str]] = None):
+        """
+        Write the queued appends to the backing manager, grouped in one backing batch: all of them, or only those
+        of the given conversations.
+        """
+        if conversation_ids is None:
+            with self._lock:
+                conversation_ids = list(self._pending)
+        self._write(conversation_ids)
+
+    def close(self):
+        """
+        Stop the background flusher and write any queued appends.
+        """
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _append(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        batch = self._batch.get()
+        evicted = []
+        with self._lock:
+            entry = self._get_entry(conversation_id, evicted)
+            if entry is not None:
+                entry.history.extend(messages)
+            self._pending.setdefault(conversation_id, []).extend(messages)
+        if batch is not None:
+            batch.add(conversation_id)
+        elif entry is None:
+            # not cached: write through rather than paying a read to populate the cache
+            evicted.append(conversation_id)
+        self._write(evicted)
+
+    def _get_entry(self, conversation_id: str, evicted: List[str]) -> Optional[_CachedConversation]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._evict(conversation_id, evicted)
+            return None
+        self._entries.move_to_end(conversation_id)
+        return entry
+
+    def _store(self, conversation_id: str, history: List[Dict[str, Any]], evicted: List[str]) -> _CachedConversation:
+        entry = _CachedConversation(history, time.monotonic() + self.ttl)
+        self._entries[conversation_id] = entry
+        self._entries.move_to_end(conversation_id)
+        while len(self._entries) > self.max_size:
+            self._evict(next(iter(self._entries)), evicted)
+        return entry
+
+    def _evict(self, conversation_id: str, evicted: List[str]):
+        # the queued messages are written by the caller once it releases the cache lock
+        self._entries.pop(conversation_id, None)
+        if conversation_id in self._pending:
+            evicted.append(conversation_id)
+
+    def _write_lock(self, conversation_id: str) -> threading.Lock:
+        return self._write_locks[hash(conversation_id) % _WRITE_LOCK_STRIPES]
+
+    def _write(self, conversation_ids: Iterable[str]):
+        """
+        Write the queued appends of some conversations, holding their write locks.
+        """
+        conversation_ids = list(dict.fromkeys(conversation_ids))
+        if not conversation_ids:
+            return
+        # locks are always taken in the same order, so concurrent writes cannot deadlock
+        locks = sorted({id(lock): lock for lock in map(self._write_lock, conversation_ids)}.items())
+        for _, lock in locks:
+            lock.acquire()
+        try:
+            self._write_locked(conversation_ids)
+        finally:
+            for _, lock in reversed(locks):
+                lock.release()
+
+    def _write_locked(self, conversation_ids: List[str]):
+        with self._lock:
+            pending = {conversation_id: self._pending.pop(conversation_id)
+                       for conversation_id in conversation_ids if conversation_id in self._pending}
+        if not pending:
+            return
+        try:
+            with self.backing_manager.batch():
+                while pending:
+                    conversation_id, messages = next(iter(pending.items()))
+                    self.backing_manager.extend_conversation_history(messages, conversation_id)
+                    del pending[conversation_id]
+        except Exception:
+            # keep what was not written so the next flush retries it
+            with self._lock:
+                for conversation_id, messages in pending.items():
+                    self._pending.setdefault(conversation_id, [])[:0] = messages
+            raise
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # the messages stay queued and are retried on the next tick
+                pass
+
+
+_shared_managers: Dict[Hashable, CachedConversationManager] = {}
+_shared_managers_lock = threading.Lock()
+
+
+def get_shared_cached_conversation_manager(key: Hashable, create_backing_manager: Callable[[], ConversationManager],
+                                           ttl: float = 600, max_size: int = 1000,
+                                           flush_interval: Optional[float] = None) -> CachedConversationManager:
+    """
+    Return the process-wide write-behind cache of a backing store, creating it and its backing manager on first
+    use. Adapters configured with the same store share one cache, so they see each other's queued appends, and
+    one flusher thread.
+
+    :param key: Identifies the backing store, e.g. ("redis", redis_url, storage_mode).
+    :param create_backing_manager: Creates the backing manager of a new cache.
+    :param ttl: Settings of a new cache, see CachedConversationManager; an existing cache keeps its own.
+    """
+    with _shared_managers_lock:
+        manager = _shared_managers.get(key)
+        if manager is None:
+            manager = CachedConversationManager(create_backing_manager(), ttl=ttl, max_size=max_size,
+                                                flush_interval=flush_interval)
+            _shared_managers[key] = manager
+        return manager
+
+
+def clear_shared_cached_conversation_managers():
+    """
+    Close and forget every shared cache, e.g. after changing the memory settings or in tests.
+    """
+    with _shared_managers_lock:
+        managers = list(_shared_managers.values())
+        _shared_managers.clear()
+    for manager in managers:
+        manager.close()
@@ -0,0 +1,150 @@
+"""
+Process-wide registry of provider SDK clients and HTTP sessions.
+
+Adapters and tools built with the same provider and credentials share one client, and with it one pool of
+keep-alive connections, instead of paying a TCP and TLS handshake on every call. Pool sizes and timeouts
+come from the `http` section of config.yaml. SDKs are imported only when a client is first requested.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agentgateway.core.cache import make_cache_key
+from agentgateway.utils.config_manager import ConfigManager
+
+_shared_clients: Dict[Tuple[Any, str], Any] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _http_setting(key: str, default):
+    return ConfigManager().get_nested('http', key, default=default)
+
+
+def get_http_timeout() -> float:
+    """
+    Timeout in seconds for SDK clients and tool HTTP requests.
+    """
+    return _http_setting('timeout', 60)
+
+
+def get_adapter_max_retries() -> int:
+    """
+    SDK-level retries of the clients of model adapters, whose calls RetryPolicy already retries; 0 by default
+    so attempts do not multiply. Clients of tools keep their SDK's own retries.
+    """
+    return _http_setting('max_retries', 0)
+
+
+def _get_or_create(factory_key: Any, settings: Dict[str, Any], create: Callable[[], Any]) -> Any:
+    # credentials are hashed so the registry does not keep them as plain-text keys
+    key = (factory_key, make_cache_key(settings))
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = create()
+            _shared_clients[key] = client
+        return client
+
+
+def _retry_settings(max_retries: Optional[int]) -> Dict[str, Any]:
+    # without max_retries the SDK's default retries apply
+    return {} if max_retries is None else {"max_retries": max_retries}
+
+
+def get_shared_client(client_class: Callable[..., Any], max_retries: Optional[int] = None, **credentials) -> Any:
+    """
+    Return the shared client of an httpx-based SDK (openai, anthropic, groq), creating it on first use.
+
+    :param client_class: The SDK client class, e.g. openai.OpenAI or anthropic.Client.
+    :param max_retries: SDK-level retries; None keeps the SDK default. Adapters pass get_adapter_max_retries().
+    :param credentials: Constructor arguments identifying the account, e.g. api_key and base_url.
+    """
+    def create():
+        import httpx
+        pool_size = _http_setting('pool_maxsize', 20)
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=get_http_timeout()
+        )
+        return client_class(**credentials, **_retry_settings(max_retries), timeout=get_http_timeout(),
+                            http_client=http_client)
+
+    return _get_or_create(client_class, {**credentials, "max_retries": max_retries}, create)
+
+
+def create_async_client(client_class: Callable[..., Any], max_retries: Optional[int] = None, **credentials) -> Any:
+    """
+    Create an async client of an httpx-based SDK with the same pool and timeout settings as get_shared_client.
+    Async clients are not shared: their connections belong to the event loop that opened them, so each adapter
+    keeps its own.
+
+    :param client_class: The SDK async client class, e.g. openai.AsyncOpenAI or anthropic.AsyncClient.
+    :param max_retries: SDK-level retries; None keeps the SDK default. Adapters pass get_adapter_max_retries().
+    :param credentials: Constructor arguments identifying the account, e.g. api_key and base_url.
+    """
+    import httpx
+    pool_size = _http_setting('pool_maxsize', 20)
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=get_http_timeout()
+    )
+    return client_class(**credentials, **_retry_settings(max_retries), timeout=get_http_timeout(),
+                        http_client=http_client)
+
+
+def get_shared_boto3_client(service_name: str, max_retries: Optional[int] = None, **credentials) -> Any:
+    """
+    Return the shared boto3 client for a service and credentials, creating it on first use.
+    :param max_retries: botocore retries; None keeps the botocore default.
+    """
+    import boto3
+    from botocore.config import Config
+
+    def create():
+        settings = {}
+        if max_retries is not None:
+            settings["retries"] = {'max_attempts': max_retries + 1, 'mode': 'standard'}
+        config = Config(
+            max_pool_connections=_http_setting('pool_maxsize', 20),
+            connect_timeout=get_http_timeout(),
+            read_timeout=get_http_timeout(),
+            **settings
+        )
+        return boto3.client(service_name, config=config, **credentials)
+
+    return _get_or_create(boto3.client, {"service_name": service_name, "max_retries": max_retries, **credentials},
+                          create)
+
+
+def get_shared_session(name: str = "default") -> Any:
+    """
+    Return a shared requests.Session with keep-alive connection pools, creating it on first use.
+    requests has no session-wide timeout, so callers pass get_http_timeout() with each request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    def create():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_http_setting('pool_connections', 10),
+                              pool_maxsize=_http_setting('pool_maxsize', 20))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    return _get_or_create(requests.Session, {"session": name}, create)
+
+
+def clear_shared_clients():
+    """
+    Close and forget every shared client, e.g. after forking or in tests.
+    """
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
@@ -1,6 +1,9 @@
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, Iterable, Optional
 import uuid
 
+from agentgateway.core.message import format_history
+
 class ConversationManager:
     def __init__(self):
         self.conversations = {}
@@ -33,9 +36,30 @@ class ConversationManager:
 
         self.conversations.setdefault(conversation_id, []).extend(messages)
 
+    @contextmanager
+    def batch(self):
+        """
+        Group the history writes made during one agent turn.
+        Backends that can pipeline writes override this; the in-memory manager writes immediately.
+        """
+        yield self
+
+    @asynccontextmanager
+    async def abatch(self):
+        """
+        Asynchronous counterpart of batch() for use inside an event loop.
+        Managers backed by a network store override this so the batch's writes run in a worker thread; this
+        default closes batch() on the loop, which only suits in-memory managers.
+        """
+        with self.batch():
+            yield self
+
+    def flush(self, conversation_ids: Optional[Iterable[str]] = None):
+        """
+        Write any appends buffered by the manager, or only those of the given conversations. The in-memory manager
+        has nothing to flush.
+        """
+        pass
+
     def get_formatted_conversation_history(self, conversation_id: Optional[str] = None) -> str:
-        history = self.get_conversation_history(conversation_id)
-        formatted_history = ""
-        for message in history:
-            formatted_history += f"{message['role'].capitalize()}: {message['content']}\n"
-        return formatted_history.strip()
\ No newline at end of file
+        return format_history(self.get_conversation_history(conversation_id))
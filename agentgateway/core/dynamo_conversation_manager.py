@@ -1,15 +1,32 @@
+import asyncio
 import boto3
+import contextvars
 import dotenv
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, Iterable, Optional
 import uuid, os
 import json
 from agentgateway.core.conversation_manager import ConversationManager
 
 
 class DynamoConversationManager(ConversationManager):
+    """
+    Stores conversation history in DynamoDB.
 
-    def __init__(self, table_name: str, region_name: str =""):
+    storage_mode "document" keeps the whole history as one JSON attribute on a single item keyed by
+    conversation_id and rewrites it on every append.
+    storage_mode "message" stores one item per message (partition key conversation_id, sort key message_seq),
+    appends with put_item/batch_write_item and reads the history with a single paginated Query. Item 0 of
+    each conversation holds the sequence counter used to number new messages.
+    """
+    STORAGE_MODES = ("document", "message")
+    SORT_KEY = "message_seq"
+
+    def __init__(self, table_name: str, region_name: str ="", storage_mode: str = "document"):
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Invalid storage mode: {storage_mode}. Expected one of {self.STORAGE_MODES}")
         dotenv.load_dotenv()
         aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
         aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
@@ -21,18 +38,26 @@ class DynamoConversationManager(ConversationManager):
                                        region_name=region_name
                                        )
         self.table = self.dynamodb.Table(table_name)
+        self.storage_mode = storage_mode
+        # write buffer of the batch() open in the current thread or asyncio task
+        self._batch_buffer = contextvars.ContextVar(f"dynamo_conversation_batch_{id(self)}", default=None)
 
     def start_conversation(self) -> str:
         conversation_id = str(uuid.uuid4())
-        self.table.put_item(Item={
-            'conversation_id': conversation_id,
-            'history': json.dumps([])
-        })
+        if self.storage_mode == "document":
+            self.table.put_item(Item={
+                'conversation_id': conversation_id,
+                'history': json.dumps([])
+            })
+        # in message mode the counter item is created by the first append
         return conversation_id
 
     def get_conversation_history(self, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
+        elif self.storage_mode == "message":
+            self._flush_conversation(conversation_id)
+            return [json.loads(item['message']) for item in self._query_messages(conversation_id)]
         else:
             try:
                 response = self.table.get_item(Key={'conversation_id': conversation_id})
@@ -43,12 +68,23 @@ class DynamoConversationManager(ConversationManager):
     def clear_conversation_history(self, conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
+        elif self.storage_mode == "message":
+            self._pending().pop(conversation_id, None)
+            items = self._query_messages(conversation_id, include_counter=True,
+                                         projection=f"conversation_id, {self.SORT_KEY}")
+            with self.table.batch_writer() as writer:
+                for item in items:
+                    writer.delete_item(Key={'conversation_id': conversation_id,
+                                            self.SORT_KEY: item[self.SORT_KEY]})
         else:
             self.table.delete_item(Key={'conversation_id': conversation_id})
 
     def add_to_conversation_history(self, message: Dict[str, Any], conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
+        if self.storage_mode == "message":
+            self._append(conversation_id, [message])
+            return
         history = self.get_conversation_history(conversation_id)
         history.append(message)
         self.table.update_item(
@@ -60,6 +96,10 @@ class DynamoConversationManager(ConversationManager):
     def extend_conversation_history(self, messages: List, conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
+        if self.storage_mode == "message":
+            if messages:
+                self._append(conversation_id, messages)
+            return
         history = self.get_conversation_history(conversation_id)
         history.extend(messages)
         self.table.update_item(
@@ -68,9 +108,110 @@ class DynamoConversationManager(ConversationManager):
             ExpressionAttributeValues={':val': json.dumps(history)}
         )
 
-    def get_formatted_conversation_history(self, conversation_id: Optional[str] = None) -> str:
-        history = self.get_conversation_history(conversation_id)
-        formatted_history = ""
-        for message in history:
-            formatted_history += f"{message['role'].capitalize()}: {message['content']}\n"
-        return formatted_history.strip()
\ No newline at end of file
+    @contextmanager
+    def batch(self):
+        """
+        Buffer message-mode appends until the batch closes (or the conversation is read), so the messages
+        of a turn share one sequence reservation and one batch_write_item call.
+        """
+        if self._batch_buffer.get() is not None:
+            # nested batch, the outermost one flushes
+            yield self
+            return
+        token = self._batch_buffer.set({})
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._batch_buffer.reset(token)
+
+    @asynccontextmanager
+    async def abatch(self):
+        """
+        Asynchronous counterpart of batch(): the buffered appends are sent from a worker thread, off the event loop.
+        """
+        if self._batch_buffer.get() is not None:
+            yield self
+            return
+        token = self._batch_buffer.set({})
+        try:
+            yield self
+        finally:
+            try:
+                # the worker runs in a copy of this context, which holds the same buffer
+                await asyncio.to_thread(self.flush)
+            finally:
+                self._batch_buffer.reset(token)
+
+    def flush(self, conversation_ids: Optional[Iterable[str]] = None):
+        """
+        Write the appends buffered by the current batch to DynamoDB, or only those of the given conversations.
+        """
+        if conversation_ids is None:
+            conversation_ids = list(self._pending())
+        for conversation_id in conversation_ids:
+            self._flush_conversation(conversation_id)
+
+    def _pending(self) -> Dict[str, List[Dict[str, Any]]]:
+        buffer = self._batch_buffer.get()
+        return buffer if buffer is not None else {}
+
+    def _append(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        buffer = self._batch_buffer.get()
+        if buffer is not None:
+            buffer.setdefault(conversation_id, []).extend(messages)
+        else:
+            self._write_messages(conversation_id, messages)
+
+    def _flush_conversation(self, conversation_id: str):
+        messages = self._pending().pop(conversation_id, None)
+        if messages:
+            self._write_messages(conversation_id, messages)
+
+    def _reserve_sequence(self, conversation_id: str, count: int) -> int:
+        """
+        Atomically reserve `count` sequence numbers and return the first one.
+        """
+        response = self.table.update_item(
+            Key={'conversation_id': conversation_id, self.SORT_KEY: 0},
+            UpdateExpression='ADD last_seq :count',
+            ExpressionAttributeValues={':count': count},
+            ReturnValues='UPDATED_NEW'
+        )
+        return int(response['Attributes']['last_seq']) - count + 1
+
+    def _write_messages(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        first_seq = self._reserve_sequence(conversation_id, len(messages))
+        items = [{
+            'conversation_id': conversation_id,
+            self.SORT_KEY: first_seq + offset,
+            'message': json.dumps(message)
+        } for offset, message in enumerate(messages)]
+
+        if len(items) == 1:
+            self.table.put_item(Item=items[0])
+        else:
+            # batch_writer splits into 25-item batch_write_item calls and resends unprocessed items
+            with self.table.batch_writer() as writer:
+                for item in items:
+                    writer.put_item(Item=item)
+
+    def _query_messages(self, conversation_id: str, include_counter: bool = False,
+                        projection: Optional[str] = None) -> List[Dict[str, Any]]:
+        key_condition = Key('conversation_id').eq(conversation_id)
+        if not include_counter:
+            key_condition = key_condition & Key(self.SORT_KEY).gt(0)
+        query_args = {'KeyConditionExpression': key_condition, 'ConsistentRead': True}
+        if projection is not None:
+            query_args['ProjectionExpression'] = projection
+
+        items = []
+        while True:
+            response = self.table.query(**query_args)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            query_args['ExclusiveStartKey'] = last_key
@@ -0,0 +1,222 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.cache import InMemoryCache
+
+
+def estimate_tokens(message: Dict[str, Any]) -> int:
+    """
+    Rough token count of a history message, at about four characters per token of its JSON form.
+    """
+    return len(json.dumps(message, default=str)) // 4 + 1
+
+
+def is_tool_result(message: Dict[str, Any]) -> bool:
+    """
+    Whether a history message carries tool results, in the OpenAI-compatible, Anthropic or Bedrock format.
+    """
+    if message.get("role") == "tool":
+        return True
+    content = message.get("content")
+    if message.get("role") == "user" and isinstance(content, list):
+        return any(isinstance(block, dict) and (block.get("type") == "tool_result" or "toolResult" in block)
+                   for block in content)
+    return False
+
+
+def group_messages(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Split a history into the units a policy may drop. Tool result messages stay in the group of the
+    assistant message that requested them, so a tool call is never separated from its result.
+    """
+    groups = []
+    for message in messages:
+        if groups and is_tool_result(message):
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+def _is_user_turn(group: List[Dict[str, Any]]) -> bool:
+    return group[0].get("role") == "user" and not is_tool_result(group[0])
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        text = content
+    elif isinstance(content, list):
+        text = " ".join(block["text"] if isinstance(block, dict) and "text" in block
+                        else json.dumps(block, default=str) for block in content)
+    else:
+        text = ""
+    if message.get("tool_calls"):
+        text = f"{text} {json.dumps(message['tool_calls'], default=str)}".strip()
+    return f"{message.get('role', 'user')}: {text}"
+
+
+def _prepend_text(message: Dict[str, Any], text: str) -> Dict[str, Any]:
+    content = message.get("content")
+    if isinstance(content, list):
+        # Bedrock text blocks have no "type" key, Anthropic ones do
+        if content and isinstance(content[0], dict) and "text" in content[0] and "type" not in content[0]:
+            block = {"text": text}
+        else:
+            block = {"type": "text", "text": text}
+        return {**message, "content": [block] + content}
+    return {**message, "content": f"{text}\n\n{content}"}
+
+
+class HistoryPolicy(ABC):
+    """
+    Decides which part of a conversation history is sent with an LLM request.
+    The stored history is never modified; apply() returns the messages for one request.
+    """
+
+    @abstractmethod
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        pass
+
+    @staticmethod
+    def _split(messages: List[Dict[str, Any]]):
+        # leading system messages are always kept
+        start = 0
+        while start < len(messages) and messages[start].get("role") == "system":
+            start += 1
+        return messages[:start], group_messages(messages[start:])
+
+    @staticmethod
+    def _window(groups: List[List[Dict[str, Any]]], first: int) -> int:
+        """
+        Move a window start back to the user message that opened its turn, so the window starts with a user
+        message as the Anthropic and Bedrock APIs require.
+        """
+        while first > 0 and not _is_user_turn(groups[first]):
+            first -= 1
+        return first
+
+
+class FullHistoryPolicy(HistoryPolicy):
+    """
+    Sends the whole history. This is the default.
+    """
+
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return messages
+
+
+class SlidingWindowPolicy(HistoryPolicy):
+    """
+    Sends the most recent messages that fit in max_tokens.
+    The latest turn is always sent, even when it alone exceeds the budget.
+    """
+
+    def __init__(self, max_tokens: int):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+
+    def _first_kept(self, groups: List[List[Dict[str, Any]]], budget: int) -> int:
+        used = 0
+        first = len(groups)
+        while first > 0:
+            size = sum(estimate_tokens(message) for message in groups[first - 1])
+            if used + size > budget and first < len(groups):
+                break
+            used += size
+            first -= 1
+        return self._window(groups, first)
+
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        system, groups = self._split(messages)
+        budget = self.max_tokens - sum(estimate_tokens(message) for message in system)
+        first = self._first_kept(groups, budget)
+        return system + [message for group in groups[first:] for message in group]
+
+
+class LastMessagesPolicy(HistoryPolicy):
+    """
+    Sends the leading system messages plus the last max_messages messages. The window is widened to the
+    start of a tool exchange or turn when the cut would land inside one.
+    """
+
+    def __init__(self, max_messages: int):
+        if max_messages <= 0:
+            raise ValueError("max_messages must be positive")
+        self.max_messages = max_messages
+
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        system, groups = self._split(messages)
+        kept = 0
+        first = len(groups)
+        while first > 0 and kept < self.max_messages:
+            first -= 1
+            kept += len(groups[first])
+        first = self._window(groups, first)
+        return system + [message for group in groups[first:] for message in group]
+
+
+class SummarizingPolicy(SlidingWindowPolicy):
+    """
+    Sends the most recent messages that fit in max_tokens and replaces the older ones with a summary,
+    prepended to the first message sent.
+
+    summarizer is a Tool that takes a "text" parameter, normally an authenticated TextSummarizationTool.
+    Summaries are cached by the exact messages they cover. When more messages fall out of the window, the
+    cached summary of the longest already summarized prefix is extended instead of summarizing from scratch.
+    """
+
+    SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+    def __init__(self, max_tokens: int, summarizer: Tool, summary_tokens: int = 300, max_summaries: int = 1000):
+        super().__init__(max_tokens)
+        if not isinstance(summarizer, Tool):
+            raise TypeError(f"summarizer must be a Tool. Got {type(summarizer).__name__}")
+        self.summarizer = summarizer
+        self.summary_tokens = summary_tokens
+        self.summaries = InMemoryCache(max_entries=max_summaries)
+
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        system, groups = self._split(messages)
+        budget = self.max_tokens - self.summary_tokens - sum(estimate_tokens(message) for message in system)
+        first = self._first_kept(groups, budget)
+        if first == 0:
+            return messages
+
+        dropped = [message for group in groups[:first] for message in group]
+        kept = [message for group in groups[first:] for message in group]
+        summary = self._summarize(dropped)
+        return system + [_prepend_text(kept[0], f"{self.SUMMARY_PREFIX} {summary}")] + kept[1:]
+
+    def _summarize(self, dropped: List[Dict[str, Any]]) -> str:
+        # running digests give the cache key of every prefix of the dropped messages in one pass
+        digest = hashlib.sha256()
+        prefix_keys = []
+        for message in dropped:
+            digest.update(json.dumps(message, sort_keys=True, default=str).encode("utf-8"))
+            prefix_keys.append(digest.hexdigest())
+
+        summary: Optional[str] = self.summaries.get(prefix_keys[-1])
+        if summary is not None:
+            return summary
+
+        covered, previous = 0, None
+        for index in range(len(prefix_keys) - 2, -1, -1):
+            previous = self.summaries.get(prefix_keys[index])
+            if previous is not None:
+                covered = index + 1
+                break
+
+        text = "\n".join(_message_text(message) for message in dropped[covered:])
+        if previous is not None:
+            text = f"{self.SUMMARY_PREFIX} {previous}\n{text}"
+
+        tool = self.summarizer.create_invocation()
+        tool.set_parameters({"text": text})
+        summary = str(tool.execute())
+        self.summaries.set(prefix_keys[-1], summary)
+        return summary
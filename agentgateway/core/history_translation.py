@@ -0,0 +1,54 @@
+"""
+Conversion of conversation history between the message formats of the providers.
+
+"chat_completions" is the OpenAI-style format, which is also the canonical format the adapters store (see
+agentgateway.core.message): tool calls in an assistant message's tool_calls and each tool result in its own
+"tool" message. "anthropic" keeps tool_use and tool_result content blocks, and "bedrock" the Converse toolUse
+and toolResult blocks. Conversions go through the canonical Message model.
+"""
+from typing import Any, Dict, List
+
+from agentgateway.core.message import (ANTHROPIC, BEDROCK, CHAT_COMPLETIONS, MESSAGE_FORMATS, Message,
+                                       merge_provider_messages)
+
+HISTORY_FORMATS = MESSAGE_FORMATS
+
+
+def _check_format(history_format: str):
+    if history_format not in HISTORY_FORMATS:
+        raise ValueError(f"Unsupported history format: {history_format}")
+
+
+def to_chat_completions(messages: List[Dict[str, Any]], source: str) -> List[Dict[str, Any]]:
+    """
+    Convert history in the source format to chat_completions messages.
+    """
+    _check_format(source)
+    if source == CHAT_COMPLETIONS:
+        return list(messages)
+    return [message.to_dict() for data in messages for message in Message.from_provider(data, source)]
+
+
+def from_chat_completions(messages: List[Dict[str, Any]], target: str) -> List[Dict[str, Any]]:
+    """
+    Convert chat_completions messages to the target format.
+
+    Tool messages become tool result blocks of a user message, and consecutive messages of the same role are
+    merged, as Anthropic and Bedrock require user and assistant turns to alternate.
+    """
+    _check_format(target)
+    if target == CHAT_COMPLETIONS:
+        return list(messages)
+    return merge_provider_messages([Message.from_dict(data) for data in messages], target)
+
+
+def translate_history(messages: List[Dict[str, Any]], source: str, target: str) -> List[Dict[str, Any]]:
+    """
+    Convert history stored in one format for an adapter of another.
+    Tool call ids are kept, so tool results still match their calls.
+    """
+    _check_format(source)
+    _check_format(target)
+    if source == target:
+        return list(messages)
+    return from_chat_completions(to_chat_completions(messages, source), target)
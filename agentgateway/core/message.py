@@ -1,13 +1,322 @@
-from typing import Literal
+"""
+The provider-neutral message model of the conversation history.
+
+Adapters store history as canonical message dicts, the OpenAI chat completions shape: {"role", "content"},
+plus "tool_calls" on assistant messages requesting tools and one {"role": "tool", "tool_call_id", "content"}
+message per tool result. Adapters of other providers convert the history to their wire format when they build
+a request, with to_provider_messages(). Conversions are cached by message content, so a message is converted
+once however many requests send it; stored messages must therefore not be modified in place.
+
+Histories written in the Anthropic or Bedrock format by earlier versions are recognised and converted too.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from agentgateway.core.cache import make_cache_key
+
+CHAT_COMPLETIONS = "chat_completions"
+ANTHROPIC = "anthropic"
+BEDROCK = "bedrock"
+
+MESSAGE_FORMATS = (CHAT_COMPLETIONS, ANTHROPIC, BEDROCK)
+
+
+def _as_text(content: Any) -> str:
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def _tool_result_text(content: Any) -> str:
+    # tool results may hold text or JSON blocks (Bedrock) or a list of text blocks (Anthropic)
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, dict) and "text" in block:
+                parts.append(block["text"])
+            elif isinstance(block, dict) and "json" in block:
+                parts.append(json.dumps(block["json"], default=str))
+            else:
+                parts.append(_as_text(block))
+        return "".join(parts)
+    return _as_text(content)
+
+
+class ToolCall:
+    """
+    A tool requested by the model. arguments is kept as received, a JSON string or a dict.
+    """
+    __slots__ = ("id", "name", "arguments")
+
+    def __init__(self, id: str, name: str, arguments: Union[str, Dict[str, Any]]):
+        self.id = id
+        self.name = name
+        self.arguments = arguments
+
+    @property
+    def input(self) -> Dict[str, Any]:
+        if isinstance(self.arguments, str):
+            return json.loads(self.arguments or "{}")
+        return self.arguments
+
+    def to_dict(self) -> Dict[str, Any]:
+        arguments = self.arguments if isinstance(self.arguments, str) else json.dumps(self.arguments)
+        return {"id": self.id, "type": "function", "function": {"name": self.name, "arguments": arguments}}
+
+    def __eq__(self, other):
+        return isinstance(other, ToolCall) and (self.id, self.name, self.input) == (other.id, other.name, other.input)
+
+    def __repr__(self):
+        return f"ToolCall(id={self.id!r}, name={self.name!r})"
+
 
 class Message:
-    def __init__(self, role: Literal["user", "assistant", "system"], content: str):
+    """
+    One message of a conversation: text from the user, the assistant or the system, an assistant request for
+    tool_calls, or the result of the tool call tool_call_id.
+    """
+    __slots__ = ("role", "content", "tool_calls", "tool_call_id", "_wire")
+
+    def __init__(self, role: Literal["user", "assistant", "system", "tool"], content: Optional[str] = None,
+                 tool_calls: Optional[List[ToolCall]] = None, tool_call_id: Optional[str] = None):
         self.role = role
         self.content = content
+        self.tool_calls = tool_calls or []
+        self.tool_call_id = tool_call_id
+        self._wire: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Message':
+        """
+        Build a message from a canonical message dict.
+        """
+        tool_calls = [ToolCall(call["id"], call["function"]["name"], call["function"].get("arguments") or "{}")
+                      for call in data.get("tool_calls") or []]
+        return cls(data["role"], data.get("content"), tool_calls, data.get("tool_call_id"))
+
+    @classmethod
+    def from_provider(cls, data: Dict[str, Any], message_format: str) -> List['Message']:
+        """
+        Build the canonical messages of a message in a provider's format. An Anthropic or Bedrock user message
+        carrying several tool results becomes one tool message per result.
+        """
+        if message_format == CHAT_COMPLETIONS:
+            return [cls.from_dict(data)]
+        if message_format not in MESSAGE_FORMATS:
+            raise ValueError(f"Unsupported message format: {message_format}")
+        content = data.get("content")
+        if not isinstance(content, list):
+            return [cls(data["role"], content)]
+
+        texts, tool_calls, tool_results = [], [], []
+        for block in content:
+            if message_format == ANTHROPIC:
+                kind = block.get("type")
+                if kind == "text":
+                    texts.append(block["text"])
+                elif kind == "tool_use":
+                    tool_calls.append(ToolCall(block["id"], block["name"], block.get("input", {})))
+                elif kind == "tool_result":
+                    tool_results.append(cls("tool", _tool_result_text(block.get("content", "")),
+                                            tool_call_id=block["tool_use_id"]))
+            elif "text" in block:
+                texts.append(block["text"])
+            elif "toolUse" in block:
+                tool_use = block["toolUse"]
+                tool_calls.append(ToolCall(tool_use["toolUseId"], tool_use["name"], tool_use.get("input", {})))
+            elif "toolResult" in block:
+                tool_result = block["toolResult"]
+                tool_results.append(cls("tool", _tool_result_text(tool_result.get("content", "")),
+                                        tool_call_id=tool_result["toolUseId"]))
+            # cachePoint and other annotation blocks have no canonical counterpart
+
+        if texts or tool_calls or not tool_results:
+            text = "".join(texts) if texts or not tool_calls else None
+            tool_results.append(cls(data["role"], text, tool_calls))
+        return tool_results
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The canonical message dict, as stored in the conversation history.
+        """
+        if self.role == "tool":
+            return {"role": "tool", "tool_call_id": self.tool_call_id, "content": self.content}
+        message = {"role": self.role, "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [tool_call.to_dict() for tool_call in self.tool_calls]
+        return message
+
+    def to_provider(self, message_format: str) -> Optional[Dict[str, Any]]:
+        """
+        The message in a provider's wire format, or None when the provider has no place for it. The result is
+        cached and shared by every request sending this message, so it must not be modified.
+        """
+        if message_format not in self._wire:
+            self._wire[message_format] = self._convert(message_format)
+        return self._wire[message_format]
+
+    def _convert(self, message_format: str) -> Optional[Dict[str, Any]]:
+        if message_format == CHAT_COMPLETIONS:
+            return self.to_dict()
+        if message_format not in MESSAGE_FORMATS:
+            raise ValueError(f"Unsupported message format: {message_format}")
+        if self.role == "system":
+            # the adapters send the instructions separately
+            return None
+        if self.role == "tool":
+            if message_format == ANTHROPIC:
+                block = {"type": "tool_result", "tool_use_id": self.tool_call_id, "content": _as_text(self.content)}
+            else:
+                block = {"toolResult": {"toolUseId": self.tool_call_id, "content": [{"text": _as_text(self.content)}],
+                                        "status": "success"}}
+            return {"role": "user", "content": [block]}
+
+        text = self.text_content()
+        if message_format == ANTHROPIC and not self.tool_calls:
+            # Anthropic accepts plain string content, as its adapter sends user input
+            return {"role": self.role, "content": text} if text else None
+        blocks = []
+        if text:
+            blocks.append({"type": "text", "text": text} if message_format == ANTHROPIC else {"text": text})
+        for tool_call in self.tool_calls:
+            if message_format == ANTHROPIC:
+                blocks.append({"type": "tool_use", "id": tool_call.id, "name": tool_call.name, "input": tool_call.input})
+            else:
+                blocks.append({"toolUse": {"toolUseId": tool_call.id, "name": tool_call.name, "input": tool_call.input}})
+        return {"role": self.role, "content": blocks} if blocks else None
+
+    def text_content(self) -> str:
+        """
+        The text of the message; multi-part content is reduced to its text parts.
+        """
+        if isinstance(self.content, list):
+            return "".join(part.get("text", "") for part in self.content if isinstance(part, dict))
+        return "" if self.content is None else _as_text(self.content)
+
+    def format(self) -> str:
+        """
+        A one-line rendering, as in "Assistant: calls weather({"city": "Paris"})".
+        """
+        text = self.text_content()
+        if self.tool_calls:
+            calls = ", ".join(f"calls {call.name}({_as_text(call.input)})" for call in self.tool_calls)
+            text = f"{text} {calls}".strip()
+        return f"{self.role.capitalize()}: {text}"
+
+    def __eq__(self, other):
+        return isinstance(other, Message) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Message(role={self.role!r}, content={self.content!r}, tool_calls={self.tool_calls!r})"
+
+
+def detect_format(data: Dict[str, Any]) -> str:
+    """
+    The format of a stored message dict: anthropic and bedrock messages carry lists of content blocks.
+    """
+    content = data.get("content")
+    if data.get("role") in ("user", "assistant") and isinstance(content, list) and content \
+            and isinstance(content[0], dict):
+        if "type" in content[0]:
+            # multi-part chat content uses typed text parts too, and reads the same as Anthropic text blocks
+            return ANTHROPIC
+        if any(key in content[0] for key in ("text", "toolUse", "toolResult", "cachePoint")):
+            return BEDROCK
+    return CHAT_COMPLETIONS
+
+
+class _ParsedMessages:
+    """
+    Canonical messages parsed from stored dicts, by a digest of the dict's content, so histories read from Redis
+    or DynamoDB, which are new dicts on every read, reuse the messages parsed before. The least recently used
+    entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, List[Message]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data: Dict[str, Any]) -> List[Message]:
+        key = make_cache_key(data)
+        with self._lock:
+            messages = self._entries.get(key)
+            if messages is not None:
+                self._entries.move_to_end(key)
+                return messages
+        messages = Message.from_provider(data, detect_format(data))
+        with self._lock:
+            self._entries[key] = messages
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return messages
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_parsed_messages = _ParsedMessages()
+
+
+def to_canonical(data: Dict[str, Any], message_format: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Convert a message in a provider's format to canonical message dicts for storing.
+    :param message_format: The format of data; detected when omitted.
+    """
+    message_format = message_format or detect_format(data)
+    if message_format == CHAT_COMPLETIONS:
+        return [data]
+    return [message.to_dict() for message in Message.from_provider(data, message_format)]
+
+
+def to_messages(history: List[Dict[str, Any]]) -> List[Message]:
+    """
+    The canonical messages of a stored history, parsed once per distinct message.
+    """
+    return [message for data in history for message in _parsed_messages.get(data)]
+
+
+def to_provider_messages(history: List[Dict[str, Any]], message_format: str) -> List[Dict[str, Any]]:
+    """
+    Convert a stored history to a provider's wire format for a request.
+
+    For Anthropic and Bedrock, tool results become tool result blocks of a user message, and consecutive
+    messages of the same role are merged, as both require user and assistant turns to alternate. Messages
+    already in the requested format are passed through.
+    """
+    if message_format == CHAT_COMPLETIONS and all(detect_format(data) == CHAT_COMPLETIONS for data in history):
+        return list(history)
+    return merge_provider_messages(to_messages(history), message_format)
+
+
+def merge_provider_messages(messages: List[Message], message_format: str) -> List[Dict[str, Any]]:
+    """
+    Convert messages to a provider's wire format, merging consecutive messages of the same role where the
+    provider requires user and assistant turns to alternate.
+    """
+    converted = []
+    for message in messages:
+        wire = message.to_provider(message_format)
+        if wire is None:
+            continue
+        if message_format != CHAT_COMPLETIONS and converted and converted[-1]["role"] == wire["role"]:
+            previous = converted[-1]
+            converted[-1] = {"role": previous["role"], "content": _as_blocks(previous["content"], message_format) +
+                             _as_blocks(wire["content"], message_format)}
+        else:
+            converted.append(wire)
+    return converted
+
+
+def _as_blocks(content: Any, message_format: str) -> List[Dict[str, Any]]:
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}] if message_format == ANTHROPIC else [{"text": content}]
+    return list(content)
 
-    def to_dict(self):
-        return {
-            "role": self.role,
-            "content": self.content
-        }
 
+def format_history(history: List[Dict[str, Any]]) -> str:
+    """
+    Render a stored history as "Role: text" lines, whatever the format of its messages.
+    """
+    return "\n".join(message.format() for message in to_messages(history))
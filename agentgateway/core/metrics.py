@@ -0,0 +1,328 @@
+"""
+Process-wide metrics of the gateway in the Prometheus text format.
+
+AgentGateway and the adapters update the metrics below as runs, LLM calls and tool calls complete, so latency and
+token usage can be followed across all conversations of the process instead of one Response at a time.
+render() returns the metrics in the Prometheus text exposition format, and start_http_server() serves them on
+/metrics for a Prometheus scraper; with metrics.port set in config.yaml, AgentGateway starts the server itself.
+
+  agentgateway_llm_latency_seconds{provider,model}       histogram of successful LLM calls
+  agentgateway_llm_tokens_total{provider,model,type}     input, output, cache_read and cache_write tokens
+  agentgateway_llm_errors_total{provider,model,error}    failed LLM call attempts by exception type
+  agentgateway_cache_hits_total{cache}                   hits of the LLM response cache and the tool result cache
+  agentgateway_tool_latency_seconds{tool}                histogram of tool executions
+  agentgateway_runs_total{provider,model,response_type}  finished gateway runs by final ResponseType, "cancelled" or "exception"
+  agentgateway_run_turns{provider,model}                 histogram of LLM turns (tool loop iterations) per run
+"""
+import bisect
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from agentgateway.utils.config_manager import ConfigManager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TURN_BUCKETS = (1, 2, 3, 4, 5, 8, 13, 21)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(value)
+
+
+class Metric:
+    """
+    A named metric with one series per combination of label values. Label values are passed positionally, in
+    the order of labelnames.
+    """
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, label_values: Tuple[str, ...], extra: str = "") -> str:
+        if len(label_values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes the labels {self.labelnames}, got {label_values}")
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, label_values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing total.
+    """
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{self._labels(labels)} {_format_value(value)}" for labels, value in values]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """
+    Counts of observations in cumulative buckets, with their sum and count.
+    """
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per series: observations per bucket, the last one above every bound, then their sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def get(self, *label_values: str) -> Tuple[int, float]:
+        """
+        The count and sum of the observations of a series.
+        """
+        with self._lock:
+            series = self._series.get(label_values)
+            return (sum(series[0]), series[1][0]) if series is not None else (0, 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        lines = []
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._labels(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    The metrics of a process, rendered together. Asking for a metric that is already registered returns it.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """
+        Reset every series, keeping the metrics registered.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_LATENCY = REGISTRY.histogram("agentgateway_llm_latency_seconds", "Latency of successful LLM calls",
+                                 ("provider", "model"))
+LLM_TOKENS = REGISTRY.counter("agentgateway_llm_tokens_total", "Tokens of LLM calls by type",
+                              ("provider", "model", "type"))
+LLM_ERRORS = REGISTRY.counter("agentgateway_llm_errors_total", "Failed LLM call attempts by exception type",
+                              ("provider", "model", "error"))
+CACHE_HITS = REGISTRY.counter("agentgateway_cache_hits_total", "Cache hits by cache", ("cache",))
+TOOL_LATENCY = REGISTRY.histogram("agentgateway_tool_latency_seconds", "Latency of tool executions", ("tool",))
+RUNS = REGISTRY.counter("agentgateway_runs_total", "Finished gateway runs by final response type",
+                        ("provider", "model", "response_type"))
+RUN_TURNS = REGISTRY.histogram("agentgateway_run_turns", "LLM turns per gateway run", ("provider", "model"),
+                               buckets=TURN_BUCKETS)
+
+_enabled: Optional[bool] = None
+
+
+def is_enabled() -> bool:
+    """
+    Whether the gateway records metrics, per the metrics section of config.yaml; read once.
+    """
+    global _enabled
+    if _enabled is None:
+        _enabled = bool(ConfigManager().get_nested('metrics', 'enabled', default=True))
+    return _enabled
+
+
+def set_enabled(enabled: Optional[bool]):
+    """
+    Turn recording on or off, or with None go back to the configured setting.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def observe_llm_call(provider: str, model: str, latency: float, input_tokens: int, output_tokens: int,
+                     cache_read_tokens: int = 0, cache_write_tokens: int = 0):
+    if not is_enabled():
+        return
+    LLM_LATENCY.observe(latency, provider, model)
+    for token_type, tokens in (("input", input_tokens), ("output", output_tokens),
+                               ("cache_read", cache_read_tokens), ("cache_write", cache_write_tokens)):
+        # providers report missing usage as None
+        if isinstance(tokens, int) and tokens > 0:
+            LLM_TOKENS.inc(provider, model, token_type, amount=tokens)
+
+
+def count_llm_error(provider: str, model: str, error: str):
+    if is_enabled():
+        LLM_ERRORS.inc(provider, model, error)
+
+
+def count_cache_hit(cache: str):
+    if is_enabled():
+        CACHE_HITS.inc(cache)
+
+
+def observe_tool_call(tool: str, latency: float):
+    if is_enabled():
+        TOOL_LATENCY.observe(latency, tool)
+
+
+def observe_run(provider: str, model: str, response_type: str, turns: int):
+    if not is_enabled():
+        return
+    RUNS.inc(provider, model, response_type)
+    RUN_TURNS.observe(turns, provider, model)
+
+
+def render(registry: MetricsRegistry = REGISTRY) -> str:
+    """
+    The metrics in the Prometheus text exposition format.
+    """
+    return registry.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servers: Dict[Tuple[str, int], ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def start_http_server(port: int, addr: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve the metrics on http://addr:port/metrics from a daemon thread. Starting a server on an address that
+    already serves returns the running server. Port 0 starts a server on a free port, see server.server_port.
+    """
+    with _servers_lock:
+        server = _servers.get((addr, port))
+        if server is None:
+            handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+            server = ThreadingHTTPServer((addr, port), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="agentgateway-metrics", daemon=True).start()
+            _servers[(addr, server.server_port)] = server
+        return server
+
+
+def start_configured_http_server() -> Optional[ThreadingHTTPServer]:
+    """
+    Start the server set up in the metrics section of config.yaml, if it sets a port.
+    """
+    config_manager = ConfigManager()
+    port = config_manager.get_nested('metrics', 'port', default=None)
+    if not port or not is_enabled():
+        return None
+    return start_http_server(int(port), config_manager.get_nested('metrics', 'addr', default='127.0.0.1'))
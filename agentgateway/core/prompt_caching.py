@@ -0,0 +1,68 @@
+"""
+Helpers marking the stable part of a request for provider-side prompt caching.
+
+Providers cache the request prefix that ends at each marked block: tools, then the system prompt, then the
+messages. The last two user messages of the history are marked, so every request of a tool loop reads the
+prefix written by the previous one and writes the prefix the next one will read. The stored history is
+never modified; marked messages are copies.
+"""
+from typing import Any, Dict, List
+
+ANTHROPIC_CACHE_CONTROL = {"type": "ephemeral"}
+BEDROCK_CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+# Anthropic accepts at most four breakpoints: tools, system prompt and these history messages
+HISTORY_BREAKPOINTS = 2
+
+
+def history_breakpoints(messages: List[Dict[str, Any]], count: int = HISTORY_BREAKPOINTS) -> List[int]:
+    """
+    Indices of the last count user messages, including tool result messages, in ascending order.
+    """
+    indices = []
+    for index in range(len(messages) - 1, -1, -1):
+        if len(indices) == count:
+            break
+        if messages[index].get("role") == "user":
+            indices.append(index)
+    return indices[::-1]
+
+
+def add_anthropic_cache_control(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the messages with a cache_control breakpoint on the last content block of each history breakpoint.
+    """
+    indices = history_breakpoints(messages)
+    if not indices:
+        return messages
+    marked = list(messages)
+    for index in indices:
+        message = messages[index]
+        content = message.get("content")
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content, "cache_control": ANTHROPIC_CACHE_CONTROL}]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            blocks = content[:-1] + [{**content[-1], "cache_control": ANTHROPIC_CACHE_CONTROL}]
+        else:
+            continue
+        marked[index] = {**message, "content": blocks}
+    return marked
+
+
+def add_bedrock_cache_points(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the messages with a Converse cachePoint block appended to each history breakpoint.
+    """
+    indices = history_breakpoints(messages)
+    if not indices:
+        return messages
+    marked = list(messages)
+    for index in indices:
+        message = messages[index]
+        content = message.get("content")
+        if isinstance(content, str):
+            content = [{"text": content}]
+        elif not isinstance(content, list) or not content:
+            continue
+        marked[index] = {**message, "content": content + [BEDROCK_CACHE_POINT]}
+    return marked
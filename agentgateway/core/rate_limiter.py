@@ -0,0 +1,277 @@
+"""
+Client-side limits on provider calls.
+
+A RateLimiter combines token buckets for requests and tokens per minute with an optional AIMD concurrency
+limit. Limiters configured in the rate_limits section of config.yaml are shared by every adapter of the same
+provider and model in the process, so a burst of conversations waits on the client instead of being
+answered with 429s.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from agentgateway.utils.config_manager import ConfigManager
+
+_THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "Throttling", "RequestLimitExceeded"}
+
+
+def is_throttling_error(error: Optional[BaseException]) -> bool:
+    """
+    Whether a provider error means the client is sending too much: an HTTP 429 from the openai, anthropic and
+    groq SDKs, or a throttling error code from botocore.
+    """
+    if error is None:
+        return False
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return code in _THROTTLING_CODES or status == 429
+    return False
+
+
+class AdaptiveConcurrency:
+    """
+    Limit on concurrent calls adjusted by AIMD: every call succeeding in time raises the limit by
+    increase / limit, so about one per round of calls, and a throttled call, or one slower than latency_target,
+    multiplies it by decrease. Calls failing for other reasons leave the limit as it is.
+
+    Calls that started before the last decrease do not decrease the limit again, so one burst of 429s from
+    a round of concurrent calls counts as a single congestion signal.
+    """
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 64, increase: float = 1.0,
+                 decrease: float = 0.5, latency_target: Optional[float] = None):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._started = 0
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    def _start(self) -> int:
+        self.in_flight += 1
+        self._started += 1
+        return self._started
+
+    def try_acquire(self) -> Optional[int]:
+        """
+        Take a slot if one is free.
+        :return: A ticket for release(), or None when the limit is reached.
+        """
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return None
+            return self._start()
+
+    def acquire(self) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            return self._start()
+
+    async def aacquire(self, poll_interval: float = 0.01) -> int:
+        # a threading.Condition cannot be awaited, so the event loop polls for a free slot
+        while True:
+            ticket = self.try_acquire()
+            if ticket is not None:
+                return ticket
+            await asyncio.sleep(poll_interval)
+
+    def release(self, ticket: int, throttled: bool = False, latency: Optional[float] = None, succeeded: bool = True):
+        with self._condition:
+            self.in_flight -= 1
+            slow = self.latency_target is not None and latency is not None and latency > self.latency_target
+            if throttled or slow:
+                if ticket > self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                    self._last_decrease = self._started
+            elif succeeded:
+                self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+            self._condition.notify_all()
+
+
+class _Bucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, per_minute: float, capacity: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class RatePermit:
+    """
+    A granted call, returned by RateLimiter.acquire() and handed back to RateLimiter.release().
+    """
+    __slots__ = ("tokens", "ticket")
+
+    def __init__(self, tokens: int, ticket: Optional[int]):
+        self.tokens = tokens
+        self.ticket = ticket
+
+
+class RateLimiter:
+    """
+    Token buckets allowing requests_per_minute calls and tokens_per_minute tokens per minute, and optionally an
+    AdaptiveConcurrency limit on calls in flight.
+
+    The request bucket allows bursts of up to burst calls, one second of requests by default; the token bucket
+    holds one second of tokens. A call that finds a bucket empty reserves the next free slot and sleeps until it
+    is due, so waiting callers are served in arrival order. Token counts passed to acquire() are estimates and
+    are corrected with the actual usage on release(). Safe to share between threads.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, burst: Optional[int] = None,
+                 tokens_per_minute: Optional[float] = None, concurrency: Optional[AdaptiveConcurrency] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if requests_per_minute is None and tokens_per_minute is None and concurrency is None:
+            raise ValueError("A RateLimiter needs requests_per_minute, tokens_per_minute or concurrency")
+        if (requests_per_minute is not None and requests_per_minute <= 0) or \
+                (tokens_per_minute is not None and tokens_per_minute <= 0):
+            raise ValueError("requests_per_minute and tokens_per_minute must be positive")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.concurrency = concurrency
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._requests = None
+        if requests_per_minute is not None:
+            capacity = burst if burst is not None else max(1, int(requests_per_minute / 60.0))
+            self._requests = _Bucket(requests_per_minute, float(capacity), now)
+        self._tokens = _Bucket(tokens_per_minute, tokens_per_minute / 60.0, now) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Take one request and the given tokens and return the seconds to wait before they may be used.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = self._requests.reserve(1, now) if self._requests is not None else 0.0
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            return wait
+
+    def acquire(self, tokens: int = 0) -> RatePermit:
+        """
+        Wait until a call may be made.
+        :param tokens: Estimated tokens of the call, counted against tokens_per_minute.
+        """
+        ticket = self.concurrency.acquire() if self.concurrency is not None else None
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                self._sleep(wait)
+        except BaseException:
+            self._release_ticket(ticket)
+            raise
+        return RatePermit(tokens, ticket)
+
+    async def aacquire(self, tokens: int = 0) -> RatePermit:
+        ticket = await self.concurrency.aacquire() if self.concurrency is not None else None
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            # e.g. asyncio.CancelledError from a timeout while waiting for the bucket
+            self._release_ticket(ticket)
+            raise
+        return RatePermit(tokens, ticket)
+
+    def _release_ticket(self, ticket: Optional[int]):
+        # hands back the slot of a call that was never made, without counting it for or against the limit
+        if ticket is not None:
+            self.concurrency.release(ticket, succeeded=False)
+
+    def release(self, permit: RatePermit, tokens_used: Optional[int] = None, latency: Optional[float] = None,
+                error: Optional[BaseException] = None):
+        """
+        Report the outcome of a call made with a permit from acquire().
+
+        :param tokens_used: Actual tokens of the call; the difference to the estimate is returned to or taken from
+                            the token bucket.
+        :param latency: Seconds the call took, compared with the concurrency latency target.
+        :param error: The exception the call raised, if any. Throttling errors reduce the concurrency limit and
+                      other errors leave it unchanged.
+        """
+        if self._tokens is not None and tokens_used is not None:
+            with self._lock:
+                self._tokens.tokens = min(self._tokens.capacity, self._tokens.tokens + permit.tokens - tokens_used)
+        if self.concurrency is not None and permit.ticket is not None:
+            self.concurrency.release(permit.ticket, throttled=is_throttling_error(error),
+                                     latency=latency if error is None else None, succeeded=error is None)
+
+
+_shared_limiters: Dict[Tuple[Hashable, ...], RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def _get_or_create(key: Tuple[Hashable, ...], create: Callable[[], Optional[RateLimiter]]) -> Optional[RateLimiter]:
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = create()
+        return _shared_limiters[key]
+
+
+def get_rate_limiter(key: Hashable, requests_per_minute: float) -> RateLimiter:
+    """
+    Return the process-wide limiter for a provider, so every gateway calling it draws from one bucket.
+
+    :param key: Identifies the provider, e.g. the AgentType value.
+    :param requests_per_minute: The provider's request limit.
+    """
+    return _get_or_create((key, requests_per_minute), lambda: RateLimiter(requests_per_minute))
+
+
+def get_provider_rate_limiter(provider: str, model_id: str) -> Optional[RateLimiter]:
+    """
+    Return the process-wide limiter configured for a provider and model in the rate_limits section of
+    config.yaml, or None when neither limits nor adaptive concurrency are configured.
+
+    Limits are looked up under rate_limits.providers.<provider>.<model_id>, falling back to the provider's
+    default entry; each model gets its own limiter.
+    """
+    def create() -> Optional[RateLimiter]:
+        config = ConfigManager().get('rate_limits') or {}
+        models: Dict[str, Any] = (config.get('providers') or {}).get(provider) or {}
+        limits = models.get(model_id) or models.get('default') or {}
+        concurrency = None
+        if config.get('adaptive_concurrency', False):
+            concurrency = AdaptiveConcurrency(initial=config.get('initial_concurrency', 8),
+                                              min_limit=config.get('min_concurrency', 1),
+                                              max_limit=config.get('max_concurrency', 64),
+                                              latency_target=config.get('latency_target'))
+        if not limits.get('requests_per_minute') and not limits.get('tokens_per_minute') and concurrency is None:
+            return None
+        return RateLimiter(requests_per_minute=limits.get('requests_per_minute'),
+                           tokens_per_minute=limits.get('tokens_per_minute'), concurrency=concurrency)
+
+    return _get_or_create(("provider", provider, model_id), create)
+
+
+def clear_rate_limiters():
+    """
+    Forget every shared limiter, e.g. after changing rate_limits or in tests.
+    """
+    with _shared_limiters_lock:
+        _shared_limiters.clear()
@@ -1,47 +1,201 @@
 import redis
 import json
-from typing import List, Dict, Any, Optional
+import asyncio
+import contextvars
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, Iterable, Optional
 import uuid
+from redis.exceptions import ResponseError
 from agentgateway.core.conversation_manager import ConversationManager
 
 
 class RedisConversationManager(ConversationManager):
-    def __init__(self, redis_url: str):
+    """
+    Stores conversation history in Redis under ``conversation:{id}``.
+
+    storage_mode "string" keeps the whole history as one JSON string that is rewritten on every append.
+    storage_mode "list" keeps one JSON-encoded message per list element, appends with RPUSH and reads with
+    LRANGE, so an append costs O(message) and concurrent writers cannot overwrite each other.
+    """
+    STORAGE_MODES = ("string", "list")
+
+    def __init__(self, redis_url: str, storage_mode: str = "string"):
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Invalid storage mode: {storage_mode}. Expected one of {self.STORAGE_MODES}")
         self.redis = redis.from_url(redis_url)
+        self.storage_mode = storage_mode
+        # write buffer of the batch() open in the current thread or asyncio task
+        self._batch_buffer = contextvars.ContextVar(f"redis_conversation_batch_{id(self)}", default=None)
+
+    def _key(self, conversation_id: str) -> str:
+        return f"conversation:{conversation_id}"
 
     def start_conversation(self) -> str:
         conversation_id = str(uuid.uuid4())
-        self.redis.set(f"conversation:{conversation_id}", json.dumps([]))
+        if self.storage_mode == "string":
+            self.redis.set(self._key(conversation_id), json.dumps([]))
+        # an empty list does not exist in Redis, the first RPUSH creates it
         return conversation_id
 
     def get_conversation_history(self, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
-        return json.loads(self.redis.get(f"conversation:{conversation_id}") or "[]")
+        if self.storage_mode == "string":
+            return json.loads(self.redis.get(self._key(conversation_id)) or "[]")
+
+        # send any buffered appends in the same round trip as the read
+        messages = self._pending().pop(conversation_id, None)
+        try:
+            items = self._push_and_read(conversation_id, messages)
+        except ResponseError:
+            # WRONGTYPE: the conversation was written in string mode, convert it in place and retry
+            self.migrate_conversation(conversation_id)
+            items = self._push_and_read(conversation_id, messages)
+        return [json.loads(item) for item in items]
 
     def clear_conversation_history(self, conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
         else:
-            self.redis.delete(f"conversation:{conversation_id}")
+            self._pending().pop(conversation_id, None)
+            self.redis.delete(self._key(conversation_id))
 
     def add_to_conversation_history(self, message: Dict[str, Any], conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
-        history = self.get_conversation_history(conversation_id)
-        history.append(message)
-        self.redis.set(f"conversation:{conversation_id}", json.dumps(history))
+        if self.storage_mode == "string":
+            history = self.get_conversation_history(conversation_id)
+            history.append(message)
+            self.redis.set(self._key(conversation_id), json.dumps(history))
+        else:
+            self._append(conversation_id, [message])
 
     def extend_conversation_history(self, messages: List, conversation_id: Optional[str] = None):
         if conversation_id is None:
             raise ValueError("Conversation ID cannot be None")
-        history = self.get_conversation_history(conversation_id)
-        history.extend(messages)
-        self.redis.set(f"conversation:{conversation_id}", json.dumps(history))
-
-    def get_formatted_conversation_history(self, conversation_id: Optional[str] = None) -> str:
-        history = self.get_conversation_history(conversation_id)
-        formatted_history = ""
-        for message in history:
-            formatted_history += f"{message['role'].capitalize()}: {message['content']}\n"
-        return formatted_history.strip()
\ No newline at end of file
+        if self.storage_mode == "string":
+            history = self.get_conversation_history(conversation_id)
+            history.extend(messages)
+            self.redis.set(self._key(conversation_id), json.dumps(history))
+        elif messages:
+            self._append(conversation_id, messages)
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer list-mode appends until the batch closes (or the conversation is read) and send them in one
+        pipeline, so the user, assistant and tool messages of a turn cost a single round trip.
+        """
+        if self._batch_buffer.get() is not None:
+            # nested batch, the outermost one flushes
+            yield self
+            return
+        token = self._batch_buffer.set({})
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._batch_buffer.reset(token)
+
+    @asynccontextmanager
+    async def abatch(self):
+        """
+        Asynchronous counterpart of batch(): the buffered appends are sent from a worker thread, off the event loop.
+        """
+        if self._batch_buffer.get() is not None:
+            yield self
+            return
+        token = self._batch_buffer.set({})
+        try:
+            yield self
+        finally:
+            try:
+                # the worker runs in a copy of this context, which holds the same buffer
+                await asyncio.to_thread(self.flush)
+            finally:
+                self._batch_buffer.reset(token)
+
+    def flush(self, conversation_ids: Optional[Iterable[str]] = None):
+        """
+        Write the appends buffered by the current batch to Redis, or only those of the given conversations.
+        """
+        buffer = self._pending()
+        if conversation_ids is None:
+            conversation_ids = list(buffer)
+        pending = {conversation_id: buffer.pop(conversation_id)
+                   for conversation_id in conversation_ids if conversation_id in buffer}
+        if not pending:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for conversation_id, messages in pending.items():
+            pipe.rpush(self._key(conversation_id), *[json.dumps(message) for message in messages])
+        results = pipe.execute(raise_on_error=False)
+        for (conversation_id, messages), result in zip(pending.items(), results):
+            if isinstance(result, ResponseError):
+                self.migrate_conversation(conversation_id)
+                self.redis.rpush(self._key(conversation_id), *[json.dumps(message) for message in messages])
+
+    def migrate_conversation(self, conversation_id: str) -> bool:
+        """
+        Convert one string-mode conversation key into a list in a single transaction.
+        :return: True if the key was converted, False if it was not a string key.
+        """
+        key = self._key(conversation_id)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    if pipe.type(key) not in (b"string", "string"):
+                        pipe.unwatch()
+                        return False
+                    history = json.loads(pipe.get(key) or "[]")
+                    pipe.multi()
+                    pipe.delete(key)
+                    if history:
+                        pipe.rpush(key, *[json.dumps(message) for message in history])
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    # another client changed the key between WATCH and EXEC, read it again
+                    continue
+
+    def migrate_to_list_storage(self, match: str = "conversation:*", count: int = 500) -> int:
+        """
+        Convert every string-mode conversation key matching the pattern into list storage.
+        :return: The number of keys converted.
+        """
+        migrated = 0
+        prefix = len("conversation:")
+        for key in self.redis.scan_iter(match=match, count=count, _type="string"):
+            if isinstance(key, bytes):
+                key = key.decode()
+            if self.migrate_conversation(key[prefix:]):
+                migrated += 1
+        return migrated
+
+    def _pending(self) -> Dict[str, List[Dict[str, Any]]]:
+        buffer = self._batch_buffer.get()
+        return buffer if buffer is not None else {}
+
+    def _append(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        buffer = self._batch_buffer.get()
+        if buffer is not None:
+            buffer.setdefault(conversation_id, []).extend(messages)
+            return
+        key = self._key(conversation_id)
+        encoded = [json.dumps(message) for message in messages]
+        try:
+            self.redis.rpush(key, *encoded)
+        except ResponseError:
+            self.migrate_conversation(conversation_id)
+            self.redis.rpush(key, *encoded)
+
+    def _push_and_read(self, conversation_id: str, messages: Optional[List[Dict[str, Any]]]) -> list:
+        key = self._key(conversation_id)
+        pipe = self.redis.pipeline(transaction=False)
+        if messages:
+            pipe.rpush(key, *[json.dumps(message) for message in messages])
+        pipe.lrange(key, 0, -1)
+        return pipe.execute()[-1]
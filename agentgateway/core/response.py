@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import Optional, Any, List, Dict
 
+from agentgateway.core.tracing import format_timestamp
+
 
 class ResponseType(Enum):
     ANSWER = "answer"
@@ -11,6 +13,35 @@ class ResponseType(Enum):
 class EventType(Enum):
     LLM_CALL = "llm_call"
     TOOL_CALL = "tool_call"
+    LLM_CACHE_HIT = "llm_cache_hit"
+    LLM_ERROR = "llm_error"
+    TOOL_CACHE_HIT = "tool_cache_hit"
+
+class StreamEventType(Enum):
+    TEXT_DELTA = "text_delta"
+    TOOL_CALL = "tool_call"
+    TOOL_RESULT = "tool_result"
+    RESPONSE = "response"
+
+class StreamEvent:
+    """
+    A single event yielded while streaming an agent run.
+
+    TEXT_DELTA carries a piece of assistant text in `content`, TOOL_CALL the tool about to be executed in
+    `tool`, TOOL_RESULT the executed tool and its output in `tool` and `content`, and RESPONSE the final
+    `response` of the turn.
+    """
+    __slots__ = ("event_type", "content", "tool", "response")
+
+    def __init__(self, event_type: 'StreamEventType', content: Any = None, tool: Any = None,
+                 response: Optional['Response'] = None):
+        self.event_type = event_type
+        self.content = content
+        self.tool = tool
+        self.response = response
+
+    def __repr__(self):
+        return f"StreamEvent(type={self.event_type.value}, content={self.content!r})"
 
 class Response:
     def __init__(self, 
@@ -25,12 +56,22 @@ class Response:
         self.llm_calls = 0  # Tracks the number of LLM calls
         self.total_input_tokens = 0  # Tracks total input tokens
         self.total_output_tokens = 0  # Tracks total output tokens
-        self.trace_details = [] # List to store individual call metrics
+        self.total_cache_read_tokens = 0  # Input tokens read from the provider's prompt cache
+        self.total_cache_write_tokens = 0  # Input tokens written to the provider's prompt cache
+        self._trace_details = [] # List to store individual call metrics
+        self._formatted_trace_details = 0  # entries whose start_time and end_time are filled in
 
     def __str__(self):
         return (f"Response(type={self.response_type.value}, content={self.content}, "
                 f"conversation_id={self.conversation_id}), usage={self.get_usage_details()}, "
-                f"trace={self.trace_details}")
+                f"trace={self.get_trace_details()}")
+
+    @property
+    def trace_details(self) -> List[Dict[str, Any]]:
+        """
+        The trace details, with their start and end times, as returned by get_trace_details().
+        """
+        return self.get_trace_details()
 
     def set_response_type(self, response_type: 'ResponseType'):
         self.response_type = response_type
@@ -50,16 +91,21 @@ class Response:
     def set_conversation_id(self, conversation_id: str):
         self.conversation_id = conversation_id
 
-    def update_usage(self, input_tokens: int, output_tokens: int):
+    def update_usage(self, input_tokens: int, output_tokens: int,
+                     cache_read_tokens: int = 0, cache_write_tokens: int = 0):
         """
         Updates the LLM usage details.
 
         :param input_tokens: Number of tokens in the input for the call.
         :param output_tokens: Number of tokens in the output for the call.
+        :param cache_read_tokens: Number of input tokens read from the provider's prompt cache.
+        :param cache_write_tokens: Number of input tokens written to the provider's prompt cache.
         """
         self.llm_calls += 1
         self.total_input_tokens += input_tokens
         self.total_output_tokens += output_tokens
+        self.total_cache_read_tokens += cache_read_tokens
+        self.total_cache_write_tokens += cache_write_tokens
 
     def get_usage_details(self):
         """
@@ -71,26 +117,38 @@ class Response:
             "llm_calls": self.llm_calls,
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
+            "total_cache_read_tokens": self.total_cache_read_tokens,
+            "total_cache_write_tokens": self.total_cache_write_tokens,
         }
 
     def add_trace_detail(self, event_type: 'EventType', latency: Optional[float] = None,
                          input_tokens: Optional[int] = None, output_tokens: Optional[int] = None,
                          name: Optional[str] = None, start_time: Optional[str] = None,
-                         end_time: Optional[str] = None):
+                         end_time: Optional[str] = None, cache_read_tokens: Optional[int] = None,
+                         cache_write_tokens: Optional[int] = None, attempt: Optional[int] = None,
+                         error: Optional[str] = None, start_ns: Optional[int] = None,
+                         end_ns: Optional[int] = None):
         """
         Adds a trace detail if at least one metric is provided.
 
-        :param event_type: The type of event (LLM_CALL or TOOL_CALL).
+        :param event_type: The type of event (LLM_CALL, TOOL_CALL, LLM_CACHE_HIT, LLM_ERROR or TOOL_CACHE_HIT).
         :param latency: Time taken for the call in seconds.
         :param input_tokens: Number of input tokens for the call.
         :param output_tokens: Number of output tokens for the call.
         :param name: Name of the event (e.g., tool name).
         :param start_time: Optional start time of the event (ISO 8601 string).
         :param end_time: Optional end time of the event (ISO 8601 string).
+        :param cache_read_tokens: Number of input tokens read from the provider's prompt cache.
+        :param cache_write_tokens: Number of input tokens written to the provider's prompt cache.
+        :param attempt: Number of the provider call attempt within one request, starting at 1.
+        :param error: Description of the error of a failed attempt.
+        :param start_ns: Monotonic start timestamp in nanoseconds, from agentgateway.core.tracing.now_ns().
+        :param end_ns: Monotonic end timestamp in nanoseconds. start_time and end_time are derived from the
+            timestamps when the trace details are first read, so recording an event formats no dates.
         """
         if event_type and (latency is not None or input_tokens is not None or
                            output_tokens is not None or name is not None or
-                           start_time is not None or end_time is not None):
+                           start_time is not None or end_time is not None or start_ns is not None):
             detail = {
                 "event_type": event_type.value,
                 "latency": latency,
@@ -98,9 +156,15 @@ class Response:
                 "output_tokens": output_tokens,
                 "name": name,
                 "start_time": start_time,
-                "end_time": end_time
+                "end_time": end_time,
+                "cache_read_tokens": cache_read_tokens,
+                "cache_write_tokens": cache_write_tokens,
+                "attempt": attempt,
+                "error": error,
+                "start_ns": start_ns,
+                "end_ns": end_ns
             }
-            self.trace_details.append(detail)
+            self._trace_details.append(detail)
 
     def get_trace_details(self) -> List[Dict[str, Any]]:
         """
@@ -108,7 +172,15 @@ class Response:
 
         :return: A list of dictionaries containing trace metrics.
         """
-        return self.trace_details
+        # entries are only appended, so each is formatted once, on the first read after it was added
+        formatted = len(self._trace_details)
+        for detail in self._trace_details[self._formatted_trace_details:formatted]:
+            if detail["start_time"] is None and detail["start_ns"] is not None:
+                detail["start_time"] = format_timestamp(detail["start_ns"])
+            if detail["end_time"] is None and detail["end_ns"] is not None:
+                detail["end_time"] = format_timestamp(detail["end_ns"])
+        self._formatted_trace_details = formatted
+        return self._trace_details
 
     def to_dict(self):
         return {
@@ -117,6 +189,6 @@ class Response:
             "tools": self.tools,
             "conversation_id": self.conversation_id,
             "llm_usage": self.get_usage_details(),
-            "trace_details": self.trace_details,
+            "trace_details": self.get_trace_details(),
         }
 
@@ -0,0 +1,361 @@
+"""
+Retries, deadlines and hedging for provider calls.
+
+A RetryPolicy runs one LLM request as a series of attempts. Failed attempts with a retryable error are
+retried after an exponential backoff with full jitter, within an optional deadline for the whole request.
+Optionally each attempt has its own timeout, and a duplicate (hedged) attempt is sent when the first one is
+slower than a fixed delay or than a percentile of recent latencies; the first reply wins. Every attempt is
+reported to a callback, so callers can trace it.
+"""
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from agentgateway.core.rate_limiter import is_throttling_error
+from agentgateway.core.tracing import now_ns
+
+_RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_AWS_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException",
+                        "InternalServerException", "ModelNotReadyException", "ModelTimeoutException",
+                        "RequestTimeout", "RequestTimeoutException"}
+# connection and timeout errors of the SDKs, matched by name so the SDKs need not be imported
+_RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ConnectTimeoutError", "ReadTimeoutError",
+                          "EndpointConnectionError", "ConnectionClosedError", "TimeoutException", "NetworkError"}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Whether a provider error is transient: throttling, timeouts, connection failures and server errors.
+    Anything else, e.g. invalid requests or authentication errors, is fatal.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)) or is_throttling_error(error):
+        return True
+    if any(cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in _RETRYABLE_STATUS_CODES
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code") in _RETRYABLE_AWS_CODES or \
+            response.get("ResponseMetadata", {}).get("HTTPStatusCode") in _RETRYABLE_STATUS_CODES
+    return False
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds the provider asked to wait before retrying, from a Retry-After header, if any.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """
+    Latencies of the most recent successful calls, for percentile-based hedging.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        :return: The latency below which percent of the recent calls completed, or None with too few samples.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100.0))]
+
+
+class AttemptOutcome:
+    """
+    The result of one attempt: value on success, else error. superseded marks an attempt abandoned because
+    another attempt of the same request replied first.
+    """
+    __slots__ = ("attempt", "value", "error", "latency", "start_ns", "end_ns", "hedged", "superseded")
+
+    def __init__(self, attempt: int, hedged: bool = False):
+        self.attempt = attempt
+        self.hedged = hedged
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.latency = 0.0
+        self.start_ns = now_ns()
+        self.end_ns: Optional[int] = None
+        self.superseded = False
+
+    def start(self) -> 'AttemptOutcome':
+        self.start_ns = now_ns()
+        return self
+
+    def finish(self, value: Any = None, error: Optional[BaseException] = None) -> 'AttemptOutcome':
+        if self.end_ns is not None:
+            # already given up on; the late result of an abandoned attempt is dropped
+            return self
+        self.end_ns = now_ns()
+        self.latency = (self.end_ns - self.start_ns) / 1e9
+        self.value = value
+        self.error = error
+        return self
+
+
+def _timed(attempt: Callable[[], Any], outcome: AttemptOutcome) -> AttemptOutcome:
+    outcome.start()
+    try:
+        return outcome.finish(value=attempt())
+    except Exception as e:
+        return outcome.finish(error=e)
+
+
+def _start_thread(attempt: Callable[[], Any], outcome: AttemptOutcome) -> Future:
+    # a daemon thread per attempt: an attempt that timed out or lost a hedge cannot be interrupted, and must
+    # neither hold a pool worker nor keep the interpreter alive. It runs in a copy of the caller's context, so the
+    # attempt sees the caller's RunContext
+    future = Future()
+    future.outcome = outcome
+    context = contextvars.copy_context()
+    threading.Thread(target=lambda: future.set_result(context.run(_timed, attempt, outcome)), daemon=True,
+                     name=f"agentgateway-attempt-{outcome.attempt}").start()
+    return future
+
+
+class RetryPolicy:
+    """
+    How a provider call is retried, bounded and hedged.
+
+    Args:
+        max_attempts: Rounds of attempts per request; 1 disables retries. A hedge does not count as a round.
+        base_delay: Backoff cap in seconds before the first retry, multiplied by multiplier for each further one.
+        max_delay: Upper bound of the backoff cap.
+        jitter: Wait a uniformly random time up to the cap ("full jitter") instead of the cap itself.
+        attempt_timeout: Seconds an attempt may take before it counts as failed with a TimeoutError.
+        deadline: Seconds for the whole request, including backoff; no attempt starts after it has passed.
+        hedge_after: Seconds after which a duplicate attempt is sent, or "p<N>", e.g. "p95", to hedge once an
+            attempt is slower than N percent of recent successful attempts.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 20.0,
+                 multiplier: float = 2.0, jitter: bool = True, attempt_timeout: Optional[float] = None,
+                 deadline: Optional[float] = None, hedge_after: Union[float, str, None] = None,
+                 sleep: Callable[[float], None] = time.sleep, rand: Callable[[], float] = random.random):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if isinstance(hedge_after, str):
+            if not hedge_after.startswith("p") or not 0 < float(hedge_after[1:]) < 100:
+                raise ValueError(f"Unsupported hedge_after: {hedge_after}. Use seconds or a percentile like 'p95'")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.sleep = sleep
+        self._rand = rand
+
+    def backoff(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """
+        Seconds to wait before the given retry (1 for the first), honouring a Retry-After from the provider.
+        """
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        delay = cap * self._rand() if self.jitter else cap
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def hedge_delay(self, tracker: Optional[LatencyTracker]) -> Optional[float]:
+        if isinstance(self.hedge_after, str):
+            return tracker.percentile(float(self.hedge_after[1:])) if tracker is not None else None
+        return self.hedge_after
+
+    def _needs_thread(self, hedge_delay: Optional[float]) -> bool:
+        return self.attempt_timeout is not None or self.deadline is not None or hedge_delay is not None
+
+    def _remaining(self, deadline_at: Optional[float]) -> Optional[float]:
+        return None if deadline_at is None else deadline_at - time.monotonic()
+
+    def _attempt_timeout(self, deadline_at: Optional[float]) -> Optional[float]:
+        remaining = self._remaining(deadline_at)
+        if remaining is None:
+            return self.attempt_timeout
+        return remaining if self.attempt_timeout is None else min(self.attempt_timeout, remaining)
+
+    def start_deadline(self) -> Optional[float]:
+        """
+        :return: The time.monotonic() value at which a request starting now runs out of time, if it has a deadline.
+        """
+        return time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def retry_delay(self, rounds: int, error: BaseException, deadline_at: Optional[float]) -> Optional[float]:
+        """
+        The backoff after the given number of failed rounds, or None when the request must fail with error: the
+        error is fatal, the attempts are used up or the deadline would pass while waiting.
+        """
+        if rounds >= self.max_attempts or not is_retryable_error(error):
+            return None
+        delay = self.backoff(rounds, error)
+        remaining = self._remaining(deadline_at)
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def call(self, attempt: Callable[[], Any], on_outcome: Callable[[AttemptOutcome], None],
+             tracker: Optional[LatencyTracker] = None) -> Any:
+        """
+        Run attempt() until it succeeds or the policy gives up, and return its value.
+
+        :param attempt: Makes one provider call.
+        :param on_outcome: Called with the outcome of every attempt, in the order they are resolved.
+        :param tracker: Receives the latency of successful attempts and provides percentile hedge delays.
+        :raises: The error of the last attempt when all attempts failed.
+        """
+        deadline_at = self.start_deadline()
+        rounds = attempts = 0
+        while True:
+            rounds += 1
+            hedge_delay = self.hedge_delay(tracker)
+            if self._needs_thread(hedge_delay):
+                outcomes = self._run_round(attempt, attempts, deadline_at, hedge_delay)
+            else:
+                outcomes = [_timed(attempt, AttemptOutcome(attempts + 1))]
+            attempts += len(outcomes)
+            for outcome in outcomes:
+                on_outcome(outcome)
+            winner = outcomes[-1]
+            if winner.error is None:
+                if tracker is not None:
+                    tracker.observe(winner.latency)
+                return winner.value
+            delay = self.retry_delay(rounds, winner.error, deadline_at)
+            if delay is None:
+                raise winner.error
+            self.sleep(delay)
+
+    def _run_round(self, attempt: Callable[[], Any], attempts: int, deadline_at: Optional[float],
+                   hedge_delay: Optional[float]) -> List[AttemptOutcome]:
+        """
+        Run a primary attempt and, if it is slow, one hedged attempt. The returned outcomes end with the reply
+        that won, or with the last failure.
+        """
+        timeout = self._attempt_timeout(deadline_at)
+        primary = _start_thread(attempt, AttemptOutcome(attempts + 1))
+        running = {primary}
+        waited = 0.0
+        if hedge_delay is not None and (timeout is None or hedge_delay < timeout):
+            done, _ = wait(running, timeout=hedge_delay)
+            if not done:
+                running.add(_start_thread(attempt, AttemptOutcome(attempts + 2, hedged=True)))
+                waited = hedge_delay
+
+        resolved = []
+        started = time.monotonic() - waited
+        while running:
+            left = None if timeout is None else timeout - (time.monotonic() - started)
+            done, running = wait(running, timeout=left if left is None else max(0.0, left),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                # the remaining attempts timed out; they keep running in their threads and are ignored
+                for future in sorted(running, key=lambda f: f.outcome.attempt):
+                    outcome = future.outcome.finish(error=TimeoutError(f"Attempt timed out after {timeout:.3f}s"))
+                    resolved.append(outcome)
+                return resolved
+            for future in sorted(done, key=lambda f: f.result().attempt):
+                resolved.append(future.result())
+            if any(outcome.error is None for outcome in resolved):
+                break
+
+        winner = next(outcome for outcome in resolved if outcome.error is None) \
+            if any(outcome.error is None for outcome in resolved) else None
+        if winner is None:
+            return resolved
+        losers = [outcome for outcome in resolved if outcome is not winner]
+        for future in sorted(running, key=lambda f: f.outcome.attempt):
+            outcome = future.outcome.finish(error=TimeoutError("Superseded by a faster attempt"))
+            outcome.superseded = True
+            losers.append(outcome)
+        return losers + [winner]
+
+    async def acall(self, attempt: Callable[[], Awaitable[Any]], on_outcome: Callable[[AttemptOutcome], None],
+                    tracker: Optional[LatencyTracker] = None) -> Any:
+        """
+        Asynchronous counterpart of call(). Attempts that time out or lose a hedge are cancelled.
+        """
+        deadline_at = self.start_deadline()
+        rounds = attempts = 0
+        while True:
+            rounds += 1
+            outcomes = await self._arun_round(attempt, attempts, deadline_at, self.hedge_delay(tracker))
+            attempts += len(outcomes)
+            for outcome in outcomes:
+                on_outcome(outcome)
+            winner = outcomes[-1]
+            if winner.error is None:
+                if tracker is not None:
+                    tracker.observe(winner.latency)
+                return winner.value
+            delay = self.retry_delay(rounds, winner.error, deadline_at)
+            if delay is None:
+                raise winner.error
+            await asyncio.sleep(delay)
+
+    async def _arun_round(self, attempt: Callable[[], Awaitable[Any]], attempts: int,
+                          deadline_at: Optional[float], hedge_delay: Optional[float]) -> List[AttemptOutcome]:
+        async def timed(outcome: AttemptOutcome) -> AttemptOutcome:
+            outcome.start()
+            try:
+                return outcome.finish(value=await attempt())
+            except Exception as e:
+                return outcome.finish(error=e)
+
+        timeout = self._attempt_timeout(deadline_at)
+        started = time.monotonic()
+        outcomes = [AttemptOutcome(attempts + 1)]
+        tasks = {asyncio.ensure_future(timed(outcomes[0])): outcomes[0]}
+        if hedge_delay is not None and (timeout is None or hedge_delay < timeout):
+            done, _ = await asyncio.wait(set(tasks), timeout=hedge_delay)
+            if not done:
+                outcomes.append(AttemptOutcome(attempts + 2, hedged=True))
+                tasks[asyncio.ensure_future(timed(outcomes[1]))] = outcomes[1]
+
+        resolved = []
+        pending = set(tasks)
+        while pending:
+            left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+            done, pending = await asyncio.wait(pending, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            resolved.extend(sorted((task.result() for task in done), key=lambda outcome: outcome.attempt))
+            if any(outcome.error is None for outcome in resolved):
+                break
+
+        winner = next((outcome for outcome in resolved if outcome.error is None), None)
+        for task in pending:
+            task.cancel()
+            outcome = tasks[task]
+            outcome.finish(error=TimeoutError("Superseded by a faster attempt") if winner is not None
+                           else TimeoutError(f"Attempt timed out after {timeout:.3f}s"))
+            outcome.superseded = winner is not None
+            resolved.append(outcome)
+        if winner is None:
+            return sorted(resolved, key=lambda outcome: outcome.attempt)
+        return [outcome for outcome in resolved if outcome is not winner] + [winner]
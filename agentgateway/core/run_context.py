@@ -0,0 +1,97 @@
+"""
+Per-run state of an adapter.
+
+Adapters keep the state of the run in progress, its Response and conversation id, in self.response and
+self.current_conversation_id. AgentGateway opens a RunContext for each run_agent(), arun_agent() and stream_agent()
+call, and while the context is active these attributes of its adapter read and write the context instead of the
+adapter. The active context is held in a ContextVar, so each thread and asyncio task sees only its own run, and a
+single prepared gateway can serve concurrent conversations.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, TypeVar
+
+from agentgateway.core.response import Response
+from agentgateway.core.tracing import get_tracer
+
+T = TypeVar("T")
+
+_current_run: ContextVar[Optional['RunContext']] = ContextVar("agentgateway_run", default=None)
+
+
+class RunContext:
+    """
+    The state of one run of an agent.
+
+    Args:
+        agent: The adapter whose state the context holds. Other adapters called during the run, such as backends
+            of a RoutingAgent or adapters used by tools, keep their own state.
+        conversation_id: The conversation of the run; the adapter's current conversation when None.
+        response: The response the run accumulates usage and trace details in. A new one by default.
+
+    span is the innermost open span of the run while tracing is enabled, the parent of the spans of LLM and
+    tool calls. turns counts the LLM turns of the run.
+    """
+    __slots__ = ("agent", "conversation_id", "response", "span", "turns")
+
+    def __init__(self, agent: Any, conversation_id: Optional[str] = None, response: Optional[Response] = None):
+        self.agent = agent
+        self.conversation_id = conversation_id
+        self.response = response if response is not None else Response()
+        self.span = None
+        self.turns = 0
+
+    @contextmanager
+    def activate(self) -> Iterator['RunContext']:
+        """
+        Make this the active run of the current thread or task until the block exits.
+        """
+        token = _current_run.set(self)
+        try:
+            yield self
+        finally:
+            _current_run.reset(token)
+
+    def trace(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        A context manager spanning its block with a child of the run's current span, which becomes the current
+        span until the block exits. Yields the span, or None when tracing is disabled.
+        """
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return nullcontext()
+        return self._trace(tracer, name, attributes)
+
+    @contextmanager
+    def _trace(self, tracer, name: str, attributes: Optional[Dict[str, Any]]):
+        parent = self.span
+        with tracer.span(name, parent, attributes) as span:
+            self.span = span
+            try:
+                yield span
+            finally:
+                self.span = parent
+
+    def iterate(self, iterator: Iterator[T]) -> Iterator[T]:
+        """
+        Iterate with this run active while the iterator runs, but not while the consumer handles its items. A
+        generator suspended at a yield cannot hold a context open, as the consumer could start other runs meanwhile.
+        """
+        while True:
+            with self.activate():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def get_current_run(agent: Any = None) -> Optional[RunContext]:
+    """
+    The active run, or None outside a run.
+    :param agent: Only return the active run if it holds the state of this adapter.
+    """
+    run = _current_run.get()
+    if run is not None and agent is not None and run.agent is not agent:
+        return None
+    return run
@@ -0,0 +1,143 @@
+from typing import Any, Callable, Dict, Optional
+
+# JSON schema type -> Python types; bool is excluded from the numeric types as JSON schema requires
+_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+Check = Callable[[Any, str], Any]
+
+
+def _compile_type(expected, next_check: Optional[Check]) -> Optional[Check]:
+    names = expected if isinstance(expected, list) else [expected]
+    if not all(name in _TYPES for name in names):
+        # unknown types are accepted, as before
+        return next_check
+    types = tuple(t for name in names for t in _TYPES[name])
+    numeric = any(name in ("number", "integer") for name in names)
+    allows_bool = "boolean" in names
+    label = expected if isinstance(expected, str) else "|".join(expected)
+
+    def check(value, path):
+        if not isinstance(value, types) or (numeric and not allows_bool and isinstance(value, bool)):
+            raise TypeError(f"Invalid type for parameter '{path}'. Expected {label}, got {type(value).__name__}")
+        return next_check(value, path) if next_check is not None else value
+
+    return check
+
+
+def _compile_enum(options, next_check: Optional[Check]) -> Check:
+    try:
+        allowed = frozenset(options)
+    except TypeError:
+        allowed = list(options)
+
+    def check(value, path):
+        try:
+            valid = value in allowed
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError(f"Invalid value for parameter '{path}'. Expected one of {list(options)}, got {value!r}")
+        return next_check(value, path) if next_check is not None else value
+
+    return check
+
+
+def _compile_array(item_check: Check) -> Check:
+    def check(value, path):
+        return [item_check(item, f"{path}[{index}]") for index, item in enumerate(value)]
+
+    return check
+
+
+def _compile_object(schema: Dict[str, Any]) -> Optional[Check]:
+    properties = {key: compile_property(sub) for key, sub in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", []))
+    defaults = {key: sub["default"] for key, sub in schema.get("properties", {}).items() if "default" in sub}
+    closed = schema.get("additionalProperties") is False
+    if not properties and not required and not defaults and not closed:
+        return None
+
+    def check(value, path):
+        for key in required:
+            if key not in value:
+                raise ValueError(f"Missing required parameter: {path}.{key}")
+        result = dict(defaults)
+        for key, item in value.items():
+            item_check = properties.get(key)
+            if item_check is not None:
+                result[key] = item_check(item, f"{path}.{key}")
+            elif closed:
+                raise ValueError(f"Unexpected parameter: {path}.{key}")
+            else:
+                result[key] = item
+        return result
+
+    return check
+
+
+def compile_property(schema: Dict[str, Any]) -> Check:
+    """
+    Compile the schema of one value into a check(value, path) function that raises on invalid values and
+    returns the value with nested defaults applied.
+    """
+    check = None
+    if schema.get("type") == "object" or "properties" in schema:
+        check = _compile_object(schema)
+    elif schema.get("type") == "array" and isinstance(schema.get("items"), dict):
+        check = _compile_array(compile_property(schema["items"]))
+    if "enum" in schema:
+        check = _compile_enum(schema["enum"], check)
+    if "type" in schema:
+        check = _compile_type(schema["type"], check)
+    return check if check is not None else (lambda value, path: value)
+
+
+class SchemaValidator:
+    """
+    Validator compiled once from a tool's parameters schema.
+
+    Supports types (including lists of types), nested objects, arrays with an items schema, enums and defaults.
+    Missing or unexpected top-level parameters raise ValueError, wrong types raise TypeError. None is accepted
+    for optional parameters, as it was before validators were compiled.
+    """
+    __slots__ = ("properties", "required", "defaults")
+
+    def __init__(self, schema: Dict[str, Any]):
+        schema_properties = schema.get("properties", {})
+        self.properties: Dict[str, Check] = {key: compile_property(sub) for key, sub in schema_properties.items()}
+        self.required = tuple(schema.get("required", []))
+        self.defaults = {key: sub["default"] for key, sub in schema_properties.items() if "default" in sub}
+
+    def validate_parameter(self, key: str, value: Any) -> Any:
+        """
+        Validate a single parameter and return it with nested defaults applied.
+        """
+        check = self.properties.get(key)
+        if check is None:
+            raise ValueError(f"Unexpected parameter: {key}")
+        if value is None:
+            if key in self.required:
+                raise ValueError(f"Required parameter '{key}' cannot be None")
+            return None
+        return check(value, key)
+
+    def validate(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a full set of parameters.
+        :return: A new dict with the validated parameters and the defaults of missing optional ones.
+        """
+        for key in self.required:
+            if key not in parameters:
+                raise ValueError(f"Missing required parameter: {key}")
+        result = dict(self.defaults)
+        for key, value in parameters.items():
+            result[key] = self.validate_parameter(key, value)
+        return result
@@ -0,0 +1,155 @@
+import json
+from typing import Any, Dict, Generator, Iterable
+
+from agentgateway.core.response import StreamEvent, StreamEventType
+
+
+def _usage_to_dict(usage) -> Dict[str, Any]:
+    if hasattr(usage, "model_dump"):
+        return usage.model_dump()
+    return dict(usage)
+
+
+def assemble_chat_completion_stream(chunks: Iterable[Any]) -> Generator[StreamEvent, None, Dict[str, Any]]:
+    """
+    Consume an OpenAI-compatible chat completion stream.
+
+    Yields a TEXT_DELTA event for every piece of assistant text and returns the assembled completion as a
+    dict in the non-streaming chat.completion shape. Tool call deltas are merged by their index: the id and
+    function name arrive with the first delta of a call and the JSON arguments are split across the rest.
+    Usage is taken from the final chunk (`usage`, or `x_groq.usage` for Groq).
+    """
+    completion = {"id": "", "object": "chat.completion", "created": 0, "model": ""}
+    content_parts = []
+    tool_calls = {}
+    finish_reason = None
+    usage = None
+
+    for chunk in chunks:
+        if not completion["id"] and getattr(chunk, "id", None):
+            completion["id"] = chunk.id
+            completion["created"] = getattr(chunk, "created", 0) or 0
+            completion["model"] = getattr(chunk, "model", "") or ""
+
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage
+        x_groq = getattr(chunk, "x_groq", None)
+        if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+            usage = x_groq.usage
+
+        for choice in chunk.choices or []:
+            delta = choice.delta
+            if delta is not None:
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield StreamEvent(StreamEventType.TEXT_DELTA, content=delta.content)
+
+                for tool_call in delta.tool_calls or []:
+                    entry = tool_calls.setdefault(tool_call.index, {
+                        "id": "", "type": "function", "function": {"name": "", "arguments": ""}
+                    })
+                    if tool_call.id:
+                        entry["id"] = tool_call.id
+                    if tool_call.function is not None:
+                        if tool_call.function.name:
+                            entry["function"]["name"] += tool_call.function.name
+                        if tool_call.function.arguments:
+                            entry["function"]["arguments"] += tool_call.function.arguments
+
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+    message = {"role": "assistant", "content": "".join(content_parts) if content_parts else None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+
+    completion["choices"] = [{"index": 0, "finish_reason": finish_reason or "stop", "message": message}]
+    completion["usage"] = _usage_to_dict(usage) if usage is not None else {
+        "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0
+    }
+    return completion
+
+
+def assemble_anthropic_message_stream(events: Iterable[Any]) -> Generator[StreamEvent, None, Dict[str, Any]]:
+    """
+    Consume the raw event stream of an Anthropic messages.create(stream=True) call.
+
+    Yields a TEXT_DELTA event for every text_delta and returns the assembled message as a dict in the
+    non-streaming Message shape. Tool use input arrives as input_json_delta fragments and is parsed once its
+    content block is complete.
+    """
+    message = {}
+    blocks = {}
+    partial_json = {}
+
+    for event in events:
+        if event.type == "message_start":
+            message = event.message.model_dump() if hasattr(event.message, "model_dump") else dict(event.message)
+            message["content"] = []
+        elif event.type == "content_block_start":
+            block = event.content_block
+            blocks[event.index] = block.model_dump() if hasattr(block, "model_dump") else dict(block)
+            if blocks[event.index].get("type") == "tool_use":
+                partial_json[event.index] = []
+        elif event.type == "content_block_delta":
+            delta = event.delta
+            if delta.type == "text_delta":
+                blocks[event.index]["text"] += delta.text
+                yield StreamEvent(StreamEventType.TEXT_DELTA, content=delta.text)
+            elif delta.type == "input_json_delta":
+                partial_json[event.index].append(delta.partial_json)
+        elif event.type == "content_block_stop":
+            if event.index in partial_json:
+                arguments = "".join(partial_json.pop(event.index))
+                blocks[event.index]["input"] = json.loads(arguments) if arguments else {}
+        elif event.type == "message_delta":
+            message["stop_reason"] = event.delta.stop_reason
+            message["stop_sequence"] = event.delta.stop_sequence
+            message.setdefault("usage", {})["output_tokens"] = event.usage.output_tokens
+
+    message["content"] = [blocks[index] for index in sorted(blocks)]
+    return message
+
+
+def assemble_converse_stream(events: Iterable[Dict[str, Any]]) -> Generator[StreamEvent, None, Dict[str, Any]]:
+    """
+    Consume the event stream of a Bedrock converse_stream() call.
+
+    Yields a TEXT_DELTA event for every text delta and returns the assembled response as a dict in the
+    converse() response shape. Tool use input arrives as JSON string fragments and is parsed once its content
+    block is complete.
+    """
+    result = {"output": {"message": {"role": "assistant", "content": []}}, "stopReason": None,
+              "usage": {"inputTokens": 0, "outputTokens": 0, "totalTokens": 0}}
+    blocks = {}
+    partial_json = {}
+
+    for event in events:
+        if "messageStart" in event:
+            result["output"]["message"]["role"] = event["messageStart"].get("role", "assistant")
+        elif "contentBlockStart" in event:
+            index = event["contentBlockStart"]["contentBlockIndex"]
+            tool_use = event["contentBlockStart"].get("start", {}).get("toolUse")
+            if tool_use is not None:
+                blocks[index] = {"toolUse": {"toolUseId": tool_use["toolUseId"], "name": tool_use["name"]}}
+                partial_json[index] = []
+        elif "contentBlockDelta" in event:
+            index = event["contentBlockDelta"]["contentBlockIndex"]
+            delta = event["contentBlockDelta"]["delta"]
+            if "text" in delta:
+                blocks.setdefault(index, {"text": ""})["text"] += delta["text"]
+                yield StreamEvent(StreamEventType.TEXT_DELTA, content=delta["text"])
+            elif "toolUse" in delta:
+                partial_json.setdefault(index, []).append(delta["toolUse"].get("input", ""))
+        elif "contentBlockStop" in event:
+            index = event["contentBlockStop"]["contentBlockIndex"]
+            if index in partial_json:
+                arguments = "".join(partial_json.pop(index))
+                blocks[index]["toolUse"]["input"] = json.loads(arguments) if arguments else {}
+        elif "messageStop" in event:
+            result["stopReason"] = event["messageStop"]["stopReason"]
+        elif "metadata" in event:
+            result["usage"].update(event["metadata"].get("usage", {}))
+
+    result["output"]["message"]["content"] = [blocks[index] for index in sorted(blocks)]
+    return result
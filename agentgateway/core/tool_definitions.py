@@ -0,0 +1,59 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from agentgateway.core.abstract_tool import Tool
+
+
+class ToolDefinition:
+    """
+    A tool formatted for one provider, with its JSON encoded once.
+    The definition dict is shared by every agent using the tool and must not be modified.
+    """
+    __slots__ = ("definition", "json", "digest")
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.definition = definition
+        self.json = json.dumps(definition, sort_keys=True, separators=(",", ":"), default=str)
+        self.digest = hashlib.sha256(self.json.encode("utf-8")).hexdigest()
+
+
+class ToolDefinitionCache:
+    """
+    Memoizes provider-specific tool definitions by tool identity and provider format, so agents built with
+    the same tools format and encode each definition only once.
+    """
+
+    def __init__(self):
+        self._definitions: Dict[Tuple[str, Hashable], ToolDefinition] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tool: Tool, provider_format: str, formatter: Callable[[Tool], Dict[str, Any]]) -> ToolDefinition:
+        """
+        :param tool: The tool to format.
+        :param provider_format: Name of the provider format, e.g. "anthropic" or "bedrock".
+        :param formatter: Builds the provider-specific definition of the tool on a cache miss.
+        """
+        key = (provider_format, tool.get_definition_key())
+        definition = self._definitions.get(key)
+        if definition is None:
+            definition = ToolDefinition(formatter(tool))
+            with self._lock:
+                definition = self._definitions.setdefault(key, definition)
+        return definition
+
+    def clear(self):
+        with self._lock:
+            self._definitions.clear()
+
+
+_shared_definitions = ToolDefinitionCache()
+
+
+def get_tool_definition(tool: Tool, provider_format: str,
+                        formatter: Callable[[Tool], Dict[str, Any]]) -> ToolDefinition:
+    """
+    Get a tool definition from the process-wide cache shared by all adapters.
+    """
+    return _shared_definitions.get(tool, provider_format, formatter)
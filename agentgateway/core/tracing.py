@@ -0,0 +1,353 @@
+"""
+Structured tracing of agent runs.
+
+A run of AgentGateway is traced as an "agent.run" span with an "agent.turn" child per LLM turn, which in turn
+parents an "llm.call" span per provider call attempt or response cache hit and a "tool.call" span per tool
+execution. Timestamps are monotonic nanoseconds from time.perf_counter_ns(), so events are ordered at sub-second
+resolution, and are converted to Unix time only when exported.
+
+Tracing is off unless the tracing section of config.yaml enables it or a Tracer with exporters is installed with
+set_tracer(). A disabled tracer creates no spans, and its callers skip building span attributes, so tracing
+costs an attribute check per event when off.
+"""
+import atexit
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+from agentgateway.utils.config_manager import ConfigManager
+
+# span kinds, with their OTLP values
+INTERNAL = 1
+CLIENT = 3
+
+# Unix time of perf_counter_ns() zero, so monotonic timestamps convert to wall clock time without reading it again
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def now_ns() -> int:
+    """
+    The current monotonic timestamp in nanoseconds.
+    """
+    return time.perf_counter_ns()
+
+
+def to_unix_ns(timestamp_ns: int) -> int:
+    """
+    Convert a monotonic timestamp from now_ns() to nanoseconds since the Unix epoch.
+    """
+    return timestamp_ns + _EPOCH_OFFSET_NS
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """
+    Format a monotonic timestamp from now_ns() as an ISO 8601 UTC time with one-second resolution.
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(to_unix_ns(timestamp_ns) // 1_000_000_000))
+
+
+class Span:
+    """
+    A timed operation of a trace. parent_id is None for the root span of a trace, and end_ns is None while the
+    span is open.
+    """
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: int, span_id: int, parent_id: Optional[int], start_ns: int,
+                 kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes if attributes is not None else {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        return None if self.end_ns is None else self.end_ns - self.start_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The span as JSON-compatible data, with hex ids and Unix timestamps.
+        """
+        return {
+            "name": self.name,
+            "kind": "client" if self.kind == CLIENT else "internal",
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": None if self.parent_id is None else f"{self.parent_id:016x}",
+            "start_ns": to_unix_ns(self.start_ns),
+            "end_ns": None if self.end_ns is None else to_unix_ns(self.end_ns),
+            "duration_ns": self.duration_ns,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return f"Span(name={self.name!r}, span_id={self.span_id:016x}, duration_ns={self.duration_ns})"
+
+
+class SpanExporter:
+    """
+    Receives every span as it ends. Exporters are called from the threads that end spans.
+    """
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def shutdown(self):
+        self.flush()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Keeps the ended spans in a list, for tests and for inspecting traces in process.
+    """
+
+    def __init__(self):
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Appends each span to a file as one line of JSON, in the form of Span.to_dict().
+    Writes are buffered; flush() or shutdown() writes them out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": value if isinstance(value, str) else json.dumps(value, default=str)}
+
+
+class OtlpFileSpanExporter(SpanExporter):
+    """
+    Writes spans in the OpenTelemetry OTLP/JSON file format: one ExportTraceServiceRequest per line, each
+    holding up to batch_size spans. The files can be read by the OpenTelemetry Collector's otlpjsonfile receiver
+    and forwarded to any tracing backend, without an OpenTelemetry dependency in the process.
+    """
+
+    def __init__(self, path: str, service_name: str = "agentgateway", batch_size: int = 512):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._pending: List[Span] = []
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._write_pending()
+                self._file.flush()
+
+    def shutdown(self):
+        self.flush()
+        with self._lock:
+            self._file.close()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        spans, self._pending = self._pending, []
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": "agentgateway"}, "spans": [self._to_otlp(span) for span in spans]}],
+        }]}
+        self._file.write(json.dumps(request) + "\n")
+
+    @staticmethod
+    def _to_otlp(span: Span) -> Dict[str, Any]:
+        otlp_span = {
+            "traceId": f"{span.trace_id:032x}",
+            "spanId": f"{span.span_id:016x}",
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(to_unix_ns(span.start_ns)),
+            "endTimeUnixNano": str(to_unix_ns(span.end_ns)),
+            "attributes": [{"key": key, "value": _otlp_value(value)}
+                           for key, value in span.attributes.items() if value is not None],
+            "status": {"code": 2, "message": span.error} if span.error is not None else {},
+        }
+        if span.parent_id is not None:
+            otlp_span["parentSpanId"] = f"{span.parent_id:016x}"
+        return otlp_span
+
+
+class Tracer:
+    """
+    Creates spans and hands them to the exporters as they end. A tracer without exporters is disabled.
+
+    Args:
+        exporters: The exporters receiving the spans.
+    """
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None):
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self.enabled = bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+        self.enabled = True
+
+    def start_span(self, name: str, parent: Optional[Span] = None, kind: int = INTERNAL,
+                   attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None) -> Optional[Span]:
+        """
+        Open a span, a child of parent or else the root of a new trace.
+        :return: The span, or None when the tracer is disabled.
+        """
+        if not self.enabled:
+            return None
+        if parent is None:
+            trace_id, parent_id = random.getrandbits(128) or 1, None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        return Span(name, trace_id, random.getrandbits(64) or 1, parent_id,
+                    start_ns if start_ns is not None else now_ns(), kind, attributes)
+
+    def end_span(self, span: Optional[Span], error: Optional[str] = None, end_ns: Optional[int] = None):
+        """
+        Close a span from start_span() and export it. Does nothing for None, so disabled tracing needs no checks.
+        """
+        if span is None:
+            return
+        span.end_ns = end_ns if end_ns is not None else now_ns()
+        if error is not None:
+            span.error = error
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, parent: Optional[Span] = None,
+                    kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """
+        Export a span for an operation that already ended, timed by its caller.
+        """
+        self.end_span(self.start_span(name, parent, kind, attributes, start_ns), error, end_ns)
+
+    @contextmanager
+    def _span(self, name: str, parent: Optional[Span], attributes: Optional[Dict[str, Any]]) -> Iterator[Span]:
+        span = self.start_span(name, parent, attributes=attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=f"{type(e).__name__}: {e}")
+            raise
+        self.end_span(span)
+
+    def span(self, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None):
+        """
+        A context manager spanning its block, yielding the span, or None when the tracer is disabled. A block
+        that raises ends the span with the error.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, parent, attributes)
+
+    def flush(self):
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def _create_exporter(config_manager: ConfigManager) -> SpanExporter:
+    exporter_type = config_manager.get_nested('tracing', 'exporter', default='jsonl')
+    path = config_manager.get_nested('tracing', 'path', default='agentgateway_traces.jsonl')
+    if exporter_type == 'jsonl':
+        return JsonlSpanExporter(path)
+    if exporter_type == 'otlp_file':
+        return OtlpFileSpanExporter(path, config_manager.get_nested('tracing', 'service_name', default='agentgateway'))
+    if exporter_type == 'memory':
+        return InMemorySpanExporter()
+    raise ValueError(f"Unsupported tracing exporter: {exporter_type}")
+
+
+def get_tracer() -> Tracer:
+    """
+    The process-wide tracer, created from the tracing section of config.yaml on first use.
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                config_manager = ConfigManager()
+                tracer = Tracer()
+                if config_manager.get_nested('tracing', 'enabled', default=False):
+                    tracer.add_exporter(_create_exporter(config_manager))
+                    atexit.register(tracer.shutdown)
+                _tracer = tracer
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """
+    Install the process-wide tracer, or with None go back to the configured one on next use.
+    :return: The tracer it replaces.
+    """
+    global _tracer
+    with _tracer_lock:
+        previous, _tracer = _tracer, tracer
+    return previous
@@ -8,6 +8,10 @@ def setup_dynamodb():
     aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
     region_name = os.environ.get('AWS_REGION', 'us-west-2')  # Default to us-west-2 if not specified
     table_name = os.environ.get('DYNAMODB_TABLE_NAME', 'agent_conversations')
+    # "document" matches DynamoConversationManager's default layout, "message" its per-message layout
+    storage_mode = os.environ.get('DYNAMODB_STORAGE_MODE', 'document')
+    # PROVISIONED or PAY_PER_REQUEST (on-demand)
+    billing_mode = os.environ.get('DYNAMODB_BILLING_MODE', 'PROVISIONED')
 
     # Initialize DynamoDB client
     dynamodb = boto3.resource('dynamodb',
@@ -23,30 +27,52 @@ def setup_dynamodb():
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             # Table doesn't exist, create it
-            table = dynamodb.create_table(
-                TableName=table_name,
-                KeySchema=[
-                    {
-                        'AttributeName': 'conversation_id',
-                        'KeyType': 'HASH'  # Partition key
-                    }
-                ],
-                AttributeDefinitions=[
-                    {
-                        'AttributeName': 'conversation_id',
-                        'AttributeType': 'S'
-                    }
-                ],
-                ProvisionedThroughput={
-                    'ReadCapacityUnits': 5,
-                    'WriteCapacityUnits': 5
-                }
-            )
+            table = dynamodb.create_table(**get_table_definition(table_name, storage_mode, billing_mode))
             # Wait for the table to be created
             table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
             print(f"Table {table_name} created successfully.")
         else:
             print(f"Error checking/creating table: {e}")
 
+def get_table_definition(table_name, storage_mode='document', billing_mode='PROVISIONED'):
+    key_schema = [
+        {
+            'AttributeName': 'conversation_id',
+            'KeyType': 'HASH'  # Partition key
+        }
+    ]
+    attribute_definitions = [
+        {
+            'AttributeName': 'conversation_id',
+            'AttributeType': 'S'
+        }
+    ]
+    if storage_mode == 'message':
+        key_schema.append({
+            'AttributeName': 'message_seq',
+            'KeyType': 'RANGE'  # Sort key
+        })
+        attribute_definitions.append({
+            'AttributeName': 'message_seq',
+            'AttributeType': 'N'
+        })
+    elif storage_mode != 'document':
+        raise ValueError(f"Invalid storage mode: {storage_mode}")
+
+    definition = {
+        'TableName': table_name,
+        'KeySchema': key_schema,
+        'AttributeDefinitions': attribute_definitions,
+        'BillingMode': billing_mode
+    }
+    if billing_mode == 'PROVISIONED':
+        definition['ProvisionedThroughput'] = {
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    elif billing_mode != 'PAY_PER_REQUEST':
+        raise ValueError(f"Invalid billing mode: {billing_mode}")
+    return definition
+
 if __name__ == "__main__":
-    setup_dynamodb()
\ No newline at end of file
+    setup_dynamodb()
@@ -1,5 +1,7 @@
 import os
+import sys
 import redis
+from agentgateway.core.redis_conversation_manager import RedisConversationManager
 
 
 def setup_redis():
@@ -29,5 +31,19 @@ def setup_redis():
         print("Failed to connect to Redis. Please check your Redis URL and ensure Redis is running.")
 
 
+def migrate_to_list_storage():
+    # Convert conversations stored as JSON strings into Redis lists
+    redis_url = os.environ.get('REDIS_URL', 'redis://localhost:6379')
+    manager = RedisConversationManager(redis_url, storage_mode="list")
+
+    try:
+        migrated = manager.migrate_to_list_storage()
+        print(f"Migrated {migrated} conversations to list storage.")
+    except redis.ConnectionError:
+        print("Failed to connect to Redis. Please check your Redis URL and ensure Redis is running.")
+
+
 if __name__ == "__main__":
-    setup_redis()
\ No newline at end of file
+    setup_redis()
+    if "--migrate-to-list" in sys.argv:
+        migrate_to_list_storage()
\ No newline at end of file
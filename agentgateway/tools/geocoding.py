@@ -0,0 +1,184 @@
+"""
+Geocoding of locations for WeatherTool.
+
+Nominatim allows about one request per second and is the slowest step of a weather lookup, so locations are
+resolved in three tiers: the bundled offline gazetteer of major cities, a persistent cache of earlier lookups and
+only then Nominatim, whose calls share one process-wide rate limit. The gazetteer and the cache are keyed on
+normalize_location(), so "London,UK", "london, uk" and "London , United Kingdom" resolve alike.
+"""
+import json
+import os
+import threading
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from agentgateway.core.cache import Cache, get_shared_cache
+from agentgateway.core.rate_limiter import get_rate_limiter
+from agentgateway.utils.agent_logger import AgentLogger
+from agentgateway.utils.config_manager import ConfigManager
+
+Coordinates = Tuple[float, float]
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.json")
+
+
+def normalize_location(location: str) -> str:
+    """
+    The form of a location name used as a lookup key: case-folded, without accents, with runs of whitespace
+    collapsed and its comma-separated parts stripped.
+    """
+    decomposed = unicodedata.normalize("NFKD", location or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return ", ".join(" ".join(part.split()) for part in folded.split(","))
+
+
+class Gazetteer:
+    """
+    Coordinates of major cities, read from a JSON file on first lookup. A city is found by its name or an alias,
+    alone or followed by its country's code, name or an alias of the country; a name shared by several cities
+    alone resolves to the first listed.
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH):
+        self.path = path
+        self._index: Optional[Dict[str, Coordinates]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Coordinates]:
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = {}
+        for city in data["cities"]:
+            coordinates = (city["latitude"], city["longitude"])
+            country_names = [city["country"]] + data["countries"].get(city["country"], [])
+            for name in [city["name"]] + city["aliases"]:
+                name = normalize_location(name)
+                index.setdefault(name, coordinates)
+                for country_name in country_names:
+                    index.setdefault(f"{name}, {normalize_location(country_name)}", coordinates)
+        return index
+
+    def _get_index(self) -> Dict[str, Coordinates]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load()
+        return self._index
+
+    def lookup(self, location: str) -> Optional[Coordinates]:
+        """
+        The coordinates of a city, or None when it is not in the gazetteer.
+        """
+        return self._get_index().get(normalize_location(location))
+
+    def __len__(self):
+        return len(self._get_index())
+
+
+class Geocoder:
+    """
+    Resolves location names to coordinates through the gazetteer, the cache and Nominatim, in that order.
+
+    Args:
+        cache: Cache of coordinates found by Nominatim, or None to look every location up again.
+        gazetteer: Offline gazetteer consulted first, or None to skip it.
+        cache_ttl: Seconds a cached location stays valid; None keeps it until evicted.
+        geocoder: A geopy geocoder; a Nominatim geocoder is created on first use by default.
+        requests_per_minute: Limit on geocoder calls, shared by every Geocoder of the process.
+    """
+
+    def __init__(self, cache: Optional[Cache] = None, gazetteer: Optional[Gazetteer] = None,
+                 cache_ttl: Optional[float] = None, geocoder=None, requests_per_minute: float = 60):
+        self.logging = AgentLogger("Geocoder")
+        self.cache = cache
+        self.gazetteer = gazetteer
+        self.cache_ttl = cache_ttl
+        self._geocoder = geocoder
+        self._limiter = get_rate_limiter("nominatim", requests_per_minute)
+
+    def _get_geocoder(self):
+        if self._geocoder is None:
+            from geopy.geocoders import Nominatim
+            self._geocoder = Nominatim(user_agent="weather_tool")
+        return self._geocoder
+
+    def geocode(self, location: str) -> Optional[Coordinates]:
+        """
+        The coordinates of a location, or None when it cannot be found.
+        Geocoder errors, such as geopy's GeocoderTimedOut, are raised to the caller.
+        """
+        key = normalize_location(location)
+        if not key:
+            return None
+        if self.gazetteer is not None:
+            coordinates = self.gazetteer.lookup(key)
+            if coordinates is not None:
+                return coordinates
+        if self.cache is not None:
+            try:
+                cached = self.cache.get(key)
+            except Exception as e:
+                self.logging.warning("Geocoder:geocode: cache lookup failed %s", e)
+                cached = None
+            if cached is not None:
+                return tuple(json.loads(cached))
+
+        permit = self._limiter.acquire()
+        try:
+            result = self._get_geocoder().geocode(location)
+        finally:
+            self._limiter.release(permit)
+        if not result:
+            return None
+        coordinates = (result.latitude, result.longitude)
+        if self.cache is not None:
+            try:
+                self.cache.set(key, json.dumps(coordinates), self.cache_ttl)
+            except Exception as e:
+                self.logging.warning("Geocoder:geocode: cache store failed %s", e)
+        return coordinates
+
+
+_geocoder: Optional[Geocoder] = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> Geocoder:
+    """
+    The process-wide geocoder, set up from the tools section of config.yaml on first use.
+    """
+    global _geocoder
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                config_manager = ConfigManager()
+                try:
+                    cache = get_shared_cache(
+                        config_manager.get_nested('tools', 'geocode_cache', default='memory'), "geocode",
+                        max_entries=config_manager.get_nested('cache', 'max_entries', default=10000),
+                        sqlite_path=config_manager.get_nested('cache', 'sqlite_path', default='agentgateway_cache.sqlite'),
+                        redis_url=config_manager.get_nested('cache', 'redis_url', default='redis://localhost:6379')
+                    )
+                except Exception as e:
+                    # e.g. a read-only working directory for the sqlite file; geocoding still works without a cache
+                    AgentLogger("Geocoder").warning("get_geocoder: geocode cache unavailable, not caching locations: %s", e)
+                    cache = None
+                use_gazetteer = config_manager.get_nested('tools', 'gazetteer', default=True)
+                _geocoder = Geocoder(
+                    cache=cache,
+                    gazetteer=Gazetteer() if use_gazetteer else None,
+                    cache_ttl=config_manager.get_nested('tools', 'geocode_ttl', default=None),
+                    requests_per_minute=config_manager.get_nested('tools', 'nominatim_requests_per_minute', default=60)
+                )
+    return _geocoder
+
+
+def set_geocoder(geocoder: Optional[Geocoder]) -> Optional[Geocoder]:
+    """
+    Install the process-wide geocoder, or with None go back to the configured one on next use.
+    :return: The geocoder it replaces.
+    """
+    global _geocoder
+    with _geocoder_lock:
+        previous, _geocoder = _geocoder, geocoder
+    return previous
@@ -5,6 +5,8 @@ from textblob import TextBlob
 
 
 class SentimentAnalysisTool(Tool):
+    CACHE_TTL = 3600
+
     def __init__(self):
         super().__init__("analyze_sentiment", "Analyze the sentiment of text")
 
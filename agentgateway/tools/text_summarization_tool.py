@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from agentgateway.core.abstract_tool import Tool
 from anthropic import Anthropic
+from agentgateway.core.clients import get_shared_client
 
 
 class TextSummarizationTool(Tool):
@@ -23,7 +24,7 @@ class TextSummarizationTool(Tool):
         max_length = parameters.get('max_length', 130)
         min_length = parameters.get('min_length', 30)
 
-        client = Anthropic(api_key=self.auth_data['api_key'])
+        client = get_shared_client(Anthropic, api_key=self.auth_data['api_key'])
 
         prompt = f"""Summarize the following text in {min_length} to {max_length} words:
 
@@ -1,6 +1,8 @@
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.cache import make_cache_key
+from agentgateway.core.schema_validator import SchemaValidator
 from agentgateway.tools.askuser_tool import AskUserTool
 from agentgateway.tools.weather_tool import WeatherTool
 from agentgateway.tools.calculator_tool import CalculatorTool
@@ -12,6 +14,8 @@ from agentgateway.tools.topic_detection_tool import TopicDetectionTool
 from agentgateway.tools.text_summarization_tool import TextSummarizationTool
 
 class ToolManager:
+    _validators: Dict[Tuple[type, str], SchemaValidator] = {}
+
     def __init__(self):
         self.logging = AgentLogger("Agent")
 
@@ -22,7 +26,7 @@ class ToolManager:
         if isinstance(input_params, str):
             input_params = json.loads(input_params)
         instance_id = tool_data.get('id')
-        self.logging.info(f"ToolManager:get_tool:tool name requested {tool_name}")
+        self.logging.info("ToolManager:get_tool:tool name requested %s", tool_name)
 
         if tool_name == "ask_user":
             tool = AskUserTool()
@@ -41,87 +45,27 @@ class ToolManager:
         elif tool_name == "summarize_text":
             tool = TextSummarizationTool()
         else:
-            self.logging.info(f"ToolManager:get_tool:Tool name not found {tool_name}")
+            self.logging.info("ToolManager:get_tool:Tool name not found %s", tool_name)
             raise ValueError(f"Unknown tool: {tool_name}")
 
         tool.set_instance_id(instance_id)
 
-        self.logging.info(f"ToolManager:get_tool: setting parameters for the tool {tool_name}")
+        self.logging.info("ToolManager:get_tool: setting parameters for the tool %s", tool_name)
         # Validate and set input parameters
         self._validate_and_set_input(tool, input_params)
-        self.logging.info(f"ToolManager:get_tool: setting parameters completed for the tool {tool_name}")
+        self.logging.info("ToolManager:get_tool: setting parameters completed for the tool %s", tool_name)
         return tool
 
     def _validate_and_set_input(self, tool: Tool, input_params: Dict[str, Any]):
-        self.logging.info(f"ToolManager:_validate_and_set_input: setting input parameters for the tool {tool.name}")
-        schema = tool.get_parameters_schema()
-        properties = schema.get('properties', {})
-        required = schema.get('required', [])
-
-        # Check for required parameters
-        for param in required:
-            if param not in input_params:
-                raise ValueError(f"Missing required parameter: {param}")
-
-        # Validate and set parameters
-        for key, value in input_params.items():
-            if key not in properties:
-                raise ValueError(f"Unexpected parameter: {key}")
+        self.logging.info("ToolManager:_validate_and_set_input: setting input parameters for the tool %s", tool.name)
+        tool.set_validator(self._get_validator(tool))
+        tool.set_parameters(input_params, replace=True)
 
-            expected_type = properties[key]['type']
-            if not self._check_type(value, expected_type):
-                raise TypeError(
-                    f"Invalid type for parameter '{key}'. Expected {expected_type}, got {type(value).__name__}")
-
-            self.logging.info(f"ToolManager:get_tool: setting parameters for the tool {tool.name}")
-            tool.set_parameter(key, value)
-
-    def _check_type(self, value: Any, expected_type: str) -> bool:
-        if expected_type == 'string':
-            return isinstance(value, str)
-        elif expected_type == 'number':
-            return isinstance(value, (int, float))
-        elif expected_type == 'integer':
-            return isinstance(value, int)
-        elif expected_type == 'boolean':
-            return isinstance(value, bool)
-        elif expected_type == 'array':
-            return isinstance(value, list)
-        elif expected_type == 'object':
-            return isinstance(value, dict)
-        else:
-            return True
-
-    def _validate_input(self, tool: Tool, input_params: Dict[str, Any]):
-        schema = tool.get_parameters_schema()
-        required_params = schema.get('required', [])
-        properties = schema.get('properties', {})
-
-        # Check for required parameters
-        for param in required_params:
-            if param not in input_params:
-                raise ValueError(f"Missing required parameter: {param}")
-
-        # Check parameter types
-        for param, value in input_params.items():
-            if param in properties:
-                expected_type = properties[param]['type']
-                if not self._check_type(value, expected_type):
-                    raise TypeError(
-                        f"Invalid type for parameter '{param}'. Expected {expected_type}, got {type(value).__name__}")
-
-    def _check_type(self, value: Any, expected_type: str) -> bool:
-        if expected_type == 'string':
-            return isinstance(value, str)
-        elif expected_type == 'number':
-            return isinstance(value, (int, float))
-        elif expected_type == 'integer':
-            return isinstance(value, int)
-        elif expected_type == 'boolean':
-            return isinstance(value, bool)
-        elif expected_type == 'array':
-            return isinstance(value, list)
-        elif expected_type == 'object':
-            return isinstance(value, dict)
-        else:
-            return True  # For any other types, we'll assume it's valid
+    def _get_validator(self, tool: Tool) -> SchemaValidator:
+        # validators are keyed by class and schema digest, so each schema is compiled once per process
+        key = (type(tool), make_cache_key(tool.get_parameters_schema()))
+        validator = ToolManager._validators.get(key)
+        if validator is None:
+            validator = tool.get_validator()
+            ToolManager._validators[key] = validator
+        return validator
@@ -2,9 +2,12 @@ import json
 from typing import Dict, Any
 from agentgateway.core.abstract_tool import Tool
 from anthropic import Anthropic
+from agentgateway.core.clients import get_shared_client
 
 
 class TopicDetectionTool(Tool):
+    CACHE_TTL = 3600
+
     def __init__(self, model_id=""):
         super().__init__("detect_topics", "Detect main topics in a given text")
         if model_id != "":
@@ -23,7 +26,7 @@ class TopicDetectionTool(Tool):
         text = parameters.get('text')
         num_topics = parameters.get('num_topics', 5)
 
-        client = Anthropic(api_key=self.auth_data['api_key'])
+        client = get_shared_client(Anthropic, api_key=self.auth_data['api_key'])
 
         prompt = f"""Analyze the following text and identify the top {num_topics} main topics. For each topic, provide a short label and the top 3 related words.
 
@@ -54,6 +57,11 @@ class TopicDetectionTool(Tool):
 
         return json.dumps(topics)
 
+    def normalize_cache_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        parameters = super().normalize_cache_parameters(parameters)
+        parameters['model'] = self.model_id
+        return parameters
+
     def get_parameters_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -1,8 +1,12 @@
 from typing import Dict, Any
 from agentgateway.core.abstract_tool import Tool
 from anthropic import Anthropic
+from agentgateway.core.clients import get_shared_client
 
 class TranslationTool(Tool):
+    # translations run at temperature 0, so a phrase translates the same way for a long time
+    CACHE_TTL = 86400
+
     def __init__(self):
         super().__init__("translate", "Translate text from one language to another")
         self.model_id = "claude-3-haiku-20240307"
@@ -25,6 +29,14 @@ class TranslationTool(Tool):
         translated_text = self.translate_text(text, source_lang, target_lang)
         return translated_text
 
+    def normalize_cache_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        parameters = super().normalize_cache_parameters(parameters)
+        for key in ('source_lang', 'target_lang'):
+            if isinstance(parameters.get(key), str):
+                parameters[key] = parameters[key].casefold()
+        parameters['model'] = self.model_id
+        return parameters
+
     def get_parameters_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -46,7 +58,7 @@ class TranslationTool(Tool):
         }
 
     def translate_text(self, text, source_lang, target_lang):
-        client = Anthropic(api_key = self.auth_data['api_key'])
+        client = get_shared_client(Anthropic, api_key=self.auth_data['api_key'])
 
     # Construct the message for Claude
         message = f"Translate the following text from {source_lang} to {target_lang}: '{text}'"
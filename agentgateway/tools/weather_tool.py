@@ -1,11 +1,15 @@
 import requests
 from typing import Dict, Any
 from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.clients import get_shared_session, get_http_timeout
+from agentgateway.tools.geocoding import get_geocoder, normalize_location
 from datetime import datetime
-from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
 
 class WeatherTool(Tool):
+    # the report is current for a few minutes, and the same cities are asked for again and again
+    CACHE_TTL = 600
+
     def __init__(self):
         super().__init__("get_weather", "Get the current weather for a specified location")
 
@@ -29,14 +33,21 @@ class WeatherTool(Tool):
             "required": ["location"]
         }
 
+    def normalize_cache_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        # "London,UK", "london, uk" and "London , UK" geocode to the same place
+        return {'location': normalize_location(parameters.get('location'))}
+
+    def is_cacheable_result(self, tool_output: Any) -> bool:
+        return not (isinstance(tool_output, str) and
+                    tool_output.startswith(("Unable to find coordinates", "An error occurred")))
+
     def get_coordinates(self, location_name):
-        geolocator = Nominatim(user_agent="weather_tool")
+        """
+        Resolve a location through the process-wide Geocoder: the offline gazetteer, the geocode cache and only
+        then Nominatim, configured in the tools section of config.yaml.
+        """
         try:
-            location = geolocator.geocode(location_name)
-            if location:
-                return location.latitude, location.longitude
-            else:
-                return None
+            return get_geocoder().geocode(location_name)
         except (GeocoderTimedOut, GeocoderUnavailable):
             print("Error: Geocoding service is unavailable. Please try again later.")
             return None
@@ -63,7 +74,7 @@ class WeatherTool(Tool):
 
         try:
             # Make the API request
-            response = requests.get(url, params=params)
+            response = get_shared_session().get(url, params=params, timeout=get_http_timeout())
             response.raise_for_status()  # Raise an exception for bad responses
             data = response.json()
 
@@ -1,10 +1,12 @@
 import json
 from typing import Dict, Any
 from agentgateway.core.abstract_tool import Tool
-import requests
+from agentgateway.core.clients import get_shared_session, get_http_timeout
 from bs4 import BeautifulSoup
 
 class WebSearchTool(Tool):
+    CACHE_TTL = 900
+
     def __init__(self):
         super().__init__("web_search", "Perform a web search and return top results")
         self.search_url = "https://www.google.com/search"
@@ -21,7 +23,8 @@ class WebSearchTool(Tool):
         num_results = parameters.get('num_results', 5)
 
         try:
-            response = requests.get(self.search_url, params={"q": query}, headers=self.headers)
+            response = get_shared_session().get(self.search_url, params={"q": query}, headers=self.headers,
+                                               timeout=get_http_timeout())
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -45,6 +48,10 @@ class WebSearchTool(Tool):
         except Exception as e:
             return {"error": str(e)}
 
+    def is_cacheable_result(self, tool_output: Any) -> bool:
+        # failed searches are reported as {"error": ...}
+        return not isinstance(tool_output, dict)
+
     def get_parameters_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
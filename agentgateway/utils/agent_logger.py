@@ -1,48 +1,134 @@
+import atexit
 import logging
-from typing import Any, Dict, Optional
+import os
+import queue
+import threading
+import warnings
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Optional, Union
+
+from agentgateway.utils.config_manager import ConfigManager
+
+# _queue_listeners holds the listener of each logger set up with use_queue, stopped at exit so queued records are written
+_queue_listeners: Dict[str, QueueListener] = {}
+_setup_lock = threading.Lock()
+
+Message = Union[str, Callable[[], str]]
+
+
+class _TraceIdFilter(logging.Filter):
+    """
+    Gives records logged without a trace id an empty one, so the trace id format works for every record.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "trace_id"):
+            record.trace_id = ""
+        return True
+
+
+def _stop_queue_listeners():
+    with _setup_lock:
+        for listener in _queue_listeners.values():
+            listener.stop()
+        _queue_listeners.clear()
+
+
+atexit.register(_stop_queue_listeners)
+
 
 class AgentLogger:
-    def __init__(self, name: str, level: str = "ERROR", trace_id: Optional[str] = ""):
+    """
+    Logger of the gateway, adapters and tools.
+
+    Messages are formatted only when their level is enabled: pass %-style arguments, as with logging, or a
+    callable returning the message, instead of formatting the message at the call:
+
+        self.logging.info("AgentGateway:run_agent: tool output: %s", tool_output)
+        self.logging.debug(lambda: f"request: {json.dumps(request)}")
+
+    The console handler is added once per logger name, however many AgentLoggers share the name, and passes every
+    record the logger lets through, so the level of the latest AgentLogger of a name applies. With use_queue,
+    the logger puts records on a queue and a background thread writes them, so logging I/O stays off the
+    request thread; it defaults to the logging.use_queue setting of config.yaml.
+    """
+
+    def __init__(self, name: str, level: str = "ERROR", trace_id: Optional[str] = "", use_queue: Optional[bool] = None):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         self.trace_id = trace_id
+        self._setup_handler(use_queue)
 
-        # Create console handler and set level
-        ch = logging.StreamHandler()
-        ch.setLevel(level)
+    def _setup_handler(self, use_queue: Optional[bool]):
+        with _setup_lock:
+            existing = next((handler for handler in self.logger.handlers
+                             if getattr(handler, "_agentgateway_handler", False)), None)
+            if existing is not None:
+                if use_queue is not None and use_queue != isinstance(existing, QueueHandler):
+                    warnings.warn(f"Logger {self.logger.name!r} is already set up with use_queue="
+                                  f"{not use_queue}; use_queue={use_queue} is ignored", RuntimeWarning, stacklevel=4)
+                return
+            if use_queue is None:
+                use_queue = ConfigManager().get_nested('logging', 'use_queue', default=False)
 
-        # Create formatter
-        if self.trace_id is not None:
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(trace_id)s - %(message)s')
-        else:
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        # Add formatter to ch
-        ch.setFormatter(formatter)
+            # Create console handler; the logger's level decides what is logged
+            ch = logging.StreamHandler()
+
+            # Create formatter
+            if self.trace_id is not None:
+                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(trace_id)s - %(message)s')
+            else:
+                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            # Add formatter to ch
+            ch.setFormatter(formatter)
+            ch.addFilter(_TraceIdFilter())
+
+            if use_queue:
+                listener = QueueListener(queue.SimpleQueue(), ch, respect_handler_level=True)
+                listener.start()
+                _queue_listeners[self.logger.name] = listener
+                handler = QueueHandler(listener.queue)
+            else:
+                handler = ch
+            handler._agentgateway_handler = True
+
+            # Add the handler to logger
+            self.logger.addHandler(handler)
 
-        # Add ch to logger
-        self.logger.addHandler(ch)
+    def isEnabledFor(self, level: Union[int, str]) -> bool:
+        """
+        Whether messages of a level are logged, e.g. to skip building an expensive message.
+        :param level: A logging level, such as logging.INFO or "INFO".
+        """
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        return self.logger.isEnabledFor(level)
 
-    def _log(self, level: str, message: str, extra: Optional[Dict[str, Any]] = None):
+    def _log(self, level: int, message: Message, args: tuple, extra: Optional[Dict[str, Any]] = None):
+        if not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
         if extra is None:
             extra = {}
         if self.trace_id is not None:
             extra['trace_id'] = self.trace_id
-        getattr(self.logger, level)(message, extra=extra)
+        self.logger.log(level, message, *args, extra=extra, stacklevel=3)
 
-    def info(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self._log('info', message, extra)
+    def info(self, message: Message, *args, extra: Optional[Dict[str, Any]] = None):
+        self._log(logging.INFO, message, args, extra)
 
-    def warning(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self._log('warning', message, extra)
+    def warning(self, message: Message, *args, extra: Optional[Dict[str, Any]] = None):
+        self._log(logging.WARNING, message, args, extra)
 
-    def error(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self._log('error', message, extra)
+    def error(self, message: Message, *args, extra: Optional[Dict[str, Any]] = None):
+        self._log(logging.ERROR, message, args, extra)
 
-    def debug(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self._log('debug', message, extra)
+    def debug(self, message: Message, *args, extra: Optional[Dict[str, Any]] = None):
+        self._log(logging.DEBUG, message, args, extra)
 
-    def critical(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self._log('critical', message, extra)
+    def critical(self, message: Message, *args, extra: Optional[Dict[str, Any]] = None):
+        self._log(logging.CRITICAL, message, args, extra)
 
     def set_level(self, level: str):
         self.logger.setLevel(level)
@@ -51,7 +137,12 @@ class AgentLogger:
         self.trace_id = trace_id
 
     def add_file_handler(self, filename: str, level: str = "INFO"):
-        file_handler = logging.FileHandler(filename)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(trace_id)s - %(message)s'))
-        self.logger.addHandler(file_handler)
\ No newline at end of file
+        with _setup_lock:
+            if any(isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(filename)
+                   for handler in self.logger.handlers):
+                return
+            file_handler = logging.FileHandler(filename)
+            file_handler.setLevel(level)
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(trace_id)s - %(message)s'))
+            file_handler.addFilter(_TraceIdFilter())
+            self.logger.addHandler(file_handler)
@@ -23,5 +23,6 @@ setup(
     python_requires=">=3.6",  # Update as needed
     package_data={
         '': ['config.yaml'],  # Include config.yaml in the root of the package
+        'agentgateway.tools': ['data/*.json'],  # Offline gazetteer of WeatherTool
     },
 )
@@ -0,0 +1,10 @@
+from openai.types.chat import ChatCompletionChunk
+
+
+def chat_completion_chunk(delta=None, finish_reason=None, usage=None, model="test-model") -> ChatCompletionChunk:
+    """A chunk of a streamed chat completion; without a delta, a usage-only chunk with no choices."""
+    return ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": model,
+        "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        "usage": usage
+    })
@@ -1,8 +1,10 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from agentgateway.adapters.anthropic_claude_agent import AnthropicClaudeAgent
 from agentgateway.core.response import Response, ResponseType
 from agentgateway.core.abstract_tool import Tool
+from anthropic.types import Message
 
 class TestAnthropicClaudeAgent(unittest.TestCase):
 
@@ -47,3 +49,101 @@ class TestAnthropicClaudeAgent(unittest.TestCase):
             "tool_use_id": "tool_id",
             "content": "Tool output"
         })
+
+    def _agent_with_history(self):
+        mock_tool = MagicMock(spec=Tool)
+        mock_tool.name = "test_tool"
+        mock_tool.description = "A test tool"
+        mock_tool.get_parameters_schema.return_value = {"properties": {}, "required": []}
+        self.agent.add_tool(mock_tool)
+        self.agent.set_instructions("A long system prompt")
+        self.agent.current_conversation_id = "cid"
+        self.agent.add_to_conversation_history({"role": "user", "content": "Weather in Paris?"}, "cid")
+        self.agent.add_to_conversation_history({"role": "assistant", "content": [
+            {"type": "tool_use", "id": "t1", "name": "test_tool", "input": {}}]}, "cid")
+        self.agent.add_to_conversation_history({"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "t1", "content": "sunny"}]}, "cid")
+
+    def test_build_request_without_prompt_caching(self):
+        self._agent_with_history()
+        request = self.agent._build_request("cid")
+        self.assertEqual(request["system"], "A long system prompt")
+        self.assertNotIn("cache_control", request["tools"][-1])
+        self.assertEqual(request["messages"][0]["content"], "Weather in Paris?")
+
+    def test_build_request_with_prompt_caching(self):
+        self._agent_with_history()
+        self.agent.set_prompt_caching(True)
+        request = self.agent._build_request("cid")
+
+        ephemeral = {"type": "ephemeral"}
+        self.assertEqual(request["system"], [{"type": "text", "text": "A long system prompt", "cache_control": ephemeral}])
+        self.assertEqual(request["tools"][-1]["cache_control"], ephemeral)
+        self.assertEqual(request["messages"][0]["content"],
+                         [{"type": "text", "text": "Weather in Paris?", "cache_control": ephemeral}])
+        self.assertNotIn("cache_control", request["messages"][1]["content"][-1])
+        self.assertEqual(request["messages"][2]["content"][-1]["cache_control"], ephemeral)
+
+        # the shared tool definitions and the stored history are left untouched
+        self.assertNotIn("cache_control", self.agent.formatted_tools[-1])
+        history = self.agent.get_conversation_history("cid")
+        self.assertEqual(history[0]["content"], "Weather in Paris?")
+        self.assertNotIn("cache_control", history[2]["content"][-1])
+
+    def test_run_records_prompt_cache_usage(self):
+        self.agent.set_auth(api_key="test_api_key")
+        self.agent.set_prompt_caching(True)
+        message = Message.model_validate({
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-2",
+            "content": [{"type": "text", "text": "Sunny"}], "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 12, "output_tokens": 3,
+                      "cache_read_input_tokens": 900, "cache_creation_input_tokens": 40}
+        })
+        self.agent.client = MagicMock()
+        self.agent.client.messages.create.return_value = message
+
+        response = self.agent.run("Weather?", conversation_id="cid")
+
+        self.assertEqual(response.response_type, ResponseType.ANSWER)
+        usage = response.get_usage_details()
+        self.assertEqual(usage["total_cache_read_tokens"], 900)
+        self.assertEqual(usage["total_cache_write_tokens"], 40)
+        trace = response.get_trace_details()[0]
+        self.assertEqual((trace["cache_read_tokens"], trace["cache_write_tokens"]), (900, 40))
+        # the history is stored in the canonical format
+        self.assertEqual(self.agent.get_conversation_history("cid"), [{"role": "user", "content": "Weather?"},
+                                                                      {"role": "assistant", "content": "Sunny"}])
+
+    def test_provider_batch(self):
+        self.agent.set_auth(api_key="test_api_key")
+        self.agent.client = MagicMock()
+        self.agent.client.post.return_value = {"id": "msgbatch_1", "processing_status": "in_progress"}
+
+        batch_id = self.agent.submit_batch({"request-0": "Hi", "request-1": "Bye"})
+
+        self.assertEqual(batch_id, "msgbatch_1")
+        path = self.agent.client.post.call_args[0][0]
+        body = self.agent.client.post.call_args[1]["body"]
+        self.assertEqual(path, "/v1/messages/batches")
+        self.assertEqual([item["custom_id"] for item in body["requests"]], ["request-0", "request-1"])
+        self.assertEqual(body["requests"][1]["params"]["messages"], [{"role": "user", "content": "Bye"}])
+
+        self.agent.client.get.return_value = {"processing_status": "in_progress"}
+        self.assertIsNone(self.agent.get_batch_results(batch_id))
+
+        message = {"id": "msg_1", "type": "message", "role": "assistant", "model": "claude-2",
+                   "content": [{"type": "text", "text": "Hello"}], "stop_reason": "end_turn",
+                   "stop_sequence": None, "usage": {"input_tokens": 5, "output_tokens": 1}}
+        results = "\n".join([
+            json.dumps({"custom_id": "request-0", "result": {"type": "succeeded", "message": message}}),
+            json.dumps({"custom_id": "request-1", "result": {"type": "errored", "error": {
+                "type": "error", "error": {"type": "invalid_request_error", "message": "bad request"}}}}),
+        ])
+        self.agent.client.get.side_effect = [{"processing_status": "ended"}, results]
+
+        responses = self.agent.get_batch_results(batch_id)
+
+        self.assertEqual(responses["request-0"].content, "Hello")
+        self.assertEqual(responses["request-0"].get_usage_details()["total_input_tokens"], 5)
+        self.assertEqual(responses["request-1"].response_type, ResponseType.ERROR)
+        self.assertEqual(responses["request-1"].content, "bad request")
@@ -80,3 +80,31 @@ class TestBedrockConverseAgent(unittest.TestCase):
                 "status": "success"
             }
         })
+
+    def test_build_request_with_prompt_caching(self):
+        mock_tool = MagicMock(spec=Tool)
+        mock_tool.name = "test_tool"
+        mock_tool.description = "A test tool"
+        mock_tool.get_parameters_schema.return_value = {"properties": {}, "required": []}
+        self.agent.add_tool(mock_tool)
+        self.agent.set_instructions("A long system prompt")
+        self.agent.add_to_conversation_history({"role": "user", "content": [{"text": "Weather?"}]}, "cid")
+
+        request = self.agent._build_request("cid")
+        self.assertEqual(request["system"], [{"text": "A long system prompt"}])
+        self.assertEqual(len(request["toolConfig"]["tools"]), 1)
+
+        self.agent.set_prompt_caching(True)
+        request = self.agent._build_request("cid")
+        cache_point = {"cachePoint": {"type": "default"}}
+        self.assertEqual(request["system"], [{"text": "A long system prompt"}, cache_point])
+        self.assertEqual(request["toolConfig"]["tools"][-1], cache_point)
+        self.assertEqual(request["messages"][0]["content"], [{"text": "Weather?"}, cache_point])
+        self.assertEqual(len(self.agent.formatted_tools), 1)
+        self.assertEqual(self.agent.get_conversation_history("cid")[0]["content"], [{"text": "Weather?"}])
+
+    def test_cache_usage(self):
+        usage = {"usage": {"inputTokens": 10, "outputTokens": 2,
+                           "cacheReadInputTokens": 500, "cacheWriteInputTokens": 20}}
+        self.assertEqual(self.agent._get_cache_usage(usage), (500, 20))
+        self.assertEqual(self.agent._get_cache_usage({"usage": {"inputTokens": 10}}), (0, 0))
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from groq.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 from agentgateway.core.response import Response, ResponseType
 from agentgateway.core.abstract_tool import Tool
@@ -76,5 +76,31 @@ class TestGroqAgent(unittest.TestCase):
         self.assertEqual(formatted_output["name"], "test_tool")
         self.assertEqual(formatted_output["content"], "Tool output")
 
+class TestGroqAgentAsync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.agent = GroqAgent("groq-model-id")
+
+    @patch("groq.AsyncClient")
+    @patch("groq.Client")
+    async def test_arun_answer(self, mock_client, mock_async_client):
+        self.agent.set_auth(api_key="test_api_key")
+        mock_response = MagicMock()
+        mock_response.choices[0].finish_reason = "stop"
+        mock_response.choices[0].message = ChatCompletionMessage(role="assistant", content="Test answer")
+        mock_response.usage.prompt_tokens = 10
+        mock_response.usage.completion_tokens = 5
+        mock_async_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        response = await self.agent.arun("Test input", is_tool_response=False)
+
+        self.assertEqual(response.response_type, ResponseType.ANSWER)
+        self.assertEqual(response.content, "Test answer")
+        self.assertEqual(response.get_usage_details()["total_input_tokens"], 10)
+        mock_client.return_value.chat.completions.create.assert_not_called()
+        mock_async_client.assert_called_once()
+        self.assertEqual(mock_async_client.call_args.kwargs["api_key"], "test_api_key")
+        self.assertEqual(mock_async_client.call_args.kwargs["max_retries"], 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
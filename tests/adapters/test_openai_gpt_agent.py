@@ -1,10 +1,14 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from agentgateway.adapters.openai_gpt_agent import  OpenAIGPTAgent
-from agentgateway.core.response import Response, ResponseType
+from agentgateway.core.response import Response, ResponseType, StreamEventType
 from agentgateway.core.abstract_tool import Tool
 from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function
+from openai.types.chat import ChatCompletion
+from agentgateway.core.cache import InMemoryCache
+from tests.adapters.chat_completion_chunks import chat_completion_chunk
 
 class TestOpenAIGPTAgent(unittest.TestCase):
 
@@ -68,3 +72,91 @@ class TestOpenAIGPTAgent(unittest.TestCase):
         self.assertEqual(assistant_message["role"], "assistant")
         self.assertEqual(len(assistant_message["tool_calls"]), 1)
         self.assertEqual(assistant_message["tool_calls"][0]["function"]["name"], "test_tool")
+
+
+    @patch('agentgateway.adapters.openai_gpt_agent.OpenAI')
+    def test_run_uses_response_cache(self, mock_openai):
+        completion = ChatCompletion.model_validate({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Cached answer"}}],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}
+        })
+        mock_openai.return_value.chat.completions.create.return_value = completion
+        self.agent.set_auth(api_key="test_api_key")
+        self.agent.set_response_cache(InMemoryCache(), ttl=60)
+
+        first = self.agent.run("Same question", conversation_id="conv-1")
+        self.agent.response = None
+        second = self.agent.run("Same question", conversation_id="conv-2")
+
+        self.assertEqual(mock_openai.return_value.chat.completions.create.call_count, 1)
+        self.assertEqual(first.content, "Cached answer")
+        self.assertEqual(second.content, "Cached answer")
+        self.assertEqual(second.get_usage_details()["llm_calls"], 0)
+        self.assertEqual([t["event_type"] for t in second.get_trace_details()], ["llm_cache_hit"])
+        self.assertEqual(second.get_trace_details()[0]["input_tokens"], 12)
+
+    @patch('agentgateway.adapters.openai_gpt_agent.OpenAI')
+    def test_stream_matches_run(self, mock_openai):
+        mock_openai.return_value.chat.completions.create.return_value = iter([
+            chat_completion_chunk({"role": "assistant", "content": "Streamed "}),
+            chat_completion_chunk({"content": "answer"}),
+            chat_completion_chunk({}, finish_reason="stop"),
+            chat_completion_chunk(usage={"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}),
+        ])
+        self.agent.set_auth(api_key="test_api_key")
+
+        events = list(self.agent.stream("Question", conversation_id="conv-1"))
+
+        _, kwargs = mock_openai.return_value.chat.completions.create.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual([e.content for e in events[:-1]], ["Streamed ", "answer"])
+        self.assertEqual(events[-1].event_type, StreamEventType.RESPONSE)
+        response = events[-1].response
+        self.assertEqual(response.response_type, ResponseType.ANSWER)
+        self.assertEqual(response.content, "Streamed answer")
+        self.assertEqual(response.get_usage_details()["total_input_tokens"], 12)
+        self.assertEqual([t["event_type"] for t in response.get_trace_details()], ["llm_call"])
+        self.assertEqual(self.agent.get_conversation_history("conv-1")[-1],
+                         {"role": "assistant", "content": "Streamed answer"})
+
+    @patch('agentgateway.adapters.openai_gpt_agent.OpenAI')
+    def test_provider_batch(self, mock_openai):
+        client = mock_openai.return_value
+        client.files.create.return_value = MagicMock(id="file-in")
+        client.batches.create.return_value = MagicMock(id="batch-1")
+        self.agent.set_auth(api_key="test_api_key")
+        self.agent.set_instructions("Be brief")
+
+        batch_id = self.agent.submit_batch({"request-0": "Hi", "request-1": "Bye"})
+
+        self.assertEqual(batch_id, "batch-1")
+        _, file_kwargs = client.files.create.call_args
+        lines = [json.loads(line) for line in file_kwargs["file"][1].decode("utf-8").splitlines()]
+        self.assertEqual([line["custom_id"] for line in lines], ["request-0", "request-1"])
+        self.assertEqual(lines[0]["url"], "/v1/chat/completions")
+        self.assertEqual(lines[0]["body"]["messages"][-1], {"role": "user", "content": "Hi"})
+
+        client.batches.retrieve.return_value = MagicMock(status="in_progress")
+        self.assertIsNone(self.agent.get_batch_results(batch_id))
+
+        completion = {
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hello"}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}
+        }
+        output = json.dumps({"custom_id": "request-0", "response": {"status_code": 200, "body": completion}, "error": None})
+        client.batches.retrieve.return_value = MagicMock(status="completed", output_file_id="file-out", error_file_id=None)
+        client.files.content.return_value = MagicMock(text=output + "\n")
+
+        responses = self.agent.get_batch_results(batch_id)
+
+        self.assertEqual(responses["request-0"].response_type, ResponseType.ANSWER)
+        self.assertEqual(responses["request-0"].content, "Hello")
+        self.assertEqual(responses["request-0"].get_usage_details()["total_input_tokens"], 5)
+        self.assertEqual(responses["request-1"].response_type, ResponseType.ERROR)
+
+    def test_set_response_cache_rejects_invalid_cache(self):
+        with self.assertRaises(TypeError):
+            self.agent.set_response_cache({})
@@ -0,0 +1,187 @@
+import asyncio
+import time
+import unittest
+from typing import Any, Dict, Optional
+
+from agentgateway.adapters.routing_agent import RoutingAgent
+from agentgateway.agent_gateway import AgentGateway
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.message import to_provider_messages
+from agentgateway.core.prompt import Prompt
+from agentgateway.core.response import Response, ResponseType, EventType, StreamEvent, StreamEventType
+
+
+class WeatherTool(Tool):
+    def __init__(self):
+        super().__init__("weather", "Current weather of a city")
+
+    def execute(self) -> Any:
+        return {"city": self.get_parameter("city"), "temp": 21}
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+class ScriptedBackend(AbstractAgent):
+    """
+    Plays a script of turns, "error", ("tool", city) or ("answer", text), storing its messages in the
+    chat_completions or anthropic format. requests records the history each turn was sent.
+    """
+
+    def __init__(self, history_format: str, script):
+        super().__init__("llama")
+        self.WIRE_FORMAT = history_format
+        self.script = list(script)
+        self.requests = []
+        self.response = None
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response = self.response
+        response.set_conversation_id(conversation_id)
+        if is_tool_response and self.WIRE_FORMAT == "chat_completions":
+            self.extend_conversation_history(agent_input, conversation_id)
+        else:
+            self.add_to_conversation_history({"role": "user", "content": agent_input}, conversation_id)
+        self.requests.append(list(self.get_conversation_history(conversation_id)))
+
+        turn = self.script.pop(0)
+        if turn == "error":
+            response.add_trace_detail(EventType.LLM_ERROR, latency=0.01, attempt=1, error="APIConnectionError")
+            response.set_response_type(ResponseType.ERROR)
+            response.set_content("connection reset")
+            return response
+        response.update_usage(10, 5)
+        response.add_trace_detail(EventType.LLM_CALL, latency=0.01, input_tokens=10, output_tokens=5, attempt=1)
+        if turn[0] == "tool":
+            if self.WIRE_FORMAT == "anthropic":
+                message = {"role": "assistant", "content": [
+                    {"type": "tool_use", "id": "toolu_1", "name": "weather", "input": {"city": turn[1]}}]}
+                tool_id = "toolu_1"
+            else:
+                message = {"role": "assistant", "tool_calls": [{"id": "call_1", "type": "function", "function": {
+                    "name": "weather", "arguments": f'{{"city": "{turn[1]}"}}'}}]}
+                tool_id = "call_1"
+            self.add_to_conversation_history(message, conversation_id)
+            response.set_response_type(ResponseType.TOOL_CALL)
+            response.set_tools([self.get_tool_from_response({"name": "weather", "input": {"city": turn[1]},
+                                                             "id": tool_id})])
+        else:
+            content = [{"type": "text", "text": turn[1]}] if self.WIRE_FORMAT == "anthropic" else turn[1]
+            self.add_to_conversation_history({"role": "assistant", "content": content}, conversation_id)
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(turn[1])
+        return response
+
+    async def arun(self, agent_input, is_tool_response: Optional[bool] = False,
+                   conversation_id: Optional[str] = None) -> Response:
+        return self.run(agent_input, is_tool_response, conversation_id)
+
+    def stream(self, agent_input, is_tool_response: Optional[bool] = False,
+               conversation_id: Optional[str] = None):
+        response = self.run(agent_input, is_tool_response, conversation_id)
+        if response.response_type == ResponseType.ANSWER:
+            yield StreamEvent(StreamEventType.TEXT_DELTA, content=response.content)
+        yield StreamEvent(StreamEventType.RESPONSE, response=response)
+
+    def get_formatted_tool_output(self, tool, tool_output):
+        raise AssertionError("the router formats tool output")
+
+    def set_auth(self, **kwargs):
+        self.auth_data = kwargs
+
+    def get_auth(self) -> Dict[str, Any]:
+        return self.auth_data
+
+    def set_model_config(self, **kwargs):
+        self.model_config.update(kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+
+def make_gateway(router: RoutingAgent) -> AgentGateway:
+    gateway = AgentGateway(router, "llama")
+    gateway.prepare_agent(Prompt("Answer about the weather"), [WeatherTool()])
+    return gateway
+
+
+class TestRoutingAgent(unittest.TestCase):
+    def test_fails_over_mid_conversation_with_translated_history(self):
+        groq = ScriptedBackend("chat_completions", [("tool", "Paris"), ("answer", "21 degrees in Paris")])
+        claude = ScriptedBackend("anthropic", ["error"])
+        router = RoutingAgent({"groq": groq, "claude": claude})
+        gateway = make_gateway(router)
+
+        response = gateway.run_agent("Weather in Paris?", gateway.start_conversation())
+
+        self.assertEqual(response.content, "21 degrees in Paris")
+        # the second turn tries claude, never called before, which sends the tool call made on groq as Anthropic
+        # content blocks
+        self.assertEqual(to_provider_messages(claude.requests[0], "anthropic"), [
+            {"role": "user", "content": "Weather in Paris?"},
+            {"role": "assistant", "content": [
+                {"type": "tool_use", "id": "call_1", "name": "weather", "input": {"city": "Paris"}}]},
+            {"role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": "call_1", "content": '{"city": "Paris", "temp": 21}'}]},
+        ])
+        # the failed turn left nothing in the history, which is stored in the chat_completions format
+        history = router.get_conversation_history(response.conversation_id)
+        self.assertEqual([message["role"] for message in history], ["user", "assistant", "tool", "assistant"])
+        self.assertEqual(history[-1], {"role": "assistant", "content": "21 degrees in Paris"})
+        traces = [(t["event_type"], t["name"]) for t in response.get_trace_details()]
+        self.assertEqual(traces, [("llm_call", "groq"), ("tool_call", "weather"), ("llm_error", "claude"),
+                                  ("llm_call", "groq")])
+        self.assertEqual(router.route(), ["groq", "claude"])
+
+    def test_routes_to_the_fastest_healthy_backend(self):
+        router = RoutingAgent({"slow": ScriptedBackend("chat_completions", []),
+                               "fast": ScriptedBackend("chat_completions", [])})
+        self.assertEqual(router.route(), ["slow", "fast"])
+
+        now = time.monotonic()
+        router.stats["slow"].record(2.0, False, router.ewma_alpha, now)
+        router.stats["fast"].record(0.5, False, router.ewma_alpha, now)
+        self.assertEqual(router.route(), ["fast", "slow"])
+
+        # errors outweigh latency, and are forgotten while the backend is idle
+        router.stats["fast"].record(0.5, True, router.ewma_alpha, now)
+        router.stats["fast"].record(0.5, True, router.ewma_alpha, now)
+        self.assertEqual(router.route()[0], "slow")
+        stats = router.stats["fast"]
+        self.assertLess(stats.score(router.error_penalty, router.error_half_life, now + 600), 2.0)
+
+    def test_all_backends_failing(self):
+        router = RoutingAgent([ScriptedBackend("chat_completions", ["error"]),
+                               ScriptedBackend("anthropic", ["error"])])
+        gateway = make_gateway(router)
+        with self.assertRaisesRegex(Exception, "All backends failed"):
+            gateway.run_agent("Weather?", gateway.start_conversation())
+
+    def test_async_and_streaming_fail_over(self):
+        backends = {"a": ScriptedBackend("chat_completions", ["error", "error"]),
+                    "b": ScriptedBackend("anthropic", [("answer", "sunny"), ("answer", "still sunny")])}
+        gateway = make_gateway(RoutingAgent(backends))
+        conversation_id = gateway.start_conversation()
+
+        response = asyncio.run(gateway.arun_agent("Weather?", conversation_id))
+        self.assertEqual(response.content, "sunny")
+
+        events = list(gateway.stream_agent("And now?", conversation_id))
+        self.assertEqual([event.content for event in events if event.event_type == StreamEventType.TEXT_DELTA],
+                         ["still sunny"])
+        self.assertEqual(backends["b"].requests[1][:2], [{"role": "user", "content": "Weather?"},
+                                                       {"role": "assistant", "content": "sunny"}])
+
+    def test_rejects_non_agents(self):
+        with self.assertRaises(TypeError):
+            RoutingAgent({"a": object()})
+        with self.assertRaises(ValueError):
+            RoutingAgent([])
+
+
+if __name__ == '__main__':
+    unittest.main()
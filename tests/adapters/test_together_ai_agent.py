@@ -5,6 +5,7 @@ from agentgateway.core.response import Response, ResponseType
 from agentgateway.core.abstract_tool import Tool
 from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function
+from tests.adapters.chat_completion_chunks import chat_completion_chunk
 
 class TestTogetherAIAgent(unittest.TestCase):
 
@@ -103,6 +104,23 @@ class TestTogetherAIAgent(unittest.TestCase):
             "content": "Tool output",
         })
 
+    @patch('openai.OpenAI')
+    def test_stream_reports_usage(self, mock_openai):
+        mock_openai.return_value.chat.completions.create.return_value = iter([
+            chat_completion_chunk({"role": "assistant", "content": "Streamed answer"}),
+            chat_completion_chunk({}, finish_reason="stop"),
+            chat_completion_chunk(usage={"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}),
+        ])
+        self.agent.set_auth(api_key="test_api_key")
+
+        response = list(self.agent.stream("Question"))[-1].response
+
+        _, kwargs = mock_openai.return_value.chat.completions.create.call_args
+        self.assertEqual(kwargs["stream_options"], {"include_usage": True})
+        self.assertEqual(response.content, "Streamed answer")
+        self.assertEqual(response.get_usage_details()["total_input_tokens"], 12)
+        self.assertEqual(response.get_usage_details()["total_output_tokens"], 3)
+
     def test_run_without_auth(self):
         with self.assertRaises(ValueError):
             self.agent.run("Test input")
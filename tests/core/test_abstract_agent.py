@@ -3,6 +3,7 @@ from typing import Dict, Any
 from agentgateway.core.abstract_agent import AbstractAgent
 from agentgateway.core.response import Response, ResponseType
 from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.history_policy import FullHistoryPolicy, LastMessagesPolicy
 
 class ConcreteTool(Tool):
     def __init__(self, name: str, description: str):
@@ -107,5 +108,23 @@ class TestAbstractAgent(unittest.TestCase):
         formatted_output = self.agent.get_formatted_tool_output(tool, "Test output")
         self.assertEqual(formatted_output, "Tool test_tool output: Test output")
 
+    def test_request_history_uses_history_policy(self):
+        conversation_id = self.agent.start_conversation()
+        for i in range(3):
+            self.agent.add_to_conversation_history({"role": "user", "content": f"q{i}"}, conversation_id)
+            self.agent.add_to_conversation_history({"role": "assistant", "content": f"a{i}"}, conversation_id)
+
+        self.assertIsInstance(self.agent.history_policy, FullHistoryPolicy)
+        self.assertEqual(len(self.agent.get_request_history(conversation_id)), 6)
+
+        self.agent.set_history_policy(LastMessagesPolicy(2))
+        self.assertEqual(self.agent.get_request_history(conversation_id),
+                         [{"role": "user", "content": "q2"}, {"role": "assistant", "content": "a2"}])
+        self.assertEqual(len(self.agent.get_conversation_history(conversation_id)), 6)
+
+    def test_set_history_policy_rejects_invalid_policy(self):
+        with self.assertRaises(TypeError):
+            self.agent.set_history_policy(object())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
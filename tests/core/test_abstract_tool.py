@@ -1,3 +1,5 @@
+import asyncio
+import tracemalloc
 import unittest
 from typing import Dict, Any
 from abc import ABC, abstractmethod
@@ -95,8 +97,56 @@ class TestAbstractTool(unittest.TestCase):
         self.assertNotEqual(cloned_tool.get_instance_id(), self.tool.get_instance_id())
         self.assertEqual(cloned_tool.get_instance_id(), "")
 
+    def test_create_invocation(self):
+        self.tool.set_auth(api_key="test_key")
+        self.tool.resource = {"model": list(range(10))}
+
+        invocation = self.tool.create_invocation("call_1")
+        invocation.set_parameters({"param1": "value1"})
+
+        self.assertIsInstance(invocation, ConcreteTool)
+        self.assertEqual(invocation.get_instance_id(), "call_1")
+        self.assertEqual(invocation.execute(), "Executed")
+        # definition, auth and attached resources are shared, per-call state is not
+        self.assertIs(invocation.auth_data, self.tool.auth_data)
+        self.assertIs(invocation.resource, self.tool.resource)
+        self.assertEqual(self.tool.get_parameters(), {})
+        self.assertEqual(self.tool.get_instance_id(), "")
+
+    def test_invocation_allocates_less_than_clone(self):
+        # stands in for a loaded model or client attached to the tool
+        self.tool.resource = {"weights": [float(i) for i in range(5000)]}
+
+        def allocated_per_call(make_instance, calls=200):
+            tracemalloc.start()
+            snapshot = tracemalloc.take_snapshot()
+            instances = [make_instance() for _ in range(calls)]
+            stats = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+            tracemalloc.stop()
+            self.assertEqual(len(instances), calls)
+            return sum(stat.size_diff for stat in stats) / calls
+
+        cloned = allocated_per_call(self.tool.clone)
+        invoked = allocated_per_call(lambda: self.tool.create_invocation("call"))
+        print(f"\nbytes allocated per tool call: clone {cloned:.0f}, create_invocation {invoked:.0f}")
+        self.assertLess(invoked * 20, cloned)
+
+    def test_cache_key(self):
+        self.assertIsNone(self.tool.get_cache_key())
+
+        self.tool.set_cache_ttl(60)
+        self.tool.set_parameters({"param1": " a   b ", "param2": 1})
+        key = self.tool.get_cache_key()
+        self.tool.set_parameters({"param1": "a b"})
+        self.assertEqual(self.tool.get_cache_key(), key)
+        self.tool.set_parameters({"param2": 2})
+        self.assertNotEqual(self.tool.get_cache_key(), key)
+
     def test_execute(self):
         self.assertEqual(self.tool.execute(), "Executed")
 
+    def test_aexecute_defaults_to_execute(self):
+        self.assertEqual(asyncio.run(self.tool.aexecute()), "Executed")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
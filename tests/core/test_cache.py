@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from agentgateway.core.cache import InMemoryCache, SQLiteCache, make_cache_key, get_shared_cache
+
+
+class TestMakeCacheKey(unittest.TestCase):
+    def test_key_is_stable_across_dict_order(self):
+        self.assertEqual(make_cache_key("m", {"a": 1, "b": [1, 2]}), make_cache_key("m", {"b": [1, 2], "a": 1}))
+
+    def test_key_changes_with_content(self):
+        self.assertNotEqual(make_cache_key("m", {"a": 1}), make_cache_key("m", {"a": 2}))
+
+
+class TestInMemoryCache(unittest.TestCase):
+    def test_get_set_delete(self):
+        cache = InMemoryCache()
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", "v")
+        self.assertEqual(cache.get("k"), "v")
+        cache.delete("k")
+        self.assertIsNone(cache.get("k"))
+
+    def test_lru_eviction(self):
+        cache = InMemoryCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        cache = InMemoryCache()
+        cache.set("k", "v", ttl=10)
+        with patch('agentgateway.core.cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get("k"))
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite")
+
+    def test_persists_across_instances(self):
+        cache = SQLiteCache(self.path)
+        cache.set("k", "v")
+        cache.close()
+        reopened = SQLiteCache(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("k"), "v")
+
+    def test_ttl_expiry_and_clear(self):
+        cache = SQLiteCache(self.path)
+        self.addCleanup(cache.close)
+        cache.set("expired", "v", ttl=10)
+        cache.set("kept", "v")
+        with patch('agentgateway.core.cache.time.time', return_value=10 ** 12):
+            self.assertIsNone(cache.get("expired"))
+        self.assertEqual(cache.get("kept"), "v")
+        cache.clear()
+        self.assertIsNone(cache.get("kept"))
+
+    def test_table_is_bounded(self):
+        cache = SQLiteCache(self.path, max_entries=5, prune_interval=10)
+        self.addCleanup(cache.close)
+        cache.set("expiring", "v", ttl=10)
+        for i in range(8):
+            cache.set(f"k{i}", "v")
+        self.assertEqual(len(cache), 9)
+
+        with patch('agentgateway.core.cache.time.time', return_value=10 ** 12):
+            cache.set("k8", "v")
+        self.assertEqual(len(cache), 5)
+        self.assertIsNone(cache.get("k3"))
+        self.assertEqual(cache.get("k4"), "v")
+        self.assertEqual(cache.get("k8"), "v")
+
+
+class TestSharedCache(unittest.TestCase):
+    def test_disabled_backend(self):
+        self.assertIsNone(get_shared_cache("none", "llm"))
+
+    def test_same_namespace_is_shared(self):
+        self.assertIs(get_shared_cache("memory", "test-shared"), get_shared_cache("memory", "test-shared"))
+        self.assertIsNot(get_shared_cache("memory", "test-shared"), get_shared_cache("memory", "test-other"))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_shared_cache("memcached", "llm")
+
+
+if __name__ == '__main__':
+    unittest.main()
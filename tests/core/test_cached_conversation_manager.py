@@ -0,0 +1,170 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from agentgateway.core.conversation_manager import ConversationManager
+from agentgateway.core.cached_conversation_manager import (CachedConversationManager,
+                                                           clear_shared_cached_conversation_managers,
+                                                           get_shared_cached_conversation_manager)
+
+
+class CountingConversationManager(ConversationManager):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    def get_conversation_history(self, conversation_id=None):
+        self.reads += 1
+        return list(super().get_conversation_history(conversation_id))
+
+    def add_to_conversation_history(self, message, conversation_id=None):
+        self.writes += 1
+        super().add_to_conversation_history(message, conversation_id)
+
+    def extend_conversation_history(self, messages, conversation_id=None):
+        self.writes += 1
+        super().extend_conversation_history(messages, conversation_id)
+
+
+class BlockingConversationManager(ConversationManager):
+    """Holds reads of the conversation "slow" until released, like a store waiting on the network."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.timed_out = False
+
+    def get_conversation_history(self, conversation_id=None):
+        if conversation_id == "slow":
+            self.entered.set()
+            self.timed_out = not self.release.wait(5)
+        return list(super().get_conversation_history(conversation_id))
+
+
+class TestCachedConversationManager(unittest.TestCase):
+    def setUp(self):
+        self.backing = CountingConversationManager()
+        self.manager = CachedConversationManager(self.backing, ttl=60, max_size=2)
+        self.addCleanup(self.manager.close)
+
+    def test_requires_conversation_manager(self):
+        with self.assertRaises(TypeError):
+            CachedConversationManager(object())
+
+    def test_reads_are_served_from_cache(self):
+        conversation_id = self.manager.start_conversation()
+        for _ in range(5):
+            self.manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+            self.manager.get_conversation_history(conversation_id)
+        self.assertEqual(self.backing.reads, 0)
+        self.assertEqual(len(self.manager.get_conversation_history(conversation_id)), 5)
+
+    def test_appends_flush_at_end_of_batch(self):
+        conversation_id = self.manager.start_conversation()
+        with self.manager.batch():
+            self.manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+            self.manager.add_to_conversation_history({"role": "assistant", "content": "Hello"}, conversation_id)
+            self.assertEqual(self.backing.writes, 0)
+        self.assertEqual(self.backing.writes, 1)
+        self.assertEqual(self.backing.conversations[conversation_id],
+                         [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}])
+
+    def test_uncached_conversation_is_loaded_once(self):
+        self.backing.add_to_conversation_history({"role": "user", "content": "Old"}, "existing")
+        self.manager.get_conversation_history("existing")
+        self.manager.get_conversation_history("existing")
+        self.assertEqual(self.backing.reads, 1)
+
+    def test_eviction_flushes_pending(self):
+        first = self.manager.start_conversation()
+        self.manager.add_to_conversation_history({"role": "user", "content": "First"}, first)
+        self.manager.start_conversation()
+        self.manager.start_conversation()
+        self.assertNotIn(first, self.manager._entries)
+        self.assertEqual(self.backing.conversations[first], [{"role": "user", "content": "First"}])
+
+    def test_ttl_expiry_reloads_from_backing(self):
+        conversation_id = self.manager.start_conversation()
+        self.manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+        with patch('agentgateway.core.cached_conversation_manager.time.monotonic', return_value=time.monotonic() + 61):
+            history = self.manager.get_conversation_history(conversation_id)
+        self.assertEqual(history, [{"role": "user", "content": "Hi"}])
+        self.assertEqual(self.backing.reads, 1)
+
+    def test_clear_drops_cache_and_pending(self):
+        conversation_id = self.manager.start_conversation()
+        self.manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+        self.manager.clear_conversation_history(conversation_id)
+        self.manager.flush()
+        self.assertEqual(self.manager.get_conversation_history(conversation_id), [])
+        self.assertEqual(self.backing.get_conversation_history(conversation_id), [])
+
+    def test_timer_flush(self):
+        manager = CachedConversationManager(self.backing, ttl=60, flush_interval=0.05)
+        self.addCleanup(manager.close)
+        conversation_id = manager.start_conversation()
+        manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+        deadline = time.monotonic() + 2
+        while not self.backing.conversations.get(conversation_id) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.backing.conversations[conversation_id], [{"role": "user", "content": "Hi"}])
+
+    def test_batches_are_per_thread(self):
+        first = self.manager.start_conversation()
+        second = self.manager.start_conversation()
+        appended, closed = threading.Event(), threading.Event()
+
+        def other_turn():
+            with self.manager.batch():
+                self.manager.add_to_conversation_history({"role": "user", "content": "Other"}, second)
+                appended.set()
+                closed.wait(5)
+
+        thread = threading.Thread(target=other_turn)
+        thread.start()
+        appended.wait(5)
+        with self.manager.batch():
+            self.manager.add_to_conversation_history({"role": "user", "content": "Mine"}, first)
+        # closing this thread's batch writes its own conversation only
+        self.assertEqual(self.backing.conversations[first], [{"role": "user", "content": "Mine"}])
+        self.assertEqual(self.backing.conversations[second], [])
+        closed.set()
+        thread.join()
+        self.assertEqual(self.backing.conversations[second], [{"role": "user", "content": "Other"}])
+
+    def test_store_reads_do_not_block_cached_conversations(self):
+        backing = BlockingConversationManager()
+        manager = CachedConversationManager(backing, ttl=60)
+        self.addCleanup(manager.close)
+        conversation_id = manager.start_conversation()
+        manager.add_to_conversation_history({"role": "user", "content": "Hi"}, conversation_id)
+
+        thread = threading.Thread(target=manager.get_conversation_history, args=("slow",))
+        thread.start()
+        backing.entered.wait(5)
+        self.assertEqual(manager.get_conversation_history(conversation_id), [{"role": "user", "content": "Hi"}])
+        manager.flush()
+        backing.release.set()
+        thread.join()
+
+        self.assertFalse(backing.timed_out)
+        self.assertEqual(backing.conversations[conversation_id], [{"role": "user", "content": "Hi"}])
+
+    def test_shared_manager_per_store(self):
+        clear_shared_cached_conversation_managers()
+        self.addCleanup(clear_shared_cached_conversation_managers)
+        create = MagicMock(side_effect=CountingConversationManager)
+
+        first = get_shared_cached_conversation_manager(("redis", "redis://a", "list"), create)
+        second = get_shared_cached_conversation_manager(("redis", "redis://a", "list"), create)
+        other = get_shared_cached_conversation_manager(("redis", "redis://b", "list"), create)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(create.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
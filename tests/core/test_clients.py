@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agentgateway.core import clients
+from agentgateway.core.clients import (create_async_client, get_shared_client, get_shared_boto3_client,
+                                       get_shared_session, clear_shared_clients)
+
+
+class TestSharedClients(unittest.TestCase):
+    def setUp(self):
+        clear_shared_clients()
+        self.addCleanup(clear_shared_clients)
+
+    def test_client_is_shared_per_credentials(self):
+        client_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+
+        first = get_shared_client(client_class, api_key="key-a")
+        second = get_shared_client(client_class, api_key="key-a")
+        other = get_shared_client(client_class, api_key="key-b")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(client_class.call_count, 2)
+
+    def test_client_uses_configured_pool_and_timeouts(self):
+        client_class = MagicMock()
+        settings = {"timeout": 12, "max_retries": 5, "pool_maxsize": 3}
+        with patch.object(clients, "_http_setting", side_effect=lambda key, default: settings.get(key, default)):
+            get_shared_client(client_class, max_retries=clients.get_adapter_max_retries(), api_key="key",
+                              base_url="https://example.test/v1")
+
+        kwargs = client_class.call_args.kwargs
+        self.assertEqual(kwargs["api_key"], "key")
+        self.assertEqual(kwargs["base_url"], "https://example.test/v1")
+        self.assertEqual(kwargs["timeout"], 12)
+        self.assertEqual(kwargs["max_retries"], 5)
+        self.assertEqual(kwargs["http_client"].timeout.read, 12)
+
+    def test_tool_clients_keep_sdk_retries(self):
+        from anthropic import Anthropic, DEFAULT_MAX_RETRIES
+        from agentgateway.adapters.anthropic_claude_agent import AnthropicClaudeAgent
+        from agentgateway.tools.translate_tool import TranslationTool
+        adapter = AnthropicClaudeAgent("claude-3-haiku-20240307")
+        adapter.set_auth(api_key="test_api_key")
+        tool = TranslationTool()
+        tool.set_auth(api_key="test_api_key")
+
+        with patch('agentgateway.tools.translate_tool.get_shared_client') as tool_get_client:
+            tool.translate_text("Hello", "en", "fr")
+        tool_client = get_shared_client(*tool_get_client.call_args.args, **tool_get_client.call_args.kwargs)
+
+        self.assertGreater(DEFAULT_MAX_RETRIES, 0)
+        self.assertEqual(tool_client.max_retries, DEFAULT_MAX_RETRIES)
+        self.assertEqual(adapter.client.max_retries, 0)
+        self.assertIsNot(tool_client, adapter.client)
+
+    def test_async_client_uses_configured_timeouts_and_no_sdk_retries(self):
+        client_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+        first = create_async_client(client_class, max_retries=clients.get_adapter_max_retries(), api_key="key")
+        second = create_async_client(client_class, max_retries=clients.get_adapter_max_retries(), api_key="key")
+
+        self.assertIsNot(first, second)
+        kwargs = client_class.call_args.kwargs
+        self.assertEqual(kwargs["max_retries"], 0)
+        self.assertEqual(kwargs["timeout"], clients.get_http_timeout())
+        self.assertEqual(type(kwargs["http_client"]).__name__, "AsyncClient")
+
+    @patch('boto3.client')
+    def test_boto3_client_is_shared(self, mock_boto3_client):
+        first = get_shared_boto3_client('bedrock-runtime', region_name="us-west-2")
+        second = get_shared_boto3_client('bedrock-runtime', region_name="us-west-2")
+
+        self.assertIs(first, second)
+        mock_boto3_client.assert_called_once()
+        args, kwargs = mock_boto3_client.call_args
+        self.assertEqual(args, ('bedrock-runtime',))
+        self.assertEqual(kwargs["region_name"], "us-west-2")
+        self.assertEqual(kwargs["config"].max_pool_connections, 20)
+
+    def test_session_is_shared_and_pooled(self):
+        session = get_shared_session()
+        self.assertIs(session, get_shared_session())
+        self.assertEqual(session.get_adapter("https://api.open-meteo.com")._pool_maxsize, 20)
+
+    def test_adapters_share_one_client(self):
+        from agentgateway.adapters.groq_agent import GroqAgent
+        first, second = GroqAgent("llama3-70b-8192"), GroqAgent("llama3-8b-8192")
+        first.set_auth(api_key="test_api_key")
+        second.set_auth(api_key="test_api_key")
+        self.assertIs(first.client, second.client)
+
+
+if __name__ == '__main__':
+    unittest.main()
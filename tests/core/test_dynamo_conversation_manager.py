@@ -0,0 +1,150 @@
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+from agentgateway.core.dynamo_conversation_manager import DynamoConversationManager
+from agentgateway.setup.setup_conversations_dynamo import get_table_definition
+
+
+class FakeTable:
+    """In-process stand-in for a DynamoDB Table resource with a conversation_id/message_seq key."""
+
+    def __init__(self, page_size=2):
+        self.items = {}
+        self.page_size = page_size
+        self.calls = []
+
+    def _conditions(self, condition):
+        expression = condition.get_expression()
+        if expression['operator'] == 'AND':
+            return self._conditions(expression['values'][0]) + self._conditions(expression['values'][1])
+        key, value = expression['values']
+        return [(key.name, expression['operator'], value)]
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues):
+        self.calls.append('update_item')
+        item = self.items.setdefault((Key['conversation_id'], Key['message_seq']), dict(Key))
+        item['last_seq'] = item.get('last_seq', Decimal(0)) + ExpressionAttributeValues[':count']
+        return {'Attributes': {'last_seq': item['last_seq']}}
+
+    def put_item(self, Item):
+        self.calls.append('put_item')
+        self.items[(Item['conversation_id'], Item['message_seq'])] = Item
+
+    def delete_item(self, Key):
+        self.items.pop((Key['conversation_id'], Key['message_seq']), None)
+
+    def batch_writer(self):
+        table = self
+
+        class Writer:
+            def __enter__(self):
+                table.calls.append('batch_write_item')
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def put_item(self, Item):
+                table.items[(Item['conversation_id'], Item['message_seq'])] = Item
+
+            def delete_item(self, Key):
+                table.delete_item(Key)
+        return Writer()
+
+    def query(self, KeyConditionExpression, ConsistentRead=False, ProjectionExpression=None, ExclusiveStartKey=None):
+        self.calls.append('query')
+        conditions = self._conditions(KeyConditionExpression)
+        matched = []
+        for (conversation_id, seq), item in sorted(self.items.items()):
+            values = {'conversation_id': conversation_id, 'message_seq': seq}
+            if all((values[name] == value) if op == '=' else (values[name] > value)
+                   for name, op, value in conditions):
+                matched.append(item)
+        start = 0
+        if ExclusiveStartKey is not None:
+            start = [i['message_seq'] for i in matched].index(ExclusiveStartKey['message_seq']) + 1
+        page = matched[start:start + self.page_size]
+        response = {'Items': page}
+        if start + self.page_size < len(matched):
+            response['LastEvaluatedKey'] = {'conversation_id': page[-1]['conversation_id'],
+                                            'message_seq': page[-1]['message_seq']}
+        return response
+
+
+class TestDynamoConversationManagerMessageMode(unittest.TestCase):
+    def setUp(self):
+        self.table = FakeTable()
+        resource = MagicMock()
+        resource.Table.return_value = self.table
+        patcher = patch('agentgateway.core.dynamo_conversation_manager.boto3.resource', return_value=resource)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = DynamoConversationManager("conversations", storage_mode="message")
+
+    def test_invalid_storage_mode(self):
+        with self.assertRaises(ValueError):
+            DynamoConversationManager("conversations", storage_mode="blob")
+
+    def test_append_and_paginated_read(self):
+        conversation_id = self.manager.start_conversation()
+        self.manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+        self.manager.extend_conversation_history([{"role": "assistant", "content": "Hi"},
+                                                  {"role": "user", "content": "Weather?"},
+                                                  {"role": "assistant", "content": "Sunny"}], conversation_id)
+        self.table.calls.clear()
+
+        history = self.manager.get_conversation_history(conversation_id)
+
+        self.assertEqual([m["content"] for m in history], ["Hello", "Hi", "Weather?", "Sunny"])
+        # four messages with a page size of two need two Query pages
+        self.assertEqual(self.table.calls, ['query', 'query'])
+        self.assertEqual(sorted(seq for cid, seq in self.table.items if seq > 0), [1, 2, 3, 4])
+
+    def test_single_append_is_one_put(self):
+        conversation_id = self.manager.start_conversation()
+        self.manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+        self.assertEqual(self.table.calls, ['update_item', 'put_item'])
+        item = self.table.items[(conversation_id, 1)]
+        self.assertEqual(json.loads(item['message']), {"role": "user", "content": "Hello"})
+
+    def test_batch_groups_turn_writes(self):
+        conversation_id = self.manager.start_conversation()
+        with self.manager.batch():
+            self.manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+            self.manager.get_conversation_history(conversation_id)
+            self.manager.add_to_conversation_history({"role": "assistant", "content": "Hi"}, conversation_id)
+            self.manager.extend_conversation_history([{"role": "user", "content": "More"}], conversation_id)
+            self.assertEqual(len(self.table.items), 2)
+        self.assertEqual(self.table.calls, ['update_item', 'put_item', 'query',
+                                            'update_item', 'batch_write_item'])
+        self.assertEqual(len(self.manager.get_conversation_history(conversation_id)), 3)
+
+    def test_clear_conversation_history(self):
+        conversation_id = self.manager.start_conversation()
+        self.manager.extend_conversation_history([{"role": "user", "content": "Hello"},
+                                                  {"role": "assistant", "content": "Hi"}], conversation_id)
+        self.manager.clear_conversation_history(conversation_id)
+        self.assertEqual(self.table.items, {})
+        self.assertEqual(self.manager.get_conversation_history(conversation_id), [])
+
+
+class TestDynamoTableDefinition(unittest.TestCase):
+    def test_message_layout_on_demand(self):
+        definition = get_table_definition("conversations", "message", "PAY_PER_REQUEST")
+        self.assertEqual([k['KeyType'] for k in definition['KeySchema']], ['HASH', 'RANGE'])
+        self.assertEqual(definition['BillingMode'], 'PAY_PER_REQUEST')
+        self.assertNotIn('ProvisionedThroughput', definition)
+
+    def test_document_layout_provisioned(self):
+        definition = get_table_definition("conversations")
+        self.assertEqual(len(definition['KeySchema']), 1)
+        self.assertIn('ProvisionedThroughput', definition)
+
+    def test_invalid_billing_mode(self):
+        with self.assertRaises(ValueError):
+            get_table_definition("conversations", "message", "FREE")
+
+
+if __name__ == '__main__':
+    unittest.main()
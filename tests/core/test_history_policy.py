@@ -0,0 +1,163 @@
+import unittest
+from typing import Any, Dict
+
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.history_policy import (FullHistoryPolicy, SlidingWindowPolicy, LastMessagesPolicy,
+                                              SummarizingPolicy, estimate_tokens, group_messages)
+
+
+class FakeSummarizer(Tool):
+    def __init__(self):
+        super().__init__("summarize_text", "Summarize long pieces of text")
+        self.calls = []
+
+    def execute(self) -> Any:
+        text = self.get_parameter("text")
+        self.calls.append(text)
+        return f"summary#{len(self.calls)}"
+
+    def create_invocation(self, instance_id: str = ""):
+        # share the call log with the template so the test can see every execution
+        return self
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+def openai_turn(index):
+    """A user question answered after one tool round trip, in the OpenAI format."""
+    return [
+        {"role": "user", "content": f"question {index} " + "x" * 200},
+        {"role": "assistant", "tool_calls": [{"id": f"call_{index}", "type": "function",
+                                              "function": {"name": "weather", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": f"call_{index}", "content": "sunny " * 20},
+        {"role": "assistant", "content": f"answer {index}"},
+    ]
+
+
+def anthropic_tool_exchange(index):
+    return [
+        {"role": "assistant", "content": [{"type": "tool_use", "id": f"tu_{index}", "name": "weather", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"tu_{index}", "content": "sunny"}]},
+    ]
+
+
+def assert_pairs_intact(test, messages):
+    call_ids = {call["id"] for m in messages for call in m.get("tool_calls", [])}
+    result_ids = {m["tool_call_id"] for m in messages if m.get("role") == "tool"}
+    test.assertEqual(call_ids, result_ids)
+
+
+class TestGroupMessages(unittest.TestCase):
+    def test_tool_results_stay_with_their_call(self):
+        groups = group_messages(openai_turn(1))
+        self.assertEqual([len(group) for group in groups], [1, 2, 1])
+
+    def test_anthropic_and_bedrock_results(self):
+        bedrock = [
+            {"role": "assistant", "content": [{"toolUse": {"toolUseId": "t", "name": "w", "input": {}}}]},
+            {"role": "user", "content": [{"toolResult": {"toolUseId": "t", "content": [{"json": {}}]}}]},
+        ]
+        self.assertEqual(len(group_messages(anthropic_tool_exchange(1))), 1)
+        self.assertEqual(len(group_messages(bedrock)), 1)
+
+
+class TestSlidingWindowPolicy(unittest.TestCase):
+    def test_short_history_is_unchanged(self):
+        history = openai_turn(1)
+        self.assertEqual(SlidingWindowPolicy(10000).apply(history), history)
+
+    def test_window_fits_budget_and_starts_with_user(self):
+        history = [m for i in range(10) for m in openai_turn(i)]
+        budget = sum(estimate_tokens(m) for m in openai_turn(0)) * 3
+        trimmed = SlidingWindowPolicy(budget).apply(history)
+
+        self.assertLessEqual(sum(estimate_tokens(m) for m in trimmed), budget)
+        self.assertEqual(trimmed[-1], history[-1])
+        self.assertEqual(trimmed[0]["role"], "user")
+        self.assertLess(len(trimmed), len(history))
+        assert_pairs_intact(self, trimmed)
+
+    def test_never_splits_a_tool_exchange(self):
+        history = [{"role": "user", "content": "go"}]
+        for i in range(5):
+            history.extend(anthropic_tool_exchange(i))
+        trimmed = SlidingWindowPolicy(1).apply(history)
+        # the latest exchange is kept whole and the question of its turn is pulled in front of it
+        self.assertEqual(trimmed, history)
+
+    def test_keeps_leading_system_messages(self):
+        history = [{"role": "system", "content": "be brief"}] + [m for i in range(10) for m in openai_turn(i)]
+        trimmed = SlidingWindowPolicy(200).apply(history)
+        self.assertEqual(trimmed[0], history[0])
+        self.assertEqual(trimmed[1]["role"], "user")
+
+
+class TestLastMessagesPolicy(unittest.TestCase):
+    def test_keeps_last_messages_from_a_turn_start(self):
+        history = [m for i in range(5) for m in openai_turn(i)]
+        trimmed = LastMessagesPolicy(3).apply(history)
+        self.assertEqual(trimmed, openai_turn(4))
+        assert_pairs_intact(self, trimmed)
+
+    def test_rejects_non_positive_limit(self):
+        with self.assertRaises(ValueError):
+            LastMessagesPolicy(0)
+
+
+class TestSummarizingPolicy(unittest.TestCase):
+    def test_older_turns_are_summarized_once(self):
+        summarizer = FakeSummarizer()
+        policy = SummarizingPolicy(600, summarizer, summary_tokens=50)
+        history = [m for i in range(6) for m in openai_turn(i)]
+
+        trimmed = policy.apply(history)
+        self.assertEqual(len(summarizer.calls), 1)
+        self.assertTrue(trimmed[0]["content"].startswith("Summary of the earlier conversation: summary#1"))
+        self.assertIn("question 0", summarizer.calls[0])
+        assert_pairs_intact(self, trimmed)
+
+        # the same history reuses the cached summary
+        self.assertEqual(policy.apply(history), trimmed)
+        self.assertEqual(len(summarizer.calls), 1)
+
+    def test_summary_is_extended_incrementally(self):
+        summarizer = FakeSummarizer()
+        policy = SummarizingPolicy(600, summarizer, summary_tokens=50)
+        history = [m for i in range(6) for m in openai_turn(i)]
+        policy.apply(history)
+
+        history.extend(openai_turn(6))
+        trimmed = policy.apply(history)
+        self.assertEqual(len(summarizer.calls), 2)
+        self.assertTrue(summarizer.calls[1].startswith("Summary of the earlier conversation: summary#1"))
+        self.assertNotIn("question 0", summarizer.calls[1])
+        self.assertIn("summary#2", trimmed[0]["content"])
+
+    def test_bedrock_summary_block(self):
+        summarizer = FakeSummarizer()
+        policy = SummarizingPolicy(60, summarizer, summary_tokens=10)
+        history = []
+        for i in range(4):
+            history.append({"role": "user", "content": [{"text": f"question {i} " + "y" * 100}]})
+            history.append({"role": "assistant", "content": [{"text": f"answer {i}"}]})
+        trimmed = policy.apply(history)
+        self.assertEqual(trimmed[0]["content"][0], {"text": "Summary of the earlier conversation: summary#1"})
+        self.assertEqual(trimmed[0]["content"][1:], history[-2]["content"])
+
+    def test_requires_a_tool(self):
+        with self.assertRaises(TypeError):
+            SummarizingPolicy(100, summarizer=lambda text: text)
+
+
+class TestFullHistoryPolicy(unittest.TestCase):
+    def test_returns_history(self):
+        history = openai_turn(1)
+        self.assertIs(FullHistoryPolicy().apply(history), history)
+
+
+if __name__ == '__main__':
+    unittest.main()
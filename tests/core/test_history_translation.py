@@ -0,0 +1,81 @@
+import unittest
+
+from agentgateway.core.history_translation import (ANTHROPIC, BEDROCK, CHAT_COMPLETIONS, from_chat_completions,
+                                                   to_chat_completions, translate_history)
+
+CHAT_HISTORY = [
+    {"role": "user", "content": "What's the weather in Paris?"},
+    {"role": "assistant", "content": None, "tool_calls": [
+        {"id": "call_1", "type": "function", "function": {"name": "weather", "arguments": '{"city": "Paris"}'}},
+        {"id": "call_2", "type": "function", "function": {"name": "time", "arguments": "{}"}},
+    ]},
+    {"role": "tool", "tool_call_id": "call_1", "content": '{"temp": 21}'},
+    {"role": "tool", "tool_call_id": "call_2", "content": "14:00"},
+    {"role": "assistant", "content": "It is 21 degrees at 14:00."},
+]
+
+ANTHROPIC_HISTORY = [
+    {"role": "user", "content": "What's the weather in Paris?"},
+    {"role": "assistant", "content": [
+        {"type": "tool_use", "id": "call_1", "name": "weather", "input": {"city": "Paris"}},
+        {"type": "tool_use", "id": "call_2", "name": "time", "input": {}},
+    ]},
+    {"role": "user", "content": [
+        {"type": "tool_result", "tool_use_id": "call_1", "content": '{"temp": 21}'},
+        {"type": "tool_result", "tool_use_id": "call_2", "content": "14:00"},
+    ]},
+    {"role": "assistant", "content": [{"type": "text", "text": "It is 21 degrees at 14:00."}]},
+]
+
+BEDROCK_HISTORY = [
+    {"role": "user", "content": [{"text": "What's the weather in Paris?"}]},
+    {"role": "assistant", "content": [
+        {"toolUse": {"toolUseId": "call_1", "name": "weather", "input": {"city": "Paris"}}},
+        {"toolUse": {"toolUseId": "call_2", "name": "time", "input": {}}},
+    ]},
+    {"role": "user", "content": [
+        {"toolResult": {"toolUseId": "call_1", "content": [{"text": '{"temp": 21}'}], "status": "success"}},
+        {"toolResult": {"toolUseId": "call_2", "content": [{"text": "14:00"}], "status": "success"}},
+    ]},
+    {"role": "assistant", "content": [{"text": "It is 21 degrees at 14:00."}]},
+]
+
+
+class TestHistoryTranslation(unittest.TestCase):
+    def test_chat_to_anthropic_groups_tool_results(self):
+        # Anthropic accepts text messages as plain strings
+        self.assertEqual(from_chat_completions(CHAT_HISTORY, ANTHROPIC), ANTHROPIC_HISTORY[:3] + [
+            {"role": "assistant", "content": "It is 21 degrees at 14:00."}])
+
+    def test_chat_to_bedrock(self):
+        self.assertEqual(from_chat_completions(CHAT_HISTORY, BEDROCK), BEDROCK_HISTORY)
+
+    def test_anthropic_and_bedrock_to_chat(self):
+        self.assertEqual(to_chat_completions(ANTHROPIC_HISTORY, ANTHROPIC), CHAT_HISTORY)
+        self.assertEqual(to_chat_completions(BEDROCK_HISTORY, BEDROCK), CHAT_HISTORY[:4] + [
+            {"role": "assistant", "content": "It is 21 degrees at 14:00."}])
+
+    def test_anthropic_to_bedrock(self):
+        self.assertEqual(translate_history(ANTHROPIC_HISTORY, ANTHROPIC, BEDROCK), BEDROCK_HISTORY)
+
+    def test_same_format_is_copied(self):
+        translated = translate_history(CHAT_HISTORY, CHAT_COMPLETIONS, CHAT_COMPLETIONS)
+        self.assertEqual(translated, CHAT_HISTORY)
+        self.assertIsNot(translated, CHAT_HISTORY)
+
+    def test_non_text_tool_results_are_encoded(self):
+        history = [{"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1", "content": {"a": 1}}]}]
+        self.assertEqual(to_chat_completions(history, ANTHROPIC),
+                         [{"role": "tool", "tool_call_id": "t1", "content": '{"a": 1}'}])
+
+    def test_bedrock_cache_points_are_dropped(self):
+        history = [{"role": "user", "content": [{"text": "hi"}, {"cachePoint": {"type": "default"}}]}]
+        self.assertEqual(to_chat_completions(history, BEDROCK), [{"role": "user", "content": "hi"}])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            translate_history(CHAT_HISTORY, CHAT_COMPLETIONS, "gemini")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from agentgateway.core.conversation_manager import ConversationManager
+from agentgateway.core.message import (ANTHROPIC, BEDROCK, CHAT_COMPLETIONS, Message, ToolCall, detect_format,
+                                       to_canonical, to_messages, to_provider_messages)
+
+HISTORY = [
+    {"role": "user", "content": "Weather in Paris?"},
+    {"role": "assistant", "content": "Let me check.", "tool_calls": [
+        {"id": "call_1", "type": "function", "function": {"name": "weather", "arguments": '{"city": "Paris"}'}}]},
+    {"role": "tool", "tool_call_id": "call_1", "content": '{"temp": 21}'},
+    {"role": "assistant", "content": "It is 21 degrees."},
+]
+
+
+class TestMessage(unittest.TestCase):
+    def test_round_trips_canonical_dicts(self):
+        for data in HISTORY:
+            self.assertEqual(Message.from_dict(data).to_dict(), data)
+        self.assertEqual(Message("user", "Hi").to_dict(), {"role": "user", "content": "Hi"})
+
+    def test_messages_are_slotted(self):
+        with self.assertRaises(AttributeError):
+            Message("user", "Hi").extra = 1
+        self.assertEqual(Message.from_dict(HISTORY[1]).tool_calls, [ToolCall("call_1", "weather", {"city": "Paris"})])
+
+    def test_converts_to_anthropic_and_bedrock(self):
+        self.assertEqual(to_provider_messages(HISTORY, ANTHROPIC), [
+            {"role": "user", "content": "Weather in Paris?"},
+            {"role": "assistant", "content": [
+                {"type": "text", "text": "Let me check."},
+                {"type": "tool_use", "id": "call_1", "name": "weather", "input": {"city": "Paris"}}]},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "call_1", "content": '{"temp": 21}'}]},
+            {"role": "assistant", "content": "It is 21 degrees."},
+        ])
+        bedrock = to_provider_messages(HISTORY, BEDROCK)
+        self.assertEqual(bedrock[0], {"role": "user", "content": [{"text": "Weather in Paris?"}]})
+        self.assertEqual(bedrock[2]["content"][0]["toolResult"]["toolUseId"], "call_1")
+        self.assertIs(to_provider_messages(HISTORY, CHAT_COMPLETIONS)[0], HISTORY[0])
+
+    def test_conversions_are_cached_per_stored_message(self):
+        first = to_provider_messages(HISTORY, ANTHROPIC)
+        second = to_provider_messages(HISTORY, ANTHROPIC)
+        self.assertIs(first[1], second[1])
+        self.assertIs(to_messages(HISTORY)[1], to_messages(HISTORY)[1])
+
+    def test_reads_legacy_provider_messages(self):
+        anthropic_results = {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "t1", "content": "sunny"},
+            {"type": "tool_result", "tool_use_id": "t2", "content": "windy"}]}
+        self.assertEqual(detect_format(anthropic_results), ANTHROPIC)
+        self.assertEqual(to_canonical(anthropic_results), [
+            {"role": "tool", "tool_call_id": "t1", "content": "sunny"},
+            {"role": "tool", "tool_call_id": "t2", "content": "windy"}])
+        bedrock_text = {"role": "user", "content": [{"text": "Hi"}]}
+        self.assertEqual(detect_format(bedrock_text), BEDROCK)
+        # a legacy history mixed with canonical messages still alternates roles on the wire
+        self.assertEqual(to_provider_messages([bedrock_text, {"role": "user", "content": "there"}], BEDROCK),
+                         [{"role": "user", "content": [{"text": "Hi"}, {"text": "there"}]}])
+
+    def test_formatted_history_handles_non_string_content(self):
+        manager = ConversationManager()
+        conversation_id = manager.start_conversation()
+        manager.extend_conversation_history(HISTORY + [
+            {"role": "assistant", "content": [{"type": "text", "text": "Anything else?"}]}], conversation_id)
+        self.assertEqual(manager.get_formatted_conversation_history(conversation_id), "\n".join([
+            "User: Weather in Paris?",
+            'Assistant: Let me check. calls weather({"city": "Paris"})',
+            'Tool: {"temp": 21}',
+            "Assistant: It is 21 degrees.",
+            "Assistant: Anything else?",
+        ]))
+
+
+if __name__ == '__main__':
+    unittest.main()
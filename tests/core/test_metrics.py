@@ -0,0 +1,167 @@
+import unittest
+import urllib.request
+from typing import Dict, Any, Optional
+from agentgateway.agent_gateway import AgentGateway
+from agentgateway.core import metrics
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.cache import InMemoryCache
+from agentgateway.core.metrics import MetricsRegistry, start_http_server
+from agentgateway.core.prompt import Prompt
+from agentgateway.core.response import Response, ResponseType
+
+
+class UpperTool(Tool):
+    def __init__(self):
+        super().__init__("upper", "Upper-cases the text")
+
+    def execute(self) -> Any:
+        return self.get_parameter("text").upper()
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+class MeteredAgent(AbstractAgent):
+    """Calls the model on every turn and asks for the upper tool on the first one."""
+
+    def __init__(self):
+        super().__init__("metered-model")
+        self.fail_with = None
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response = self.response
+        self._call_model({"input": agent_input}, response)
+        if not is_tool_response:
+            response.set_response_type(ResponseType.TOOL_CALL)
+            response.set_tools([self.get_tool_from_response({"name": "upper", "input": {"text": "hi"}, "id": "call_0"})])
+        else:
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(agent_input[0])
+        return response
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        if self.fail_with is not None:
+            raise self.fail_with
+        return {"input_tokens": 10, "output_tokens": 2}
+
+    def _get_usage(self, model_response):
+        return model_response["input_tokens"], model_response["output_tokens"]
+
+    def set_auth(self, **kwargs):
+        self.auth_data.update(kwargs)
+
+    def get_auth(self) -> Dict[str, Any]:
+        return self.auth_data
+
+    def set_model_config(self, **kwargs):
+        self.model_config.update(kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+    def get_formatted_tool_output(self, tool, tool_output):
+        return tool_output
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_render_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("path",))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        requests.inc('/a"b')
+        requests.inc('/a"b', amount=2)
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(value)
+
+        self.assertIs(registry.counter("requests_total", "Requests", ("path",)), requests)
+        self.assertEqual(registry.render().splitlines(), [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{path="/a\\"b"} 3',
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ])
+
+    def test_invalid_use(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("total", "Total")
+        with self.assertRaises(ValueError):
+            counter.inc(amount=-1)
+        with self.assertRaises(ValueError):
+            registry.histogram("total", "Total")
+
+
+class TestGatewayMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.REGISTRY.clear()
+        self.addCleanup(metrics.REGISTRY.clear)
+
+    def _gateway(self):
+        gateway = AgentGateway(MeteredAgent(), "metered-model")
+        gateway.prepare_agent(Prompt("test"), [UpperTool()])
+        self.addCleanup(gateway.close)
+        return gateway
+
+    def test_run_updates_metrics(self):
+        gateway = self._gateway()
+        self.assertEqual(gateway.run_agent("go").content, "HI")
+        gateway.run_agent("again")
+
+        labels = ("MeteredAgent", "metered-model")
+        self.assertEqual(metrics.LLM_LATENCY.get(*labels)[0], 4)
+        self.assertEqual(metrics.LLM_TOKENS.get(*labels, "input"), 40)
+        self.assertEqual(metrics.LLM_TOKENS.get(*labels, "output"), 8)
+        self.assertEqual(metrics.TOOL_LATENCY.get("upper")[0], 2)
+        self.assertEqual(metrics.RUNS.get(*labels, "answer"), 2)
+        self.assertEqual(metrics.RUN_TURNS.get(*labels), (2, 4.0))
+
+    def test_errors_and_cache_hits(self):
+        gateway = self._gateway()
+        gateway.adapter.set_response_cache(InMemoryCache())
+        gateway.run_agent("go")
+        gateway.run_agent("go")
+        self.assertEqual(metrics.CACHE_HITS.get("llm_response"), 2)
+
+        gateway.adapter.fail_with = ValueError("bad request")
+        with self.assertRaises(Exception):
+            gateway.run_agent("fails")
+        labels = ("MeteredAgent", "metered-model")
+        self.assertEqual(metrics.LLM_ERRORS.get(*labels, "ValueError"), 1)
+        self.assertEqual(metrics.RUNS.get(*labels, "exception"), 1)
+
+    def test_abandoned_stream_is_counted(self):
+        stream = self._gateway().stream_agent("go")
+        next(stream)
+        stream.close()
+        self.assertEqual(metrics.RUNS.get("MeteredAgent", "metered-model", "cancelled"), 1)
+
+    def test_disabled_metrics_are_not_recorded(self):
+        metrics.set_enabled(False)
+        self.addCleanup(metrics.set_enabled, None)
+        self._gateway().run_agent("go")
+        self.assertEqual(metrics.REGISTRY.get("agentgateway_runs_total").get("MeteredAgent", "metered-model", "answer"), 0)
+
+    def test_http_endpoint(self):
+        self._gateway().run_agent("go")
+        server = start_http_server(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as reply:
+            self.assertEqual(reply.headers["Content-Type"], metrics.CONTENT_TYPE)
+            body = reply.read().decode("utf-8")
+        self.assertIn('agentgateway_runs_total{provider="MeteredAgent",model="metered-model",response_type="answer"} 1',
+                      body)
+        self.assertIn('agentgateway_tool_latency_seconds_count{tool="upper"} 1', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,298 @@
+import asyncio
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.rate_limiter import (AdaptiveConcurrency, RateLimiter, clear_rate_limiters,
+                                             get_provider_rate_limiter, get_rate_limiter, is_throttling_error)
+from agentgateway.core.response import Response
+from agentgateway.core.retry import RetryPolicy
+from agentgateway.utils.config_manager import ConfigManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class AdvancingClock(FakeClock):
+    """A clock whose sleep() moves time forward, for simulations without real waiting."""
+
+    def sleep(self, seconds):
+        super().sleep(seconds)
+        self.now += seconds
+
+
+class ThrottledError(Exception):
+    status_code = 429
+
+
+class SimulatedProvider:
+    """Answers at most requests_per_minute calls in any 60 second window and throttles the rest."""
+
+    def __init__(self, clock, requests_per_minute: int):
+        self.clock = clock
+        self.requests_per_minute = requests_per_minute
+        self.accepted = []
+        self.throttled = 0
+
+    def call(self, tokens: int):
+        recent = [t for t in self.accepted if t > self.clock.now - 60]
+        if len(recent) >= self.requests_per_minute:
+            self.throttled += 1
+            raise ThrottledError("429 Too Many Requests")
+        self.accepted.append(self.clock.now)
+        return {"input_tokens": tokens, "output_tokens": 10}
+
+
+class SimulatedAgent(AbstractAgent):
+    def __init__(self, provider: SimulatedProvider):
+        super().__init__("simulated-model")
+        self.provider = provider
+
+    def run(self, agent_input, is_tool_response=False, conversation_id=None) -> Response:
+        response = Response()
+        self._call_model({"tokens": agent_input}, response)
+        return response
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return self.provider.call(request["tokens"])
+
+    def _get_usage(self, model_response):
+        return model_response["input_tokens"], model_response["output_tokens"]
+
+    def set_auth(self, **kwargs):
+        pass
+
+    def get_auth(self) -> Dict[str, Any]:
+        return {}
+
+    def set_model_config(self, **kwargs):
+        pass
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        limiter = RateLimiter(120, burst=2, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(clock.sleeps, [])
+
+        # the bucket is empty: queued callers reserve consecutive slots, 0.5s apart
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(clock.sleeps, [0.5, 1.0])
+
+    def test_refills_over_time_up_to_capacity(self):
+        clock = FakeClock()
+        limiter = RateLimiter(60, burst=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            limiter.acquire()
+
+        clock.now = 100.0
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(clock.sleeps, [])
+        limiter.acquire()
+        self.assertEqual(clock.sleeps, [1.0])
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+        with self.assertRaises(ValueError):
+            RateLimiter()
+
+    def test_token_bucket_waits_and_corrects_estimates(self):
+        clock = FakeClock()
+        # one second of tokens, 100, is available at once
+        limiter = RateLimiter(tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+
+        permit = limiter.acquire(tokens=100)
+        self.assertEqual(clock.sleeps, [])
+        # the call used 40 tokens less than estimated, which go back to the bucket
+        limiter.release(permit, tokens_used=60)
+        limiter.acquire(tokens=40)
+        self.assertEqual(clock.sleeps, [])
+        limiter.acquire(tokens=50)
+        self.assertEqual(clock.sleeps, [0.5])
+
+    def test_simulated_provider_is_never_throttled(self):
+        clock = AdvancingClock()
+        provider = SimulatedProvider(clock, requests_per_minute=30)
+        agent = SimulatedAgent(provider)
+        # a bucket admits its burst on top of a minute of refills, so it is set one request under the provider limit
+        agent.set_rate_limiter(RateLimiter(29, tokens_per_minute=60000, clock=clock, sleep=clock.sleep))
+
+        for _ in range(90):
+            agent.run(500)
+
+        self.assertEqual(provider.throttled, 0)
+        self.assertEqual(len(provider.accepted), 90)
+        # 90 calls at 29 per minute take about three minutes of simulated time
+        self.assertGreaterEqual(clock.now, 170)
+
+        unlimited = SimulatedAgent(SimulatedProvider(clock, requests_per_minute=30))
+        unlimited.set_retry_policy(RetryPolicy(max_attempts=1))
+        with self.assertRaises(ThrottledError):
+            for _ in range(90):
+                unlimited.run(500)
+
+    def test_shared_limiter_per_provider(self):
+        self.assertIs(get_rate_limiter("test-provider", 60), get_rate_limiter("test-provider", 60))
+        self.assertIsNot(get_rate_limiter("test-provider", 60), get_rate_limiter("other-provider", 60))
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_additive_increase_and_single_decrease_per_round(self):
+        concurrency = AdaptiveConcurrency(initial=4, max_limit=8)
+        tickets = [concurrency.try_acquire() for _ in range(4)]
+        self.assertIsNone(concurrency.try_acquire())
+
+        for ticket in tickets:
+            concurrency.release(ticket)
+        self.assertGreater(concurrency.limit, 4.9)
+
+        tickets = [concurrency.try_acquire() for _ in range(4)]
+        # all four calls of the round are throttled, which halves the limit once
+        for ticket in tickets:
+            concurrency.release(ticket, throttled=True)
+        self.assertAlmostEqual(concurrency.limit, 4.9 / 2, delta=0.1)
+
+    def test_slow_calls_decrease_the_limit(self):
+        concurrency = AdaptiveConcurrency(initial=8, latency_target=2.0)
+        concurrency.release(concurrency.try_acquire(), latency=5.0)
+        self.assertEqual(concurrency.limit, 4)
+
+    def test_failed_calls_leave_the_limit_unchanged(self):
+        limiter = RateLimiter(concurrency=AdaptiveConcurrency(initial=4))
+        limiter.release(limiter.acquire(), error=ValueError("bad input"))
+        self.assertEqual(limiter.concurrency.limit, 4)
+        limiter.release(limiter.acquire())
+        self.assertEqual(limiter.concurrency.limit, 4.25)
+
+    def test_interrupted_acquire_releases_the_slot(self):
+        def interrupted(seconds):
+            raise KeyboardInterrupt
+        limiter = RateLimiter(requests_per_minute=60, concurrency=AdaptiveConcurrency(initial=2), sleep=interrupted)
+        limiter.acquire()
+        with self.assertRaises(KeyboardInterrupt):
+            limiter.acquire()
+        self.assertEqual(limiter.concurrency.in_flight, 1)
+
+    def test_cancelled_aacquire_releases_the_slot(self):
+        limiter = RateLimiter(requests_per_minute=60, concurrency=AdaptiveConcurrency(initial=2))
+
+        async def cancel_while_waiting():
+            await limiter.aacquire()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(limiter.aacquire(), timeout=0.05)
+
+        asyncio.run(cancel_while_waiting())
+        self.assertEqual(limiter.concurrency.in_flight, 1)
+        self.assertEqual(limiter.concurrency.limit, 2)
+
+    def test_aimd_converges_to_simulated_provider_capacity(self):
+        # a provider serving 10 concurrent calls throttles the rest of each round
+        capacity = 10
+        concurrency = AdaptiveConcurrency(initial=2, max_limit=64)
+        total = throttled = 0
+        limits = []
+        for _ in range(60):
+            tickets = []
+            ticket = concurrency.try_acquire()
+            while ticket is not None:
+                tickets.append(ticket)
+                ticket = concurrency.try_acquire()
+            total += len(tickets)
+            throttled += len(tickets[capacity:])
+            for ticket in tickets[:capacity]:
+                concurrency.release(ticket)
+            for ticket in tickets[capacity:]:
+                concurrency.release(ticket, throttled=True)
+            limits.append(concurrency.limit)
+
+        self.assertEqual(concurrency.in_flight, 0)
+        self.assertTrue(all(capacity / 2 <= limit <= capacity + 2 for limit in limits[20:]))
+        self.assertLess(throttled / total, 0.03)
+
+    def test_is_throttling_error(self):
+        self.assertTrue(is_throttling_error(ThrottledError()))
+        self.assertTrue(is_throttling_error(ClientError({"Error": {"Code": "ThrottlingException"}}, "Converse")))
+        self.assertFalse(is_throttling_error(ClientError({"Error": {"Code": "ValidationException"}}, "Converse")))
+        self.assertFalse(is_throttling_error(ValueError("bad input")))
+        self.assertFalse(is_throttling_error(None))
+
+
+class TestProviderRateLimiter(unittest.TestCase):
+    def setUp(self):
+        clear_rate_limiters()
+        self.addCleanup(clear_rate_limiters)
+
+    def test_limits_from_config_per_model(self):
+        providers = {"openai": {"default": {"requests_per_minute": 500},
+                                "gpt-4o-mini": {"requests_per_minute": 5000, "tokens_per_minute": 2000000}}}
+        with patch.dict(ConfigManager().config["rate_limits"], {"providers": providers}):
+            mini = get_provider_rate_limiter("openai", "gpt-4o-mini")
+            other = get_provider_rate_limiter("openai", "gpt-4o")
+            unconfigured = get_provider_rate_limiter("anthropic", "claude-3-5-sonnet")
+
+            self.assertEqual((mini.requests_per_minute, mini.tokens_per_minute), (5000, 2000000))
+            self.assertEqual((other.requests_per_minute, other.tokens_per_minute), (500, None))
+            self.assertIsNone(other.concurrency)
+            self.assertIsNone(unconfigured)
+            self.assertIs(get_provider_rate_limiter("openai", "gpt-4o-mini"), mini)
+
+            from agentgateway.agent_gateway import AgentGateway, AgentType
+            gateway = AgentGateway(AgentType.OPENAI, "gpt-4o-mini")
+            self.assertIs(gateway.adapter.rate_limiter, mini)
+
+    def test_adapters_built_outside_gateway_use_configured_limits(self):
+        from agentgateway.adapters.openai_gpt_agent import OpenAIGPTAgent
+        from agentgateway.adapters.routing_agent import RoutingAgent
+        providers = {"openai": {"gpt-4o-mini": {"requests_per_minute": 5000},
+                                "gpt-4o": {"requests_per_minute": 500}}}
+        with patch.dict(ConfigManager().config["rate_limits"], {"providers": providers}):
+            adapter = OpenAIGPTAgent("gpt-4o-mini")
+            self.assertIs(adapter.rate_limiter, get_provider_rate_limiter("openai", "gpt-4o-mini"))
+            adapter.set_model("gpt-4o")
+            self.assertIs(adapter.rate_limiter, get_provider_rate_limiter("openai", "gpt-4o"))
+
+            routing = RoutingAgent([OpenAIGPTAgent("gpt-4o-mini"), OpenAIGPTAgent("gpt-4o")])
+            self.assertIsNone(routing.rate_limiter)
+            self.assertEqual([backend.rate_limiter.requests_per_minute for backend in routing.backends.values()],
+                             [5000, 500])
+
+            custom = get_rate_limiter("custom", 60)
+            adapter.set_rate_limiter(custom)
+            adapter.set_model("gpt-4o-mini")
+            self.assertIs(adapter.rate_limiter, custom)
+
+    def test_adaptive_concurrency_from_config(self):
+        with patch.dict(ConfigManager().config["rate_limits"], {"adaptive_concurrency": True}):
+            limiter = get_provider_rate_limiter("groq", "llama3-8b-8192")
+        self.assertIsNotNone(limiter.concurrency)
+        self.assertEqual(limiter.concurrency.limit, 8)
+        self.assertIsNone(limiter.requests_per_minute)
+
+    def test_shared_limiter_per_provider(self):
+        self.assertIs(get_rate_limiter("test-provider", 60), get_rate_limiter("test-provider", 60))
+        self.assertIsNot(get_rate_limiter("test-provider", 60), get_rate_limiter("other-provider", 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
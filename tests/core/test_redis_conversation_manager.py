@@ -0,0 +1,209 @@
+import asyncio
+import fnmatch
+import json
+import unittest
+from unittest.mock import patch
+from redis.exceptions import ResponseError
+from agentgateway.core.message import Message, _parsed_messages, to_messages
+from agentgateway.core.redis_conversation_manager import RedisConversationManager
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for the redis commands used by RedisConversationManager."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def _check(self, key, kind):
+        if key in self.data and not isinstance(self.data[key], kind):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+    def _encode(self, value):
+        return value.encode() if isinstance(value, str) else value
+
+    def set(self, key, value):
+        self.round_trips += 1
+        self.data[key] = self._encode(value)
+
+    def get(self, key):
+        self.round_trips += 1
+        self._check(key, bytes)
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.round_trips += 1
+        self.data.pop(key, None)
+
+    def rpush(self, key, *values):
+        self.round_trips += 1
+        self._check(key, list)
+        self.data.setdefault(key, []).extend(self._encode(v) for v in values)
+        return len(self.data[key])
+
+    def lrange(self, key, start, end):
+        self.round_trips += 1
+        self._check(key, list)
+        items = self.data.get(key, [])
+        return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def type(self, key):
+        self.round_trips += 1
+        value = self.data.get(key)
+        if value is None:
+            return b"none"
+        return b"list" if isinstance(value, list) else b"string"
+
+    def scan_iter(self, match="*", count=None, _type=None):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match) and (_type is None or self.type(key) == _type.encode()):
+                yield key.encode()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.buffering = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def watch(self, *keys):
+        self.buffering = False
+
+    def unwatch(self):
+        pass
+
+    def multi(self):
+        self.buffering = True
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def command(*args, **kwargs):
+            if not self.buffering:
+                return method(*args, **kwargs)
+            self.commands.append((method, args, kwargs))
+            return self
+        return command
+
+    def execute(self, raise_on_error=True):
+        self.redis.round_trips += 1
+        results = []
+        for method, args, kwargs in self.commands:
+            round_trips = self.redis.round_trips
+            try:
+                results.append(method(*args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+            self.redis.round_trips = round_trips
+        self.commands = []
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+
+class TestRedisConversationManager(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeRedis()
+        patcher = patch('agentgateway.core.redis_conversation_manager.redis.from_url', return_value=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_storage_mode(self):
+        with self.assertRaises(ValueError):
+            RedisConversationManager("redis://localhost:6379", storage_mode="hash")
+
+    def test_string_mode_unchanged(self):
+        manager = RedisConversationManager("redis://localhost:6379")
+        conversation_id = manager.start_conversation()
+        manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+        self.assertEqual(json.loads(self.fake.data[f"conversation:{conversation_id}"]),
+                         [{"role": "user", "content": "Hello"}])
+
+    def test_list_mode_appends_and_reads(self):
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+        conversation_id = manager.start_conversation()
+        manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+        manager.extend_conversation_history([{"role": "assistant", "content": "Hi"},
+                                             {"role": "user", "content": "Bye"}], conversation_id)
+        self.assertEqual(len(self.fake.data[f"conversation:{conversation_id}"]), 3)
+        self.assertEqual(manager.get_formatted_conversation_history(conversation_id),
+                         "User: Hello\nAssistant: Hi\nUser: Bye")
+        manager.clear_conversation_history(conversation_id)
+        self.assertEqual(manager.get_conversation_history(conversation_id), [])
+
+    def test_list_mode_batch_pipelines_turn_writes(self):
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+        conversation_id = manager.start_conversation()
+        self.fake.round_trips = 0
+        with manager.batch():
+            manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+            history = manager.get_conversation_history(conversation_id)
+            manager.add_to_conversation_history({"role": "assistant", "content": "Hi"}, conversation_id)
+            self.assertNotIn(b"Hi", b"".join(self.fake.data[f"conversation:{conversation_id}"]))
+        self.assertEqual(history, [{"role": "user", "content": "Hello"}])
+        # one pipeline for append + read, one for the buffered assistant message
+        self.assertEqual(self.fake.round_trips, 2)
+        self.assertEqual(len(manager.get_conversation_history(conversation_id)), 2)
+
+    def test_list_mode_abatch_pipelines_turn_writes(self):
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+        conversation_id = manager.start_conversation()
+        self.fake.round_trips = 0
+
+        async def turn():
+            async with manager.abatch():
+                manager.add_to_conversation_history({"role": "user", "content": "Hello"}, conversation_id)
+                manager.add_to_conversation_history({"role": "assistant", "content": "Hi"}, conversation_id)
+                self.assertNotIn(f"conversation:{conversation_id}", self.fake.data)
+        asyncio.run(turn())
+
+        self.assertEqual(self.fake.round_trips, 1)
+        self.assertEqual(len(manager.get_conversation_history(conversation_id)), 2)
+
+    def test_repeated_reads_are_parsed_once(self):
+        _parsed_messages.clear()
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+        conversation_id = manager.start_conversation()
+        manager.extend_conversation_history([{"role": "user", "content": "Hello"},
+                                             {"role": "assistant", "content": "Hi"}], conversation_id)
+
+        with patch.object(Message, "from_provider", wraps=Message.from_provider) as from_provider:
+            first = to_messages(manager.get_conversation_history(conversation_id))
+            second = to_messages(manager.get_conversation_history(conversation_id))
+
+        self.assertEqual(from_provider.call_count, 2)
+        self.assertIs(first[1], second[1])
+
+    def test_list_mode_reads_legacy_string_key(self):
+        self.fake.data["conversation:legacy"] = json.dumps([{"role": "user", "content": "Old"}]).encode()
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+        manager.add_to_conversation_history({"role": "assistant", "content": "New"}, "legacy")
+        self.assertEqual([m["content"] for m in manager.get_conversation_history("legacy")], ["Old", "New"])
+
+    def test_migrate_to_list_storage(self):
+        for conversation_id in ("a", "b"):
+            self.fake.data[f"conversation:{conversation_id}"] = json.dumps(
+                [{"role": "user", "content": conversation_id}]).encode()
+        self.fake.data["conversation:c"] = [json.dumps({"role": "user", "content": "c"}).encode()]
+        manager = RedisConversationManager("redis://localhost:6379", storage_mode="list")
+
+        self.assertEqual(manager.migrate_to_list_storage(), 2)
+        for conversation_id in ("a", "b", "c"):
+            self.assertIsInstance(self.fake.data[f"conversation:{conversation_id}"], list)
+            self.assertEqual(manager.get_conversation_history(conversation_id),
+                             [{"role": "user", "content": conversation_id}])
+
+
+if __name__ == '__main__':
+    unittest.main()
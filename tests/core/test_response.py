@@ -1,5 +1,6 @@
 import unittest
-from agentgateway.core.response import Response, ResponseType
+from agentgateway.core.response import EventType, Response, ResponseType
+from agentgateway.core.tracing import format_timestamp, now_ns
 
 class TestResponse(unittest.TestCase):
     def setUp(self):
@@ -40,11 +41,21 @@ class TestResponse(unittest.TestCase):
             "content": "Use tool X",
             "tools": ["tool1"],
             "conversation_id": "test_conversation",
-            "llm_usage": {'llm_calls':0, 'total_input_tokens':0, 'total_output_tokens':0},
+            "llm_usage": {'llm_calls':0, 'total_input_tokens':0, 'total_output_tokens':0,
+                          'total_cache_read_tokens':0, 'total_cache_write_tokens':0},
             'trace_details': []
         }
         self.assertEqual(self.response.to_dict(), expected_dict)
 
+    def test_update_usage_with_prompt_cache_tokens(self):
+        self.response.update_usage(100, 20, cache_read_tokens=80, cache_write_tokens=5)
+        self.response.update_usage(10, 2)
+        usage = self.response.get_usage_details()
+        self.assertEqual(usage["llm_calls"], 2)
+        self.assertEqual(usage["total_input_tokens"], 110)
+        self.assertEqual(usage["total_cache_read_tokens"], 80)
+        self.assertEqual(usage["total_cache_write_tokens"], 5)
+
     def test_str_representation(self):
         self.response.set_response_type(ResponseType.ASK_USER)
         self.response.set_content("What's your name?")
@@ -52,6 +63,18 @@ class TestResponse(unittest.TestCase):
         self.assertEqual(self.response.content, "What's your name?")
         self.assertEqual(self.response.conversation_id, "test_conversation")
 
+    def test_trace_details_have_times_from_timestamps(self):
+        self.response.set_response_type(ResponseType.ANSWER)
+        start_ns = now_ns()
+        self.response.add_trace_detail(EventType.LLM_CALL, latency=0.5, name="model", start_ns=start_ns,
+                                       end_ns=start_ns + 500_000_000)
+
+        detail = self.response.trace_details[0]
+        self.assertEqual(detail["start_time"], format_timestamp(start_ns))
+        self.assertEqual(detail["end_time"], format_timestamp(start_ns + 500_000_000))
+        self.assertIn(repr(detail["start_time"]), str(self.response))
+        self.assertEqual(self.response.get_trace_details(), [detail])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
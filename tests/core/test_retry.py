@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, Dict
+
+from botocore.exceptions import ClientError
+
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.response import Response, StreamEvent, StreamEventType
+from agentgateway.core.retry import LatencyTracker, RetryPolicy, get_retry_after, is_retryable_error
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int, headers: Dict[str, str] = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("FakeResponse", (), {"headers": headers or {}})()
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+class FlakyProvider:
+    """Fails with the given errors, in order, then answers."""
+
+    def __init__(self, *errors, delays=()):
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def call(self):
+        with self.lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else 0
+            error = self.errors.pop(0) if self.errors else None
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        return {"input_tokens": 10, "output_tokens": 5}
+
+
+class RetryingAgent(AbstractAgent):
+    def __init__(self, provider: FlakyProvider):
+        super().__init__("retry-model")
+        self.provider = provider
+
+    def run(self, agent_input=None, is_tool_response=False, conversation_id=None) -> Response:
+        response = Response()
+        self._call_model({}, response)
+        return response
+
+    def _invoke_model(self, request: Dict[str, Any]) -> Any:
+        return self.provider.call()
+
+    async def _ainvoke_model(self, request: Dict[str, Any]) -> Any:
+        return self.provider.call()
+
+    def _invoke_model_stream(self, request: Dict[str, Any]):
+        model_response = self.provider.call()
+        yield StreamEvent(StreamEventType.TEXT_DELTA, content="partial")
+        return model_response
+
+    def _get_usage(self, model_response):
+        return model_response["input_tokens"], model_response["output_tokens"]
+
+    def set_auth(self, **kwargs):
+        pass
+
+    def get_auth(self) -> Dict[str, Any]:
+        return {}
+
+    def set_model_config(self, **kwargs):
+        pass
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+
+def no_jitter_policy(**kwargs) -> RetryPolicy:
+    sleeps = []
+    policy = RetryPolicy(jitter=False, sleep=sleeps.append, **kwargs)
+    policy.sleeps = sleeps
+    return policy
+
+
+class TestRetryClassification(unittest.TestCase):
+    def test_transient_errors_are_retryable(self):
+        for status_code in (408, 429, 500, 502, 503, 529):
+            self.assertTrue(is_retryable_error(StatusError(status_code)), status_code)
+        self.assertTrue(is_retryable_error(APIConnectionError("reset")))
+        self.assertTrue(is_retryable_error(TimeoutError()))
+        self.assertTrue(is_retryable_error(
+            ClientError({"Error": {"Code": "ServiceUnavailableException"}}, "Converse")))
+
+    def test_client_errors_are_fatal(self):
+        for status_code in (400, 401, 403, 404, 422):
+            self.assertFalse(is_retryable_error(StatusError(status_code)), status_code)
+        self.assertFalse(is_retryable_error(ValueError("bad input")))
+        self.assertFalse(is_retryable_error(ClientError({"Error": {"Code": "ValidationException"}}, "Converse")))
+
+    def test_retry_after_header(self):
+        self.assertEqual(get_retry_after(StatusError(429, {"retry-after": "7"})), 7.0)
+        self.assertIsNone(get_retry_after(StatusError(429)))
+        self.assertIsNone(get_retry_after(ValueError()))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff_is_capped(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=False)
+        self.assertEqual([policy.backoff(retry) for retry in range(1, 6)], [0.5, 1.0, 2.0, 3, 3])
+
+    def test_full_jitter_stays_under_the_cap(self):
+        policy = RetryPolicy(base_delay=1, rand=lambda: 0.25)
+        self.assertEqual(policy.backoff(3), 1.0)
+
+    def test_retry_after_raises_the_delay(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=10, jitter=False)
+        self.assertEqual(policy.backoff(1, StatusError(429, {"retry-after": "4"})), 4.0)
+        self.assertEqual(policy.backoff(1, StatusError(429, {"retry-after": "60"})), 10)
+
+    def test_retries_transient_errors_then_succeeds(self):
+        policy = no_jitter_policy(max_attempts=3)
+        provider = FlakyProvider(StatusError(503), StatusError(429))
+        outcomes = []
+
+        self.assertEqual(policy.call(provider.call, outcomes.append)["output_tokens"], 5)
+        self.assertEqual(provider.calls, 3)
+        self.assertEqual(policy.sleeps, [0.5, 1.0])
+        self.assertEqual([(o.attempt, o.error is None) for o in outcomes], [(1, False), (2, False), (3, True)])
+
+    def test_fatal_errors_are_not_retried(self):
+        policy = no_jitter_policy(max_attempts=3)
+        provider = FlakyProvider(StatusError(400))
+        with self.assertRaises(StatusError):
+            policy.call(provider.call, lambda outcome: None)
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(policy.sleeps, [])
+
+    def test_gives_up_after_max_attempts(self):
+        policy = no_jitter_policy(max_attempts=2)
+        provider = FlakyProvider(StatusError(500), StatusError(500), StatusError(500))
+        with self.assertRaises(StatusError):
+            policy.call(provider.call, lambda outcome: None)
+        self.assertEqual(provider.calls, 2)
+
+    def test_deadline_stops_retries_that_would_overrun_it(self):
+        policy = no_jitter_policy(max_attempts=5, base_delay=2, deadline=1)
+        provider = FlakyProvider(StatusError(500))
+        with self.assertRaises(StatusError):
+            policy.call(provider.call, lambda outcome: None)
+        self.assertEqual(provider.calls, 1)
+
+    def test_attempt_timeout_fails_slow_attempts(self):
+        policy = no_jitter_policy(max_attempts=2, attempt_timeout=0.05)
+        provider = FlakyProvider(delays=[1.0])
+        outcomes = []
+
+        self.assertEqual(policy.call(provider.call, outcomes.append)["input_tokens"], 10)
+        self.assertIsInstance(outcomes[0].error, TimeoutError)
+        self.assertIsNone(outcomes[1].error)
+
+    def test_hedge_wins_over_a_slow_attempt(self):
+        policy = no_jitter_policy(hedge_after=0.05)
+        provider = FlakyProvider(delays=[1.0])
+        outcomes = []
+
+        started = time.perf_counter()
+        policy.call(provider.call, outcomes.append)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual([(o.attempt, o.hedged, o.superseded) for o in outcomes], [(1, False, True), (2, True, False)])
+
+    def test_percentile_hedging_waits_for_samples(self):
+        tracker = LatencyTracker(window=10, min_samples=5)
+        policy = RetryPolicy(hedge_after="p90")
+        self.assertIsNone(policy.hedge_delay(tracker))
+        for latency in (0.1, 0.2, 0.3, 0.4, 1.0):
+            tracker.observe(latency)
+        self.assertEqual(policy.hedge_delay(tracker), 1.0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(hedge_after="fast")
+
+    def test_async_retries_and_hedges(self):
+        policy = no_jitter_policy(max_attempts=2, hedge_after=0.05)
+        calls = []
+
+        async def attempt():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise StatusError(503)
+            if len(calls) == 2:
+                await asyncio.sleep(1.0)
+            return "ok"
+
+        outcomes = []
+        self.assertEqual(asyncio.run(policy.acall(attempt, outcomes.append)), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([(o.attempt, o.hedged, o.superseded) for o in outcomes],
+                         [(1, False, False), (2, False, True), (3, True, False)])
+
+
+class TestAgentRetries(unittest.TestCase):
+    def test_every_attempt_is_traced(self):
+        agent = RetryingAgent(FlakyProvider(APIConnectionError("reset")))
+        agent.set_retry_policy(no_jitter_policy(max_attempts=3))
+
+        response = agent.run()
+
+        traces = response.get_trace_details()
+        self.assertEqual([(t["event_type"], t["attempt"]) for t in traces], [("llm_error", 1), ("llm_call", 2)])
+        self.assertEqual(traces[0]["error"], "APIConnectionError: reset")
+        self.assertEqual(response.get_usage_details()["llm_calls"], 1)
+
+    def test_async_attempts_are_traced(self):
+        agent = RetryingAgent(FlakyProvider(StatusError(529)))
+        agent.set_retry_policy(no_jitter_policy(max_attempts=2))
+        response = Response()
+
+        asyncio.run(agent._acall_model({}, response))
+
+        self.assertEqual([t["event_type"] for t in response.get_trace_details()], ["llm_error", "llm_call"])
+
+    def test_stream_retries_before_the_first_event(self):
+        agent = RetryingAgent(FlakyProvider(StatusError(500)))
+        agent.set_retry_policy(no_jitter_policy(max_attempts=2))
+        response = Response()
+
+        events = list(agent._stream_model({}, response))
+
+        self.assertEqual([event.content for event in events], ["partial"])
+        self.assertEqual([t["attempt"] for t in response.get_trace_details()], [1, 2])
+
+    def test_set_retry_policy_rejects_other_types(self):
+        agent = RetryingAgent(FlakyProvider())
+        with self.assertRaises(TypeError):
+            agent.set_retry_policy({"max_attempts": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from typing import Any, Dict
+
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.schema_validator import SchemaValidator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "city": {"type": "string"},
+        "units": {"type": "string", "enum": ["metric", "imperial"], "default": "metric"},
+        "days": {"type": "integer", "default": 1},
+        "ratio": {"type": "number"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "location": {
+            "type": "object",
+            "properties": {
+                "lat": {"type": "number"},
+                "lon": {"type": "number"},
+                "precision": {"type": "integer", "default": 2}
+            },
+            "required": ["lat", "lon"]
+        },
+        "points": {
+            "type": "array",
+            "items": {"type": "object", "properties": {"x": {"type": "integer"}}, "required": ["x"]}
+        },
+        "note": {"type": ["string", "null"]}
+    },
+    "required": ["city"]
+}
+
+
+class CountingTool(Tool):
+    def __init__(self):
+        super().__init__("forecast", "Forecast")
+        self.schema_calls = 0
+
+    def execute(self) -> Any:
+        return self.get_parameters()
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        self.schema_calls += 1
+        return SCHEMA
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+class TestSchemaValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = SchemaValidator(SCHEMA)
+
+    def test_applies_defaults(self):
+        self.assertEqual(self.validator.validate({"city": "Oslo"}), {"city": "Oslo", "units": "metric", "days": 1})
+
+    def test_nested_object_with_defaults(self):
+        result = self.validator.validate({"city": "Oslo", "location": {"lat": 59.9, "lon": 10}})
+        self.assertEqual(result["location"], {"lat": 59.9, "lon": 10, "precision": 2})
+
+    def test_nested_required_and_types(self):
+        with self.assertRaisesRegex(ValueError, "location.lon"):
+            self.validator.validate({"city": "Oslo", "location": {"lat": 1.0}})
+        with self.assertRaisesRegex(TypeError, "location.lat"):
+            self.validator.validate({"city": "Oslo", "location": {"lat": "north", "lon": 1}})
+
+    def test_arrays(self):
+        self.assertEqual(self.validator.validate({"city": "Oslo", "tags": ["a", "b"]})["tags"], ["a", "b"])
+        with self.assertRaisesRegex(TypeError, r"tags\[1\]"):
+            self.validator.validate({"city": "Oslo", "tags": ["a", 2]})
+        with self.assertRaisesRegex(ValueError, r"points\[0\].x"):
+            self.validator.validate({"city": "Oslo", "points": [{}]})
+
+    def test_enum(self):
+        with self.assertRaisesRegex(ValueError, "units"):
+            self.validator.validate({"city": "Oslo", "units": "kelvin"})
+
+    def test_type_lists_and_bool_is_not_a_number(self):
+        self.assertIsNone(self.validator.validate({"city": "Oslo", "note": None})["note"])
+        with self.assertRaises(TypeError):
+            self.validator.validate({"city": "Oslo", "days": True})
+        self.assertEqual(self.validator.validate({"city": "Oslo", "ratio": 2})["ratio"], 2)
+
+    def test_top_level_errors(self):
+        with self.assertRaisesRegex(ValueError, "Missing required parameter: city"):
+            self.validator.validate({})
+        with self.assertRaisesRegex(ValueError, "Unexpected parameter: country"):
+            self.validator.validate({"city": "Oslo", "country": "NO"})
+        with self.assertRaisesRegex(ValueError, "cannot be None"):
+            self.validator.validate_parameter("city", None)
+
+
+class TestToolValidatorCaching(unittest.TestCase):
+    def test_schema_is_compiled_once(self):
+        tool = CountingTool()
+        tool.set_parameters({"city": "Oslo"})
+        tool.set_parameter("days", 3)
+        for i in range(5):
+            tool.create_invocation(f"call_{i}").set_parameters({"city": "Lima"}, replace=True)
+        self.assertEqual(tool.schema_calls, 1)
+        self.assertEqual(tool.get_parameters(), {"city": "Oslo", "units": "metric", "days": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
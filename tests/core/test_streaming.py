@@ -0,0 +1,136 @@
+import unittest
+from types import SimpleNamespace
+
+from openai.types.chat import ChatCompletionChunk
+from anthropic.types import (RawMessageStartEvent, RawContentBlockStartEvent, RawContentBlockDeltaEvent,
+                             RawContentBlockStopEvent, RawMessageDeltaEvent, RawMessageStopEvent)
+
+from agentgateway.core.response import StreamEventType
+from agentgateway.core.streaming import (assemble_chat_completion_stream, assemble_anthropic_message_stream,
+                                         assemble_converse_stream)
+
+
+def drain(generator):
+    """Collect the yielded events and the return value of an assembler."""
+    events = []
+    while True:
+        try:
+            events.append(next(generator))
+        except StopIteration as stop:
+            return events, stop.value
+
+
+def chat_chunk(delta=None, finish_reason=None, usage=None):
+    choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    return ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 1, "model": "gpt-4o",
+        "choices": choices, "usage": usage
+    })
+
+
+class TestAssembleChatCompletionStream(unittest.TestCase):
+    def test_text_deltas_and_usage(self):
+        chunks = [
+            chat_chunk({"role": "assistant", "content": "Hel"}),
+            chat_chunk({"content": "lo"}),
+            chat_chunk({}, finish_reason="stop"),
+            chat_chunk(usage={"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}),
+        ]
+        events, completion = drain(assemble_chat_completion_stream(chunks))
+
+        self.assertEqual([event.content for event in events], ["Hel", "lo"])
+        self.assertTrue(all(event.event_type == StreamEventType.TEXT_DELTA for event in events))
+        self.assertEqual(completion["choices"][0]["message"]["content"], "Hello")
+        self.assertEqual(completion["choices"][0]["finish_reason"], "stop")
+        self.assertEqual(completion["usage"]["prompt_tokens"], 5)
+
+    def test_tool_call_arguments_are_assembled_by_index(self):
+        chunks = [
+            chat_chunk({"role": "assistant", "tool_calls": [
+                {"index": 0, "id": "call_a", "type": "function", "function": {"name": "weather", "arguments": ""}}]}),
+            chat_chunk({"tool_calls": [{"index": 0, "function": {"arguments": '{"city": '}}]}),
+            chat_chunk({"tool_calls": [
+                {"index": 1, "id": "call_b", "type": "function", "function": {"name": "time", "arguments": "{}"}}]}),
+            chat_chunk({"tool_calls": [{"index": 0, "function": {"arguments": '"Paris"}'}}]}),
+            chat_chunk({}, finish_reason="tool_calls"),
+        ]
+        events, completion = drain(assemble_chat_completion_stream(chunks))
+
+        self.assertEqual(events, [])
+        message = completion["choices"][0]["message"]
+        self.assertIsNone(message["content"])
+        self.assertEqual(message["tool_calls"], [
+            {"id": "call_a", "type": "function", "function": {"name": "weather", "arguments": '{"city": "Paris"}'}},
+            {"id": "call_b", "type": "function", "function": {"name": "time", "arguments": "{}"}},
+        ])
+        self.assertEqual(completion["choices"][0]["finish_reason"], "tool_calls")
+
+    def test_groq_usage_from_x_groq(self):
+        last = SimpleNamespace(id="c", created=1, model="llama", usage=None, choices=[],
+                               x_groq=SimpleNamespace(usage={"prompt_tokens": 3, "completion_tokens": 1,
+                                                             "total_tokens": 4}))
+        _, completion = drain(assemble_chat_completion_stream([last]))
+        self.assertEqual(completion["usage"]["total_tokens"], 4)
+
+
+class TestAssembleAnthropicMessageStream(unittest.TestCase):
+    def test_text_and_tool_use(self):
+        events = [
+            RawMessageStartEvent.model_validate({"type": "message_start", "message": {
+                "id": "msg_1", "type": "message", "role": "assistant", "model": "claude", "content": [],
+                "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 9, "output_tokens": 1}}}),
+            RawContentBlockStartEvent.model_validate({"type": "content_block_start", "index": 0,
+                                                      "content_block": {"type": "text", "text": ""}}),
+            RawContentBlockDeltaEvent.model_validate({"type": "content_block_delta", "index": 0,
+                                                      "delta": {"type": "text_delta", "text": "Checking"}}),
+            RawContentBlockStopEvent.model_validate({"type": "content_block_stop", "index": 0}),
+            RawContentBlockStartEvent.model_validate({"type": "content_block_start", "index": 1, "content_block": {
+                "type": "tool_use", "id": "toolu_1", "name": "weather", "input": {}}}),
+            RawContentBlockDeltaEvent.model_validate({"type": "content_block_delta", "index": 1,
+                                                      "delta": {"type": "input_json_delta", "partial_json": '{"ci'}}),
+            RawContentBlockDeltaEvent.model_validate({"type": "content_block_delta", "index": 1,
+                                                      "delta": {"type": "input_json_delta", "partial_json": 'ty": "Oslo"}'}}),
+            RawContentBlockStopEvent.model_validate({"type": "content_block_stop", "index": 1}),
+            RawMessageDeltaEvent.model_validate({"type": "message_delta", "delta": {"stop_reason": "tool_use",
+                                                                                     "stop_sequence": None},
+                                                 "usage": {"output_tokens": 20}}),
+            RawMessageStopEvent.model_validate({"type": "message_stop"}),
+        ]
+        stream_events, message = drain(assemble_anthropic_message_stream(events))
+
+        self.assertEqual([event.content for event in stream_events], ["Checking"])
+        self.assertEqual(message["content"][0], {"type": "text", "text": "Checking"})
+        self.assertEqual(message["content"][1]["input"], {"city": "Oslo"})
+        self.assertEqual(message["stop_reason"], "tool_use")
+        self.assertEqual(message["usage"]["input_tokens"], 9)
+        self.assertEqual(message["usage"]["output_tokens"], 20)
+
+
+class TestAssembleConverseStream(unittest.TestCase):
+    def test_text_and_tool_use(self):
+        events = [
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "One "}}},
+            {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "moment"}}},
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+            {"contentBlockStart": {"contentBlockIndex": 1,
+                                   "start": {"toolUse": {"toolUseId": "tu_1", "name": "weather"}}}},
+            {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"toolUse": {"input": '{"city":'}}}},
+            {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"toolUse": {"input": '"Lima"}'}}}},
+            {"contentBlockStop": {"contentBlockIndex": 1}},
+            {"messageStop": {"stopReason": "tool_use"}},
+            {"metadata": {"usage": {"inputTokens": 11, "outputTokens": 6, "totalTokens": 17}}},
+        ]
+        stream_events, result = drain(assemble_converse_stream(events))
+
+        self.assertEqual([event.content for event in stream_events], ["One ", "moment"])
+        self.assertEqual(result["output"]["message"]["content"], [
+            {"text": "One moment"},
+            {"toolUse": {"toolUseId": "tu_1", "name": "weather", "input": {"city": "Lima"}}},
+        ])
+        self.assertEqual(result["stopReason"], "tool_use")
+        self.assertEqual(result["usage"]["inputTokens"], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
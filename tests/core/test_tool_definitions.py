@@ -0,0 +1,83 @@
+import json
+import unittest
+from typing import Any, Dict
+
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.cache import InMemoryCache
+from agentgateway.core.tool_definitions import ToolDefinitionCache
+
+
+class SchemaTool(Tool):
+    def __init__(self, name="lookup", description="Look something up", required=("query",)):
+        super().__init__(name, description)
+        self.required = list(required)
+
+    def execute(self) -> Any:
+        return "ok"
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {"query": {"type": "string"}, "limit": {"type": "integer"}},
+                "required": self.required}
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+def format_tool(tool):
+    return {"name": tool.name, "description": tool.description, "input_schema": tool.get_parameters_schema()}
+
+
+class TestToolDefinitionCache(unittest.TestCase):
+    def test_definition_is_formatted_and_encoded_once(self):
+        cache = ToolDefinitionCache()
+        formatted = []
+
+        def counting_format(tool):
+            formatted.append(tool)
+            return format_tool(tool)
+        first = cache.get(SchemaTool(), "anthropic", counting_format)
+        second = cache.get(SchemaTool(), "anthropic", counting_format)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(formatted), 1)
+        self.assertEqual(json.loads(first.json), first.definition)
+
+    def test_keyed_by_format_and_tool_identity(self):
+        cache = ToolDefinitionCache()
+        tool = SchemaTool()
+        anthropic = cache.get(tool, "anthropic", format_tool)
+        bedrock = cache.get(tool, "bedrock", lambda t: {"toolSpec": format_tool(t)})
+        renamed = cache.get(SchemaTool(name="search"), "anthropic", format_tool)
+        reshaped = cache.get(SchemaTool(required=("query", "limit")), "anthropic", format_tool)
+
+        self.assertIsNot(anthropic, bedrock)
+        self.assertNotEqual(anthropic.digest, renamed.digest)
+        self.assertEqual(reshaped.definition["input_schema"]["required"], ["query", "limit"])
+        self.assertNotEqual(anthropic.digest, reshaped.digest)
+
+
+class TestAdapterToolDefinitions(unittest.TestCase):
+    def test_identical_agents_share_definitions(self):
+        from agentgateway.adapters.anthropic_claude_agent import AnthropicClaudeAgent
+        first, second = AnthropicClaudeAgent("claude"), AnthropicClaudeAgent("claude")
+        first.add_tool(SchemaTool(description="shared definition"))
+        second.add_tool(SchemaTool(description="shared definition"))
+
+        self.assertIs(first.formatted_tools[0], second.formatted_tools[0])
+        self.assertEqual(first.formatted_tools[0]["input_schema"]["required"], ["query"])
+
+    def test_response_cache_key_uses_tool_digests(self):
+        from agentgateway.adapters.groq_agent import GroqAgent
+        agent = GroqAgent("llama3-70b-8192")
+        agent.set_response_cache(InMemoryCache())
+        agent.add_tool(SchemaTool())
+        request = {"model": "llama3-70b-8192", "messages": [], "tools": agent.formatted_tools}
+
+        key = agent._get_response_cache_key(request)
+        self.assertEqual(key, agent._get_response_cache_key(dict(request)))
+        agent.add_tool(SchemaTool(name="search"))
+        self.assertNotEqual(key, agent._get_response_cache_key({**request, "tools": agent.formatted_tools}))
+
+
+if __name__ == '__main__':
+    unittest.main()
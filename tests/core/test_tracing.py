@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict, Any, Optional
+from agentgateway.agent_gateway import AgentGateway
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.prompt import Prompt
+from agentgateway.core.response import Response, ResponseType
+from agentgateway.core.tracing import (CLIENT, InMemorySpanExporter, JsonlSpanExporter, OtlpFileSpanExporter, Tracer,
+                                       format_timestamp, now_ns, set_tracer)
+
+
+class EchoTool(Tool):
+    def __init__(self):
+        super().__init__("echo", "Echoes the text")
+
+    def execute(self) -> Any:
+        return self.get_parameter("text")
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+class ToolCallingAgent(AbstractAgent):
+    """Calls the model on every turn, asks for the echo tool on the first one and answers with its output."""
+
+    def __init__(self):
+        super().__init__("fake-model")
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        response = self.response
+        self._call_model({"model": self.model_id, "input": agent_input}, response)
+        if not is_tool_response:
+            response.set_response_type(ResponseType.TOOL_CALL)
+            response.set_tools([self.get_tool_from_response({"name": "echo", "input": {"text": "hi"}, "id": "call_0"})])
+        else:
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(agent_input[0])
+        return response
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        return {"text": "ok"}
+
+    def set_auth(self, **kwargs):
+        self.auth_data.update(kwargs)
+
+    def get_auth(self) -> Dict[str, Any]:
+        return self.auth_data
+
+    def set_model_config(self, **kwargs):
+        self.model_config.update(kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+    def get_formatted_tool_output(self, tool, tool_output):
+        return tool_output
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        previous = set_tracer(Tracer([self.exporter]))
+        self.addCleanup(set_tracer, previous)
+
+    def _gateway(self):
+        gateway = AgentGateway(ToolCallingAgent(), "fake-model")
+        gateway.prepare_agent(Prompt("test"), [EchoTool()])
+        self.addCleanup(gateway.close)
+        return gateway
+
+    def test_gateway_run_span_hierarchy(self):
+        response = self._gateway().run_agent("go", conversation_id="conv")
+        self.assertEqual(response.content, "hi")
+
+        spans = {}
+        for span in self.exporter.get_finished_spans():
+            spans.setdefault(span.name, []).append(span)
+        run, = spans["agent.run"]
+        self.assertIsNone(run.parent_id)
+        self.assertEqual(run.attributes["conversation_id"], "conv")
+        turns = spans["agent.turn"]
+        self.assertEqual(len(turns), 2)
+        self.assertTrue(all(turn.parent_id == run.span_id for turn in turns))
+
+        llm_calls = spans["llm.call"]
+        self.assertEqual([call.parent_id for call in llm_calls], [turn.span_id for turn in turns])
+        self.assertEqual(llm_calls[0].kind, CLIENT)
+        self.assertEqual(llm_calls[0].attributes["provider"], "ToolCallingAgent")
+        tool_call, = spans["tool.call"]
+        self.assertEqual(tool_call.parent_id, turns[0].span_id)
+        self.assertEqual(tool_call.attributes, {"tool": "echo", "tool_call_id": "call_0", "cache_hit": False})
+
+        all_spans = self.exporter.get_finished_spans()
+        self.assertEqual({span.trace_id for span in all_spans}, {run.trace_id})
+        for span in all_spans:
+            self.assertLessEqual(span.start_ns, span.end_ns)
+            self.assertGreaterEqual(span.start_ns, run.start_ns)
+            self.assertLessEqual(span.end_ns, run.end_ns)
+
+    def test_stream_and_async_runs_are_traced(self):
+        gateway = self._gateway()
+        list(gateway.stream_agent("go"))
+        self.assertEqual([span.name for span in self.exporter.get_finished_spans()][-1], "agent.run")
+
+        self.exporter.clear()
+        asyncio.run(gateway.arun_agent("go"))
+        names = [span.name for span in self.exporter.get_finished_spans()]
+        self.assertEqual(names.count("agent.turn"), 2)
+        self.assertEqual(names.count("tool.call"), 1)
+
+    def test_span_records_error(self):
+        tracer = Tracer([self.exporter])
+        with self.assertRaises(ValueError):
+            with tracer.span("work"):
+                raise ValueError("bad input")
+        span, = self.exporter.get_finished_spans()
+        self.assertEqual(span.error, "ValueError: bad input")
+
+    def test_disabled_tracer_creates_no_spans(self):
+        set_tracer(Tracer())
+        response = self._gateway().run_agent("go")
+        self.assertEqual(response.content, "hi")
+        self.assertEqual(self.exporter.get_finished_spans(), [])
+        # the response trace still carries timestamps
+        trace = response.get_trace_details()[0]
+        self.assertRegex(trace["start_time"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$")
+        self.assertLessEqual(trace["start_ns"], trace["end_ns"])
+
+    def test_file_exporters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl_path = os.path.join(directory, "traces.jsonl")
+            otlp_path = os.path.join(directory, "traces.otlp.jsonl")
+            tracer = Tracer([JsonlSpanExporter(jsonl_path), OtlpFileSpanExporter(otlp_path, "test-service")])
+            root = tracer.start_span("agent.run", attributes={"model": "fake-model"})
+            start = now_ns()
+            tracer.record_span("llm.call", start, now_ns(), root, CLIENT, {"input_tokens": 5}, error="timeout")
+            tracer.end_span(root)
+            tracer.shutdown()
+
+            with open(jsonl_path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual([line["name"] for line in lines], ["llm.call", "agent.run"])
+            self.assertEqual(lines[0]["parent_id"], lines[1]["span_id"])
+            self.assertEqual(lines[0]["error"], "timeout")
+
+            with open(otlp_path) as f:
+                request, = [json.loads(line) for line in f]
+            resource_spans, = request["resourceSpans"]
+            self.assertEqual(resource_spans["resource"]["attributes"][0]["value"], {"stringValue": "test-service"})
+            llm_call, root_span = resource_spans["scopeSpans"][0]["spans"]
+            self.assertEqual(llm_call["parentSpanId"], root_span["spanId"])
+            self.assertNotIn("parentSpanId", root_span)
+            self.assertEqual(len(root_span["traceId"]), 32)
+            self.assertEqual(llm_call["kind"], CLIENT)
+            self.assertEqual(llm_call["attributes"], [{"key": "input_tokens", "value": {"intValue": "5"}}])
+            self.assertEqual(llm_call["status"], {"code": 2, "message": "timeout"})
+            self.assertLessEqual(int(root_span["startTimeUnixNano"]), int(llm_call["startTimeUnixNano"]))
+
+    def test_format_timestamp(self):
+        self.assertRegex(format_timestamp(now_ns()), r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,555 @@
+import asyncio
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+from typing import Dict, Any, Optional
+from agentgateway.agent_gateway import AgentGateway, UnsupportedAgentException
+from agentgateway.core.abstract_agent import AbstractAgent
+from agentgateway.core.abstract_tool import Tool
+from agentgateway.core.cache import InMemoryCache
+from agentgateway.core.cached_conversation_manager import CachedConversationManager
+from agentgateway.core.conversation_manager import ConversationManager
+from agentgateway.core.prompt import Prompt
+from agentgateway.core.response import Response, ResponseType, StreamEventType
+from agentgateway.utils.config_manager import ConfigManager
+
+
+class SleepTool(Tool):
+    """Sleeps and echoes the label; with a barrier, first waits until all the barrier's parties are running."""
+
+    def __init__(self, name: str = "sleep", delay: float = 0.2, barrier: Optional[threading.Barrier] = None):
+        super().__init__(name, "Sleeps and echoes the label")
+        self.delay = delay
+        self.barrier = barrier
+
+    def execute(self) -> Any:
+        if self.barrier is not None:
+            # raises BrokenBarrierError after the timeout unless the calls overlap
+            self.barrier.wait()
+        time.sleep(self.delay)
+        return f"{self.get_parameter('label')}:{threading.current_thread().name}"
+
+    def get_parameters_schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {"label": {"type": "string"}},
+            "required": ["label"]
+        }
+
+    def is_auth_setup(self) -> bool:
+        return True
+
+
+class FakeToolAgent(AbstractAgent):
+    """Asks for one tool call per label on the first turn, then answers with the tool outputs."""
+
+    def __init__(self, tool_calls):
+        super().__init__("fake-model")
+        self.tool_calls = tool_calls
+        self.response = None
+        self.tool_inputs = []
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        if self.response is None:
+            self.response = Response()
+        response = self.response
+        response.set_conversation_id(conversation_id or "conv")
+        if not is_tool_response:
+            tools = [self.get_tool_from_response({"name": name, "input": {"label": label}, "id": f"call_{i}"})
+                     for i, (name, label) in enumerate(self.tool_calls)]
+            response.set_response_type(ResponseType.TOOL_CALL)
+            response.set_tools(tools)
+        else:
+            self.tool_inputs.append(agent_input)
+            response.set_response_type(ResponseType.ANSWER)
+            response.set_content(",".join(item["content"].split(":")[0] for item in agent_input))
+        return response
+
+    def set_auth(self, **kwargs):
+        self.auth_data.update(kwargs)
+
+    def get_auth(self) -> Dict[str, Any]:
+        return self.auth_data
+
+    def set_model_config(self, **kwargs):
+        self.model_config.update(kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+    def get_formatted_tool_output(self, tool, tool_output):
+        return {"tool_call_id": tool.instance_id, "content": tool_output}
+
+
+class TestAgentGatewayToolExecution(unittest.TestCase):
+    def _gateway(self, tool_calls, tool: Optional[Tool] = None, **kwargs):
+        adapter = FakeToolAgent(tool_calls)
+        gateway = AgentGateway(adapter, "fake-model", **kwargs)
+        gateway.prepare_agent(Prompt("test"), [tool or SleepTool()])
+        self.addCleanup(gateway.close)
+        return gateway, adapter
+
+    def test_sequential_execution_by_default(self):
+        gateway, adapter = self._gateway([("sleep", "a"), ("sleep", "b")], parallel_tool_calls=False)
+        response = gateway.run_agent("go")
+        self.assertEqual(response.content, "a,b")
+        self.assertIsNone(gateway._tool_executor)
+
+    def test_parallel_execution_preserves_order_and_traces(self):
+        labels = ["paris", "tokyo", "lima", "oslo"]
+        tool = SleepTool(barrier=threading.Barrier(len(labels), timeout=5))
+        gateway, adapter = self._gateway([("sleep", label) for label in labels], tool,
+                                         parallel_tool_calls=True, max_tool_workers=4)
+        response = gateway.run_agent("go")
+
+        self.assertEqual(response.content, ",".join(labels))
+        self.assertEqual([item["tool_call_id"] for item in adapter.tool_inputs[0]],
+                         ["call_0", "call_1", "call_2", "call_3"])
+        self.assertFalse(tool.barrier.broken)
+
+        tool_traces = [t for t in response.get_trace_details() if t["event_type"] == "tool_call"]
+        self.assertEqual(len(tool_traces), len(labels))
+        for trace in tool_traces:
+            self.assertEqual(trace["name"], "sleep")
+            self.assertGreaterEqual(trace["latency"], 0.2)
+            self.assertLessEqual(trace["start_time"], trace["end_time"])
+
+    def test_parallel_execution_uses_bounded_pool(self):
+        gateway, adapter = self._gateway([("sleep", str(i)) for i in range(6)],
+                                         parallel_tool_calls=True, max_tool_workers=2)
+        gateway.run_agent("go")
+        threads = {item["content"].split(":")[1] for item in adapter.tool_inputs[0]}
+        self.assertLessEqual(len(threads), 2)
+
+    def test_unknown_tool_raises_before_execution(self):
+        gateway, adapter = self._gateway([("sleep", "a")], parallel_tool_calls=True)
+        gateway.tools.clear()
+        with self.assertRaises(UnsupportedAgentException):
+            gateway.run_agent("go")
+
+    def test_concurrent_runs_share_one_pool(self):
+        gateway, adapter = self._gateway([("sleep", "a"), ("sleep", "b")], SleepTool(delay=0),
+                                         parallel_tool_calls=True)
+        def slow_pool(*args, **kwargs):
+            # widens the window between checking for a pool and storing it
+            time.sleep(0.05)
+            return ThreadPoolExecutor(*args, **kwargs)
+
+        with patch('agentgateway.agent_gateway.ThreadPoolExecutor', side_effect=slow_pool) as pool_class:
+            with ThreadPoolExecutor(max_workers=8) as callers:
+                pools = set(callers.map(lambda _: gateway._get_tool_executor(), range(8)))
+        self.assertEqual(len(pools), 1)
+        pool_class.assert_called_once()
+
+
+class TestAgentGatewayAsync(unittest.IsolatedAsyncioTestCase):
+    def _gateway(self, tool_calls, tool: Optional[Tool] = None, **kwargs):
+        adapter = FakeToolAgent(tool_calls)
+        gateway = AgentGateway(adapter, "fake-model", **kwargs)
+        gateway.prepare_agent(Prompt("test"), [tool or SleepTool()])
+        self.addCleanup(gateway.close)
+        return gateway, adapter
+
+    async def test_arun_agent_answer(self):
+        gateway, adapter = self._gateway([("sleep", "a"), ("sleep", "b")], parallel_tool_calls=False)
+        response = await gateway.arun_agent("go")
+        self.assertEqual(response.response_type, ResponseType.ANSWER)
+        self.assertEqual(response.content, "a,b")
+
+    async def test_arun_agent_runs_tools_concurrently(self):
+        labels = ["paris", "tokyo", "lima"]
+        tool = SleepTool(barrier=threading.Barrier(len(labels), timeout=5))
+        gateway, adapter = self._gateway([("sleep", label) for label in labels], tool,
+                                         parallel_tool_calls=True, max_tool_workers=3)
+        response = await gateway.arun_agent("go")
+        self.assertEqual(response.content, ",".join(labels))
+        self.assertFalse(tool.barrier.broken)
+        tool_traces = [t for t in response.get_trace_details() if t["event_type"] == "tool_call"]
+        self.assertEqual(len(tool_traces), len(labels))
+
+    async def test_concurrent_conversations_share_event_loop(self):
+        barrier = threading.Barrier(4, timeout=5)
+        gateways = [self._gateway([("sleep", str(i))], SleepTool(barrier=barrier), parallel_tool_calls=False)[0]
+                    for i in range(4)]
+        responses = await asyncio.gather(*(gateway.arun_agent("go") for gateway in gateways))
+        self.assertEqual([r.content for r in responses], ["0", "1", "2", "3"])
+        self.assertFalse(barrier.broken)
+
+
+class ThreadRecordingCache(InMemoryCache):
+    """Records the threads it is called from."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ttl=None):
+        self.threads.append(threading.get_ident())
+        super().set(key, value, ttl)
+
+
+class ThreadRecordingConversationManager(ConversationManager):
+    """Records the threads it is called from."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get_conversation_history(self, conversation_id=None):
+        self.threads.append(threading.get_ident())
+        return super().get_conversation_history(conversation_id)
+
+    def add_to_conversation_history(self, message, conversation_id=None):
+        self.threads.append(threading.get_ident())
+        super().add_to_conversation_history(message, conversation_id)
+
+    def extend_conversation_history(self, messages, conversation_id=None):
+        self.threads.append(threading.get_ident())
+        super().extend_conversation_history(messages, conversation_id)
+
+
+class TestAgentGatewayAsyncStores(unittest.IsolatedAsyncioTestCase):
+    @patch('agentgateway.adapters.openai_gpt_agent.AsyncOpenAI')
+    async def test_stores_are_called_off_the_event_loop(self, mock_async_openai):
+        from openai.types.chat import ChatCompletion
+        from agentgateway.adapters.openai_gpt_agent import OpenAIGPTAgent
+        mock_async_openai.return_value.chat.completions.create = AsyncMock(return_value=ChatCompletion.model_validate({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hi"}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}
+        }))
+        store = ThreadRecordingConversationManager()
+        history = CachedConversationManager(store, ttl=60)
+        self.addCleanup(history.close)
+        response_cache = ThreadRecordingCache()
+        adapter = OpenAIGPTAgent("gpt-4o-mini")
+        adapter.set_auth(api_key="test_api_key")
+        adapter.set_response_cache(response_cache, ttl=60)
+        gateway = AgentGateway(adapter, "gpt-4o-mini")
+        gateway.prepare_agent(Prompt("test"), conversation_manager=history)
+        self.addCleanup(gateway.close)
+
+        await gateway.arun_agent("Hello", "conv-1")
+        await gateway.arun_agent("Again", "conv-1")
+
+        self.assertTrue(store.threads)
+        self.assertEqual(len(response_cache.threads), 4)
+        self.assertNotIn(threading.get_ident(), store.threads + response_cache.threads)
+        self.assertEqual([message["content"] for message in store.conversations["conv-1"]],
+                         ["Hello", "Hi", "Again", "Hi"])
+
+    async def test_tool_cache_is_called_off_the_event_loop(self):
+        cache = ThreadRecordingCache()
+        gateway = AgentGateway(FakeToolAgent([("sleep", "paris")]), "fake-model")
+        gateway.prepare_agent(Prompt("test"), [CachedSleepTool()])
+        gateway.set_tool_cache(cache)
+        self.addCleanup(gateway.close)
+
+        await gateway.arun_agent("go")
+        await gateway.arun_agent("go")
+
+        self.assertEqual(len(cache.threads), 3)
+        self.assertNotIn(threading.get_ident(), cache.threads)
+
+
+class TestAgentGatewaySharedAcrossConversations(unittest.TestCase):
+    def setUp(self):
+        self.adapter = FakeToolAgent([("sleep", "a")])
+        self.gateway = AgentGateway(self.adapter, "fake-model")
+        self.gateway.prepare_agent(Prompt("test"), [SleepTool(delay=0.05)])
+        self.addCleanup(self.gateway.close)
+        self.conversation_ids = [self.gateway.start_conversation() for _ in range(4)]
+
+    def assert_isolated(self, responses):
+        self.assertEqual([response.conversation_id for response in responses], self.conversation_ids)
+        self.assertEqual(len({id(response) for response in responses}), len(responses))
+        for response in responses:
+            self.assertEqual([t["event_type"] for t in response.get_trace_details()], ["tool_call"])
+        self.assertIsNone(self.adapter.response)
+
+    def test_threads_run_conversations_on_one_gateway(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(lambda cid: self.gateway.run_agent("go", cid), self.conversation_ids))
+        self.assert_isolated(responses)
+
+    def test_tasks_run_conversations_on_one_gateway(self):
+        async def run_all():
+            return await asyncio.gather(*(self.gateway.arun_agent("go", cid) for cid in self.conversation_ids))
+        self.assert_isolated(asyncio.run(run_all()))
+
+    def test_interleaved_streams(self):
+        streams = [self.gateway.stream_agent("go", cid) for cid in self.conversation_ids]
+        responses = [None] * len(streams)
+        # advance the streams in turns on one thread, as a server multiplexing them would
+        while not all(responses):
+            for index, stream in enumerate(streams):
+                if responses[index] is None:
+                    event = next(stream)
+                    if event.event_type == StreamEventType.RESPONSE:
+                        responses[index] = event.response
+        self.assert_isolated(responses)
+
+
+class CachedSleepTool(SleepTool):
+    CACHE_TTL = 60
+
+    def __init__(self):
+        super().__init__(delay=0.01)
+        # shared with the invocations, which copy the tool's attributes
+        self.executions = []
+
+    def execute(self) -> Any:
+        self.executions.append(self.get_parameter("label"))
+        return super().execute()
+
+
+class TestAgentGatewayToolCache(unittest.TestCase):
+    def _gateway(self, tool, label, cache):
+        gateway = AgentGateway(FakeToolAgent([(tool.name, label)]), "fake-model")
+        gateway.prepare_agent(Prompt("test"), [tool])
+        gateway.set_tool_cache(cache)
+        self.addCleanup(gateway.close)
+        return gateway
+
+    def test_cached_results_skip_execution(self):
+        tool = CachedSleepTool()
+        cache = InMemoryCache()
+        first = self._gateway(tool, "paris", cache).run_agent("go")
+        # the key is built from normalized parameters, so another gateway sharing the cache hits
+        second = self._gateway(tool, "  paris ", cache).run_agent("go")
+        third = asyncio.run(self._gateway(tool, "paris", cache).arun_agent("go"))
+
+        self.assertEqual(tool.executions, ["paris"])
+        self.assertEqual([response.content for response in (first, second, third)], ["paris"] * 3)
+        self.assertEqual([t["event_type"] for t in first.get_trace_details()], ["tool_call"])
+        self.assertEqual([t["event_type"] for t in second.get_trace_details()], ["tool_cache_hit"])
+        self.assertEqual([t["event_type"] for t in third.get_trace_details()], ["tool_cache_hit"])
+
+    def test_tools_without_ttl_and_uncacheable_results_run_every_time(self):
+        cache = InMemoryCache()
+        gateway = self._gateway(SleepTool(delay=0.01), "paris", cache)
+        gateway.run_agent("go")
+        gateway.run_agent("go")
+        self.assertEqual(len(cache._entries), 0)
+
+        tool = CachedSleepTool()
+        tool.is_cacheable_result = lambda tool_output: False
+        gateway = self._gateway(tool, "paris", cache)
+        gateway.run_agent("go")
+        gateway.run_agent("go")
+        self.assertEqual(tool.executions, ["paris", "paris"])
+
+
+class TestAgentGatewayStreaming(unittest.TestCase):
+    def test_stream_agent_yields_tool_events_and_final_response(self):
+        adapter = FakeToolAgent([("sleep", "a"), ("sleep", "b")])
+        gateway = AgentGateway(adapter, "fake-model", parallel_tool_calls=True)
+        gateway.prepare_agent(Prompt("test"), [SleepTool(delay=0)])
+        self.addCleanup(gateway.close)
+
+        events = list(gateway.stream_agent("go"))
+
+        self.assertEqual([event.event_type for event in events], [
+            StreamEventType.TOOL_CALL, StreamEventType.TOOL_CALL,
+            StreamEventType.TOOL_RESULT, StreamEventType.TOOL_RESULT,
+            StreamEventType.TEXT_DELTA, StreamEventType.RESPONSE
+        ])
+        self.assertEqual([event.tool.get_parameter("label") for event in events[:2]], ["a", "b"])
+        self.assertTrue(events[2].content.startswith("a:"))
+        self.assertEqual(events[4].content, "a,b")
+        response = events[-1].response
+        self.assertEqual(response.response_type, ResponseType.ANSWER)
+        self.assertEqual(response.content, "a,b")
+        tool_traces = [t for t in response.get_trace_details() if t["event_type"] == "tool_call"]
+        self.assertEqual(len(tool_traces), 2)
+
+    def test_stream_agent_flushes_only_its_conversation(self):
+        store = ConversationManager()
+        history = CachedConversationManager(store, ttl=60)
+        self.addCleanup(history.close)
+        gateway = AgentGateway(FakeBatchAgent(delay=0), "fake-model")
+        gateway.prepare_agent(Prompt("test"), conversation_manager=history)
+        self.addCleanup(gateway.close)
+        streamed, other = gateway.start_conversation(), gateway.start_conversation()
+        # an append to a cached conversation outside a batch stays queued until it is flushed
+        history.add_to_conversation_history({"role": "user", "content": "queued"}, other)
+
+        list(gateway.stream_agent("go", streamed))
+
+        self.assertEqual([message["content"] for message in store.conversations[streamed]], ["go", "echo:go"])
+        self.assertEqual(store.conversations[other], [])
+
+
+class FakeBatchAgent(AbstractAgent):
+    """Local provider that echoes each input after a delay, tracking concurrent calls and batch jobs."""
+    SUPPORTS_PROVIDER_BATCH = True
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__("fake-model")
+        self.delay = delay
+        self.response = None
+        # batch inputs run on shallow copies of the adapter, so the counters live in shared containers
+        self.lock = threading.Lock()
+        self.calls = {"in_flight": 0, "max_in_flight": 0}
+        self.call_times = []
+        self.jobs = {}
+
+    def run(self, agent_input, is_tool_response: Optional[bool] = False, conversation_id: Optional[str] = None) -> Response:
+        if self.response is None:
+            self.response = Response()
+        response = self.response
+        self.add_to_conversation_history({"role": "user", "content": agent_input}, conversation_id)
+        model_response = self._call_model(self._build_request(conversation_id), response)
+        self._process_model_response(model_response, response, conversation_id)
+        return response
+
+    def _build_request(self, conversation_id) -> Dict[str, Any]:
+        return {"model": self.model_id, "messages": self.get_request_history(conversation_id)}
+
+    def _invoke_model(self, request: Dict[str, Any]):
+        with self.lock:
+            self.calls["in_flight"] += 1
+            self.calls["max_in_flight"] = max(self.calls["max_in_flight"], self.calls["in_flight"])
+            self.call_times.append(time.perf_counter())
+        try:
+            time.sleep(self.delay)
+            return self._reply(request)
+        finally:
+            with self.lock:
+                self.calls["in_flight"] -= 1
+
+    @staticmethod
+    def _reply(request: Dict[str, Any]):
+        text = request["messages"][-1]["content"]
+        if text == "fail":
+            return {"stop": "error", "text": "provider rejected the input"}
+        return {"stop": "end_turn", "text": f"echo:{text}"}
+
+    def _process_model_response(self, model_response, response: Response, conversation_id):
+        response.set_conversation_id(conversation_id)
+        self.add_to_conversation_history({"role": "assistant", "content": model_response["text"]}, conversation_id)
+        if model_response["stop"] == "end_turn":
+            response.set_response_type(ResponseType.ANSWER)
+        else:
+            response.set_response_type(ResponseType.ERROR)
+        response.set_content(model_response["text"])
+
+    def _submit_batch(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        batch_id = f"batch-{len(self.jobs)}"
+        # each job reports "processing" on its first status check
+        self.jobs[batch_id] = {"requests": requests, "checks": 0}
+        return batch_id
+
+    def _get_batch_results(self, batch_id: str):
+        job = self.jobs[batch_id]
+        job["checks"] += 1
+        if job["checks"] == 1:
+            return None
+        return {custom_id: self._reply(request) for custom_id, request in job["requests"].items()}
+
+    def set_auth(self, **kwargs):
+        self.auth_data.update(kwargs)
+
+    def get_auth(self) -> Dict[str, Any]:
+        return self.auth_data
+
+    def set_model_config(self, **kwargs):
+        self.model_config.update(kwargs)
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return self.model_config
+
+
+class TestAgentGatewayBatch(unittest.TestCase):
+    def _gateway(self, adapter=None):
+        adapter = adapter or FakeBatchAgent()
+        gateway = AgentGateway(adapter, "fake-model")
+        gateway.prepare_agent(Prompt("test"))
+        self.addCleanup(gateway.close)
+        return gateway, adapter
+
+    def test_run_batch_bounds_concurrency(self):
+        gateway, adapter = self._gateway()
+        inputs = [f"q{i}" for i in range(12)]
+
+        results = list(gateway.run_batch(inputs, max_concurrency=3))
+
+        self.assertEqual(sorted(result.index for result in results), list(range(12)))
+        for result in results:
+            self.assertTrue(result.ok)
+            self.assertEqual(result.response.content, f"echo:{result.input}")
+        self.assertEqual(adapter.calls["max_in_flight"], 3)
+        # each input ran in its own conversation, which is dropped once it completes
+        self.assertEqual(len({result.response.conversation_id for result in results}), 12)
+        self.assertEqual(adapter.conversation_manager.conversations, {})
+
+    def test_run_batch_ordered_keeps_history_and_reports_errors(self):
+        gateway, adapter = self._gateway()
+
+        results = list(gateway.run_batch(["a", "fail", "c"], max_concurrency=3, ordered=True, keep_history=True))
+
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        self.assertEqual(results[0].response.content, "echo:a")
+        self.assertFalse(results[1].ok)
+        self.assertIsNone(results[1].response)
+        self.assertIn("provider rejected the input", str(results[1].error))
+        self.assertEqual(adapter.get_conversation_history(results[2].response.conversation_id)[-1]["content"], "echo:c")
+
+    def test_run_batch_consumes_inputs_lazily(self):
+        gateway, adapter = self._gateway()
+        consumed = []
+
+        def inputs():
+            for i in range(100):
+                consumed.append(i)
+                yield f"q{i}"
+
+        results = gateway.run_batch(inputs(), max_concurrency=2)
+        next(results)
+        self.assertLessEqual(len(consumed), 6)
+        results.close()
+
+    def test_run_batch_applies_provider_rate_limit(self):
+        gateway, adapter = self._gateway(FakeBatchAgent(delay=0))
+
+        # 600 per minute allows a burst of 10 calls, then one every 0.1s
+        list(gateway.run_batch([f"q{i}" for i in range(13)], max_concurrency=13, requests_per_minute=600))
+
+        self.assertGreaterEqual(max(adapter.call_times) - min(adapter.call_times), 0.25)
+
+    @patch('agentgateway.agent_gateway.time.sleep')
+    def test_run_batch_through_provider_batch_endpoint(self, mock_sleep):
+        gateway, adapter = self._gateway()
+
+        with patch.dict(ConfigManager().config["batch"], {"provider_batch_size": 2}):
+            results = list(gateway.run_batch(["a", "fail", "c"], use_provider_batch=True, ordered=True))
+
+        self.assertEqual(sorted(adapter.jobs), ["batch-0", "batch-1"])
+        self.assertEqual(adapter.calls["max_in_flight"], 0)
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        self.assertEqual(results[0].response.content, "echo:a")
+        self.assertEqual(results[0].response.get_usage_details()["llm_calls"], 1)
+        self.assertFalse(results[1].ok)
+        self.assertEqual(results[2].response.content, "echo:c")
+        mock_sleep.assert_called_once()
+        self.assertEqual(adapter.conversation_manager.conversations, {})
+
+    def test_provider_batch_requires_support_and_no_tools(self):
+        tool_gateway, _ = self._gateway()
+        tool_gateway.prepare_agent(Prompt("test"), [SleepTool()])
+        with self.assertRaises(ValueError):
+            tool_gateway.run_batch(["a"], use_provider_batch=True)
+
+        gateway = AgentGateway(FakeToolAgent([]), "fake-model")
+        with self.assertRaises(ValueError):
+            gateway.run_batch(["a"], use_provider_batch=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
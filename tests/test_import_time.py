@@ -0,0 +1,49 @@
+import json
+import subprocess
+import sys
+import unittest
+
+PROVIDER_SDKS = ["openai", "anthropic", "groq", "boto3", "botocore", "redis", "together"]
+
+
+def run_import(code: str) -> dict:
+    """Run code in a fresh interpreter and report the import time and the provider SDKs it loaded."""
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = sorted({{name.split('.')[0] for name in sys.modules}} & set({PROVIDER_SDKS!r}))\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    def test_gateway_import_loads_no_provider_sdk(self):
+        result = run_import("import agentgateway.agent_gateway")
+        print(f"\nimport agentgateway.agent_gateway: {result['elapsed'] * 1000:.1f} ms")
+        self.assertEqual(result["loaded"], [])
+
+    def test_core_import_loads_no_provider_sdk(self):
+        result = run_import("import agentgateway.core, agentgateway.adapters")
+        self.assertEqual(result["loaded"], [])
+
+    def test_selected_adapter_loads_only_its_sdk(self):
+        result = run_import(
+            "from agentgateway.agent_gateway import AgentGateway, AgentType\n"
+            "AgentGateway(AgentType.GROQ, 'llama3-70b-8192')"
+        )
+        self.assertEqual(result["loaded"], ["groq"])
+
+    def test_lazy_package_attributes(self):
+        result = run_import(
+            "from agentgateway.adapters import GroqAgent\n"
+            "from agentgateway.core import RedisConversationManager"
+        )
+        self.assertEqual(result["loaded"], ["groq", "redis"])
+
+
+if __name__ == '__main__':
+    unittest.main()
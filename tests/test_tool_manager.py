@@ -44,3 +44,23 @@ def test_tool_manager_validate_and_set_input():
     # Invalid parameter type
     with pytest.raises(TypeError):
         manager._validate_and_set_input(calculator_tool, {"expression": 42})
+
+
+def test_tool_manager_validators_follow_the_schema():
+    class StrictCalculatorTool(CalculatorTool):
+        strict = False
+
+        def get_parameters_schema(self):
+            schema = super().get_parameters_schema()
+            if self.strict:
+                schema = {**schema, "properties": {**schema["properties"], "precision": {"type": "integer"}},
+                          "required": schema["required"] + ["precision"]}
+            return schema
+
+    manager = ToolManager()
+    manager._validate_and_set_input(StrictCalculatorTool(), {"expression": "2+2"})
+
+    strict_tool = StrictCalculatorTool()
+    strict_tool.strict = True
+    with pytest.raises(ValueError):
+        manager._validate_and_set_input(strict_tool, {"expression": "2+2"})
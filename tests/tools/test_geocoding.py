@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from agentgateway.core.cache import SQLiteCache
+from agentgateway.tools.geocoding import Gazetteer, Geocoder, get_geocoder, normalize_location, set_geocoder
+from agentgateway.tools.weather_tool import WeatherTool
+
+
+class StubNominatim:
+    """Answers every location but "Atlantis" after a delay standing in for the network round trip."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.queries = []
+
+    def geocode(self, location):
+        self.queries.append(location)
+        time.sleep(self.delay)
+        if location == "Atlantis":
+            return None
+        return SimpleNamespace(latitude=10.5, longitude=-20.25)
+
+
+class TestGeocoding(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = os.path.join(directory.name, "geocode.sqlite")
+        self.cache = self._cache()
+
+    def _cache(self):
+        cache = SQLiteCache(self.cache_path, table="geocode_cache")
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_normalize_location(self):
+        self.assertEqual(normalize_location("  São   Paulo ,BRAZIL "), "sao paulo, brazil")
+        self.assertEqual(normalize_location("London,UK"), normalize_location("london , uk"))
+        self.assertEqual(normalize_location(None), "")
+
+    def test_gazetteer(self):
+        gazetteer = Gazetteer()
+        london = gazetteer.lookup("London")
+        self.assertEqual(london, (51.5074, -0.1278))
+        for name in ["London,UK", "london , united kingdom", "LONDON, GB", "London, England"]:
+            self.assertEqual(gazetteer.lookup(name), london)
+        self.assertEqual(gazetteer.lookup("Sao Paulo, BR"), gazetteer.lookup("São Paulo"))
+        self.assertEqual(gazetteer.lookup("Bombay"), gazetteer.lookup("Mumbai, India"))
+        self.assertIsNone(gazetteer.lookup("London, France"))
+        self.assertIsNone(gazetteer.lookup("Springfield"))
+        self.assertGreater(len(gazetteer), 150)
+
+    def test_lookups_are_cached_persistently(self):
+        nominatim = StubNominatim()
+        geocoder = Geocoder(self.cache, Gazetteer(), geocoder=nominatim, requests_per_minute=6000)
+
+        self.assertEqual(geocoder.geocode("Springfield, Illinois"), (10.5, -20.25))
+        self.assertEqual(geocoder.geocode("springfield ,  illinois"), (10.5, -20.25))
+        self.assertEqual(geocoder.geocode("Paris, France"), (48.8566, 2.3522))
+        self.assertIsNone(geocoder.geocode("Atlantis"))
+        self.assertIsNone(geocoder.geocode("Atlantis"))
+        self.assertEqual(nominatim.queries, ["Springfield, Illinois", "Atlantis", "Atlantis"])
+
+        # a new process finds the location in the cache file
+        restarted = Geocoder(self._cache(), geocoder=nominatim, requests_per_minute=6000)
+        self.assertEqual(restarted.geocode("SPRINGFIELD, ILLINOIS"), (10.5, -20.25))
+        self.assertEqual(len(nominatim.queries), 3)
+
+    def test_weather_tool_uses_process_geocoder(self):
+        nominatim = StubNominatim()
+        previous = set_geocoder(Geocoder(self.cache, Gazetteer(), geocoder=nominatim, requests_per_minute=6000))
+        self.addCleanup(set_geocoder, previous)
+
+        tool = WeatherTool()
+        self.assertEqual(tool.get_coordinates("Tokyo, Japan"), (35.6762, 139.6503))
+        self.assertEqual(tool.get_coordinates("Springfield"), (10.5, -20.25))
+        self.assertEqual(nominatim.queries, ["Springfield"])
+
+    def test_unavailable_cache_falls_back_to_no_cache(self):
+        previous = set_geocoder(None)
+        self.addCleanup(set_geocoder, previous)
+        error = sqlite3.OperationalError("unable to open database file")
+        with patch("agentgateway.tools.geocoding.get_shared_cache", side_effect=error):
+            geocoder = get_geocoder()
+
+        self.assertIsNone(geocoder.cache)
+        self.assertEqual(geocoder.geocode("Tokyo"), (35.6762, 139.6503))
+
+    def test_benchmark_against_stubbed_nominatim(self):
+        # Nominatim answers in tens of milliseconds and allows one request per second; the stub only models the
+        # round trip, so the remote figure is a lower bound
+        locations = ["Springfield, Illinois", "Portland, Maine", "Cork, Ireland", "Graz, Austria", "Bergen, Norway"]
+        nominatim = StubNominatim(delay=0.02)
+        geocoder = Geocoder(self.cache, Gazetteer(), geocoder=nominatim, requests_per_minute=6000)
+        rounds = 20
+
+        start = time.perf_counter()
+        for location in locations:
+            geocoder.geocode(location)
+        remote = (time.perf_counter() - start) / len(locations)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for location in locations:
+                geocoder.geocode(location.upper())
+        cached = (time.perf_counter() - start) / (rounds * len(locations))
+
+        cities = ["London, UK", "Paris", "Tokyo", "New York", "Sydney"]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for city in cities:
+                geocoder.geocode(city)
+        offline = (time.perf_counter() - start) / (rounds * len(cities))
+
+        print(f"\ngeocode per lookup: stubbed Nominatim {remote * 1000:.2f} ms, SQLite cache {cached * 1000:.3f} ms, "
+              f"gazetteer {offline * 1000:.3f} ms")
+        self.assertEqual(len(nominatim.queries), len(locations))
+        self.assertLess(cached * 10, remote)
+        self.assertLess(offline * 10, remote)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,9 +14,9 @@ def test_weather_tool_is_auth_setup():
     assert tool.is_auth_setup() == True
 
 
-@patch('agentgateway.tools.weather_tool.requests.get')
+@patch('agentgateway.tools.weather_tool.get_shared_session')
 @patch('agentgateway.tools.weather_tool.WeatherTool.get_coordinates')
-def test_weather_tool_execute(mock_get_coordinates, mock_requests_get):
+def test_weather_tool_execute(mock_get_coordinates, mock_get_session):
     tool = WeatherTool()
     tool.set_parameter("location", "London,UK")
 
@@ -27,7 +27,7 @@ def test_weather_tool_execute(mock_get_coordinates, mock_requests_get):
         "hourly": {"temperature_2m": [20], "precipitation": [0], "windspeed_10m": [10]},
         "daily": {"temperature_2m_max": [25], "temperature_2m_min": [15], "precipitation_sum": [0]}
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_session.return_value.get.return_value = mock_response
 
     result = tool.execute()
     assert "Weather Report for London,UK" in result
@@ -39,4 +39,21 @@ def test_weather_tool_parameters_schema():
     schema = tool.get_parameters_schema()
     assert schema["type"] == "object"
     assert "location" in schema["properties"]
-    assert "location" in schema["required"]
\ No newline at end of file
+    assert "location" in schema["required"]
+
+
+def test_weather_tool_cache_key_normalizes_location():
+    tool = WeatherTool()
+    tool.set_parameter("location", "London,UK")
+    other = WeatherTool()
+    other.set_parameter("location", "  london ,  uk")
+    assert tool.get_cache_key() == other.get_cache_key()
+
+    other.set_parameter("location", "Paris, France")
+    assert tool.get_cache_key() != other.get_cache_key()
+
+
+def test_weather_tool_does_not_cache_failures():
+    tool = WeatherTool()
+    assert not tool.is_cacheable_result("Unable to find coordinates for Atlantis")
+    assert tool.is_cacheable_result("Weather Report for London,UK")
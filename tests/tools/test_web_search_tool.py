@@ -7,8 +7,8 @@ class TestWebSearchTool(unittest.TestCase):
     def setUp(self):
         self.tool = WebSearchTool()
 
-    @patch('agentgateway.tools.web_search_tool.requests.get')
-    def test_web_search(self, mock_get):
+    @patch('agentgateway.tools.web_search_tool.get_shared_session')
+    def test_web_search(self, mock_get_session):
         # Mock the response
         mock_response = MagicMock()
         mock_response.text = """
@@ -28,7 +28,7 @@ class TestWebSearchTool(unittest.TestCase):
         </html>
         """
         mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
 
         self.tool.set_parameters({"query": "test query", "num_results": 2})
         results = json.loads(self.tool.execute())
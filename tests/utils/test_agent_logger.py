@@ -0,0 +1,101 @@
+import io
+import logging
+import logging.handlers
+import unittest
+from unittest.mock import Mock
+from agentgateway.utils.agent_logger import AgentLogger, _queue_listeners
+
+
+class Expensive:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "expensive"
+
+
+class TestAgentLogger(unittest.TestCase):
+    def _logger(self, name, **kwargs):
+        logger = AgentLogger(name, **kwargs)
+        self.addCleanup(self._remove_handlers, logging.getLogger(name))
+        return logger
+
+    @staticmethod
+    def _remove_handlers(logger):
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        listener = _queue_listeners.pop(logger.name, None)
+        if listener is not None:
+            listener.stop()
+
+    @staticmethod
+    def _capture(logger, handler_index=0):
+        stream = io.StringIO()
+        logger.logger.handlers[handler_index].setStream(stream)
+        return stream
+
+    def test_disabled_messages_are_not_formatted(self):
+        logger = self._logger("test_lazy", level="ERROR")
+        argument = Expensive()
+        message = Mock(return_value="built")
+
+        logger.info("tool output: %s", argument)
+        logger.debug(message)
+
+        self.assertEqual(argument.formatted, 0)
+        message.assert_not_called()
+        self.assertFalse(logger.isEnabledFor("INFO"))
+        self.assertTrue(logger.isEnabledFor(logging.ERROR))
+
+    def test_enabled_messages_are_formatted(self):
+        logger = self._logger("test_enabled", level="INFO", trace_id="trace-1")
+        stream = self._capture(logger)
+
+        logger.info("tool output: %s", Expensive())
+        logger.warning(lambda: "built lazily")
+
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].endswith("INFO - trace-1 - tool output: expensive"))
+        self.assertTrue(lines[1].endswith("WARNING - trace-1 - built lazily"))
+
+    def test_handler_is_added_once_per_name(self):
+        first = self._logger("test_shared")
+        self._logger("test_shared")
+        first.add_file_handler("/dev/null")
+        first.add_file_handler("/dev/null")
+        self.addCleanup(lambda: [h.close() for h in first.logger.handlers if isinstance(h, logging.FileHandler)])
+
+        self.assertEqual(len(first.logger.handlers), 2)
+
+    def test_later_logger_level_applies(self):
+        self._logger("test_relevel", level="ERROR")
+        logger = self._logger("test_relevel", level="DEBUG")
+        stream = self._capture(logger)
+
+        logger.debug("visible %s", "now")
+
+        self.assertIn("visible now", stream.getvalue())
+        self.assertEqual(len(logger.logger.handlers), 1)
+
+    def test_conflicting_use_queue_warns(self):
+        self._logger("test_conflict", use_queue=False)
+        with self.assertWarns(RuntimeWarning):
+            self._logger("test_conflict", use_queue=True)
+
+    def test_queue_handler_writes_from_listener_thread(self):
+        logger = self._logger("test_queue", level="INFO", use_queue=True)
+        self.assertIsInstance(logger.logger.handlers[0], logging.handlers.QueueHandler)
+        stream = io.StringIO()
+        listener = _queue_listeners["test_queue"]
+        listener.handlers[0].setStream(stream)
+
+        logger.info("queued %s", 1)
+        listener.stop()
+        listener.start()
+
+        self.assertIn("queued 1", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()